@@ -0,0 +1,91 @@
+"""
+SMALL Scale Tests - Authentication Caching
+
+Unit tests for the validated token cache and throttled last_login writes
+"""
+
+import base64
+import json
+import time
+from datetime import datetime, timedelta
+
+from trexima.web.auth import TokenCache, UserContext, token_cache
+from trexima.web.models import db, get_or_create_user
+
+
+def make_token(exp):
+    payload = base64.urlsafe_b64encode(json.dumps({'exp': exp}).encode()).rstrip(b'=')
+    return f"header.{payload.decode()}.signature"
+
+
+class TestTokenCache:
+    """Test LRU eviction and expiry of cached tokens"""
+
+    def test_evicts_least_recently_used(self):
+        """Test that the oldest unused token is dropped first"""
+        cache = TokenCache(max_size=2)
+        tokens = [make_token(time.time() + 3600 + i) for i in range(3)]
+        for i, token in enumerate(tokens[:2]):
+            cache.put(token, UserContext(f'user{i}', f'user{i}@example.com'))
+
+        assert cache.get(tokens[0]).user_id == 'user0'
+        cache.put(tokens[2], UserContext('user2', 'user2@example.com'))
+
+        assert cache.get(tokens[1]) is None
+        assert cache.get(tokens[0]).user_id == 'user0'
+        assert cache.get(tokens[2]).user_id == 'user2'
+
+    def test_expired_and_unexpiring_tokens(self):
+        """Test that tokens are only cached until their exp claim"""
+        cache = TokenCache()
+        expired = make_token(time.time() - 1)
+        no_exp = 'header.' + base64.urlsafe_b64encode(b'{}').decode() + '.signature'
+        for token in (expired, no_exp, 'not-a-jwt'):
+            cache.put(token, UserContext('user', 'user@example.com'))
+            assert cache.get(token) is None
+        assert cache.stats()['entries'] == 0
+
+
+class TestLastLogin:
+    """Test that looking up a user doesn't write on every request"""
+
+    def test_last_login_throttled(self, app):
+        """Test that a recent last_login is kept"""
+        app.config['LAST_LOGIN_UPDATE_SECONDS'] = 300
+        user = get_or_create_user('login-user', 'login@example.com')
+        first = user.last_login
+
+        user = get_or_create_user('login-user', 'login@example.com')
+        assert user.last_login == first
+
+        user.last_login = datetime.utcnow() - timedelta(minutes=10)
+        db.session.commit()
+        user = get_or_create_user('login-user', 'login@example.com')
+        assert user.last_login > datetime.utcnow() - timedelta(minutes=1)
+
+    def test_user_memoized_per_request(self, app):
+        """Test that a request looks the user up once"""
+        with app.test_request_context():
+            first = get_or_create_user('memo-user', 'memo@example.com')
+            assert get_or_create_user('memo-user', 'memo@example.com') is first
+
+
+class TestAdminEndpoints:
+    """Test the admin endpoints that report cache stats"""
+
+    def test_stats_and_health(self, app):
+        """Test that stats and detailed health respond, health with token cache stats"""
+        token = make_token(time.time() + 3600)
+        token_cache.put(token, UserContext('admin-user', 'admin@example.com', is_admin=True))
+        client = app.test_client()
+        headers = {'Authorization': f'Bearer {token}'}
+        try:
+            response = client.get('/api/admin/stats', headers=headers)
+            assert response.status_code == 200
+            assert 'users' in response.get_json()
+
+            response = client.get('/api/admin/health/detailed', headers=headers)
+            assert response.status_code == 200
+            assert 'entries' in response.get_json()['checks']['auth']['token_cache']
+        finally:
+            token_cache.clear()
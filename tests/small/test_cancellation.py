@@ -0,0 +1,58 @@
+"""
+SMALL Scale Tests - Cancellation
+
+Unit tests for cooperative cancellation tokens
+"""
+
+from unittest.mock import MagicMock
+
+import pytest
+from openpyxl import Workbook
+
+from trexima.core.cancellation import CancellationToken, OperationCancelled
+from trexima.core.translation_importer import TranslationImporter
+
+
+class TestCancellation:
+    """Test cancellation checks and cleanup"""
+
+    def test_check_is_throttled(self):
+        """Test that the check function runs at most once per interval"""
+        calls = []
+
+        def check():
+            calls.append(1)
+            return len(calls) > 1
+
+        token = CancellationToken(check, check_interval=3600)
+        assert not token.cancelled
+        assert not token.cancelled
+        assert len(calls) == 1
+
+        token = CancellationToken(check, check_interval=0)
+        assert token.cancelled
+        with pytest.raises(OperationCancelled):
+            token.raise_if_cancelled()
+
+    def test_cancelled_is_not_an_exception(self):
+        """Test that broad except Exception handlers do not swallow it"""
+        token = CancellationToken.none()
+        token.cancel()
+        with pytest.raises(OperationCancelled):
+            try:
+                token.raise_if_cancelled()
+            except Exception:
+                pass
+
+    def test_importer_discards_partial_output(self, tmp_path):
+        """Test that a cancelled import leaves no files behind"""
+        token = CancellationToken.none()
+        token.cancel()
+        importer = TranslationImporter(MagicMock(), cancel_token=token)
+
+        workbook = Workbook()
+        workbook.active.title = "DataModel (de-DE)"
+        with pytest.raises(OperationCancelled):
+            importer.import_from_workbook(workbook, ["DataModel (de-DE)"], str(tmp_path))
+
+        assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,54 @@
+"""
+SMALL Scale Tests - Change Log Writer
+
+Unit tests for the streaming import change log
+"""
+
+import csv
+import json
+import os
+
+import pytest
+
+from trexima.io.changelog_writer import ChangeLogWriter
+
+
+class TestChangeLogWriter:
+    """Test streamed change records and import log lines"""
+
+    def test_jsonl_records_and_log(self, tmp_path):
+        """Test that records and log lines are written as they arrive"""
+        with ChangeLogWriter(str(tmp_path)) as writer:
+            writer.record("DataModel (de-DE)", 2, "Translation Added: 'Name'")
+            writer.log("Row 2: Added 'de-DE' translation")
+            writer.log("Row 3: Added 'de-DE' translation")
+
+        with open(writer.change_log_path, encoding="utf-8") as f:
+            records = [json.loads(line) for line in f]
+        assert records == [
+            {"sheet": "DataModel (de-DE)", "row": 2, "change": "Translation Added: 'Name'"}
+        ]
+
+        with open(writer.log_path, encoding="utf-8") as f:
+            lines = f.read().split("\n\n")
+        assert len(lines) == 2
+        assert lines[1].endswith("Row 3: Added 'de-DE' translation")
+
+    def test_csv_format_and_bounded_tail(self, tmp_path):
+        """Test CSV output and that only recent log lines are kept in memory"""
+        with ChangeLogWriter(str(tmp_path), change_log_format="csv", tail_size=3) as writer:
+            for row in range(10):
+                writer.record("PM", row, f"change {row}")
+                writer.log(f"line {row}")
+
+        assert os.path.basename(writer.change_log_path).endswith(".csv")
+        with open(writer.change_log_path, newline="", encoding="utf-8") as f:
+            rows = list(csv.DictReader(f))
+        assert len(rows) == 10
+        assert writer.changes_written == 10
+        assert [line.split(": ", 1)[1] for line in writer.tail] == ["line 7", "line 8", "line 9"]
+
+    def test_invalid_format(self, tmp_path):
+        """Test that unknown formats are rejected"""
+        with pytest.raises(ValueError):
+            ChangeLogWriter(str(tmp_path), change_log_format="xml")
@@ -0,0 +1,45 @@
+"""
+SMALL Scale Tests - Disk Cache
+
+Unit tests for the LRU cache of object storage files
+"""
+
+import os
+
+from trexima.web.disk_cache import DiskCache
+
+
+def writer(size):
+    def write(path):
+        with open(path, 'wb') as f:
+            f.write(b'x' * size)
+    return write
+
+
+class TestDiskCache:
+    """Test hits, misses and LRU eviction"""
+
+    def test_hit_and_miss_statistics(self, tmp_path):
+        """Test that entries are found by key and ETag"""
+        cache = DiskCache(str(tmp_path), max_bytes=1000)
+        name = DiskCache.entry_name('users/u/wb.xlsx', 'etag-1')
+
+        assert cache.get(name) is None
+        path = cache.put(name, writer(10))
+        assert cache.get(name) == path
+        assert cache.get(DiskCache.entry_name('users/u/wb.xlsx', 'etag-2')) is None
+
+        stats = cache.stats()
+        assert (stats['hits'], stats['misses'], stats['size_bytes']) == (1, 2, 10)
+
+    def test_least_recently_used_is_evicted(self, tmp_path):
+        """Test that eviction keeps recently read entries"""
+        cache = DiskCache(str(tmp_path), max_bytes=250)
+        for i, name in enumerate(['a', 'b']):
+            os.utime(cache.put(name, writer(100)), (i, i))
+        # Reading 'a' makes 'b' the least recently used entry
+        cache.get('a')
+        cache.put('c', writer(100))
+
+        assert sorted(os.listdir(tmp_path)) == ['a', 'c']
+        assert cache.stats()['evictions'] == 1
@@ -0,0 +1,79 @@
+"""
+SMALL Scale Tests - Element Index
+
+Unit tests for the element indexes used by PM/GM import/export
+"""
+
+from bs4 import BeautifulSoup
+
+from trexima.core.element_index import SiblingLanguageIndex, AttributeIndex
+
+
+TEMPLATE_XML = """
+<obj-plan-template>
+<obj-plan-name>Goals</obj-plan-name>
+<obj-plan-name lang="de_DE">Ziele</obj-plan-name>
+<obj-plan-desc>Description</obj-plan-desc>
+<obj-plan-desc lang="fr_FR">Description FR</obj-plan-desc>
+</obj-plan-template>
+"""
+
+
+class TestSiblingLanguageIndex:
+    """Test sibling-language lookups and inserts"""
+
+    def test_lookup_is_scoped_to_tag_name(self):
+        """Test that lookups only match siblings with the same tag name"""
+        soup = BeautifulSoup(TEMPLATE_XML, "html.parser")
+        index = SiblingLanguageIndex()
+
+        name_tag = soup.find("obj-plan-name")
+        desc_tag = soup.find("obj-plan-desc")
+
+        assert index.get_lang_tag(name_tag, "de_DE").string == "Ziele"
+        assert index.get_lang_tag(name_tag, "fr_FR") is None
+        assert index.get_lang_tag(desc_tag, "fr_FR").string == "Description FR"
+
+    def test_insert_appends_after_last_sibling(self):
+        """Test that new language tags land after the group and are indexed"""
+        soup = BeautifulSoup(TEMPLATE_XML, "html.parser")
+        index = SiblingLanguageIndex()
+        name_tag = soup.find("obj-plan-name")
+
+        group = index.group_for(name_tag)
+        new_tags = []
+        for lang in ["fr_FR", "es_ES"]:
+            new_tag = soup.new_tag("obj-plan-name")
+            new_tag["lang"] = lang
+            new_tags.append(new_tag)
+        group.insert(new_tags)
+
+        names = soup.find_all("obj-plan-name")
+        assert [t.get("lang") for t in names] == [None, "de_DE", "fr_FR", "es_ES"]
+        assert names[-1].find_next_sibling().name == "obj-plan-desc"
+        assert index.get_lang_tag(name_tag, "es_ES") is new_tags[1]
+
+
+SECTIONS_XML = """
+<sf-form>
+<fm-sect index="1"><fm-sect-name>Goals</fm-sect-name></fm-sect>
+<fm-sect index="2"><fm-sect-name>Comments</fm-sect-name></fm-sect>
+<fm-sect-config index="1"></fm-sect-config>
+<fm-sect index="2"><fm-sect-name>Duplicate</fm-sect-name></fm-sect>
+</sf-form>
+"""
+
+
+class TestAttributeIndex:
+    """Test (tag, attribute, value) lookups"""
+
+    def test_matches_soup_find(self):
+        """Test that lookups return the same element as soup.find"""
+        soup = BeautifulSoup(SECTIONS_XML, "html.parser")
+        index = AttributeIndex(soup)
+
+        for tag_name, value in [("fm-sect", "1"), ("fm-sect", "2"), ("fm-sect-config", "1")]:
+            assert index.find(tag_name, "index", value) is soup.find(
+                tag_name, attrs={"index": value}
+            )
+        assert index.find("fm-sect", "index", "3") is None
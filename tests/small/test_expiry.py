@@ -0,0 +1,47 @@
+"""
+SMALL Scale Tests - Expiry Sweeper
+
+Unit tests for batched deletion of expired generated files
+"""
+
+from datetime import datetime, timedelta
+
+from trexima.web.expiry import sweep_expired, expired_backlog
+from trexima.web.models import db, User, Project, GeneratedFile
+from trexima.web.storage import ObjectStorageService
+from trexima.web.storage_usage import get_usage
+
+
+class TestExpirySweep:
+    """Test that expired files leave storage, database and counters"""
+
+    def test_sweep_in_batches(self, app, tmp_path):
+        """Test batched deletes and the remaining backlog"""
+        storage = ObjectStorageService()
+        storage._use_local_storage = True
+        storage._local_base = str(tmp_path)
+        storage._initialized = True
+
+        user = User(xsuaa_id='expiry-user', email='expiry@example.com')
+        project = Project(name='Expiry', owner=user)
+        db.session.add_all([user, project])
+        now = datetime.utcnow()
+        for i, days in enumerate([-3, -2, -1, 30]):
+            key = f'gen/file{i}.xlsx'
+            storage.upload_bytes(b'x' * 10, key)
+            db.session.add(GeneratedFile(
+                project=project, filename=f'file{i}.xlsx', file_type='workbook',
+                storage_key=key, file_size=10, expires_at=now + timedelta(days=days)
+            ))
+        db.session.commit()
+        assert expired_backlog() == 3
+
+        metrics = sweep_expired(storage, batch_size=2, max_batches=1)
+        assert (metrics['deleted'], metrics['backlog']) == (2, 1)
+
+        metrics = sweep_expired(storage, batch_size=2)
+        assert (metrics['deleted'], metrics['backlog']) == (1, 0)
+
+        assert [f.filename for f in GeneratedFile.query.all()] == ['file3.xlsx']
+        assert [f['key'] for f in storage.iter_files('gen/')] == ['gen/file3.xlsx']
+        assert get_usage(user.id)['generated'] == {'count': 1, 'size': 10}
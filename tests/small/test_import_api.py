@@ -6,6 +6,7 @@ Unit tests for the import blueprint
 
 import pytest
 import io
+import os
 from unittest.mock import Mock, patch, MagicMock
 from trexima.web.models import db
 
@@ -246,3 +247,40 @@ class TestImportOptions:
 
         # Should require at least one worksheet
         assert len(worksheets) == 0  # Would fail validation
+
+
+class TestImportJob:
+    """Test the import job handler"""
+
+    def test_workbook_is_read_from_storage_and_removed(self, app, tmp_path):
+        """Test that the job downloads its workbook and deletes it when done"""
+        from trexima.web.blueprints import import_bp
+        from trexima.web.models import User, Project
+        from tests.small.test_storage import local_storage
+
+        storage = local_storage(tmp_path)
+        key = 'users/u/projects/p/jobs/j/workbook.xlsx'
+        storage.upload_bytes(b'not a workbook', key)
+
+        user = User(id='import-user', xsuaa_id='xsuaa-import', email='import@example.com')
+        project = Project(id='import-project', name='Import', user_id=user.id, status='importing')
+        db.session.add_all([user, project])
+        db.session.commit()
+
+        downloaded = []
+        download = storage.download_to_file
+
+        def download_to_file(storage_key, local_path):
+            downloaded.append(local_path)
+            return download(storage_key, local_path)
+
+        with patch('trexima.web.blueprints.import_bp.storage_service', storage), \
+                patch.object(storage, 'download_to_file', download_to_file):
+            assert not import_bp._execute_import(
+                project_id=project.id, user_id=user.id, workbook_key=key,
+                uploaded_files=[], worksheets=None, push_to_api=False, sf_connection={}
+            )
+
+        assert downloaded and not storage.file_exists(key)
+        assert not any(os.path.exists(p) for p in downloaded)
+        assert db.session.get(Project, project.id).status == 'exported'
@@ -0,0 +1,135 @@
+"""
+SMALL Scale Tests - Job Queue
+
+Unit tests for claiming and running persisted jobs
+"""
+
+import threading
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+from flask import current_app
+
+from trexima.web.models import db, User, Project, Job
+from trexima.web import jobs
+
+
+def _create_project():
+    user = User(id='job-user', xsuaa_id='xsuaa-job', email='job@example.com')
+    project = Project(id='job-project', name='Job Project', user_id=user.id)
+    db.session.add_all([user, project])
+    db.session.commit()
+    return project
+
+
+def _queue_job(project, job_type):
+    job = Job(job_type=job_type, project_id=project.id, user_id=project.user_id,
+              payload={'value': 1}, status='queued')
+    db.session.add(job)
+    db.session.commit()
+    return job
+
+
+class TestJobQueue:
+    """Test the database-backed job queue"""
+
+    def test_claim_and_run(self, app):
+        """Test that a claimed job runs its handler and completes"""
+        calls = []
+
+        @jobs.job_handler('test-ok')
+        def _handler(value):
+            calls.append(value)
+            return True
+
+        project = _create_project()
+        job = _queue_job(project, 'test-ok')
+        assert jobs.has_active_job(project.id)
+
+        claimed = jobs.claim_next_job('worker-test')
+        assert claimed.id == job.id
+        assert claimed.status == 'running'
+        assert jobs.claim_next_job('worker-test') is None
+
+        jobs.run_job(claimed)
+
+        assert calls == [1]
+        assert db.session.get(Job, job.id).status == 'completed'
+        assert not jobs.has_active_job(project.id)
+
+    def test_cancelled_job(self, app):
+        """Test that a failed handler of a cancel-requested job is cancelled"""
+        @jobs.job_handler('test-cancel')
+        def _handler(value):
+            return False
+
+        project = _create_project()
+        job = _queue_job(project, 'test-cancel')
+        claimed = jobs.claim_next_job('worker-test')
+
+        assert jobs.request_cancel(project.id)
+        assert jobs.is_cancel_requested(project.id)
+        jobs.run_job(claimed)
+
+        job = db.session.get(Job, job.id)
+        assert job.status == 'cancelled'
+        assert job.finished_at is not None
+
+    def test_interrupted_job_resumes_from_checkpoint(self, app):
+        """Test that a stale job is requeued with its checkpoint, then given up"""
+        abandoned = []
+
+        @jobs.job_handler('test-resume', on_abandon=lambda value: abandoned.append(value))
+        def _handler(value):
+            return True
+
+        project = _create_project()
+        job = _queue_job(project, 'test-resume')
+        claimed = jobs.claim_next_job('worker-test')
+        jobs.JobCheckpoint(claimed.id).save('models', loaded_count=2)
+
+        # The worker died: no heartbeat for longer than the timeout
+        claimed.heartbeat_at = datetime.utcnow() - timedelta(minutes=10)
+        db.session.commit()
+
+        assert jobs.requeue_stale_jobs() == 1
+        job = db.session.get(Job, job.id)
+        db.session.refresh(job)
+        assert job.status == 'queued'
+        assert job.checkpoint['stages']['models'] == {'loaded_count': 2}
+
+        app.config['JOB_MAX_ATTEMPTS'] = 1
+        claimed = jobs.claim_next_job('worker-test')
+        claimed.heartbeat_at = None
+        db.session.commit()
+
+        jobs.requeue_stale_jobs()
+        db.session.refresh(claimed)
+        assert claimed.status == 'failed'
+        assert abandoned == [1]
+
+    def test_inline_job_runs_with_dispatching_app(self, app):
+        """Test that an inline job uses the app that queued it, not a new one"""
+        apps = []
+
+        @jobs.job_handler('test-inline')
+        def _handler(value):
+            with jobs.job_app_context() as job_app:
+                apps.append(job_app)
+            return True
+
+        def in_thread(func, *args):
+            # A background task starts without an app context
+            thread = threading.Thread(target=func, args=args)
+            thread.start()
+            thread.join()
+
+        project = _create_project()
+        job = _queue_job(project, 'test-inline')
+        with patch('trexima.web.websocket.socketio.start_background_task', in_thread), \
+                patch('trexima.web.app.create_app', side_effect=AssertionError("new app")):
+            jobs._dispatch_inline()
+
+        assert apps == [current_app._get_current_object()]
+        db.session.expire_all()
+        assert db.session.get(Job, job.id).status == 'completed'
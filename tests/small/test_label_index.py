@@ -0,0 +1,119 @@
+"""
+SMALL Scale Tests - Label Index
+
+Unit tests for label search over data model elements
+"""
+
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from trexima.core.datamodel_processor import DataModelProcessor
+from trexima.core.label_index import LabelIndex, tokenize
+from trexima.web import label_search
+from trexima.web.label_search import label_index_key, source_key_of
+
+
+SDM_XML = """<?xml version="1.0" encoding="UTF-8"?>
+<succession-data-model>
+<standard-element id="costCenter">
+<label>Cost Center</label>
+<label xml:lang="de-DE">Kostenstelle</label>
+</standard-element>
+<standard-element id="customCostCode">
+<label>Cost Code</label>
+</standard-element>
+<standard-element id="hidden" visibility="none">
+<label>Cost Hidden</label>
+</standard-element>
+</succession-data-model>
+"""
+
+
+def build_index(tmp_path):
+    path = tmp_path / "sdm.xml"
+    path.write_text(SDM_XML, encoding="utf-8")
+    processor = DataModelProcessor()
+    processor.load_data_model(str(path))
+    return LabelIndex.build(processor)
+
+
+class TestLabelIndex:
+    """Test token, prefix, locale and missing-locale search"""
+
+    def test_tokenize(self):
+        """Test that markup is ignored and case is folded"""
+        assert tokenize("<b>Cost</b> Center") == ["cost", "center"]
+
+    def test_search(self, tmp_path):
+        """Test matches per locale and for missing translations"""
+        index = build_index(tmp_path)
+
+        assert [e['field_id'] for e in index.search("cost")['entries']] == ['costCenter', 'customCostCode']
+        assert index.search("cost center", prefix=False)['total'] == 1
+        assert index.search("cost cen")['entries'][0]['labels'] == {'de_DE': 'Kostenstelle'}
+        assert index.search("kosten", locale="de-DE")['total'] == 1
+        assert index.search("kosten", locale="default")['total'] == 0
+        assert [e['field_id'] for e in index.search("cost", missing="de_DE")['entries']] == ['customCostCode']
+
+    def test_round_trip(self, tmp_path):
+        """Test that a stored index answers like the built one"""
+        index = LabelIndex.from_bytes(build_index(tmp_path).to_bytes())
+        assert index.locales == ['de_DE']
+        assert index.search("co")['total'] == 2
+
+    def test_index_key(self):
+        """Test that index keys map back to their model file"""
+        key = label_index_key("blobs/sha256/ab/abc")
+        assert source_key_of(key) == "blobs/sha256/ab/abc"
+        assert source_key_of("blobs/sha256/ab/abc") is None
+
+
+class TestLabelIndexCache:
+    """Test loading indexes into the per-process cache"""
+
+    def test_concurrent_requests_build_once(self, app, tmp_path):
+        """Test that requests waiting for a build use its result"""
+        index = build_index(tmp_path)
+        builds = []
+
+        def build(file):
+            builds.append(file.storage_key)
+            time.sleep(0.05)
+            return index
+
+        file = MagicMock(storage_key='blobs/sha256/cc/ccc', original_name='sdm.xml')
+        results = []
+
+        def search():
+            with app.app_context():
+                results.append(label_search.get_label_index(file))
+
+        label_search.forget_label_indexes()
+        with patch.object(label_search, 'build_label_index', build), \
+                patch.object(label_search, '_read', return_value=None), \
+                patch.object(label_search, 'storage_service'):
+            threads = [threading.Thread(target=search) for _ in range(4)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+
+        assert builds == ['blobs/sha256/cc/ccc']
+        assert results == [index] * 4
+        assert not label_search._loading
+        label_search.forget_label_indexes()
+
+    def test_failed_build_releases_loading_entry(self, app):
+        """Test that a failed build can be retried"""
+        file = MagicMock(storage_key='blobs/sha256/dd/ddd', original_name='sdm.xml')
+
+        label_search.forget_label_indexes()
+        with patch.object(label_search, 'build_label_index', side_effect=IOError("gone")), \
+                patch.object(label_search, '_read', return_value=None):
+            with pytest.raises(IOError):
+                label_search.get_label_index(file)
+
+        assert not label_search._loading
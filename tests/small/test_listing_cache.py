@@ -0,0 +1,75 @@
+"""
+SMALL Scale Tests - Listing Caching
+
+Unit tests for project versions and conditional, compressed JSON responses
+"""
+
+import gzip
+import json
+
+from trexima.web.http_utils import conditional_json, make_etag
+from trexima.web.models import db, User, Project, ProjectFile
+
+
+class TestProjectVersion:
+    """Test that changes bump the project version"""
+
+    def test_changes_bump_version(self, app):
+        """Test that file and metadata changes bump, access does not"""
+        user = User(xsuaa_id='version-user', email='version@example.com')
+        project = Project(name='Versioned', owner=user)
+        db.session.add_all([user, project])
+        db.session.commit()
+        assert project.version == 1
+
+        db.session.add(ProjectFile(
+            project=project, file_type='sdm', original_name='sdm.xml',
+            storage_key='k', file_size=1
+        ))
+        db.session.commit()
+        assert project.version == 2
+
+        project.name = 'Renamed'
+        db.session.commit()
+        assert project.version == 3
+
+        project.last_accessed_at = None
+        project.record_access()
+        db.session.commit()
+        assert project.version == 3
+
+    def test_to_dict_many_matches_to_dict(self, app):
+        """Test that batch serialization gives the same result"""
+        user = User(xsuaa_id='batch-user', email='batch@example.com')
+        projects = [Project(name=f'P{i}', owner=user) for i in range(2)]
+        db.session.add_all([user, *projects])
+        db.session.add(ProjectFile(
+            project=projects[0], file_type='cdm', original_name='cdm.xml',
+            storage_key='k2', file_size=2
+        ))
+        db.session.commit()
+
+        assert Project.to_dict_many(projects) == [p.to_dict() for p in projects]
+
+
+class TestConditionalJson:
+    """Test ETag revalidation and compression"""
+
+    def test_not_modified_skips_build(self, app):
+        """Test that a matching If-None-Match returns 304 without serializing"""
+        etag = make_etag('project', 1)
+
+        def build():
+            raise AssertionError('payload built for a 304')
+
+        with app.test_request_context(headers={'If-None-Match': f'W/"{etag}"'}):
+            response = conditional_json(etag, build)
+        assert response.status_code == 304
+
+    def test_gzip(self, app):
+        """Test that large bodies are compressed for gzip clients"""
+        payload = {'items': ['x' * 100] * 50}
+        with app.test_request_context(headers={'Accept-Encoding': 'gzip'}):
+            response = conditional_json(make_etag('list'), lambda: payload)
+        assert response.headers['Content-Encoding'] == 'gzip'
+        assert json.loads(gzip.decompress(response.get_data())) == payload
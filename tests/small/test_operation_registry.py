@@ -0,0 +1,47 @@
+"""
+SMALL Scale Tests - Operation Registry
+
+Unit tests for the in-memory and database operation registries
+"""
+
+import pytest
+
+from trexima.web.operation_registry import (
+    InMemoryOperationRegistry, DatabaseOperationRegistry
+)
+
+
+@pytest.fixture(params=['memory', 'database'])
+def registry(request, app):
+    if request.param == 'memory':
+        return InMemoryOperationRegistry()
+    return DatabaseOperationRegistry(app)
+
+
+class TestOperationRegistry:
+    """Test both registry backends against the same contract"""
+
+    def test_set_get_remove(self, registry):
+        """Test the lifecycle of an entry"""
+        assert not registry.contains('proj-1')
+
+        registry.set('proj-1', {'operation': 'export', 'current_step': 1, 'percent': 5})
+        registry.set('proj-1', {'operation': 'export', 'current_step': 2, 'percent': 20})
+
+        entry = registry.get('proj-1')
+        assert entry['current_step'] == 2
+        assert entry['cancelled'] is False
+        assert list(registry.all()) == ['proj-1']
+
+        registry.remove('proj-1')
+        assert registry.get('proj-1') is None
+
+    def test_cancel_survives_progress_updates(self, registry):
+        """Test that a progress update does not clear a cancellation"""
+        assert not registry.request_cancel('proj-1')
+
+        registry.set('proj-1', {'operation': 'import', 'current_step': 1})
+        assert registry.request_cancel('proj-1')
+        registry.set('proj-1', {'operation': 'import', 'current_step': 2})
+
+        assert registry.is_cancelled('proj-1')
@@ -0,0 +1,92 @@
+"""
+SMALL Scale Tests - Orphan Reconciliation
+
+Unit tests for the paginated, resumable orphan scan
+"""
+
+import os
+import time
+from unittest.mock import patch
+
+import pytest
+
+from trexima.web.models import db, User, Project, ProjectFile, Job
+from trexima.web.orphans import reconcile_orphans
+from trexima.web.storage import ObjectStorageService
+
+
+class Interrupted(Exception):
+    pass
+
+
+class FakeRun:
+    """TaskRun that keeps its state in memory and can fail after some pages"""
+
+    def __init__(self, state=None, fail_after=None):
+        self.state = dict(state or {})
+        self.fail_after = fail_after
+        self.saves = 0
+
+    def save(self, **state):
+        self.state.update(state)
+        self.saves += 1
+        if self.fail_after is not None and self.saves >= self.fail_after:
+            raise Interrupted()
+
+
+@pytest.fixture
+def storage(app, tmp_path):
+    storage = ObjectStorageService()
+    storage._use_local_storage = True
+    storage._local_base = str(tmp_path)
+    storage._initialized = True
+
+    user = User(xsuaa_id='orphan-user', email='orphan@example.com')
+    project = Project(name='Orphans', owner=user)
+    db.session.add_all([user, project])
+    db.session.flush()
+    job = Job(job_type='export', project_id=project.id, user_id=user.id, status='running')
+    db.session.add(job)
+    db.session.add(ProjectFile(project=project, file_type='sdm', original_name='sdm.xml',
+                               storage_key='blobs/sha256/aa/kept'))
+    db.session.commit()
+
+    keys = [
+        'blobs/sha256/aa/kept',
+        'blobs/sha256/bb/orphan',
+        f'users/{user.id}/projects/{project.id}/generated/old.xlsx',
+        f'users/{user.id}/projects/{project.id}/jobs/{job.id}/odata.json.gz',
+    ]
+    for key in keys:
+        storage.upload_bytes(b'data', key)
+        old = time.time() - 7200
+        os.utime(os.path.join(str(tmp_path), key), (old, old))
+    storage.upload_bytes(b'new', 'blobs/sha256/cc/uploading')
+    return storage
+
+
+class TestOrphanScan:
+    """Test orphan detection, deletion and resuming"""
+
+    def test_dry_run_reports_old_unreferenced_objects(self, storage):
+        """Test that referenced, recent and active-job objects are kept"""
+        result = reconcile_orphans(FakeRun(), storage, dry_run=True)
+
+        assert result['scanned'] == 5
+        assert result['orphaned'] == 2
+        assert result['deleted'] == 0
+        assert result['sample'][0] == 'blobs/sha256/bb/orphan'
+        assert result['sample'][1].endswith('generated/old.xlsx')
+
+    def test_interrupted_scan_resumes_from_cursor(self, storage):
+        """Test that a resumed scan continues after the saved cursor"""
+        with patch('trexima.web.orphans.PAGE_SIZE', 1):
+            first = FakeRun(fail_after=2)
+            with pytest.raises(Interrupted):
+                reconcile_orphans(first, storage, dry_run=False)
+            result = reconcile_orphans(FakeRun(first.state), storage)
+
+        assert result['scanned'] == 5
+        assert result['deleted'] == 2
+        assert not storage.file_exists('blobs/sha256/bb/orphan')
+        assert storage.file_exists('blobs/sha256/aa/kept')
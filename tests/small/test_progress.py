@@ -0,0 +1,53 @@
+"""
+SMALL Scale Tests - Progress Pipeline
+
+Unit tests for progress coalescing and delta payloads
+"""
+
+from unittest.mock import patch
+
+from trexima.web.websocket import ProgressTracker, emit_progress, emit_operation_complete
+
+
+class TestProgressPipeline:
+    """Test that progress is rate-limited and sent as deltas"""
+
+    def test_updates_within_a_step_are_coalesced(self, app):
+        """Test that a burst of updates emits its first and last update per step"""
+        with patch('trexima.web.websocket.emit_progress') as emit:
+            with ProgressTracker('proj-progress', 'export') as tracker:
+                for i in range(500):
+                    tracker.update(5, f"Field {i}", sub_progress=i / 500)
+                tracker.update(6, "Foundation objects")
+
+        assert [(c.kwargs['step'], c.kwargs['message']) for c in emit.call_args_list] == [
+            (5, "Field 0"), (5, "Field 499"), (6, "Foundation objects")
+        ]
+
+    def test_held_back_update_is_sent_on_complete(self, app):
+        """Test that the last throttled update is not lost when the operation ends"""
+        with patch('trexima.web.websocket.emit_progress') as emit, \
+                patch('trexima.web.websocket.emit_operation_complete'):
+            with ProgressTracker('proj-progress', 'export') as tracker:
+                tracker.update(5, "Field 0")
+                tracker.update(5, "Field 1")
+                tracker.complete()
+
+        assert [c.kwargs['message'] for c in emit.call_args_list] == [
+            "Field 0", "Field 1", "Operation completed successfully"
+        ]
+
+    def test_delta_payloads(self, app):
+        """Test that only changed fields follow the first full update"""
+        with patch('trexima.web.websocket.socketio') as socketio:
+            emit_progress('proj-delta', 'export', 1, 10, 'Initializing', 0, 'Starting', {'a': 1})
+            emit_progress('proj-delta', 'export', 1, 10, 'Initializing', 5, 'Loading', {'a': 1})
+            emit_progress('proj-delta', 'export', 1, 10, 'Initializing', 5, 'Loading', {'a': 1})
+            emit_operation_complete('proj-delta', 'export', success=True)
+
+        payloads = [c.args[1] for c in socketio.emit.call_args_list if c.args[0] == 'progress_update']
+        assert len(payloads) == 2
+        assert payloads[0]['delta'] is False and payloads[0]['details'] == {'a': 1}
+        assert payloads[1]['delta'] is True
+        assert payloads[1]['message'] == 'Loading'
+        assert 'details' not in payloads[1] and 'total_steps' not in payloads[1]
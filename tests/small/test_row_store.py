@@ -0,0 +1,101 @@
+"""
+SMALL Scale Tests - Translation Row Store
+
+Unit tests for storing workbook rows and paging through them
+"""
+
+import pytest
+from openpyxl import Workbook, load_workbook
+
+from trexima.io.row_store import TranslationRowStore, encode_cursor, label_columns
+from trexima.io.workbook_fingerprint import WorkbookFingerprint
+
+
+def make_workbook():
+    workbook = Workbook()
+    workbook.remove(workbook.active)
+    ws = workbook.create_sheet("DataModel (de-DE)")
+    ws.append(["Section", "Element/Subsection", "Field Id", "Default Label", "Label/Name in German"])
+    for i in range(5):
+        ws.append(["Personal", "", f"field{i}", f"Label {4 - i}", "" if i % 2 else f"Feld {i}"])
+
+    ws = workbook.create_sheet("Performance_Review_Templates")
+    ws.append([
+        "Translation Type", "Template Name", "Section/Element/Subsection",
+        "Translatable Item/Field", "Default Label", "Label Key",
+        "Label in German (de_DE)", "Label in French (fr_FR)"
+    ])
+    ws.append(["Manage Templates", "Review", "Intro", "Name", "Intro", "", "Einleitung", ""])
+    return workbook
+
+
+class TestTranslationRowStore:
+    """Test filters, keyset pagination and workbook output"""
+
+    def test_label_columns(self):
+        """Test locale detection from headers and sheet names"""
+        assert label_columns("DataModel (de-DE)", ["Section", "Label/Name in German"]) == {1: "de_DE"}
+        assert label_columns("PM", ["Label Key", "Label in French (fr_FR)"]) == {1: "fr_FR"}
+
+    def test_query_and_pages(self, tmp_path):
+        """Test filters and that pages continue where the last one ended"""
+        path = str(tmp_path / "rows.sqlite")
+        with TranslationRowStore.create(path) as store:
+            assert store.add_workbook(make_workbook()) == 6
+
+        with TranslationRowStore.open(path) as store:
+            missing = store.query(missing_locale="de-DE")
+            assert [r['field_id'] for r in missing['rows']] == ['field1', 'field3']
+            assert store.count(locale="fr_FR") == 1
+            assert store.query(search="intro")['rows'][0]['labels'] == {'de_DE': 'Einleitung', 'fr_FR': ''}
+
+            seen, cursor = [], None
+            while True:
+                page = store.query(sheet="DataModel (de-DE)", sort="default_label", cursor=cursor, limit=2)
+                seen.extend(r['default_label'] for r in page['rows'])
+                cursor = page['next_cursor']
+                if cursor is None:
+                    break
+            assert seen == [f"Label {i}" for i in range(5)]
+
+            out = str(tmp_path / "filtered.xlsx")
+            assert store.write_workbook(out, missing_locale="de_DE") == 2
+            assert load_workbook(out).sheetnames == ["DataModel (de-DE)", "Performance_Review_Templates"]
+
+    def test_cursor_of_another_sort_is_rejected(self, tmp_path):
+        """Test that a cursor only continues the sort order it came from"""
+        path = str(tmp_path / "rows.sqlite")
+        with TranslationRowStore.create(path) as store:
+            store.add_workbook(make_workbook())
+
+            cursor = store.query(sort="row", limit=2)['next_cursor']
+            assert store.query(sort="row", cursor=cursor, limit=2)['rows']
+            for sort in ("section", "field_id", "default_label"):
+                with pytest.raises(ValueError, match="Invalid cursor"):
+                    store.query(sort=sort, cursor=cursor)
+
+            cursor = store.query(sort="section", limit=2)['next_cursor']
+            with pytest.raises(ValueError, match="Invalid cursor"):
+                store.query(sort="row", cursor=cursor)
+            with pytest.raises(ValueError, match="Invalid cursor"):
+                store.query(sort="row", cursor=encode_cursor("row", ["1"]))
+            with pytest.raises(ValueError, match="Invalid cursor"):
+                store.query(sort="section", cursor="not a cursor")
+
+    def test_hidden_sheets_are_skipped(self, tmp_path):
+        """Test that the fingerprint sheet is neither stored nor written"""
+        workbook = make_workbook()
+        WorkbookFingerprint().embed(workbook)
+        workbook.create_sheet("Notes").sheet_state = 'hidden'
+
+        path = str(tmp_path / "rows.sqlite")
+        with TranslationRowStore.create(path) as store:
+            assert store.add_workbook(workbook) == 6
+
+        with TranslationRowStore.open(path) as store:
+            assert [s['name'] for s in store.sheets()] == ["DataModel (de-DE)", "Performance_Review_Templates"]
+            assert store.count() == 6
+
+            out = str(tmp_path / "all.xlsx")
+            store.write_workbook(out)
+            assert load_workbook(out).sheetnames == ["DataModel (de-DE)", "Performance_Review_Templates"]
@@ -0,0 +1,69 @@
+"""
+SMALL Scale Tests - Job Scheduler
+
+Unit tests for fair-share admission and queue forecasts
+"""
+
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+from trexima.web.scheduler import FairShareScheduler, tenant_key
+
+NOW = datetime(2024, 1, 1, 12, 0, 0)
+
+
+def _job(job_id, user_id, tenant=None, priority=0, minutes_ago=0, started=False):
+    created = NOW - timedelta(minutes=minutes_ago)
+    return SimpleNamespace(
+        id=job_id, job_type='export', user_id=user_id, tenant=tenant,
+        priority=priority, cancel_requested=False, created_at=created,
+        started_at=created if started else None, finished_at=None
+    )
+
+
+class TestFairShareScheduler:
+    """Test limits, fair ordering and forecasts"""
+
+    def test_per_user_and_tenant_limits(self):
+        """Test that busy users and tenants are skipped"""
+        scheduler = FairShareScheduler(max_concurrent=3, max_per_user=1, max_per_tenant=1)
+        running = [_job('r1', 'alice', tenant='acme@sf', started=True)]
+        queued = [
+            _job('q1', 'alice', minutes_ago=3),
+            _job('q2', 'bob', tenant='acme@sf', minutes_ago=2),
+            _job('q3', 'carol', tenant='other@sf', minutes_ago=1),
+        ]
+
+        assert scheduler.select_next(queued, running, {}).id == 'q3'
+
+    def test_least_usage_then_priority(self):
+        """Test that light users go first unless an admin raised a priority"""
+        scheduler = FairShareScheduler(max_concurrent=1)
+        queued = [_job('heavy', 'alice', minutes_ago=5), _job('light', 'bob')]
+        usage = {'alice': 600.0}
+
+        assert scheduler.select_next(queued, [], usage).id == 'light'
+
+        queued[0].priority = 10
+        assert scheduler.select_next(queued, [], usage).id == 'heavy'
+
+    def test_plan_estimates_start_times(self):
+        """Test that queued jobs start as simulated slots free up"""
+        scheduler = FairShareScheduler(max_concurrent=1, max_per_user=1)
+        running = [_job('r1', 'alice', started=True)]
+        queued = [_job('q1', 'bob', minutes_ago=2), _job('q2', 'carol', minutes_ago=1)]
+
+        plan = scheduler.plan(queued, running, {}, {'export': 60.0}, now=NOW)
+
+        assert [(job.id, start) for job, start in plan] == [
+            ('q1', NOW + timedelta(seconds=60)),
+            ('q2', NOW + timedelta(seconds=120)),
+        ]
+
+    def test_tenant_key(self):
+        """Test tenant identification from a connection config"""
+        assert tenant_key({
+            'endpoint_url': 'https://api4.successfactors.com/odata/v2',
+            'company_id': 'ACME'
+        }) == 'acme@api4.successfactors.com'
+        assert tenant_key({'endpoint_url': None, 'company_id': None}) is None
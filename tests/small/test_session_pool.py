@@ -0,0 +1,76 @@
+"""
+SMALL Scale Tests - Session Pool
+
+Unit tests for per-session state of the legacy routes
+"""
+
+import threading
+
+from trexima.web.session_pool import SessionPool, TREE_SIZE_FACTOR, session_pool
+
+
+class TestSessionPool:
+    """Test LRU, TTL and memory eviction"""
+
+    def test_lru_eviction(self):
+        """Test that the least recently used session goes first"""
+        pool = SessionPool(max_sessions=2)
+        for session_id in ('a', 'b', 'a', 'c'):
+            with pool.checkout(session_id) as state:
+                state.get_processor()
+
+        assert pool.stats()['sessions'] == 2
+        with pool.checkout('b') as state:
+            assert state.processor is None
+
+    def test_ttl_and_in_use(self):
+        """Test that idle sessions expire but sessions in use stay"""
+        pool = SessionPool(ttl_seconds=-1)
+        with pool.checkout('a') as outer:
+            outer.get_processor()
+            with pool.checkout('b'):
+                pass
+            assert pool.stats()['sessions'] == 1
+            assert outer.processor is not None
+        assert pool.stats()['sessions'] == 0
+        assert outer.processor is None
+
+    def test_memory_budget(self, tmp_path):
+        """Test that sessions over the memory budget release their trees"""
+        model = tmp_path / 'model.xml'
+        model.write_bytes(b'x' * 100)
+        pool = SessionPool(memory_bytes=150 * TREE_SIZE_FACTOR, upload_root=str(tmp_path / 'sessions'))
+
+        for session_id in ('a', 'b'):
+            with pool.checkout(session_id) as state:
+                state.get_processor()
+                state.add_model_file(str(model))
+
+        stats = pool.stats()
+        assert (stats['sessions'], stats['evictions']) == (1, 1)
+        assert stats['estimated_bytes'] == 100 * TREE_SIZE_FACTOR
+
+
+class TestSessionRoutes:
+    """Test which legacy routes wait for the session's lock"""
+
+    def test_progress_is_read_while_session_is_busy(self, app, client):
+        """Test that progress polls are answered while an export holds the session"""
+        from trexima.web.routes import SESSION_ID_KEY
+
+        with client.session_transaction() as flask_session:
+            flask_session[SESSION_ID_KEY] = 'busy-session'
+
+        responses = []
+        with session_pool.checkout('busy-session') as state:
+            state.update_progress(40, 'Exporting')
+            poll = threading.Thread(target=lambda: responses.extend([
+                client.get('/api/progress'), client.get('/api/status')
+            ]))
+            poll.start()
+            poll.join(timeout=5)
+            assert not poll.is_alive()
+
+        assert [r.status_code for r in responses] == [200, 200]
+        assert responses[0].get_json() == {'percent': 40, 'message': 'Exporting'}
+        assert responses[1].get_json()['progress']['percent'] == 40
@@ -0,0 +1,85 @@
+"""
+SMALL Scale Tests - SF Tenant Catalog
+
+Unit tests for building, storing and invalidating tenant catalogs
+"""
+
+from unittest.mock import MagicMock
+
+from trexima.web import sf_catalog
+from trexima.web.models import db
+from trexima.web.sf_catalog import (
+    connection_params, catalog_key, refresh_catalog, get_catalog, invalidate_catalog,
+    schedule_refresh, discard_client
+)
+
+
+class StubClient:
+    """Answers catalog queries like a connected ODataClient"""
+
+    def get_all_entity_names(self):
+        return ['cust_Project', 'FOCompany', 'PerPersonal', 'User']
+
+    def get_picklist_count(self, picklist_type):
+        return {'mdf': 12, 'legacy': 3}[picklist_type]
+
+    def get_migrated_legacy_picklist_count(self):
+        return 2
+
+    def get_active_locales(self):
+        return ['en_US', 'de_DE']
+
+    def disconnect(self):
+        pass
+
+
+PARAMS = {
+    'endpoint_url': 'https://api.example.com/odata/v2/',
+    'company_id': 'ACME',
+    'username': 'api-user',
+    'password': 'secret'
+}
+
+
+class TestSFCatalog:
+    """Test the catalog lifecycle"""
+
+    def test_connection_params(self):
+        """Test that incomplete credentials give no parameters"""
+        assert connection_params({'endpoint': 'https://x', 'company_id': 'C', 'username': 'u'}) is None
+        params = connection_params({**PARAMS, 'endpoint_url': None, 'endpoint': PARAMS['endpoint_url']})
+        assert catalog_key(params) == catalog_key(PARAMS)
+        assert catalog_key(PARAMS) != catalog_key({**PARAMS, 'username': 'other'})
+
+    def test_refresh_and_invalidate(self, app):
+        """Test that a refreshed catalog is served until invalidated"""
+        data = refresh_catalog(PARAMS, client=StubClient())
+        assert data['entities']['mdf_objects'] == ['cust_Project']
+        assert data['entities']['foundation_objects'] == ['FOCompany']
+        assert data['entities']['ec_objects'] == ['PerPersonal']
+        assert data['picklists']['mdf_count'] == 12
+
+        catalog = get_catalog(PARAMS)
+        assert catalog.data == data
+        assert not catalog.is_stale
+
+        invalidate_catalog(PARAMS)
+        db.session.expire_all()
+        assert get_catalog(PARAMS) is None
+
+    def test_client_of_a_skipped_refresh_is_not_leaked(self, app):
+        """Test that a refresh already running pools or disconnects the new client"""
+        key = catalog_key(PARAMS)
+        sf_catalog._refreshing.add(key)
+        try:
+            first, second = MagicMock(), MagicMock()
+            assert not schedule_refresh(app, PARAMS, client=first)
+            assert sf_catalog._clients[key][1] is first
+
+            assert not schedule_refresh(app, PARAMS, client=second)
+            second.disconnect.assert_called_once()
+            first.disconnect.assert_not_called()
+            assert sf_catalog._clients[key][1] is first
+        finally:
+            sf_catalog._refreshing.discard(key)
+            discard_client(PARAMS)
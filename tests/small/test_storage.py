@@ -0,0 +1,229 @@
+"""
+SMALL Scale Tests - Storage Streaming
+
+Unit tests for chunked, hashed uploads
+"""
+
+import hashlib
+import io
+import os
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from trexima.web.storage import ObjectStorageService
+
+
+def local_storage(base_dir) -> ObjectStorageService:
+    storage = ObjectStorageService()
+    storage._use_local_storage = True
+    storage._local_base = str(base_dir)
+    storage._initialized = True
+    return storage
+
+
+class FailingStream(io.BytesIO):
+    """Stream that breaks after the first read"""
+
+    def read(self, size=-1):
+        if self.tell():
+            raise IOError("connection reset")
+        return super().read(size)
+
+
+class TestUploadStream:
+    """Test streaming uploads to local storage and S3"""
+
+    def test_local_upload_hashes_and_renames(self, tmp_path):
+        """Test that head and stream are written and hashed in one pass"""
+        data = b"<succession-data-model>" + b"x" * 10000
+        storage = local_storage(tmp_path)
+
+        result = storage.upload_stream(
+            io.BytesIO(data[100:]), 'users/u/projects/p/uploads/sdm.xml',
+            head=data[:100], chunk_size=1024
+        )
+
+        assert result['size'] == len(data)
+        assert result['sha256'] == hashlib.sha256(data).hexdigest()
+        upload_dir = tmp_path / 'users/u/projects/p/uploads'
+        assert [p.name for p in upload_dir.iterdir()] == ['sdm.xml']
+        assert (upload_dir / 'sdm.xml').read_bytes() == data
+
+    def test_failed_local_upload_leaves_nothing(self, tmp_path):
+        """Test that the temp file is removed when the stream fails"""
+        storage = local_storage(tmp_path)
+
+        with pytest.raises(IOError):
+            storage.upload_stream(FailingStream(b"x" * 5000), 'a/b.xml', chunk_size=1024)
+
+        assert list((tmp_path / 'a').iterdir()) == []
+
+    def test_s3_multipart_parts(self):
+        """Test that large streams are sent as numbered parts"""
+        storage = ObjectStorageService()
+        storage._initialized = True
+        storage.bucket = 'bucket'
+        storage.client = MagicMock()
+        storage.client.create_multipart_upload.return_value = {'UploadId': 'up-1'}
+        storage.client.upload_part.side_effect = lambda **kw: {'ETag': f"e{kw['PartNumber']}"}
+        storage.client.complete_multipart_upload.return_value = {'ETag': '"final"'}
+
+        result = storage.upload_stream(io.BytesIO(b"y" * 2500), 'k', chunk_size=1000)
+
+        sizes = [len(c.kwargs['Body']) for c in storage.client.upload_part.call_args_list]
+        assert sizes == [1000, 1000, 500]
+        parts = storage.client.complete_multipart_upload.call_args.kwargs['MultipartUpload']['Parts']
+        assert [p['PartNumber'] for p in parts] == [1, 2, 3]
+        assert result['etag'] == 'final' and result['size'] == 2500
+
+
+class TestContentAddressedBlobs:
+    """Test deduplicated upload blobs and their reference counts"""
+
+    def test_identical_content_is_stored_once(self, tmp_path):
+        """Test that a second upload of the same bytes writes nothing"""
+        storage = local_storage(tmp_path)
+
+        first = storage.store_blob(io.BytesIO(b"<corporate-data-model/>"))
+        second = storage.store_blob(io.BytesIO(b"<corporate-data-model/>"))
+
+        assert first['key'] == second['key'] == storage.blob_key(first['sha256'])
+        assert not first['deduplicated'] and second['deduplicated']
+
+    def test_blob_released_with_last_reference(self, app, tmp_path):
+        """Test that shared blobs survive until no file refers to them"""
+        from trexima.web.blobs import file_refs, release_files
+        from trexima.web.models import db, User, Project, ProjectFile
+
+        storage = local_storage(tmp_path)
+        blob = storage.store_blob(io.BytesIO(b"<succession-data-model/>"))
+
+        user = User(xsuaa_id='blob-user', email='blob@example.com')
+        projects = [Project(name=f'P{i}', owner=user) for i in range(2)]
+        files = [
+            ProjectFile(project=p, file_type='sdm', original_name='sdm.xml',
+                        storage_key=blob['key'], content_hash=blob['sha256'])
+            for p in projects
+        ]
+        db.session.add_all([user] + projects + files)
+        db.session.commit()
+
+        with patch('trexima.web.blobs.storage_service', storage):
+            for f in files:
+                refs = file_refs([f])
+                db.session.delete(f)
+                db.session.commit()
+                release_files(refs)
+                assert storage.file_exists(blob['key']) == (f is not files[-1])
+
+    def test_deduplicated_blob_is_touched(self, tmp_path):
+        """Test that deduplicating refreshes the blob's age for the orphan scan"""
+        storage = local_storage(tmp_path)
+        blob = storage.store_blob(io.BytesIO(b"<corporate-data-model/>"))
+        path = tmp_path / blob['key']
+        os.utime(path, (0, 0))
+
+        storage.store_blob(io.BytesIO(b"<corporate-data-model/>"))
+
+        assert path.stat().st_mtime > 0
+
+    def test_release_racing_a_deduplicated_upload(self, app, tmp_path):
+        """Test that a blob survives when an upload commits a reference mid-release"""
+        from trexima.web.blobs import file_refs, release_files, ensure_blobs
+        from trexima.web.models import db, User, Project, ProjectFile
+
+        content = b"<succession-data-model/>"
+        storage = local_storage(tmp_path)
+        blob = storage.store_blob(io.BytesIO(content))
+
+        user = User(xsuaa_id='race-user', email='race@example.com')
+        old, new = Project(name='Old', owner=user), Project(name='New', owner=user)
+        old_file = ProjectFile(project=old, file_type='sdm', original_name='sdm.xml',
+                               storage_key=blob['key'], content_hash=blob['sha256'])
+        db.session.add_all([user, old, new, old_file])
+        db.session.commit()
+        refs = file_refs([old_file])
+        db.session.delete(old_file)
+        db.session.commit()
+
+        def upload():
+            stream = io.BytesIO(content)
+            result = storage.store_blob(stream)
+            db.session.add(ProjectFile(project=new, file_type='sdm', original_name='sdm.xml',
+                                       storage_key=result['key'], content_hash=result['sha256']))
+            db.session.commit()
+            return [(result['key'], stream, None)]
+
+        with patch('trexima.web.blobs.storage_service', storage):
+            # The upload deduplicates and commits after the release moved the blob aside
+            move = storage.move_file
+            uploads = []
+
+            def move_then_upload(source, target):
+                move(source, target)
+                if not uploads:
+                    uploads.extend(upload())
+
+            with patch.object(storage, 'move_file', move_then_upload):
+                assert release_files(refs) == 0
+            ensure_blobs(uploads)
+            assert storage.get_file(blob['key']) == content
+
+            # The upload deduplicates before the release and commits after it
+            new_file = ProjectFile.query.filter_by(project_id=new.id).one()
+            refs = file_refs([new_file])
+            db.session.delete(new_file)
+            db.session.commit()
+            stream = io.BytesIO(content)
+            assert storage.store_blob(stream)['deduplicated']
+            assert release_files(refs) == 1
+            assert not storage.file_exists(blob['key'])
+
+            db.session.add(ProjectFile(project=new, file_type='sdm', original_name='sdm.xml',
+                                       storage_key=blob['key'], content_hash=blob['sha256']))
+            db.session.commit()
+            assert ensure_blobs([(blob['key'], stream, None)]) == 1
+            assert storage.get_file(blob['key']) == content
+            assert not list((tmp_path / 'blobs/released').iterdir())
+
+
+class TestSendStorageFile:
+    """Test streamed downloads with ETag and Range support"""
+
+    @pytest.fixture
+    def stored(self, tmp_path):
+        storage = local_storage(tmp_path)
+        storage.upload_bytes(bytes(range(256)) * 40, 'gen/workbook.xlsx')
+        with patch('trexima.web.http_utils.storage_service', storage):
+            yield storage
+
+    def send(self, app, headers=None):
+        from trexima.web.http_utils import send_storage_file
+        with app.test_request_context(headers=headers or {}):
+            response = send_storage_file('gen/workbook.xlsx', 'workbook.xlsx')
+            response.direct_passthrough = False
+            return response
+
+    def test_full_download_and_revalidation(self, app, stored):
+        """Test that a matching If-None-Match returns 304 without a body"""
+        response = self.send(app)
+        assert response.status_code == 200
+        assert response.get_data() == bytes(range(256)) * 40
+
+        response = self.send(app, {'If-None-Match': response.headers['ETag']})
+        assert response.status_code == 304
+        assert response.get_data() == b''
+
+    def test_range_requests(self, app, stored):
+        """Test partial content and unsatisfiable ranges"""
+        response = self.send(app, {'Range': 'bytes=256-511'})
+        assert response.status_code == 206
+        assert response.headers['Content-Range'] == 'bytes 256-511/10240'
+        assert response.get_data() == bytes(range(256))
+
+        response = self.send(app, {'Range': 'bytes=20000-'})
+        assert response.status_code == 416
+
+        response = self.send(app, {'Range': 'bytes=0-9', 'If-Range': '"stale"'})
+        assert response.status_code == 200
@@ -0,0 +1,70 @@
+"""
+SMALL Scale Tests - Storage Usage
+
+Unit tests for transactional usage counters and their reconciliation
+"""
+
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock
+
+from trexima.web.models import db, User, Project, ProjectFile, GeneratedFile, StorageUsage
+from trexima.web.storage_usage import get_usage, reconcile_storage_usage
+from trexima.web.maintenance import run_task
+
+
+def make_project(name='usage'):
+    user = User(xsuaa_id=f'{name}-user', email=f'{name}@example.com')
+    project = Project(name=name, owner=user)
+    db.session.add_all([user, project])
+    db.session.commit()
+    return user, project
+
+
+class TestStorageUsage:
+    """Test that counters follow file rows"""
+
+    def test_counters_follow_inserts_and_deletes(self, app):
+        """Test per-user and global counters, including cascaded deletes"""
+        user, project = make_project()
+        db.session.add_all([
+            ProjectFile(project=project, file_type='sdm', original_name='sdm.xml',
+                        storage_key='blobs/a', file_size=100),
+            GeneratedFile(project=project, filename='wb.xlsx', file_type='workbook',
+                          storage_key='users/x/generated/wb.xlsx', file_size=40,
+                          expires_at=datetime.utcnow() + timedelta(days=1))
+        ])
+        db.session.commit()
+
+        usage = get_usage(user.id)
+        assert usage['uploads'] == {'count': 1, 'size': 100}
+        assert usage['generated'] == {'count': 1, 'size': 40}
+        assert get_usage()['total_size'] == 140
+
+        db.session.delete(project)
+        db.session.commit()
+        assert get_usage(user.id)['total_files'] == 0
+        assert get_usage()['total_size'] == 0
+
+    def test_reconcile_fixes_drift(self, app):
+        """Test that reconciling rebuilds counters and measures storage"""
+        user, project = make_project('drift')
+        db.session.add(ProjectFile(project=project, file_type='cdm', original_name='cdm.xml',
+                                   storage_key='blobs/b', file_size=70))
+        db.session.commit()
+        StorageUsage.query.filter_by(user_id=user.id).update({'bytes': 5})
+        db.session.commit()
+
+        storage = MagicMock()
+        storage.iter_files.side_effect = lambda prefix: iter(
+            [{'key': 'blobs/sha256/ab/ab', 'size': 70}] if prefix == 'blobs/' else []
+        )
+        result = reconcile_storage_usage(storage)
+
+        assert result['corrected'] == 1
+        assert get_usage(user.id)['uploads'] == {'count': 1, 'size': 70}
+        assert result['usage']['stored']['uploads'] == {'count': 1, 'size': 70}
+
+    def test_task_runs_once_per_interval(self, app):
+        """Test that the maintenance lease keeps a task from rerunning"""
+        assert run_task('storage_usage', 'worker-a')
+        assert not run_task('storage_usage', 'worker-b')
@@ -0,0 +1,76 @@
+"""
+SMALL Scale Tests - Translation Memory
+
+Unit tests for exact and fuzzy translation suggestions
+"""
+
+from trexima.config import SUGGESTED_LABEL_HEADER
+from trexima.core.datamodel_processor import DataModelProcessor
+from trexima.core.translation_extractor import TranslationExtractor
+from trexima.core.translation_memory import TranslationMemory
+
+
+SDM_XML = """<?xml version="1.0" encoding="UTF-8"?>
+<succession-data-model>
+<standard-element id="costCenter">
+<label>Cost Center</label>
+<label xml:lang="de-DE">Kostenstelle</label>
+</standard-element>
+<standard-element id="customCostCenter">
+<label>Cost  center</label>
+</standard-element>
+<standard-element id="customCostCentre">
+<label>Cost Centre</label>
+</standard-element>
+<standard-element id="customMood">
+<label>Mood</label>
+</standard-element>
+</succession-data-model>
+"""
+
+
+class TestTranslationMemory:
+    """Test exact and fuzzy lookups"""
+
+    def test_exact_match(self):
+        """Test that normalized labels match and the most frequent translation wins"""
+        memory = TranslationMemory()
+        memory.add("Cost Center", {"de_DE": "Kostenstelle"})
+        memory.add("<b>cost center</b>", {"de-DE": "Kostenstelle", "fr_FR": ""})
+        memory.add("COST CENTER", {"de_DE": "Kostenst."})
+
+        assert len(memory) == 1
+        assert memory.lookup("cost   Center", "de_DE") == "Kostenstelle"
+        assert memory.lookup("Cost Center", "fr_FR") is None
+        assert memory.suggest("Cost Center", "de_DE")[0]['score'] == 1.0
+
+    def test_fuzzy_match(self):
+        """Test that similar labels are suggested and unrelated ones are not"""
+        memory = TranslationMemory()
+        memory.add("Cost Center", {"de_DE": "Kostenstelle"})
+        memory.add("Company Code", {"de_DE": "Buchungskreis"})
+
+        suggestions = memory.suggest("Cost Centre", "de-DE")
+        assert [s['target'] for s in suggestions] == ["Kostenstelle"]
+        assert 0.5 <= suggestions[0]['score'] < 1.0
+        assert memory.suggest("Employee Mood", "de_DE") == []
+
+
+class TestExportSuggestions:
+    """Test suggestions on exported DataModel sheets"""
+
+    def test_missing_labels_get_suggestions(self, tmp_path):
+        """Test that fields missing a language get the label of similar fields"""
+        path = tmp_path / "sdm.xml"
+        path.write_text(SDM_XML, encoding="utf-8")
+        processor = DataModelProcessor()
+        processor.load_data_model(str(path))
+
+        workbook = TranslationExtractor(processor).extract_to_workbook(["de_DE"])
+        ws = workbook["DataModel (de-DE)"]
+
+        assert ws.cell(row=1, column=6).value == SUGGESTED_LABEL_HEADER
+        suggestions = {row[2]: row[5] if len(row) > 5 else None for row in ws.iter_rows(min_row=2, values_only=True)}
+        assert suggestions["customCostCenter"] == "Kostenstelle"
+        assert suggestions["customCostCentre"] == "Kostenstelle"
+        assert suggestions["customMood"] is None
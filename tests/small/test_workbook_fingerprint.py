@@ -0,0 +1,115 @@
+"""
+SMALL Scale Tests - Workbook Fingerprints
+
+Unit tests for the export fingerprints used to skip unchanged import rows
+"""
+
+import io
+
+from openpyxl import load_workbook
+
+from trexima.config import SHEET_NAME_GM
+from trexima.io.excel_handler import ExcelHandler
+from trexima.io.workbook_fingerprint import WorkbookFingerprint, FINGERPRINT_SHEET_NAME
+
+
+def _exported_workbook() -> io.BytesIO:
+    excel_handler = ExcelHandler()
+    workbook = excel_handler.create_workbook()
+    ws = workbook.create_sheet(SHEET_NAME_GM)
+    ws.append(["Id", "Template", "Section", "Item", "Default", "Label in German (de_DE)"])
+    ws.append([1, "Goals", "Plan", "Name (obj-plan-name)", "Goal", "Ziel"])
+    ws.append([2, "Goals", "Plan", "Desc (obj-plan-desc)", "Description", None])
+    del workbook["Sheet"]
+
+    stream = io.BytesIO()
+    excel_handler.prepare_and_save_workbook(workbook, stream)
+    stream.seek(0)
+    return stream
+
+
+class TestWorkbookFingerprint:
+    """Test embedding and comparing row fingerprints"""
+
+    def test_fingerprint_sheet_is_hidden(self):
+        """Test that the fingerprint sheet is very hidden"""
+        workbook = load_workbook(_exported_workbook())
+
+        assert workbook[FINGERPRINT_SHEET_NAME].sheet_state == "veryHidden"
+        assert SHEET_NAME_GM in WorkbookFingerprint().load(workbook)
+
+    def test_unchanged_workbook_has_no_changed_rows(self):
+        """Test that a workbook sent back as exported has no edited rows"""
+        workbook = load_workbook(_exported_workbook())
+        fingerprint = WorkbookFingerprint().load(workbook)[SHEET_NAME_GM]
+
+        assert fingerprint.changed_rows(workbook[SHEET_NAME_GM]) == set()
+
+    def test_edited_and_appended_rows_are_changed(self):
+        """Test that edited cells and rows added after export are detected"""
+        workbook = load_workbook(_exported_workbook())
+        ws = workbook[SHEET_NAME_GM]
+        ws["F3"] = "Beschreibung"
+        ws.append([3, "Goals", "Plan", "Metric (obj-plan-metric)", "Metric", "Messgröße"])
+
+        fingerprint = WorkbookFingerprint().load(workbook)[SHEET_NAME_GM]
+
+        assert fingerprint.changed_rows(ws) == {3, 4}
+
+
+SDM_XML = """<?xml version="1.0" encoding="UTF-8"?>
+<succession-data-model>
+<hris-element id="jobInfo">
+<label>Job Information</label>
+<label xml:lang="de-DE">Stelleninformationen</label>
+<hris-field id="costCenter" visibility="both">
+<label>Cost Center</label>
+</hris-field>
+</hris-element>
+</succession-data-model>
+"""
+
+STANDARD_SDM_XML = """<?xml version="1.0" encoding="UTF-8"?>
+<succession-data-model>
+<hris-element id="jobInfo">
+<label>Job Information</label>
+<hris-field id="costCenter" visibility="both">
+<label>Cost Center</label>
+<label xml:lang="de-DE">Kostenstelle</label>
+</hris-field>
+</hris-element>
+</succession-data-model>
+"""
+
+
+class TestPrefilledRows:
+    """Test that translations filled in by the export are imported"""
+
+    def test_unedited_standard_labels_are_imported(self, tmp_path):
+        """Test an export/import round trip without edits"""
+        from trexima.core.datamodel_processor import DataModelProcessor
+        from trexima.core.translation_extractor import TranslationExtractor
+        from trexima.core.translation_importer import TranslationImporter
+
+        (tmp_path / "sdm.xml").write_text(SDM_XML, encoding="utf-8")
+        (tmp_path / "std.xml").write_text(STANDARD_SDM_XML, encoding="utf-8")
+        processor = DataModelProcessor()
+        model = processor.load_data_model(str(tmp_path / "sdm.xml"))
+        processor.load_data_model(str(tmp_path / "std.xml"), is_standard=True)
+
+        extractor = TranslationExtractor(processor)
+        workbook = extractor.extract_to_workbook(["de_DE"], suggest_translations=False)
+        path = extractor.save_workbook(workbook, str(tmp_path), "export.xlsx")
+
+        workbook = load_workbook(path)
+        rows = list(workbook["DataModel (de-DE)"].iter_rows(min_row=2, max_col=5, values_only=True))
+        assert rows[-1][2:] == ("costCenter", "Cost Center", "Kostenstelle")
+
+        output_dir = tmp_path / "out"
+        output_dir.mkdir()
+        TranslationImporter(processor).import_from_workbook(
+            workbook, ["DataModel (de-DE)"], str(output_dir), annotate_workbook=False
+        )
+
+        field = model.soup.find("hris-field", attrs={"id": "costCenter"})
+        assert field.find("label", attrs={"xml:lang": "de-DE"}).string == "Kostenstelle"
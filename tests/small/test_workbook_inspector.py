@@ -0,0 +1,110 @@
+"""
+SMALL Scale Tests - Workbook Inspector
+
+Unit tests for header-only workbook validation
+"""
+
+import io
+import zipfile
+from xml.sax.saxutils import quoteattr
+
+from trexima.config import SHEET_NAME_GM
+from trexima.io.excel_handler import ExcelHandler
+from trexima.io.workbook_inspector import WorkbookInspector
+
+
+def _workbook_bytes(workbook) -> io.BytesIO:
+    stream = io.BytesIO()
+    workbook.save(stream)
+    stream.seek(0)
+    return stream
+
+
+def _raw_workbook(row_xml: str) -> io.BytesIO:
+    """Build an xlsx package whose only sheet has the given first row."""
+    main = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+    rel = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+    stream = io.BytesIO()
+    with zipfile.ZipFile(stream, "w") as archive:
+        archive.writestr("xl/workbook.xml", (
+            f'<workbook xmlns="{main}" xmlns:r="{rel}"><sheets>'
+            f'<sheet name={quoteattr(SHEET_NAME_GM)} sheetId="1" r:id="rId1"/></sheets></workbook>'
+        ))
+        archive.writestr("xl/_rels/workbook.xml.rels", (
+            '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            f'<Relationship Id="rId1" Type="{rel}/worksheet" Target="worksheets/sheet1.xml"/>'
+            '</Relationships>'
+        ))
+        archive.writestr("xl/worksheets/sheet1.xml", (
+            f'<worksheet xmlns="{main}"><sheetData><row r="1">{row_xml}</row></sheetData></worksheet>'
+        ))
+    stream.seek(0)
+    return stream
+
+
+def _inline(text: str, ref: str = None) -> str:
+    r = f' r="{ref}"' if ref else ''
+    return f'<c{r} t="inlineStr"><is><t>{text}</t></is></c>'
+
+
+class TestWorkbookInspector:
+    """Test sheet names, languages and row counts read from the xlsx package"""
+
+    def test_translations_workbook(self):
+        """Test a workbook with per-language and template sheets"""
+        excel_handler = ExcelHandler()
+        workbook = excel_handler.create_workbook()
+        excel_handler.create_sheets_per_lang(
+            workbook, "DataModel", ["de_DE", "fr_FR"], ["Data Model", "Item", "Id", "Default"]
+        )
+        ws = workbook.create_sheet(SHEET_NAME_GM)
+        ws.append(["Id", "Template", "Section", "Item", "Default", "Label in German (de_DE)"])
+        for i in range(25):
+            ws.append([i, "Goals", "Plan", "Name", "Goal", "Ziel"])
+        del workbook["Sheet"]
+
+        summary = WorkbookInspector().inspect(_workbook_bytes(workbook))
+
+        assert summary.valid
+        assert summary.errors == []
+        assert summary.sheet_names == ["DataModel (de_DE)", "DataModel (fr_FR)", SHEET_NAME_GM]
+        assert summary.languages == ["de_DE", "fr_FR"]
+
+        gm_sheet = summary.sheets[2]
+        assert gm_sheet.max_row == 26
+        assert gm_sheet.headers[5] == "Label in German (de_DE)"
+
+    def test_unrelated_workbook(self):
+        """Test that a workbook without translation sheets is invalid"""
+        workbook = ExcelHandler().create_workbook()
+        workbook["Sheet"].append(["Name", "Value"])
+
+        summary = WorkbookInspector().inspect(_workbook_bytes(workbook))
+
+        assert not summary.valid
+        assert "No translation worksheets found" in summary.errors
+
+    def test_not_a_zip(self):
+        """Test that non-xlsx content is reported, not raised"""
+        summary = WorkbookInspector().inspect(io.BytesIO(b"fake xlsx content"))
+
+        assert not summary.valid
+        assert summary.sheets == []
+        assert summary.errors
+
+    def test_cells_without_reference(self):
+        """Test that cells without r take the column after the previous one"""
+        row = _inline("Id") + _inline("Template") + _inline("Default", "E1") + _inline("Label in German (de_DE)")
+
+        summary = WorkbookInspector().inspect(_raw_workbook(row))
+
+        assert summary.errors == []
+        assert summary.sheets[0].headers == ["Id", "Template", None, None, "Default", "Label in German (de_DE)"]
+        assert summary.languages == ["de_DE"]
+
+    def test_invalid_cell_reference(self):
+        """Test that an invalid cell reference is reported, not raised"""
+        summary = WorkbookInspector().inspect(_raw_workbook(_inline("Id", "1A")))
+
+        assert not summary.valid
+        assert any("Invalid cell reference" in e for e in summary.errors)
@@ -403,6 +403,9 @@ export const projectsApi = {
         other: string[];
       };
       total_sheets: number;
+      languages?: string[];
+      worksheets?: { name: string; max_row: number | null; languages: string[] }[];
+      errors?: string[];
       error?: string;
     }> => {
       const formData = new FormData();
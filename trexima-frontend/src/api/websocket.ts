@@ -25,6 +25,8 @@ class WebSocketService {
   private reconnectAttempts = 0;
   private maxReconnectAttempts = 5;
   private connectionPromise: Promise<void> | null = null;
+  // Last merged progress per project; the server sends deltas after the first update
+  private progressState: Map<string, ProgressUpdate> = new Map();
 
   /**
    * Connect to WebSocket server
@@ -93,13 +95,15 @@ class WebSocketService {
       });
 
       // Set up event listeners for server events
-      this.socket.on('progress_update', (data) => {
-        console.log('[WS] Progress update:', data);
-        this.emitToCallbacks(data.project_id, 'progress', data);
+      this.socket.on('progress_update', (data: ProgressUpdate) => {
+        const update = this.mergeProgress(data);
+        console.log('[WS] Progress update:', update);
+        this.emitToCallbacks(update.project_id, 'progress', update);
       });
 
       this.socket.on('operation_complete', (data) => {
         console.log('[WS] Operation complete:', data);
+        this.progressState.delete(data.project_id);
         this.emitToCallbacks(data.project_id, 'complete', data);
       });
 
@@ -126,6 +130,7 @@ class WebSocketService {
       this.socket = null;
     }
     this.callbacks.clear();
+    this.progressState.clear();
     this.connectionPromise = null;
   }
 
@@ -217,6 +222,16 @@ class WebSocketService {
     };
   }
 
+  /**
+   * Merge a delta progress update into the last known state of its project
+   */
+  private mergeProgress(data: ProgressUpdate): ProgressUpdate {
+    const previous = this.progressState.get(data.project_id);
+    const update = data.delta && previous ? { ...previous, ...data } : data;
+    this.progressState.set(data.project_id, update);
+    return update;
+  }
+
   /**
    * Emit data to registered callbacks
    */
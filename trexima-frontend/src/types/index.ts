@@ -100,7 +100,7 @@ export interface ProjectFile {
 export interface GeneratedFile {
   id: string;
   filename: string;
-  file_type: 'translation_workbook' | 'import_xml' | 'changelog_workbook' | 'import_log';
+  file_type: 'translation_workbook' | 'import_xml' | 'changelog_workbook' | 'import_changelog' | 'import_log';
   file_size: number;
   created_at: string;
   expires_at: string;
@@ -171,6 +171,8 @@ export interface ProgressUpdate {
   message: string;
   details?: Record<string, unknown>;
   timestamp: string;
+  // True if only changed fields were sent; merged by the WebSocket service
+  delta?: boolean;
 }
 
 export interface OperationResult {
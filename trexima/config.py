@@ -34,6 +34,19 @@ SHEET_NAME_PM = "Performance_Review_Templates"
 SHEET_NAME_GM = "Goal&Development_Plan_Templates"
 SHEET_NAME_PL = "Picklists"
 
+# Column with translation memory suggestions on DataModel sheets
+SUGGESTED_LABEL_HEADER = "Suggested Label (from similar labels)"
+
+# Sheet name prefixes that identify a translations workbook
+WORKBOOK_SHEET_PREFIXES = [
+    SHEET_NAME_PL,
+    "FOAndConfigData",
+    SHEET_NAME_PM,
+    SHEET_NAME_GM,
+    "DataModel",
+    "ObjectDefinitions"
+]
+
 # Tags Configuration
 EMPLOYEE_PROFILE_TAGS = [
     "standard-element", "background-element", "userinfo-element",
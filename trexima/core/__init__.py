@@ -8,10 +8,13 @@ from .odata_client import ODataClient
 from .translation_extractor import TranslationExtractor
 from .translation_importer import TranslationImporter
 from .datamodel_processor import DataModelProcessor
+from .cancellation import CancellationToken, OperationCancelled
 
 __all__ = [
     'ODataClient',
     'TranslationExtractor',
     'TranslationImporter',
-    'DataModelProcessor'
+    'DataModelProcessor',
+    'CancellationToken',
+    'OperationCancelled'
 ]
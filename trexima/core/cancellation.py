@@ -0,0 +1,73 @@
+"""
+Cancellation Module
+
+Cooperative cancellation for long-running extraction and import work.
+"""
+
+import threading
+import time
+from typing import Callable, Optional
+
+
+class OperationCancelled(BaseException):
+    """
+    Raised when an operation is cancelled by the user.
+
+    Derives from BaseException (like asyncio.CancelledError) so the broad
+    ``except Exception`` fallbacks in extraction and API code do not
+    swallow it.
+    """
+    pass
+
+
+class CancellationToken:
+    """
+    Cancellation flag checked by hot loops.
+
+    The token is cancelled explicitly with cancel(), or when the optional
+    check function returns True. The check may be expensive (e.g. a
+    database lookup), so it runs at most once per check_interval.
+    """
+
+    def __init__(
+        self,
+        check: Optional[Callable[[], bool]] = None,
+        check_interval: float = 0.5
+    ):
+        self._check = check
+        self._check_interval = check_interval
+        self._last_check: Optional[float] = None
+        self._event = threading.Event()
+
+    @classmethod
+    def none(cls) -> "CancellationToken":
+        """A token that is only cancelled explicitly."""
+        return cls()
+
+    def cancel(self):
+        """Cancel the operation."""
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        """Check if the operation was cancelled."""
+        if self._event.is_set():
+            return True
+        if self._check is not None:
+            now = time.monotonic()
+            if self._last_check is None or now - self._last_check >= self._check_interval:
+                self._last_check = now
+                if self._check():
+                    self._event.set()
+                    return True
+        return False
+
+    def raise_if_cancelled(self, message: str = "Operation cancelled by user"):
+        """
+        Raise OperationCancelled if the operation was cancelled.
+
+        Raises:
+            OperationCancelled: If cancelled
+        """
+        if self.cancelled:
+            raise OperationCancelled(message)
@@ -15,6 +15,7 @@ from ..config import (
 )
 from ..models.datamodel import DataModel, DataModelType, TranslatableTag
 from ..io.xml_handler import XMLHandler
+from .element_index import SiblingLanguageIndex, AttributeIndex
 
 
 class DataModelProcessor:
@@ -27,6 +28,8 @@ class DataModelProcessor:
         self.translatable_tags: List[str] = []
         self.is_pmgm_included = False
         self.is_sdm_included = False
+        self.lang_indexes: Dict[str, SiblingLanguageIndex] = {}
+        self.attr_indexes: Dict[str, AttributeIndex] = {}
 
     def load_data_model(
         self,
@@ -69,6 +72,8 @@ class DataModelProcessor:
 
             # Store in dictionary
             self.data_models[data_model.name] = data_model
+            self.lang_indexes.pop(data_model.name, None)
+            self.attr_indexes.pop(data_model.name, None)
 
         return data_model
 
@@ -90,6 +95,22 @@ class DataModelProcessor:
         """Get a data model by name."""
         return self.data_models.get(name)
 
+    def get_lang_index(self, data_model: DataModel) -> SiblingLanguageIndex:
+        """Get the sibling-language index of a data model (created lazily)."""
+        index = self.lang_indexes.get(data_model.name)
+        if index is None:
+            index = SiblingLanguageIndex()
+            self.lang_indexes[data_model.name] = index
+        return index
+
+    def get_attr_index(self, data_model: DataModel) -> AttributeIndex:
+        """Get the (tag, attribute, value) index of a data model (created lazily)."""
+        index = self.attr_indexes.get(data_model.name)
+        if index is None or index.soup is not data_model.soup:
+            index = AttributeIndex(data_model.soup)
+            self.attr_indexes[data_model.name] = index
+        return index
+
     def get_all_data_models(self, include_standard: bool = False) -> List[DataModel]:
         """
         Get all loaded data models.
@@ -296,3 +317,5 @@ class DataModelProcessor:
         self.translatable_tags = []
         self.is_pmgm_included = False
         self.is_sdm_included = False
+        self.lang_indexes = {}
+        self.attr_indexes = {}
@@ -0,0 +1,123 @@
+"""
+Element Index Module
+
+Lookup indexes over parsed data model trees, shared by the extractor
+and the importer.
+"""
+
+from typing import Dict, List, Any, Tuple
+
+from bs4 import Tag
+
+
+class SiblingGroup:
+    """Same-named sibling tags of one parent, indexed by language."""
+
+    def __init__(self, parent, tag_name: str, lang_attr: str = "lang"):
+        self.parent = parent
+        self.tag_name = tag_name
+        self.lang_attr = lang_attr
+        self.default_tag = None
+        self.last_tag = None
+        self.by_lang: Dict[str, Any] = {}
+
+        for child in parent.children:
+            if not isinstance(child, Tag) or child.name != tag_name:
+                continue
+            lang = child.get(lang_attr)
+            if lang is None:
+                if self.default_tag is None:
+                    self.default_tag = child
+            elif lang not in self.by_lang:
+                self.by_lang[lang] = child
+            self.last_tag = child
+
+    def get(self, lang: str):
+        """Get the sibling tag for a language, or None."""
+        return self.by_lang.get(lang)
+
+    def insert(self, new_tags: List[Any]):
+        """
+        Insert new language tags after the last sibling in one operation.
+
+        Args:
+            new_tags: Tags carrying the language attribute
+        """
+        if not new_tags:
+            return
+
+        if self.last_tag is not None:
+            self.last_tag.insert_after(*new_tags)
+        else:
+            self.parent.extend(new_tags)
+
+        for new_tag in new_tags:
+            lang = new_tag.get(self.lang_attr)
+            if lang is not None and lang not in self.by_lang:
+                self.by_lang[lang] = new_tag
+        self.last_tag = new_tags[-1]
+
+
+class SiblingLanguageIndex:
+    """
+    Per-element index of language variants held in sibling tags.
+
+    PM/GM templates store translations as repeated sibling tags, e.g.
+    <obj-plan-name>...</obj-plan-name><obj-plan-name lang="de_DE">...</obj-plan-name>.
+    Each (parent, tag name) group is scanned once and then served from
+    the index, so per-language lookups and inserts are O(1).
+    """
+
+    def __init__(self, lang_attr: str = "lang"):
+        self.lang_attr = lang_attr
+        self._groups: Dict[tuple, SiblingGroup] = {}
+
+    def group_for(self, tag) -> SiblingGroup:
+        """Get the sibling group that a tag belongs to."""
+        parent = tag.parent
+        key = (id(parent), tag.name)
+        group = self._groups.get(key)
+        if group is None or group.parent is not parent:
+            group = SiblingGroup(parent, tag.name, self.lang_attr)
+            self._groups[key] = group
+        return group
+
+    def get_lang_tag(self, tag, lang: str):
+        """Get the sibling of a tag that holds the given language."""
+        return self.group_for(tag).get(lang)
+
+    def clear(self):
+        """Drop all cached groups."""
+        self._groups = {}
+
+
+class AttributeIndex:
+    """
+    Index of elements by (tag name, attribute, value) over one tree.
+
+    Each (tag name, attribute) pair is indexed with a single find_all on
+    first use. The first element in document order wins, matching
+    soup.find(tag_name, attrs={attr: value}).
+    """
+
+    def __init__(self, soup):
+        self.soup = soup
+        self._maps: Dict[Tuple[str, str], Dict[str, Any]] = {}
+
+    def find(self, tag_name: str, attr: str, value: str):
+        """Get the first element with the given tag name and attribute value."""
+        key = (tag_name, attr)
+        values = self._maps.get(key)
+        if values is None:
+            values = {}
+            for element in self.soup.find_all(tag_name, attrs={attr: True}):
+                attr_value = element.get(attr)
+                if isinstance(attr_value, list):
+                    attr_value = " ".join(attr_value)
+                values.setdefault(attr_value, element)
+            self._maps[key] = values
+        return values.get(value)
+
+    def clear(self):
+        """Drop all indexed pairs."""
+        self._maps = {}
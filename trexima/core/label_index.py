@@ -0,0 +1,265 @@
+"""
+Label Index Module
+
+Inverted index over the labels of translatable elements, for finding
+where a label is used and in which languages it is missing.
+"""
+
+import gzip
+import json
+import re
+from bisect import bisect_left
+from typing import Dict, List, Optional, Any, Iterable
+
+from ..config import TAGS_TO_BE_IGNORED
+
+# Bump when entries or tokenization change; older indexes are rebuilt
+INDEX_VERSION = 1
+
+# Postings keys besides locales
+DEFAULT_LABEL = "default"  # Label without a language
+ANY_LABEL = "*"            # Default label or any locale
+
+_MARKUP = re.compile(r"<[^>]*>")
+_TOKEN = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Split a label into case-folded word tokens (markup is ignored)."""
+    if not text:
+        return []
+    return _TOKEN.findall(_MARKUP.sub(" ", text).casefold())
+
+
+def normalize_locale(locale: str) -> str:
+    """Use underscores in locale codes (de-DE -> de_DE)."""
+    return locale.replace("-", "_")
+
+
+class LabelIndex:
+    """
+    Token index of element labels per locale.
+
+    Entries are the translatable elements (one per parent tag and label
+    tag name) with their section path, default label and labels by
+    locale. Postings map (locale, token) to entry numbers in ascending
+    order; tokens are also kept sorted per locale for prefix lookups.
+    """
+
+    def __init__(self, model: str = ""):
+        self.model = model
+        self.entries: List[Dict[str, Any]] = []
+        self._postings: Dict[str, Dict[str, List[int]]] = {}
+        self._sorted_tokens: Dict[str, List[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    @property
+    def locales(self) -> List[str]:
+        """Locales with at least one label."""
+        return sorted(k for k in self._postings if k not in (DEFAULT_LABEL, ANY_LABEL))
+
+    # =========================================================================
+    # BUILDING
+    # =========================================================================
+
+    def add(
+        self,
+        model: str,
+        section: str,
+        subsection: str,
+        field: str,
+        field_id: str,
+        default_label: str,
+        labels: Dict[str, str]
+    ) -> int:
+        """
+        Add an element.
+
+        Returns:
+            Entry number
+        """
+        entry_id = len(self.entries)
+        self.entries.append({
+            'model': model,
+            'section': section,
+            'subsection': subsection,
+            'field': field,
+            'field_id': field_id,
+            'default_label': default_label,
+            'labels': labels
+        })
+        self._index(entry_id)
+        return entry_id
+
+    def _index(self, entry_id: int):
+        entry = self.entries[entry_id]
+        texts = [(DEFAULT_LABEL, entry['default_label'])] + list(entry['labels'].items())
+        for key, text in texts:
+            for token in tokenize(text):
+                for postings_key in (key, ANY_LABEL):
+                    postings = self._postings.setdefault(postings_key, {}).setdefault(token, [])
+                    if not postings or postings[-1] != entry_id:
+                        postings.append(entry_id)
+        self._sorted_tokens = {}
+
+    @classmethod
+    def build(
+        cls,
+        processor,
+        active_countries: List[str] = None,
+        cancel_token=None,
+        include_standard: bool = False
+    ) -> 'LabelIndex':
+        """
+        Index the translatable elements of all loaded models.
+
+        Elements are selected like the exporter does: by the processor's
+        translatable_tags, skipping hidden and ignored parents.
+
+        Args:
+            processor: DataModelProcessor with loaded models
+            active_countries: Only index these countries' CSF elements
+            cancel_token: Optional CancellationToken
+            include_standard: Also index the standard SAP models
+        """
+        xml_handler = processor.xml_handler
+        data_models = processor.get_all_data_models(include_standard)
+        index = cls(", ".join(m.name for m in data_models))
+
+        for data_model in data_models:
+            seen = set()
+            for tag in data_model.soup.find_all(processor.translatable_tags):
+                if cancel_token is not None:
+                    cancel_token.raise_if_cancelled()
+                parent = tag.parent
+                key = (id(parent), tag.name)
+                if key in seen:
+                    continue
+                seen.add(key)
+
+                if parent.get("visibility") == "none" or parent.name in TAGS_TO_BE_IGNORED:
+                    continue
+
+                section, subsection, _, skip_country = processor.get_section_info(
+                    tag, data_model.name, active_countries
+                )
+                if skip_country:
+                    continue
+
+                # DM labels carry xml:lang, PM/GM sibling tags carry lang
+                labels = {}
+                for sibling in parent.find_all(tag.name, recursive=False):
+                    lang = sibling.get("xml:lang") or sibling.get("lang")
+                    if lang:
+                        labels.setdefault(normalize_locale(lang), sibling.string or "")
+
+                index.add(
+                    model=data_model.name,
+                    section=section or "",
+                    subsection=subsection or "",
+                    field=xml_handler.get_readable_name(tag.name, True),
+                    field_id=parent.get("id") or "",
+                    default_label=xml_handler.get_default_title(tag, False, True) or "",
+                    labels=labels
+                )
+
+        return index
+
+    # =========================================================================
+    # SEARCH
+    # =========================================================================
+
+    def _tokens_with_prefix(self, key: str, prefix: str) -> Iterable[str]:
+        tokens = self._sorted_tokens.get(key)
+        if tokens is None:
+            tokens = sorted(self._postings.get(key, {}))
+            self._sorted_tokens[key] = tokens
+        i = bisect_left(tokens, prefix)
+        while i < len(tokens) and tokens[i].startswith(prefix):
+            yield tokens[i]
+            i += 1
+
+    def _match(self, key: str, token: str, prefix: bool) -> set:
+        postings = self._postings.get(key, {})
+        if not prefix:
+            return set(postings.get(token, ()))
+        matches = set()
+        for match in self._tokens_with_prefix(key, token):
+            matches.update(postings[match])
+        return matches
+
+    def search(
+        self,
+        query: str,
+        locale: Optional[str] = None,
+        missing: Optional[str] = None,
+        prefix: bool = True,
+        limit: Optional[int] = 50
+    ) -> Dict[str, Any]:
+        """
+        Find elements whose label contains all query tokens.
+
+        Args:
+            query: Words to find; the last one may be a prefix
+            locale: Search the labels of this locale, 'default' for the
+                default label (default: default label or any locale)
+            missing: Only elements without a label for this locale
+            prefix: Match the last query token as a prefix
+            limit: Maximum number of entries returned (None for all)
+
+        Returns:
+            Dict with total and the matching entries in document order
+        """
+        key = normalize_locale(locale) if locale else ANY_LABEL
+        tokens = tokenize(query)
+
+        if tokens:
+            sets = [self._match(key, token, False) for token in tokens[:-1]]
+            sets.append(self._match(key, tokens[-1], prefix))
+            sets.sort(key=len)
+            matches = sets[0].intersection(*sets[1:])
+        elif missing:
+            matches = set(range(len(self.entries)))
+        else:
+            matches = set()
+
+        if missing:
+            missing = normalize_locale(missing)
+            matches = {i for i in matches if not self.entries[i]['labels'].get(missing)}
+
+        ids = sorted(matches)
+        if limit is not None:
+            ids = ids[:limit]
+        return {'total': len(matches), 'entries': [self.entries[i] for i in ids]}
+
+    # =========================================================================
+    # PERSISTENCE
+    # =========================================================================
+
+    def to_bytes(self) -> bytes:
+        """Serialize the entries (postings are rebuilt on load)."""
+        data = {'version': INDEX_VERSION, 'model': self.model, 'entries': self.entries}
+        return gzip.compress(json.dumps(data, separators=(",", ":")).encode("utf-8"), compresslevel=6)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'LabelIndex':
+        """
+        Load an index written by to_bytes().
+
+        Raises:
+            ValueError: If the data is not an index of the current version
+        """
+        try:
+            payload = json.loads(gzip.decompress(data))
+        except (OSError, ValueError) as e:
+            raise ValueError(f"Invalid label index: {e}")
+        if not isinstance(payload, dict) or payload.get('version') != INDEX_VERSION:
+            raise ValueError("Label index version mismatch")
+
+        index = cls(payload.get('model', ""))
+        index.entries = payload['entries']
+        for entry_id in range(len(index.entries)):
+            index._index(entry_id)
+        return index
@@ -5,18 +5,125 @@ Handles communication with SAP SuccessFactors OData API.
 """
 
 from typing import List, Optional, Dict, Any
+import base64
+import gzip
+import json
 import requests
 import pyodata
 from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
 
 from ..config import ODataConfig
+from .cancellation import CancellationToken, OperationCancelled
+
+# (connect, read) timeout in seconds for API requests without their own
+DEFAULT_TIMEOUT = (15, 300)
+# Response bodies are read in chunks so cancellation can stop a download
+RESPONSE_CHUNK_SIZE = 64 * 1024
+
+
+class CancellableAdapter(HTTPAdapter):
+    """
+    HTTP adapter that honours a cancellation token.
+
+    Checks the token before each request and between chunks of the
+    response body, closing the connection when cancelled.
+    """
+
+    def __init__(self, cancel_token: CancellationToken, **kwargs):
+        self.cancel_token = cancel_token
+        super().__init__(**kwargs)
+
+    def send(self, request, stream=False, timeout=None, **kwargs):
+        self.cancel_token.raise_if_cancelled()
+        response = super().send(
+            request, stream=True, timeout=timeout or DEFAULT_TIMEOUT, **kwargs
+        )
+        if stream:
+            return response
+
+        chunks = []
+        try:
+            for chunk in response.iter_content(RESPONSE_CHUNK_SIZE):
+                self.cancel_token.raise_if_cancelled()
+                chunks.append(chunk)
+        except OperationCancelled:
+            response.close()
+            raise
+        response._content = b"".join(chunks)
+        return response
+
+
+class RecordingSession(requests.Session):
+    """
+    HTTP session that records successful GET responses and replays them.
+
+    Lets a retried export reuse the OData payloads fetched by an earlier
+    attempt instead of querying SuccessFactors again.
+    """
+
+    def __init__(self, recorded: Optional[Dict[str, Dict[str, Any]]] = None):
+        super().__init__()
+        self.recorded: Dict[str, Dict[str, Any]] = recorded or {}
+        self.replayed = 0
+        self.unsaved = 0
+
+    @staticmethod
+    def _key(url: str, params: Any) -> str:
+        return requests.Request("GET", url, params=params).prepare().url
+
+    def request(self, method, url, params=None, **kwargs):
+        if method.upper() != "GET":
+            return super().request(method, url, params=params, **kwargs)
+
+        key = self._key(url, params)
+        entry = self.recorded.get(key)
+        if entry is not None:
+            self.replayed += 1
+            return self._replay(key, entry)
+
+        response = super().request(method, url, params=params, **kwargs)
+        if response.status_code == 200:
+            self.recorded[key] = {
+                "status": response.status_code,
+                "content_type": response.headers.get("Content-Type", ""),
+                "body": base64.b64encode(response.content).decode("ascii")
+            }
+            self.unsaved += 1
+        return response
+
+    @staticmethod
+    def _replay(url: str, entry: Dict[str, Any]) -> requests.Response:
+        response = requests.Response()
+        response.status_code = entry["status"]
+        response.headers = CaseInsensitiveDict({"Content-Type": entry["content_type"]})
+        response._content = base64.b64decode(entry["body"])
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers) or "utf-8"
+        response.url = url
+        return response
+
+    def dumps(self) -> bytes:
+        """Serialize the recorded responses (gzipped JSON)."""
+        self.unsaved = 0
+        return gzip.compress(json.dumps(self.recorded).encode("utf-8"))
+
+    @classmethod
+    def loads(cls, data: bytes) -> "RecordingSession":
+        """Create a session that replays responses from dumps()."""
+        return cls(json.loads(gzip.decompress(data).decode("utf-8")))
 
 
 class ODataClient:
     """Client for SAP SuccessFactors OData API."""
 
-    def __init__(self, config: Optional[ODataConfig] = None):
+    def __init__(
+        self,
+        config: Optional[ODataConfig] = None,
+        cancel_token: Optional[CancellationToken] = None
+    ):
         self.config = config
+        self.cancel_token = cancel_token or CancellationToken.none()
         self.service = None
         self.session = None
         self._connected = False
@@ -26,7 +133,8 @@ class ODataClient:
         service_url: str = None,
         company_id: str = None,
         username: str = None,
-        password: str = None
+        password: str = None,
+        session: Optional[requests.Session] = None
     ) -> bool:
         """
         Connect to the OData service.
@@ -36,6 +144,7 @@ class ODataClient:
             company_id: SF company ID
             username: API username
             password: API password
+            session: HTTP session to use (e.g. a RecordingSession)
 
         Returns:
             True if connection successful
@@ -49,8 +158,11 @@ class ODataClient:
             username = self.config.username
             password = self.config.password
 
-        self.session = requests.Session()
+        self.session = session or requests.Session()
         self.session.auth = (f"{username}@{company_id}", password)
+        adapter = CancellableAdapter(self.cancel_token)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
 
         self.service = pyodata.Client(service_url, self.session)
         self._connected = True
@@ -6,7 +6,7 @@ Extracts translations from SF data models and exports to Excel.
 
 import os
 import time
-from typing import List, Optional, Dict, Any, Callable
+from typing import List, Optional, Dict, Any, Callable, Set
 
 import babel
 from bs4 import BeautifulSoup
@@ -20,13 +20,16 @@ from ..config import (
     EMPLOYEE_PROFILE_TAGS,
     TAGS_TO_BE_IGNORED,
     HIGHLIGHT_TAGS,
-    KEYWORD_SAP_STANDARD
+    KEYWORD_SAP_STANDARD,
+    SUGGESTED_LABEL_HEADER
 )
 from ..models.datamodel import DataModel, DataModelType, ExportResult
 from ..io.xml_handler import XMLHandler
 from ..io.excel_handler import ExcelHandler
 from .datamodel_processor import DataModelProcessor
 from .odata_client import ODataClient
+from .cancellation import CancellationToken
+from .translation_memory import TranslationMemory
 
 
 class TranslationExtractor:
@@ -36,13 +39,15 @@ class TranslationExtractor:
         self,
         processor: DataModelProcessor,
         odata_client: Optional[ODataClient] = None,
-        progress_callback: Optional[Callable[[int, str], None]] = None
+        progress_callback: Optional[Callable[[int, str], None]] = None,
+        cancel_token: Optional[CancellationToken] = None
     ):
         self.processor = processor
         self.odata_client = odata_client
         self.xml_handler = XMLHandler()
         self.excel_handler = ExcelHandler()
         self.progress_callback = progress_callback
+        self.cancel_token = cancel_token or CancellationToken.none()
 
         # State
         self.picklist_ids: List[str] = []
@@ -50,6 +55,9 @@ class TranslationExtractor:
         self.label_keys_dict: Dict[str, Dict] = {}
         self.label_keys_headers: List[str] = []
         self.active_countries: List[str] = []
+        self.translation_memory: Optional[TranslationMemory] = None
+        # Rows whose translations come from the export, not the model, by sheet
+        self.prefilled_rows: Dict[str, Set[int]] = {}
 
     def _log_progress(self, percent: int, message: str):
         """Log progress if callback is set."""
@@ -72,7 +80,8 @@ class TranslationExtractor:
         # Other options
         picklist_from_csv: Optional[str] = None,
         remove_html_tags: bool = False,
-        system_default_lang: str = "en_US"
+        system_default_lang: str = "en_US",
+        suggest_translations: bool = True
     ) -> Workbook:
         """
         Extract translations to an Excel workbook.
@@ -89,12 +98,18 @@ class TranslationExtractor:
             picklist_from_csv: Path to picklist CSV file
             remove_html_tags: Whether to remove HTML tags from labels
             system_default_lang: System default language
+            suggest_translations: Suggest labels for missing data model
+                translations from the translation memory
 
         Returns:
             Workbook with exported translations
         """
         workbook = self.excel_handler.create_workbook()
         progress = 0
+        self.prefilled_rows = {}
+
+        # Filled from picklists and FO data as they are exported, then from the models
+        self.translation_memory = TranslationMemory() if suggest_translations else None
 
         # Determine if any picklists should be exported
         export_any_picklists = export_mdf_picklists or export_legacy_picklists
@@ -121,7 +136,7 @@ class TranslationExtractor:
         if export_any_picklists:
             self._log_progress(progress, "Extracting picklists...")
             if picklist_from_csv:
-                self._export_picklists_from_csv(workbook, picklist_from_csv)
+                self._export_picklists_from_csv(workbook, picklist_from_csv, system_default_lang)
             elif self.odata_client and self.odata_client.is_connected:
                 self._export_picklists_from_api(
                     workbook, locales_for_export, system_default_lang,
@@ -141,6 +156,8 @@ class TranslationExtractor:
 
         # Export data model translations
         self._log_progress(progress, "Extracting data model translations...")
+        if self.translation_memory is not None:
+            self.translation_memory.add_models(self.processor)
         self._export_datamodel_translations(
             workbook,
             locales_for_export,
@@ -215,6 +232,7 @@ class TranslationExtractor:
                 obj_id = "LegalEntity"
 
             for lang in locales:
+                self.cancel_token.raise_if_cancelled()
                 ws_name = f"ObjectDefinitions ({lang})"
                 if ws_name not in workbook.sheetnames:
                     continue
@@ -287,6 +305,7 @@ class TranslationExtractor:
                 total_legacy = self.odata_client.get_picklist_count("legacy")
                 offset = 0
                 while offset < total_legacy:
+                    self.cancel_token.raise_if_cancelled()
                     items = self.odata_client.get_legacy_picklists(batch_size, offset)
                     picklist_items.extend(items)
                     offset += batch_size
@@ -296,6 +315,7 @@ class TranslationExtractor:
             total_mdf = self.odata_client.get_picklist_count("mdf")
             offset = 0
             while offset < total_mdf:
+                self.cancel_token.raise_if_cancelled()
                 items = self.odata_client.get_mdf_picklists(batch_size, offset)
                 picklist_items.extend(items)
                 offset += batch_size
@@ -310,6 +330,7 @@ class TranslationExtractor:
 
         # Process picklists
         for picklist_item in picklist_items:
+            self.cancel_token.raise_if_cancelled()
             is_mdf = False
             try:
                 picklist_item.__getattr__("values")
@@ -336,11 +357,13 @@ class TranslationExtractor:
                 external_code = option.externalCode
                 row_data = [references, picklist_id, external_code]
                 labels = []
+                labels_by_locale = {}
 
                 if is_mdf:
                     option_id = option.optionId
                     for locale in locales:
                         label = option.__getattr__(f"label_{locale}")
+                        labels_by_locale[locale] = label
                         if locale == default_lang:
                             labels.insert(0, label)
                         else:
@@ -351,6 +374,7 @@ class TranslationExtractor:
                         for pl_label in option.picklistLabels:
                             if locale == pl_label.locale:
                                 label = pl_label.label
+                                labels_by_locale[locale] = label
                                 if locale == default_lang:
                                     labels.insert(0, label)
                                 else:
@@ -360,11 +384,13 @@ class TranslationExtractor:
                 row_data.append(option_id)
                 row_data.extend(labels)
                 ws.append(row_data)
+                self._remember(labels_by_locale.get(default_lang), labels_by_locale)
 
     def _export_picklists_from_csv(
         self,
         workbook: Workbook,
-        csv_path: str
+        csv_path: str,
+        default_lang: str = "en_US"
     ):
         """Export picklists from CSV file."""
         from ..io.csv_handler import CSVHandler
@@ -376,6 +402,16 @@ class TranslationExtractor:
         ws.column_dimensions[get_column_letter(1)].width = 75
 
         headers = values_matrix[0]
+        label_cols = {
+            i: header[len("values.label."):]
+            for i, header in enumerate(headers)
+            if header.startswith("values.label.")
+        }
+        source_col = next(
+            (i for i, locale in label_cols.items() if locale in ("defaultValue", default_lang)),
+            None
+        )
+
         col_num = 0
         for header in headers:
             col_num += 1
@@ -404,6 +440,12 @@ class TranslationExtractor:
                 row[0] = "References in EC"
             else:
                 row[0] = references
+                if source_col is not None and source_col < len(row):
+                    self._remember(
+                        row[source_col],
+                        {locale: row[i] for i, locale in label_cols.items()
+                         if locale != "defaultValue" and i < len(row)}
+                    )
 
             ws.append(row)
 
@@ -462,6 +504,7 @@ class TranslationExtractor:
         objects_to_export.extend(fo_entities)
 
         for obj_name in objects_to_export:
+            self.cancel_token.raise_if_cancelled()
             trans_props, trans_fields = self.odata_client.get_translatable_properties(
                 obj_name, locales
             )
@@ -482,6 +525,7 @@ class TranslationExtractor:
                 key_prop = metadata.key_proprties[0].name if metadata else "externalCode"
 
                 for obj in objects:
+                    self.cancel_token.raise_if_cancelled()
                     try:
                         key = obj.__getattr__(key_prop)
                     except (AttributeError, KeyError):
@@ -509,6 +553,7 @@ class TranslationExtractor:
                                 row.append(obj.__getattr__(f"{field}_{lang}"))
 
                             ws.append(row)
+                            self._remember(row[3], dict(zip(locales, row[4:])))
 
             except Exception as e:
                 print(f"Error processing {obj_name}: {e}")
@@ -545,6 +590,16 @@ class TranslationExtractor:
                 row.append("")
 
         ws.append(row)
+        self._remember(row[3], dict(zip(locales, row[4:])))
+
+    def _mark_prefilled(self, ws):
+        """Mark the last row of a sheet as holding export-time translations."""
+        self.prefilled_rows.setdefault(ws.title, set()).add(ws.max_row)
+
+    def _remember(self, source, labels: Dict[str, Any]):
+        """Add exported labels to the translation memory, if there is one."""
+        if self.translation_memory is not None and source:
+            self.translation_memory.add(source, labels)
 
     def _export_datamodel_translations(
         self,
@@ -595,6 +650,11 @@ class TranslationExtractor:
             )
             for lang in xml_langs:
                 worksheets.append(f"DataModel ({lang})")
+                if self.translation_memory is not None:
+                    # After the label column, which is the one imported
+                    workbook[f"DataModel ({lang})"].cell(
+                        row=1, column=len(dm_headers) + 2, value=SUGGESTED_LABEL_HEADER
+                    )
 
         # Process each data model
         data_models = self.processor.get_all_data_models()
@@ -607,6 +667,7 @@ class TranslationExtractor:
             )
 
             translatable_tags = data_model.soup.find_all(self.processor.translatable_tags)
+            lang_index = self.processor.get_lang_index(data_model)
             is_pmgm_soup = False
             translation_feature = "Manage Templates"
 
@@ -636,6 +697,7 @@ class TranslationExtractor:
             added_countries_per_ws = {}
 
             for tag in translatable_tags:
+                self.cancel_token.raise_if_cancelled()
                 parent_tag = tag.parent
                 parent_tag_name = parent_tag.name
                 parent_tag_id = parent_tag.get("id")
@@ -676,11 +738,12 @@ class TranslationExtractor:
                             subsection_name, field, default_label
                         ]
 
+                        lang_siblings = lang_index.group_for(tag)
+                        prefilled = False
+
                         for lang_id in xml_langs:
                             lang = lang_id.replace("-", "_")
-                            lang_label_tag = parent_tag.find(
-                                attrs={"lang": lang}, recursive=False
-                            )
+                            lang_label_tag = lang_siblings.get(lang)
 
                             if lang_label_tag is None:
                                 msg_key = tag.get("msgKey") or tag.get("msgkey")
@@ -688,6 +751,7 @@ class TranslationExtractor:
 
                                 if msg_key and msg_key in self.label_keys_dict:
                                     lang_label = self.label_keys_dict[msg_key].get(lang, "")
+                                    prefilled = prefilled or bool(lang_label)
 
                                 if ws_name == SHEET_NAME_PM and msg_key and msg_key not in row:
                                     row.append(msg_key)
@@ -701,6 +765,8 @@ class TranslationExtractor:
                             row.append(lang_label)
 
                         ws.append(row)
+                        if prefilled:
+                            self._mark_prefilled(ws)
 
                     prev_parent_tag = parent_tag
                     prev_tag_name = tag.name
@@ -734,10 +800,17 @@ class TranslationExtractor:
                                 parent_tag_id, default_label, standard_label
                             ]
 
+                            if not standard_label and self.translation_memory is not None:
+                                suggestion = self.translation_memory.best(default_label, missing_lang)
+                                if suggestion:
+                                    row.append(suggestion)
+
                             if parent_tag_name in HIGHLIGHT_TAGS:
                                 self.excel_handler.append_as_header_row(dm_ws, row)
                             else:
                                 dm_ws.append(row)
+                            if standard_label:
+                                self._mark_prefilled(dm_ws)
 
                     prev_parent_tag = parent_tag
 
@@ -780,7 +853,10 @@ class TranslationExtractor:
         else:
             filename = os.path.join(save_dir, filename)
 
-        self.excel_handler.prepare_and_save_workbook(workbook, filename)
+        self.excel_handler.prepare_and_save_workbook(
+            workbook, filename, cancel_token=self.cancel_token,
+            prefilled_rows=self.prefilled_rows
+        )
         return filename
 
     def set_label_keys(
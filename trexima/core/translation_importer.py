@@ -5,8 +5,8 @@ Imports translations from Excel workbooks back to SF data models.
 """
 
 import os
-import time
-from typing import List, Optional, Dict, Any, Callable, Tuple
+from collections import deque
+from typing import List, Optional, Dict, Any, Callable, Tuple, Set
 
 from openpyxl import Workbook
 from bs4 import BeautifulSoup
@@ -21,7 +21,10 @@ from ..models.datamodel import DataModel, ImportResult
 from ..io.xml_handler import XMLHandler
 from ..io.excel_handler import ExcelHandler
 from ..io.csv_handler import CSVHandler
+from ..io.changelog_writer import ChangeLogWriter
+from ..io.workbook_fingerprint import WorkbookFingerprint, FINGERPRINT_SHEET_NAME
 from .datamodel_processor import DataModelProcessor
+from .cancellation import CancellationToken, OperationCancelled
 
 
 class TranslationImporter:
@@ -30,19 +33,26 @@ class TranslationImporter:
     def __init__(
         self,
         processor: DataModelProcessor,
-        progress_callback: Optional[Callable[[int, str], None]] = None
+        progress_callback: Optional[Callable[[int, str], None]] = None,
+        cancel_token: Optional[CancellationToken] = None
     ):
         self.processor = processor
         self.xml_handler = XMLHandler()
         self.excel_handler = ExcelHandler()
         self.csv_handler = CSVHandler()
         self.progress_callback = progress_callback
+        self.cancel_token = cancel_token or CancellationToken.none()
 
         # State
         self.label_keys_dict: Dict[str, Dict] = {}
         self.label_keys_headers: List[str] = []
-        self.import_logs: List[str] = []
+        self.import_logs: deque = deque(maxlen=200)
         self.modified_models: List[DataModel] = []
+        self.change_log: Optional[ChangeLogWriter] = None
+        self.annotate_workbook = True
+        self.skip_unchanged = True
+        self.section_cache: Dict[Tuple[str, str], Any] = {}
+        self.written_files: List[str] = []
 
     def _log_progress(self, percent: int, message: str):
         """Log progress if callback is set."""
@@ -50,85 +60,158 @@ class TranslationImporter:
             self.progress_callback(percent, message)
 
     def _log_import(self, message: str):
-        """Add message to import logs."""
-        timestamp = time.strftime("%a_%d%b_%Y_%Hh%Mm%Ss", time.localtime())
-        self.import_logs.append(f"{timestamp}: {message}")
+        """Write message to the import log (recent lines stay in import_logs)."""
+        if self.change_log:
+            self.change_log.log(message)
+        else:
+            self.import_logs.append(message)
+
+    def _record_change(self, ws, row_num: int, change_log_col: Optional[int], text: str):
+        """Stream a row's change text to the change log, and the sheet if annotating."""
+        if self.change_log:
+            self.change_log.record(ws.title, row_num, text)
+        if change_log_col:
+            ws.cell(row=row_num, column=change_log_col).value = text
 
     def import_from_workbook(
         self,
         workbook: Workbook,
         worksheets_to_process: List[str],
-        save_dir: str
+        save_dir: str,
+        annotate_workbook: bool = True,
+        change_log_format: str = "jsonl",
+        skip_unchanged: bool = True
     ) -> ImportResult:
         """
         Import translations from workbook to data models.
 
+        Change records and log lines are streamed to disk while sheets are
+        processed. Annotating the workbook with a change log column (and
+        re-saving it) is optional, as it costs a second full workbook save.
+
+        If the cancel token fires, the files written so far are removed
+        and OperationCancelled is raised.
+
         Args:
             workbook: Translations workbook
             worksheets_to_process: List of worksheet names to process
             save_dir: Directory to save output files
+            annotate_workbook: Whether to write changes into the workbook
+                and save TranslationsWorkbook_WithChangeLog.xlsx
+            change_log_format: Change log file format ("jsonl" or "csv")
+            skip_unchanged: Whether to skip rows that still match the
+                fingerprints embedded at export time
 
         Returns:
             ImportResult with operation details
         """
-        self.import_logs = []
         self.modified_models = []
+        self.section_cache = {}
+        self.annotate_workbook = annotate_workbook
+        self.skip_unchanged = skip_unchanged
+        self.written_files = []
+        self.change_log = ChangeLogWriter(save_dir, change_log_format).open()
+        self.import_logs = self.change_log.tail
+        try:
+            return self._import_sheets(workbook, worksheets_to_process, save_dir)
+        except OperationCancelled:
+            self.change_log.close()
+            self._discard_outputs()
+            raise
+        finally:
+            self.change_log.close()
+            self.change_log = None
+
+    def _discard_outputs(self):
+        """Remove the partial output of a cancelled import."""
+        paths = self.written_files + [self.change_log.change_log_path, self.change_log.log_path]
+        for path in paths:
+            if path and os.path.exists(path):
+                os.remove(path)
+        self.written_files = []
+
+    def _import_sheets(
+        self,
+        workbook: Workbook,
+        worksheets_to_process: List[str],
+        save_dir: str
+    ) -> ImportResult:
+        """Process worksheets and write the output files."""
         progress = 0
         progress_incr = 55 / len(worksheets_to_process) if worksheets_to_process else 0
 
         result = ImportResult(success=True)
+        fingerprints = WorkbookFingerprint().load(workbook) if self.skip_unchanged else {}
 
         for ws_name in worksheets_to_process:
+            self.cancel_token.raise_if_cancelled()
             progress += progress_incr
+            if ws_name == FINGERPRINT_SHEET_NAME:
+                continue
+
             self._log_progress(
                 int(progress),
                 f"Processing '{ws_name}' sheet from workbook..."
             )
 
             ws = workbook[ws_name]
-            ws.protection.password = "...ApTrans..."
-            ws.protection.disable()
-
             max_col = self._get_max_column(ws)
             if max_col < 2:
                 continue
 
+            # Rows edited since export (None = no fingerprint, process all)
+            changed_rows = None
+            if ws_name in fingerprints:
+                changed_rows = fingerprints[ws_name].changed_rows(ws)
+                if not changed_rows:
+                    self._log_import(f"No edited rows in '{ws_name}', skipped")
+                    continue
+
             # Add change log column
-            change_log_col = self.excel_handler.add_change_log_column(ws)
+            change_log_col = None
+            if self.annotate_workbook:
+                ws.protection.password = "...ApTrans..."
+                ws.protection.disable()
+                change_log_col = self.excel_handler.add_change_log_column(ws)
 
             if ws_name.startswith("DataModel"):
-                self._process_datamodel_sheet(ws, ws_name, change_log_col)
+                self._process_datamodel_sheet(ws, ws_name, change_log_col, changed_rows)
             elif ws_name in [SHEET_NAME_PM, SHEET_NAME_GM]:
-                self._process_pmgm_sheet(ws, ws_name, change_log_col, save_dir)
+                self._process_pmgm_sheet(ws, ws_name, change_log_col, save_dir, changed_rows)
 
-            ws.protection.enable()
-            ws.protection.sort = False
-            ws.protection.autoFilter = False
-            ws.protection.formatColumns = False
+            if self.annotate_workbook:
+                ws.protection.enable()
+                ws.protection.sort = False
+                ws.protection.autoFilter = False
+                ws.protection.formatColumns = False
 
             result.changes_made += 1
 
         # Save modified workbook with change log
-        if self.modified_models:
+        if self.modified_models and self.annotate_workbook:
             progress += 5
             self._log_progress(progress, "Saving updated workbook with change log...")
 
+            self.cancel_token.raise_if_cancelled()
             workbook_path = os.path.join(save_dir, "TranslationsWorkbook_WithChangeLog.xlsx")
+            self.written_files.append(workbook_path)
             workbook.save(workbook_path)
 
-        # Save import log
+        # Import log and change log are streamed; just report them
         progress += 5
-        log_path = self._save_import_log(save_dir)
-        result.log_file_path = log_path
+        result.log_file_path = self.change_log.log_path
+        result.change_log_path = self.change_log.change_log_path
 
         # Generate ready-to-import XML files
         progress_incr = 35 / len(self.modified_models) if self.modified_models else 0
 
         for model in self.modified_models:
+            self.cancel_token.raise_if_cancelled()
             progress += progress_incr
             file_name = f"ReadyToImport_{model.name}.xml"
             file_path = os.path.join(save_dir, file_name)
 
+            self.written_files.append(file_path)
             self.xml_handler.write_xml_file(model.soup, file_path)
             result.files_generated.append(file_path)
 
@@ -155,18 +238,26 @@ class TranslationImporter:
         self,
         ws,
         ws_name: str,
-        change_log_col: int
+        change_log_col: Optional[int],
+        changed_rows: Optional[Set[int]] = None
     ):
-        """Process a DataModel worksheet."""
+        """
+        Process a DataModel worksheet.
+
+        Rows outside changed_rows only update the header-row state; they
+        are not matched against the XML.
+        """
         # Extract language from sheet name
         lang_id = ws_name[11:-1]  # "DataModel (xx-XX)" -> "xx-XX"
 
         row_num = 1
         parent_tag = None
         grand_parent_tag = None
+        last_changed_row = max(changed_rows) if changed_rows else 0
 
         while row_num < ws.max_row:
             row_num += 1
+            self.cancel_token.raise_if_cancelled()
 
             dm_ref = ws.cell(row=row_num, column=1).value
             translatable_item = ws.cell(row=row_num, column=2).value
@@ -176,6 +267,18 @@ class TranslationImporter:
             if not dm_ref:
                 break
 
+            row_changed = changed_rows is None or row_num in changed_rows
+            is_header_row = (
+                ws.cell(row=row_num, column=1).font.b
+                and ws.cell(row=row_num, column=2).font.b
+                and ws.cell(row=row_num, column=3).font.b
+            )
+            if not row_changed:
+                if row_num > last_changed_row:
+                    break
+                if not is_header_row:
+                    continue
+
             # Handle CSF data models
             is_csf = False
             if "(" in dm_ref:
@@ -188,19 +291,17 @@ class TranslationImporter:
 
             data_model = self.processor.get_data_model(dm_ref)
             if not data_model:
-                ws.cell(row=row_num, column=change_log_col).value = (
-                    f"No data model found for {dm_ref}"
-                )
+                if row_changed:
+                    self._record_change(
+                        ws, row_num, change_log_col,
+                        f"No data model found for {dm_ref}"
+                    )
                 continue
 
             soup = data_model.soup
 
             # Handle header rows
-            col1_bold = ws.cell(row=row_num, column=1).font.b
-            col2_bold = ws.cell(row=row_num, column=2).font.b
-            col3_bold = ws.cell(row=row_num, column=3).font.b
-
-            if col1_bold and col2_bold and col3_bold:
+            if is_header_row:
                 if translatable_item == "country" or grand_parent_tag is None:
                     grand_parent_tag = soup
                 elif grand_parent_tag:
@@ -218,6 +319,9 @@ class TranslationImporter:
             if parent_tag is None:
                 parent_tag = soup
 
+            if not row_changed:
+                continue
+
             # Find matching tag
             matching_tag = parent_tag.find(
                 name=translatable_item,
@@ -236,7 +340,8 @@ class TranslationImporter:
                 self._log_import(
                     f"No matching tag found in {dm_ref} for {translatable_item} ({tag_id})"
                 )
-                ws.cell(row=row_num, column=change_log_col).value = (
+                self._record_change(
+                    ws, row_num, change_log_col,
                     f"No matching tag found in {dm_ref}"
                 )
                 continue
@@ -270,7 +375,8 @@ class TranslationImporter:
                     self._log_import(
                         f"Row {row_num}: Added '{lang_id}' translation for {translatable_item}"
                     )
-                    ws.cell(row=row_num, column=change_log_col).value = (
+                    self._record_change(
+                        ws, row_num, change_log_col,
                         f"Translation Added: '{lang_label}'"
                     )
             else:
@@ -286,7 +392,8 @@ class TranslationImporter:
                             f"Row {row_num}: Changed '{lang_id}' translation for "
                             f"{translatable_item} from '{old_label}' to '{lang_label}'"
                         )
-                        ws.cell(row=row_num, column=change_log_col).value = (
+                        self._record_change(
+                            ws, row_num, change_log_col,
                             f"Translation Changed from '{old_label}' to '{lang_label}'"
                         )
 
@@ -294,10 +401,16 @@ class TranslationImporter:
         self,
         ws,
         ws_name: str,
-        change_log_col: int,
-        save_dir: str
+        change_log_col: Optional[int],
+        save_dir: str,
+        changed_rows: Optional[Set[int]] = None
     ):
-        """Process a PM/GM template worksheet."""
+        """
+        Process a PM/GM template worksheet.
+
+        Rows outside changed_rows are not matched; only their section is
+        remembered for following "Section Configuration" rows.
+        """
         parent_tag_name = "sf-form" if ws_name == SHEET_NAME_PM else "obj-plan-template"
 
         # Prepare label key rows for writing
@@ -328,15 +441,25 @@ class TranslationImporter:
         parent_tag = None
         unmatched_rows = []
         unmatched_templates = []
+        last_changed_row = max(changed_rows) if changed_rows else 0
+        skipped_section = None
 
         while row_num < ws.max_row:
             row_num += 1
+            self.cancel_token.raise_if_cancelled()
 
             template_name = ws.cell(row=row_num, column=2).value
             if template_name is None:
                 break
 
             section_name = ws.cell(row=row_num, column=3).value
+
+            if changed_rows is not None and row_num not in changed_rows:
+                if row_num > last_changed_row:
+                    break
+                if section_name and "(" in section_name:
+                    skipped_section = (template_name, section_name)
+                continue
             translatable_item = ws.cell(row=row_num, column=4).value
             change_text = None
 
@@ -351,20 +474,18 @@ class TranslationImporter:
 
             # Parse section name for attributes
             if section_name and "(" in section_name:
-                attr_name = section_name[section_name.rfind("(") + 1:section_name.rfind("=")]
-                attr_value = section_name[section_name.rfind("=") + 1:section_name.rfind(")")]
-                section_name_clean = section_name[:section_name.find("(")]
-                section_tag_name = self.xml_handler.derive_section_tag_name(section_name_clean)
-
-                parent_section_tag = soup.find(
-                    section_tag_name, attrs={attr_name: attr_value}
-                )
-                if parent_section_tag is None:
-                    parent_section_tag = soup.find(
-                        "fm-sect", attrs={attr_name: attr_value}
-                    )
+                parent_section_tag = self._resolve_section(data_model, section_name)
+                skipped_section = None
                 parent_tag = parent_section_tag
             elif section_name == f"{CHILD_CHAR}Section Configuration":
+                if skipped_section:
+                    # The section row itself was unchanged and skipped
+                    section_model = self.processor.get_data_model(skipped_section[0])
+                    parent_section_tag = (
+                        self._resolve_section(section_model, skipped_section[1])
+                        if section_model else None
+                    )
+                    skipped_section = None
                 if parent_section_tag:
                     parent_tag = parent_section_tag.find("fm-sect-config")
             else:
@@ -413,16 +534,42 @@ class TranslationImporter:
                 )
 
             if change_text:
-                ws.cell(row=row_num, column=change_log_col).value = change_text
+                self._record_change(ws, row_num, change_log_col, change_text)
 
         # Write updated label keys file for PM
         if ws_name == SHEET_NAME_PM and label_key_rows:
             label_keys_path = os.path.join(save_dir, "ReadyToImport_FormLabelKeys.csv")
+            self.written_files.append(label_keys_path)
             self.csv_handler.write_csv_from_dict_list(
                 label_keys_path, label_key_rows, self.label_keys_headers
             )
             self._log_progress(0, f"Generated ReadyToImport_FormLabelKeys.csv")
 
+    def _resolve_section(self, data_model: DataModel, section_name: str):
+        """
+        Find the section element for a section label like 'Name (id=3)'.
+
+        Consecutive rows share sections, so results are cached per
+        (template, section label) and looked up via the template's
+        attribute index.
+        """
+        key = (data_model.name, section_name)
+        if key in self.section_cache:
+            return self.section_cache[key]
+
+        attr_name = section_name[section_name.rfind("(") + 1:section_name.rfind("=")]
+        attr_value = section_name[section_name.rfind("=") + 1:section_name.rfind(")")]
+        section_name_clean = section_name[:section_name.find("(")]
+        section_tag_name = self.xml_handler.derive_section_tag_name(section_name_clean)
+
+        attr_index = self.processor.get_attr_index(data_model)
+        section_tag = attr_index.find(section_tag_name, attr_name, attr_value)
+        if section_tag is None:
+            section_tag = attr_index.find("fm-sect", attr_name, attr_value)
+
+        self.section_cache[key] = section_tag
+        return section_tag
+
     def _process_pm_tag(
         self,
         tag,
@@ -511,36 +658,34 @@ class TranslationImporter:
                 new_labels.append(def_label)
 
         # Update language-specific labels
-        next_siblings = tag.find_next_siblings(tag_name)
-        matching_tag = tag
+        siblings = self.processor.get_lang_index(data_model).group_for(tag)
+        new_lang_tags = []
 
         for lang_key in lang_labels:
             lang_val = lang_labels.get(lang_key)
             if not lang_val or not lang_val.strip():
                 continue
 
-            lang_found = False
-            for sibling in next_siblings:
-                if sibling.get("lang") == lang_key:
-                    matching_tag = sibling
-                    lang_found = True
-                    old_val = sibling.string
-                    if old_val != lang_val:
-                        sibling.string = f"<![CDATA[{lang_val}]]>"
-                        modified_langs.append(lang_key)
-                        old_labels.append(old_val)
-                        new_labels.append(lang_val)
-                    break
-
-            if not lang_found:
+            sibling = siblings.get(lang_key)
+            if sibling is not None:
+                old_val = sibling.string
+                if old_val != lang_val:
+                    sibling.string = f"<![CDATA[{lang_val}]]>"
+                    modified_langs.append(lang_key)
+                    old_labels.append(old_val)
+                    new_labels.append(lang_val)
+            else:
                 # Create new language tag
                 new_lang_tag = soup.new_tag(tag_name)
                 new_lang_tag["lang"] = lang_key
                 new_lang_tag.string = f"<![CDATA[{lang_val}]]>"
-                matching_tag.insert_after(new_lang_tag)
+                new_lang_tags.append(new_lang_tag)
 
-                if data_model not in self.modified_models:
-                    self.modified_models.append(data_model)
+        if new_lang_tags:
+            siblings.insert(new_lang_tags)
+
+            if data_model not in self.modified_models:
+                self.modified_models.append(data_model)
 
         if modified_langs:
             if data_model not in self.modified_models:
@@ -556,16 +701,6 @@ class TranslationImporter:
 
         return change_text
 
-    def _save_import_log(self, save_dir: str) -> str:
-        """Save import log to file."""
-        timestamp = time.strftime("%a_%d%b_%Y_%Hh%Mm%Ss", time.localtime())
-        log_file = os.path.join(save_dir, f"ImportLog_{timestamp}.log")
-
-        with open(log_file, "wt", encoding="utf-8") as f:
-            f.write("\n\n".join(self.import_logs))
-
-        return log_file
-
     def set_label_keys(
         self,
         label_keys_dict: Dict[str, Dict],
@@ -0,0 +1,197 @@
+"""
+Translation Memory Module
+
+Known translations of source labels, for suggesting labels of languages
+a field is missing.
+
+Source labels are normalized (markup removed, case folded, whitespace
+collapsed) and each distinct one becomes a unit holding the translations
+seen for it per locale. Exact matches are a dict lookup. Fuzzy matches
+use MinHash signatures of character trigrams with locality-sensitive
+hashing: a signature is split into bands and units sharing any band are
+candidates, which are then scored by trigram Jaccard similarity. Only a
+few candidates are scored per lookup, regardless of the memory size.
+"""
+
+import random
+import re
+import zlib
+from collections import Counter
+from typing import Dict, List, Optional, Any
+
+from .label_index import LabelIndex, normalize_locale
+
+# MinHash signature: BANDS bands of ROWS hashes each. Units sharing a band
+# are candidates; with 12 x 3 a pair with similarity 0.5 is found ~80% of
+# the time, one with 0.7 ~99%.
+BANDS = 12
+ROWS = 3
+NGRAM_SIZE = 3
+
+DEFAULT_MIN_SCORE = 0.5
+
+# One 32-bit hash per n-gram, permuted by XOR with fixed random masks
+_rng = random.Random(20240611)
+_MASKS = [_rng.getrandbits(32) for _ in range(BANDS * ROWS)]
+
+_MARKUP = re.compile(r"<[^>]*>")
+_SPACE = re.compile(r"\s+")
+
+
+def normalize_source(text: str) -> str:
+    """Normalize a source label for matching."""
+    if not text:
+        return ""
+    return _SPACE.sub(" ", _MARKUP.sub(" ", str(text))).strip().casefold()
+
+
+def ngrams(normalized: str) -> set:
+    """Character trigrams of a normalized label (padded with spaces)."""
+    padded = f" {normalized} "
+    if len(padded) <= NGRAM_SIZE:
+        return {padded}
+    return {padded[i:i + NGRAM_SIZE] for i in range(len(padded) - NGRAM_SIZE + 1)}
+
+
+def similarity(a: set, b: set) -> float:
+    """Jaccard similarity of two n-gram sets."""
+    if not a or not b:
+        return 0.0
+    common = len(a & b)
+    return common / (len(a) + len(b) - common)
+
+
+def _band_keys(grams: set) -> List[tuple]:
+    hashes = [zlib.crc32(gram.encode("utf-8")) for gram in grams]
+    signature = [min(h ^ mask for h in hashes) for mask in _MASKS]
+    return [(band, *signature[band * ROWS:(band + 1) * ROWS]) for band in range(BANDS)]
+
+
+class TranslationMemory:
+    """
+    Exact and fuzzy lookup of translations by source label.
+
+    Usage:
+        memory = TranslationMemory()
+        memory.add("Cost Center", {"de_DE": "Kostenstelle"})
+        memory.suggest("Cost Centre", "de-DE")
+    """
+
+    def __init__(self, min_score: float = DEFAULT_MIN_SCORE):
+        self.min_score = min_score
+        self._sources: List[str] = []
+        self._targets: List[Dict[str, Counter]] = []
+        self._exact: Dict[str, int] = {}
+        self._buckets: Dict[tuple, List[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._sources)
+
+    # =========================================================================
+    # BUILDING
+    # =========================================================================
+
+    def add(self, source: str, targets: Dict[str, Any]) -> Optional[int]:
+        """
+        Remember the translations of a source label.
+
+        Args:
+            source: Label in the source (default) language
+            targets: {locale: translation}; empty translations are ignored
+
+        Returns:
+            Unit number, or None if there was nothing to remember
+        """
+        normalized = normalize_source(source)
+        targets = {
+            normalize_locale(locale): str(value).strip()
+            for locale, value in targets.items()
+            if locale and value and str(value).strip()
+        }
+        if not normalized or not targets:
+            return None
+
+        unit = self._exact.get(normalized)
+        if unit is None:
+            unit = len(self._sources)
+            grams = ngrams(normalized)
+            self._sources.append(normalized)
+            self._targets.append({})
+            self._exact[normalized] = unit
+            for key in _band_keys(grams):
+                self._buckets.setdefault(key, []).append(unit)
+
+        by_locale = self._targets[unit]
+        for locale, value in targets.items():
+            by_locale.setdefault(locale, Counter())[value] += 1
+        return unit
+
+    def add_models(self, processor, include_standard: bool = True):
+        """Remember the labels of a processor's loaded data models."""
+        index = LabelIndex.build(processor, include_standard=include_standard)
+        for entry in index.entries:
+            self.add(entry['default_label'], entry['labels'])
+
+    # =========================================================================
+    # LOOKUP
+    # =========================================================================
+
+    def lookup(self, source: str, locale: str) -> Optional[str]:
+        """Get the most frequent translation of exactly this label, or None."""
+        unit = self._exact.get(normalize_source(source))
+        if unit is None:
+            return None
+        counts = self._targets[unit].get(normalize_locale(locale))
+        return counts.most_common(1)[0][0] if counts else None
+
+    def suggest(
+        self,
+        source: str,
+        locale: str,
+        limit: int = 3,
+        min_score: Optional[float] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Get translations of the same or similar labels.
+
+        Args:
+            source: Label to translate
+            locale: Target locale
+            limit: Maximum number of suggestions
+            min_score: Minimum similarity (default: the memory's min_score)
+
+        Returns:
+            Suggestions (target, source, score), best first; an exact
+            match scores 1.0
+        """
+        normalized = normalize_source(source)
+        if not normalized:
+            return []
+        locale = normalize_locale(locale)
+        if min_score is None:
+            min_score = self.min_score
+
+        grams = ngrams(normalized)
+        candidates = {self._exact[normalized]} if normalized in self._exact else set()
+        for key in _band_keys(grams):
+            candidates.update(self._buckets.get(key, ()))
+
+        scored = []
+        for unit in candidates:
+            counts = self._targets[unit].get(locale)
+            if not counts:
+                continue
+            score = 1.0 if self._sources[unit] == normalized else similarity(grams, ngrams(self._sources[unit]))
+            if score >= min_score:
+                scored.append((score, unit, counts.most_common(1)[0][0]))
+
+        scored.sort(key=lambda s: (-s[0], s[1]))
+        return [
+            {'target': target, 'source': self._sources[unit], 'score': round(score, 3)}
+            for score, unit, target in scored[:limit]
+        ]
+
+    def best(self, source: str, locale: str) -> Optional[str]:
+        """Get the best suggestion for a label, or None."""
+        suggestions = self.suggest(source, locale, limit=1)
+        return suggestions[0]['target'] if suggestions else None
@@ -7,5 +7,6 @@ Contains modules for file input/output operations.
 from .xml_handler import XMLHandler
 from .excel_handler import ExcelHandler
 from .csv_handler import CSVHandler
+from .changelog_writer import ChangeLogWriter
 
-__all__ = ['XMLHandler', 'ExcelHandler', 'CSVHandler']
+__all__ = ['XMLHandler', 'ExcelHandler', 'CSVHandler', 'ChangeLogWriter']
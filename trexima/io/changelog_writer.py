@@ -0,0 +1,124 @@
+"""
+Change Log Writer Module
+
+Streams import change records and log lines to disk as they are produced.
+"""
+
+import csv
+import json
+import os
+import time
+from collections import deque
+from typing import Optional, Deque
+
+CHANGE_LOG_FORMATS = ("jsonl", "csv")
+CHANGE_LOG_FIELDS = ["sheet", "row", "change"]
+
+
+class ChangeLogWriter:
+    """
+    Writes the import change log and import log line by line.
+
+    Change records go to a JSONL or CSV file, free-text log lines to a
+    plain .log file. Nothing is accumulated in memory except a bounded
+    tail of recent log lines, so the cost of a large import stays flat.
+    """
+
+    def __init__(
+        self,
+        save_dir: str,
+        change_log_format: str = "jsonl",
+        tail_size: int = 200,
+        encoding: str = "utf-8"
+    ):
+        """
+        Args:
+            save_dir: Directory for the log files
+            change_log_format: "jsonl" or "csv"
+            tail_size: Number of recent log lines kept in memory
+            encoding: File encoding
+        """
+        if change_log_format not in CHANGE_LOG_FORMATS:
+            raise ValueError(f"Unsupported change log format: {change_log_format}")
+
+        self.save_dir = save_dir
+        self.change_log_format = change_log_format
+        self.encoding = encoding
+        self.tail: Deque[str] = deque(maxlen=tail_size)
+        self.changes_written = 0
+
+        self.change_log_path: Optional[str] = None
+        self.log_path: Optional[str] = None
+        self._change_file = None
+        self._csv_writer = None
+        self._log_file = None
+        self._log_count = 0
+
+        # Timestamps only change once per second; format them once
+        self._ts_second = -1
+        self._ts_text = ""
+
+    def _timestamp(self) -> str:
+        """Get the log timestamp, re-formatted at most once per second."""
+        now = int(time.time())
+        if now != self._ts_second:
+            self._ts_second = now
+            self._ts_text = time.strftime("%a_%d%b_%Y_%Hh%Mm%Ss", time.localtime(now))
+        return self._ts_text
+
+    def open(self):
+        """Create the log files."""
+        timestamp = self._timestamp()
+
+        self.log_path = os.path.join(self.save_dir, f"ImportLog_{timestamp}.log")
+        self._log_file = open(self.log_path, "w", encoding=self.encoding)
+
+        self.change_log_path = os.path.join(
+            self.save_dir, f"ChangeLog_{timestamp}.{self.change_log_format}"
+        )
+        self._change_file = open(
+            self.change_log_path, "w", newline="", encoding=self.encoding
+        )
+        if self.change_log_format == "csv":
+            self._csv_writer = csv.DictWriter(self._change_file, CHANGE_LOG_FIELDS)
+            self._csv_writer.writeheader()
+        return self
+
+    def log(self, message: str):
+        """Write a timestamped line to the import log."""
+        line = f"{self._timestamp()}: {message}"
+        self.tail.append(line)
+        if self._log_file is None:
+            return
+        if self._log_count:
+            self._log_file.write("\n\n")
+        self._log_file.write(line)
+        self._log_count += 1
+
+    def record(self, sheet: str, row: int, change: str):
+        """Write one change record."""
+        if self._change_file is None:
+            return
+        record = {"sheet": sheet, "row": row, "change": change}
+        if self._csv_writer is not None:
+            self._csv_writer.writerow(record)
+        else:
+            self._change_file.write(json.dumps(record, ensure_ascii=False))
+            self._change_file.write("\n")
+        self.changes_written += 1
+
+    def close(self):
+        """Flush and close the log files."""
+        for handle in (self._change_file, self._log_file):
+            if handle is not None:
+                handle.close()
+        self._change_file = None
+        self._csv_writer = None
+        self._log_file = None
+
+    def __enter__(self):
+        return self.open()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+        return False
@@ -6,7 +6,7 @@ Handles reading and writing of Excel workbooks.
 
 import os
 import time
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Set
 
 import babel
 from openpyxl import Workbook, load_workbook
@@ -19,10 +19,12 @@ from openpyxl.worksheet.worksheet import Worksheet
 
 from ..config import (
     SHEET_NAME_PM,
-    SHEET_NAME_GM,
     SHEET_NAME_PL,
-    WORKBOOK_PASSWORD
+    WORKBOOK_PASSWORD,
+    WORKBOOK_SHEET_PREFIXES
 )
+from ..core.cancellation import CancellationToken
+from .workbook_fingerprint import WorkbookFingerprint
 
 
 class ExcelHandler:
@@ -177,15 +179,26 @@ class ExcelHandler:
     def prepare_and_save_workbook(
         self,
         workbook: Workbook,
-        file_path: str
+        file_path: str,
+        embed_fingerprints: bool = True,
+        cancel_token: Optional[CancellationToken] = None,
+        prefilled_rows: Optional[Dict[str, Set[int]]] = None
     ):
         """
         Prepare workbook with protection and formatting, then save.
 
+        A partially written file is removed if saving fails.
+
         Args:
             workbook: Workbook to prepare
             file_path: Path to save the workbook
+            embed_fingerprints: Whether to embed row fingerprints so the
+                import can skip rows that were not edited
+            cancel_token: Checked between sheets and rows
+            prefilled_rows: Rows with export-time translations by sheet
+                name, fingerprinted as always changed
         """
+        cancel_token = cancel_token or CancellationToken.none()
         self._setup_styles(workbook)
 
         # Set workbook properties
@@ -198,14 +211,27 @@ class ExcelHandler:
 
         # Format each worksheet
         for ws in workbook:
-            self._format_worksheet(ws)
+            cancel_token.raise_if_cancelled()
+            self._format_worksheet(ws, cancel_token)
+
+        if embed_fingerprints:
+            cancel_token.raise_if_cancelled()
+            WorkbookFingerprint().embed(workbook, prefilled_rows=prefilled_rows)
 
-        workbook.save(file_path)
+        cancel_token.raise_if_cancelled()
+        try:
+            workbook.save(file_path)
+        except BaseException:
+            if isinstance(file_path, str) and os.path.exists(file_path):
+                os.remove(file_path)
+            raise
 
-    def _format_worksheet(self, ws: Worksheet):
+    def _format_worksheet(self, ws: Worksheet, cancel_token: Optional[CancellationToken] = None):
         """Apply formatting to a worksheet."""
         from datetime import datetime, date, time
 
+        cancel_token = cancel_token or CancellationToken.none()
+
         ws.page_setup.orientation = ws.ORIENTATION_LANDSCAPE
         ws.page_setup.paperSize = ws.PAPERSIZE_TABLOID
         ws.page_setup.fitToHeight = 0
@@ -213,6 +239,7 @@ class ExcelHandler:
 
         # First pass: Clean ALL datetime objects in the worksheet (Excel doesn't support timezones)
         for row in ws.iter_rows():
+            cancel_token.raise_if_cancelled()
             for cell in row:
                 if isinstance(cell.value, (datetime, time)):
                     if cell.value.tzinfo is not None:
@@ -309,17 +336,9 @@ class ExcelHandler:
             True if valid
         """
         sheet_names = workbook.sheetnames
-        valid_prefixes = [
-            SHEET_NAME_PL,
-            "FOAndConfigData",
-            SHEET_NAME_PM,
-            SHEET_NAME_GM,
-            "DataModel",
-            "ObjectDefinitions"
-        ]
 
         for name in sheet_names:
-            for prefix in valid_prefixes:
+            for prefix in WORKBOOK_SHEET_PREFIXES:
                 if name == prefix or name.startswith(prefix):
                     return True
 
@@ -0,0 +1,481 @@
+"""
+Translation Row Store Module
+
+Keeps the rows of a translations workbook in an indexed SQLite file, so
+they can be filtered, sorted and paged without loading the workbook.
+
+Every worksheet row is stored once (sheet, section, field id, default
+label and all cells) and each of its label cells again per locale, which
+makes "rows missing a German label" an index lookup. Pages are read with
+keyset pagination: the cursor holds the sort key of the last row, so
+page 1,000 costs the same as page 1.
+"""
+
+import base64
+import json
+import os
+import sqlite3
+from typing import List, Dict, Any, Optional, Iterator, Tuple
+
+from openpyxl import Workbook
+
+from ..core.label_index import normalize_locale
+from .workbook_fingerprint import FINGERPRINT_SHEET_NAME
+from .workbook_inspector import LANG_SUFFIX_PATTERN
+
+# Key columns by header, most specific first
+SECTION_HEADERS = ["Section", "Template Name", "Object", "FO/Config Name", "Reference"]
+FIELD_ID_HEADERS = ["Field Id", "Id", "Option ID", "Code", "Translatable Item/Field"]
+DEFAULT_LABEL_HEADERS = ["Default Label"]
+
+# Sort orders and the row column they sort by
+SORT_COLUMNS = {
+    'row': 'id',
+    'section': 'section',
+    'field_id': 'field_id',
+    'default_label': 'default_label'
+}
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+INSERT_BATCH_SIZE = 5000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sheets (
+    name TEXT PRIMARY KEY,
+    position INTEGER NOT NULL,
+    headers TEXT NOT NULL,
+    locales TEXT NOT NULL,
+    row_count INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS rows (
+    id INTEGER PRIMARY KEY,
+    sheet TEXT NOT NULL,
+    row_no INTEGER NOT NULL,
+    section TEXT NOT NULL DEFAULT '',
+    field_id TEXT NOT NULL DEFAULT '',
+    default_label TEXT NOT NULL DEFAULT '',
+    cells TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS labels (
+    row_id INTEGER NOT NULL,
+    locale TEXT NOT NULL,
+    value TEXT NOT NULL,
+    PRIMARY KEY (row_id, locale)
+) WITHOUT ROWID;
+"""
+
+INDEXES = """
+CREATE INDEX IF NOT EXISTS rows_by_sheet ON rows (sheet, id);
+CREATE INDEX IF NOT EXISTS rows_by_section ON rows (section, id);
+CREATE INDEX IF NOT EXISTS rows_by_field_id ON rows (field_id, id);
+CREATE INDEX IF NOT EXISTS rows_by_default_label ON rows (default_label, id);
+CREATE INDEX IF NOT EXISTS labels_by_locale ON labels (locale, value, row_id);
+"""
+
+
+def _text(value: Any) -> str:
+    return "" if value is None else str(value)
+
+
+def _find_column(headers: List[str], candidates: List[str]) -> Optional[int]:
+    for name in candidates:
+        if name in headers:
+            return headers.index(name)
+    return None
+
+
+def label_columns(sheet_name: str, headers: List[str]) -> Dict[int, str]:
+    """
+    Find the label columns of a sheet and their locales.
+
+    A label column's locale comes from its header ("Label in German
+    (de_DE)") or, on per-language sheets, from the sheet name.
+
+    Returns:
+        {column index: locale}
+    """
+    sheet_match = LANG_SUFFIX_PATTERN.search(sheet_name)
+    columns = {}
+    for index, header in enumerate(headers):
+        if not header or header == "Label Key":
+            continue
+        if not (header.startswith("Label") or header.startswith("Option Label")):
+            continue
+        match = LANG_SUFFIX_PATTERN.search(header) or sheet_match
+        if match:
+            columns[index] = normalize_locale(match.group(1))
+    return columns
+
+
+def encode_cursor(sort: str, values: list) -> str:
+    """Encode the sort key of the last row; the sort order is kept with it."""
+    return base64.urlsafe_b64encode(json.dumps([sort] + values).encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str, sort: str) -> list:
+    """
+    Decode a cursor of encode_cursor() for the given sort order.
+
+    Returns:
+        [id] for 'row', [value, id] for the other sort orders
+
+    Raises:
+        ValueError: If the cursor is malformed or from another sort order
+    """
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+    except (ValueError, TypeError):
+        raise ValueError("Invalid cursor")
+    if not isinstance(values, list) or not values or values[0] != sort:
+        raise ValueError("Invalid cursor")
+    values = values[1:]
+    types = [int] if SORT_COLUMNS.get(sort) == 'id' else [str, int]
+    if len(values) != len(types) or not all(
+        type(value) is expected for value, expected in zip(values, types)
+    ):
+        raise ValueError("Invalid cursor")
+    return values
+
+
+class TranslationRowStore:
+    """
+    SQLite store of translation workbook rows.
+
+    Usage:
+        store = TranslationRowStore.create(path)
+        store.add_workbook(workbook)
+        store.close()
+
+        store = TranslationRowStore.open(path)
+        page = store.query(sheet="DataModel (de-DE)", missing_locale="de_DE")
+    """
+
+    def __init__(self, connection: sqlite3.Connection):
+        self.connection = connection
+        self.connection.row_factory = sqlite3.Row
+
+    @classmethod
+    def create(cls, path: str) -> "TranslationRowStore":
+        """Create an empty store (replacing an existing file)."""
+        if os.path.exists(path):
+            os.remove(path)
+        connection = sqlite3.connect(path)
+        connection.execute("PRAGMA journal_mode=OFF")
+        connection.execute("PRAGMA synchronous=OFF")
+        connection.executescript(SCHEMA)
+        return cls(connection)
+
+    @classmethod
+    def open(cls, path: str) -> "TranslationRowStore":
+        """Open an existing store read-only."""
+        if not os.path.exists(path):
+            raise FileNotFoundError(path)
+        connection = sqlite3.connect(f"file:{path}?mode=ro", uri=True, check_same_thread=False)
+        return cls(connection)
+
+    def close(self):
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # =========================================================================
+    # WRITING
+    # =========================================================================
+
+    def add_workbook(self, workbook: Workbook) -> int:
+        """
+        Store all rows of a workbook's visible sheets, then build the indexes.
+
+        Hidden sheets (e.g. the export fingerprints) are not translations.
+
+        Returns:
+            Number of rows stored
+        """
+        total = 0
+        worksheets = [
+            ws for ws in workbook.worksheets
+            if getattr(ws, 'sheet_state', 'visible') == 'visible' and ws.title != FINGERPRINT_SHEET_NAME
+        ]
+        for position, worksheet in enumerate(worksheets):
+            rows = worksheet.iter_rows(values_only=True)
+            headers = [_text(h) for h in next(rows, ())]
+            total += self.add_sheet(worksheet.title, headers, rows, position)
+        self.connection.executescript(INDEXES)
+        self.connection.execute("ANALYZE")
+        self.connection.commit()
+        return total
+
+    def add_sheet(
+        self,
+        name: str,
+        headers: List[str],
+        rows: Iterator[tuple],
+        position: Optional[int] = None
+    ) -> int:
+        """
+        Store the data rows of one sheet.
+
+        Args:
+            name: Sheet name
+            headers: Header row
+            rows: Data rows (values)
+            position: Sheet order (default: after the last sheet)
+
+        Returns:
+            Number of rows stored
+        """
+        if position is None:
+            position = self.connection.execute("SELECT COUNT(*) FROM sheets").fetchone()[0]
+        locales = label_columns(name, headers)
+        section_col = _find_column(headers, SECTION_HEADERS)
+        field_col = _find_column(headers, FIELD_ID_HEADERS)
+        label_col = _find_column(headers, DEFAULT_LABEL_HEADERS)
+        if section_col is None:
+            section_col = 0
+
+        next_id = self.connection.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM rows").fetchone()[0]
+        row_batch, label_batch = [], []
+        count = 0
+        for row_no, values in enumerate(rows, start=2):
+            if not any(v is not None and v != "" for v in values):
+                continue
+            cells = [_text(v) for v in values]
+
+            def cell(index):
+                return cells[index] if index is not None and index < len(cells) else ""
+
+            row_id = next_id + count
+            row_batch.append((
+                row_id, name, row_no, cell(section_col), cell(field_col),
+                cell(label_col), json.dumps(cells, ensure_ascii=False)
+            ))
+            for index, locale in locales.items():
+                label_batch.append((row_id, locale, cell(index)))
+            count += 1
+
+            if len(row_batch) >= INSERT_BATCH_SIZE:
+                self._insert(row_batch, label_batch)
+                row_batch, label_batch = [], []
+        self._insert(row_batch, label_batch)
+
+        self.connection.execute(
+            "INSERT OR REPLACE INTO sheets (name, position, headers, locales, row_count) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (name, position, json.dumps(headers), json.dumps(sorted(set(locales.values()))), count)
+        )
+        return count
+
+    def _insert(self, rows: list, labels: list):
+        if rows:
+            self.connection.executemany(
+                "INSERT INTO rows (id, sheet, row_no, section, field_id, default_label, cells) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)", rows
+            )
+        if labels:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO labels (row_id, locale, value) VALUES (?, ?, ?)", labels
+            )
+
+    # =========================================================================
+    # READING
+    # =========================================================================
+
+    def sheets(self) -> List[Dict[str, Any]]:
+        """Get the sheets with headers, locales and row counts, in order."""
+        return [
+            {
+                'name': row['name'],
+                'headers': json.loads(row['headers']),
+                'locales': json.loads(row['locales']),
+                'row_count': row['row_count']
+            }
+            for row in self.connection.execute("SELECT * FROM sheets ORDER BY position")
+        ]
+
+    def _where(
+        self,
+        sheet: Optional[str],
+        section: Optional[str],
+        field_id: Optional[str],
+        locale: Optional[str],
+        missing_locale: Optional[str],
+        search: Optional[str]
+    ) -> Tuple[List[str], list]:
+        clauses, params = [], []
+        if sheet:
+            clauses.append("r.sheet = ?")
+            params.append(sheet)
+        if section:
+            clauses.append("r.section = ?")
+            params.append(section)
+        if field_id:
+            clauses.append("r.field_id = ?")
+            params.append(field_id)
+        if locale:
+            clauses.append("EXISTS (SELECT 1 FROM labels l WHERE l.row_id = r.id AND l.locale = ?)")
+            params.append(normalize_locale(locale))
+        if missing_locale:
+            clauses.append(
+                "EXISTS (SELECT 1 FROM labels l WHERE l.row_id = r.id AND l.locale = ? AND l.value = '')"
+            )
+            params.append(normalize_locale(missing_locale))
+        if search:
+            escaped = search.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            clauses.append("(r.default_label LIKE ? ESCAPE '\\' OR r.field_id LIKE ? ESCAPE '\\')")
+            params.extend([f"%{escaped}%"] * 2)
+        return clauses, params
+
+    def iter_rows(
+        self,
+        sheet: str = None,
+        section: str = None,
+        field_id: str = None,
+        locale: str = None,
+        missing_locale: str = None,
+        search: str = None,
+        sort: str = 'row',
+        descending: bool = False,
+        cursor: str = None,
+        limit: int = None
+    ) -> Iterator[sqlite3.Row]:
+        """Iterate matching rows in sort order (see query())."""
+        column = SORT_COLUMNS.get(sort)
+        if column is None:
+            raise ValueError(f"Unknown sort: {sort}")
+
+        clauses, params = self._where(sheet, section, field_id, locale, missing_locale, search)
+        direction = "DESC" if descending else "ASC"
+        if cursor:
+            values = decode_cursor(cursor, sort)
+            compare = "<" if descending else ">"
+            if column == 'id':
+                clauses.append(f"r.id {compare} ?")
+            else:
+                clauses.append(f"(r.{column}, r.id) {compare} (?, ?)")
+            params.extend(values)
+
+        order = f"r.id {direction}" if column == 'id' else f"r.{column} {direction}, r.id {direction}"
+        sql = "SELECT r.* FROM rows r"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += f" ORDER BY {order}"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return iter(self.connection.execute(sql, params))
+
+    def query(
+        self,
+        sheet: str = None,
+        section: str = None,
+        field_id: str = None,
+        locale: str = None,
+        missing_locale: str = None,
+        search: str = None,
+        sort: str = 'row',
+        descending: bool = False,
+        cursor: str = None,
+        limit: int = DEFAULT_PAGE_SIZE
+    ) -> Dict[str, Any]:
+        """
+        Get one page of rows.
+
+        Args:
+            sheet: Only rows of this sheet
+            section: Only rows of this section
+            field_id: Only rows of this field
+            locale: Only rows with a label column for this locale
+            missing_locale: Only rows whose label for this locale is empty
+            search: Substring of the default label or field id
+            sort: 'row' (workbook order), 'section', 'field_id' or 'default_label'
+            descending: Reverse the sort order
+            cursor: next_cursor of the previous page
+            limit: Rows per page (at most MAX_PAGE_SIZE)
+
+        Returns:
+            Dict with rows and next_cursor (None on the last page)
+
+        Raises:
+            ValueError: If sort or cursor is invalid
+        """
+        limit = max(1, min(int(limit), MAX_PAGE_SIZE))
+        rows = list(self.iter_rows(
+            sheet, section, field_id, locale, missing_locale, search,
+            sort, descending, cursor, limit + 1
+        ))
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+
+        labels: Dict[int, Dict[str, str]] = {row['id']: {} for row in rows}
+        if rows:
+            placeholders = ",".join("?" * len(rows))
+            for label in self.connection.execute(
+                f"SELECT row_id, locale, value FROM labels WHERE row_id IN ({placeholders})",
+                [row['id'] for row in rows]
+            ):
+                labels[label['row_id']][label['locale']] = label['value']
+
+        next_cursor = None
+        if has_more:
+            last = rows[-1]
+            column = SORT_COLUMNS[sort]
+            next_cursor = encode_cursor(sort, [last['id']] if column == 'id' else [last[column], last['id']])
+
+        return {
+            'rows': [
+                {
+                    'id': row['id'],
+                    'sheet': row['sheet'],
+                    'row': row['row_no'],
+                    'section': row['section'],
+                    'field_id': row['field_id'],
+                    'default_label': row['default_label'],
+                    'labels': labels[row['id']],
+                    'cells': json.loads(row['cells'])
+                }
+                for row in rows
+            ],
+            'next_cursor': next_cursor
+        }
+
+    def count(self, **filters) -> int:
+        """Count rows matching filters (as for query())."""
+        clauses, params = self._where(
+            filters.get('sheet'), filters.get('section'), filters.get('field_id'),
+            filters.get('locale'), filters.get('missing_locale'), filters.get('search')
+        )
+        sql = "SELECT COUNT(*) FROM rows r"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        return self.connection.execute(sql, params).fetchone()[0]
+
+    def write_workbook(self, path: str, **filters) -> int:
+        """
+        Write matching rows to an xlsx file, one sheet per stored sheet.
+
+        Args:
+            path: Output path
+            **filters: Filters as for query() (without cursor and limit)
+
+        Returns:
+            Number of rows written
+        """
+        workbook = Workbook(write_only=True)
+        written = 0
+        for sheet in self.sheets():
+            if filters.get('sheet') and filters['sheet'] != sheet['name']:
+                continue
+            worksheet = workbook.create_sheet(sheet['name'])
+            worksheet.append(sheet['headers'])
+            for row in self.iter_rows(**{**filters, 'sheet': sheet['name']}):
+                worksheet.append(json.loads(row['cells']))
+                written += 1
+        if not workbook.worksheets:
+            workbook.create_sheet("Empty")
+        workbook.save(path)
+        return written
@@ -0,0 +1,174 @@
+"""
+Workbook Fingerprint Module
+
+Embeds per-row fingerprints of exported worksheets in a hidden sheet so
+the importer can tell which rows were edited after export.
+
+Rows whose translations were pre-filled by the export (e.g. from the
+standard model) hold values the model does not have yet, so they are
+fingerprinted as always changed and are imported even if not edited.
+"""
+
+import base64
+import hashlib
+from typing import List, Dict, Optional, Set, Any, Iterable, Collection
+
+from openpyxl import Workbook
+from openpyxl.worksheet.worksheet import Worksheet
+
+from ..config import WORKBOOK_PASSWORD
+
+FINGERPRINT_SHEET_NAME = "_TreximaFingerprints"
+FINGERPRINT_VERSION = "1"
+ROW_DIGEST_SIZE = 8
+# Base64 characters per cell; a multiple of 4 keeps chunks independently decodable
+CHUNK_CHARS = 32000
+VALUE_SEPARATOR = "\x1f"
+# Digest of pre-filled rows; never equal to a row_digest() in practice
+PREFILLED_DIGEST = bytes(ROW_DIGEST_SIZE)
+
+
+def row_digest(values: Iterable[Any]) -> bytes:
+    """Hash the values of one row (None and "" are treated alike)."""
+    text = VALUE_SEPARATOR.join("" if v is None else str(v) for v in values)
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=ROW_DIGEST_SIZE).digest()
+
+
+class SheetFingerprint:
+    """Row digests of one worksheet as it was exported."""
+
+    def __init__(self, sheet_name: str, width: int, digest: str, row_digests: List[bytes]):
+        self.sheet_name = sheet_name
+        self.width = width
+        self.digest = digest
+        self.row_digests = row_digests
+
+    @classmethod
+    def from_worksheet(
+        cls,
+        ws: Worksheet,
+        prefilled_rows: Collection[int] = ()
+    ) -> "SheetFingerprint":
+        """
+        Fingerprint the data rows (row 2 onwards) of a worksheet.
+
+        Args:
+            ws: Worksheet as exported
+            prefilled_rows: Row numbers to mark as always changed
+        """
+        width = ws.max_column
+        row_digests = [
+            PREFILLED_DIGEST if row_num in prefilled_rows else row_digest(values)
+            for row_num, values in enumerate(
+                ws.iter_rows(min_row=2, max_col=width, values_only=True), start=2
+            )
+        ]
+        return cls(ws.title, width, cls._sheet_digest(row_digests), row_digests)
+
+    @staticmethod
+    def _sheet_digest(row_digests: List[bytes]) -> str:
+        return hashlib.blake2b(b"".join(row_digests), digest_size=16).hexdigest()
+
+    def changed_rows(self, ws: Worksheet) -> Set[int]:
+        """
+        Get the row numbers whose values differ from the export.
+
+        Rows past the exported range and pre-filled rows count as changed.
+        """
+        changed = set()
+        exported = len(self.row_digests)
+        for index, values in enumerate(
+            ws.iter_rows(min_row=2, max_col=self.width, values_only=True)
+        ):
+            if (index >= exported
+                    or self.row_digests[index] == PREFILLED_DIGEST
+                    or row_digest(values) != self.row_digests[index]):
+                changed.add(index + 2)
+        return changed
+
+    def to_row(self) -> List[Any]:
+        """Serialize to a fingerprint sheet row."""
+        encoded = base64.b64encode(b"".join(self.row_digests)).decode("ascii")
+        chunks = [
+            encoded[i:i + CHUNK_CHARS] for i in range(0, len(encoded), CHUNK_CHARS)
+        ]
+        return [self.sheet_name, self.width, self.digest, len(self.row_digests)] + chunks
+
+    @classmethod
+    def from_row(cls, values: List[Any]) -> Optional["SheetFingerprint"]:
+        """Deserialize from a fingerprint sheet row."""
+        try:
+            sheet_name, width, digest, row_count = values[:4]
+            width, row_count = int(width), int(row_count)
+            raw = base64.b64decode("".join(v for v in values[4:] if v))
+        except (ValueError, TypeError):
+            return None
+
+        row_digests = [
+            raw[i:i + ROW_DIGEST_SIZE] for i in range(0, len(raw), ROW_DIGEST_SIZE)
+        ]
+        if len(row_digests) != row_count or cls._sheet_digest(row_digests) != digest:
+            return None
+        return cls(sheet_name, width, digest, row_digests)
+
+
+class WorkbookFingerprint:
+    """Writes and reads the hidden fingerprint sheet."""
+
+    def embed(
+        self,
+        workbook: Workbook,
+        sheet_names: Optional[List[str]] = None,
+        prefilled_rows: Optional[Dict[str, Set[int]]] = None
+    ):
+        """
+        Fingerprint worksheets into a very hidden, protected sheet.
+
+        Args:
+            workbook: Workbook about to be saved
+            sheet_names: Sheets to fingerprint (default: all data sheets)
+            prefilled_rows: Pre-filled row numbers by sheet name
+        """
+        prefilled_rows = prefilled_rows or {}
+        if FINGERPRINT_SHEET_NAME in workbook.sheetnames:
+            del workbook[FINGERPRINT_SHEET_NAME]
+
+        if sheet_names is None:
+            sheet_names = list(workbook.sheetnames)
+
+        fingerprints = [
+            SheetFingerprint.from_worksheet(workbook[name], prefilled_rows.get(name, ()))
+            for name in sheet_names
+        ]
+
+        ws = workbook.create_sheet(FINGERPRINT_SHEET_NAME)
+        ws.append(["Sheet", "Width", "Digest", "Rows", FINGERPRINT_VERSION])
+        for fingerprint in fingerprints:
+            ws.append(fingerprint.to_row())
+
+        ws.sheet_state = "veryHidden"
+        ws.protection.password = WORKBOOK_PASSWORD
+        ws.protection.sheet = True
+
+    def load(self, workbook: Workbook) -> Dict[str, SheetFingerprint]:
+        """
+        Read fingerprints from a workbook.
+
+        Returns:
+            Dict of sheet name to fingerprint (empty if none or unreadable)
+        """
+        if FINGERPRINT_SHEET_NAME not in workbook.sheetnames:
+            return {}
+
+        ws = workbook[FINGERPRINT_SHEET_NAME]
+        rows = ws.iter_rows(values_only=True)
+        header = next(rows, None)
+        if not header or len(header) < 5 or str(header[4]) != FINGERPRINT_VERSION:
+            return {}
+
+        fingerprints = {}
+        for values in rows:
+            fingerprint = SheetFingerprint.from_row(list(values))
+            if fingerprint:
+                fingerprints[fingerprint.sheet_name] = fingerprint
+        return fingerprints
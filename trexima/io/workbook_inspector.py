@@ -0,0 +1,258 @@
+"""
+Workbook Inspector Module
+
+Reads sheet names, header rows and dimensions straight from the xlsx
+package, without loading the workbook.
+"""
+
+import posixpath
+import re
+import zipfile
+from typing import List, Dict, Optional, Set, Any, BinaryIO, Union
+from xml.etree import ElementTree
+
+from ..config import SHEET_NAME_PM, SHEET_NAME_GM, WORKBOOK_SHEET_PREFIXES
+from ..models.datamodel import SheetSummary, WorkbookSummary
+
+NS_MAIN = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+NS_REL = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+NS_PKG_REL = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+
+WORKBOOK_PART = "xl/workbook.xml"
+WORKBOOK_RELS_PART = "xl/_rels/workbook.xml.rels"
+SHARED_STRINGS_PART = "xl/sharedStrings.xml"
+
+# "DataModel (de-DE)", "Label in German (de_DE)"
+LANG_SUFFIX_PATTERN = re.compile(r"\(([A-Za-z]{2,3}(?:[-_][A-Za-z0-9]+)*)\)\s*$")
+CELL_REF_PATTERN = re.compile(r"([A-Z]+)(\d+)")
+
+
+def _column_index(cell_ref: str) -> int:
+    """
+    Convert a cell reference like 'C1' to a 1-based column index.
+
+    Raises:
+        ValueError: If cell_ref is not a cell reference
+    """
+    match = CELL_REF_PATTERN.match(cell_ref)
+    if not match:
+        raise ValueError(f"Invalid cell reference '{cell_ref}'")
+    index = 0
+    for char in match.group(1):
+        index = index * 26 + (ord(char) - 64)
+    return index
+
+
+def _max_row_from_dimension(ref: str) -> Optional[int]:
+    """Get the last row number from a dimension ref like 'A1:H1200'."""
+    last = ref.split(":")[-1]
+    match = CELL_REF_PATTERN.match(last)
+    return int(match.group(2)) if match else None
+
+
+class WorkbookInspector:
+    """
+    Header-only reader for translation workbooks.
+
+    Only xl/workbook.xml, its relationships, the <dimension> and first row
+    of each worksheet, and the shared strings those header cells reference
+    are parsed. Cost is independent of the number of data rows.
+    """
+
+    def __init__(self, valid_prefixes: Optional[List[str]] = None):
+        self.valid_prefixes = valid_prefixes or WORKBOOK_SHEET_PREFIXES
+
+    def inspect(self, source: Union[str, BinaryIO]) -> WorkbookSummary:
+        """
+        Inspect a workbook.
+
+        Args:
+            source: Path or seekable binary stream of an .xlsx file
+
+        Returns:
+            WorkbookSummary with sheets, languages, row counts and errors
+        """
+        try:
+            archive = zipfile.ZipFile(source)
+        except (zipfile.BadZipFile, OSError) as e:
+            return WorkbookSummary(valid=False, errors=[f"Not a valid xlsx file: {e}"])
+
+        with archive:
+            try:
+                return self._inspect_archive(archive)
+            except (KeyError, ValueError, ElementTree.ParseError, zipfile.BadZipFile) as e:
+                return WorkbookSummary(valid=False, errors=[f"Corrupt workbook: {e}"])
+
+    def _inspect_archive(self, archive: zipfile.ZipFile) -> WorkbookSummary:
+        """Inspect an opened xlsx package."""
+        names = set(archive.namelist())
+        if WORKBOOK_PART not in names:
+            return WorkbookSummary(valid=False, errors=["Missing xl/workbook.xml"])
+
+        sheet_parts = self._read_sheet_parts(archive)
+        summary = WorkbookSummary(valid=True)
+        header_cells: Dict[str, Dict[int, Any]] = {}
+
+        for name, state, part in sheet_parts:
+            sheet = SheetSummary(name=name, state=state)
+            summary.sheets.append(sheet)
+
+            if part is None or part not in names:
+                summary.errors.append(f"Worksheet '{name}' has no sheet data")
+                continue
+
+            sheet.max_row, header_cells[name] = self._read_header_row(archive, part)
+
+        # Resolve shared strings referenced by header cells
+        needed = {
+            value[1] for cells in header_cells.values()
+            for value in cells.values() if value[0] == "s"
+        }
+        shared = self._read_shared_strings(archive, needed) if needed else {}
+
+        for sheet in summary.sheets:
+            cells = header_cells.get(sheet.name, {})
+            width = max(cells) if cells else 0
+            headers: List[Optional[str]] = [None] * width
+            for col, (kind, value) in cells.items():
+                headers[col - 1] = shared.get(value) if kind == "s" else value
+            sheet.headers = headers
+            sheet.languages = self._detect_languages(sheet)
+
+        self._validate(summary)
+        return summary
+
+    def _read_sheet_parts(self, archive: zipfile.ZipFile) -> List[tuple]:
+        """Get (name, state, part path) for each sheet in workbook order."""
+        targets = {}
+        try:
+            with archive.open(WORKBOOK_RELS_PART) as f:
+                for rel in ElementTree.parse(f).getroot().iter(f"{NS_PKG_REL}Relationship"):
+                    target = rel.get("Target", "")
+                    if target.startswith("/"):
+                        target = target.lstrip("/")
+                    else:
+                        target = posixpath.normpath(posixpath.join("xl", target))
+                    targets[rel.get("Id")] = target
+        except KeyError:
+            pass
+
+        sheets = []
+        with archive.open(WORKBOOK_PART) as f:
+            for sheet in ElementTree.parse(f).getroot().iter(f"{NS_MAIN}sheet"):
+                sheets.append((
+                    sheet.get("name"),
+                    sheet.get("state", "visible"),
+                    targets.get(sheet.get(f"{NS_REL}id"))
+                ))
+        return sheets
+
+    def _read_header_row(self, archive: zipfile.ZipFile, part: str) -> tuple:
+        """
+        Read the dimension and first row of a worksheet.
+
+        Cells without a reference (it is optional) take the column after
+        the previous cell.
+
+        Returns:
+            (max_row, {column: (kind, value)}) where kind "s" marks a
+            shared string index still to be resolved
+
+        Raises:
+            ValueError: If a cell has an invalid reference or value
+        """
+        max_row = None
+        cells: Dict[int, Any] = {}
+        col = 0
+
+        with archive.open(part) as f:
+            for event, elem in ElementTree.iterparse(f, events=("start", "end")):
+                if event == "start":
+                    if elem.tag == f"{NS_MAIN}dimension":
+                        max_row = _max_row_from_dimension(elem.get("ref", ""))
+                    continue
+
+                if elem.tag == f"{NS_MAIN}c":
+                    ref = elem.get("r")
+                    col = _column_index(ref) if ref else col + 1
+                    cell_type = elem.get("t")
+                    if cell_type == "s":
+                        v = elem.find(f"{NS_MAIN}v")
+                        if v is not None and v.text is not None:
+                            cells[col] = ("s", int(v.text))
+                    elif cell_type == "inlineStr":
+                        text = "".join(t.text or "" for t in elem.iter(f"{NS_MAIN}t"))
+                        cells[col] = ("v", text)
+                    else:
+                        v = elem.find(f"{NS_MAIN}v")
+                        if v is not None:
+                            cells[col] = ("v", v.text)
+                elif elem.tag == f"{NS_MAIN}row":
+                    # Only the first row is needed
+                    break
+
+        return max_row, cells
+
+    def _read_shared_strings(self, archive: zipfile.ZipFile, needed: Set[int]) -> Dict[int, str]:
+        """Read shared strings up to the highest index needed."""
+        strings: Dict[int, str] = {}
+        last_needed = max(needed)
+        index = 0
+
+        try:
+            with archive.open(SHARED_STRINGS_PART) as f:
+                for event, elem in ElementTree.iterparse(f, events=("end",)):
+                    if elem.tag != f"{NS_MAIN}si":
+                        continue
+                    if index in needed:
+                        # Skip phonetic runs; keep plain and rich text runs
+                        parts = [elem.findtext(f"{NS_MAIN}t") or ""]
+                        for run in elem.iterfind(f"{NS_MAIN}r"):
+                            parts.append(run.findtext(f"{NS_MAIN}t") or "")
+                        strings[index] = "".join(parts)
+                    elem.clear()
+                    if index >= last_needed:
+                        break
+                    index += 1
+        except KeyError:
+            pass
+
+        return strings
+
+    def _detect_languages(self, sheet: SheetSummary) -> List[str]:
+        """Detect languages from a per-language sheet name or its header row."""
+        match = LANG_SUFFIX_PATTERN.search(sheet.name)
+        if match:
+            return [match.group(1)]
+
+        languages = []
+        for header in sheet.headers:
+            if not header:
+                continue
+            match = LANG_SUFFIX_PATTERN.search(header)
+            if match and match.group(1) not in languages:
+                languages.append(match.group(1))
+        return languages
+
+    def is_translation_sheet(self, name: str) -> bool:
+        """Check whether a sheet name belongs to a translations workbook."""
+        return any(name.startswith(prefix) for prefix in self.valid_prefixes)
+
+    def _validate(self, summary: WorkbookSummary):
+        """Add structural errors and set the valid flag."""
+        translation_sheets = [
+            s for s in summary.sheets
+            if s.state == "visible" and self.is_translation_sheet(s.name)
+        ]
+        if not translation_sheets:
+            summary.errors.append("No translation worksheets found")
+
+        for sheet in translation_sheets:
+            if not any(sheet.headers):
+                summary.errors.append(f"Worksheet '{sheet.name}' has no header row")
+            elif sheet.name.startswith("DataModel") and not sheet.languages:
+                summary.errors.append(f"Worksheet '{sheet.name}' has no language in its name")
+            elif sheet.name in (SHEET_NAME_PM, SHEET_NAME_GM) and not sheet.languages:
+                summary.errors.append(f"Worksheet '{sheet.name}' has no language columns")
+
+        summary.valid = not summary.errors
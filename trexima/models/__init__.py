@@ -13,7 +13,9 @@ from .datamodel import (
     PicklistOption,
     LabelKeyEntry,
     ExportResult,
-    ImportResult
+    ImportResult,
+    SheetSummary,
+    WorkbookSummary
 )
 
 __all__ = [
@@ -25,5 +27,7 @@ __all__ = [
     'PicklistOption',
     'LabelKeyEntry',
     'ExportResult',
-    'ImportResult'
+    'ImportResult',
+    'SheetSummary',
+    'WorkbookSummary'
 ]
@@ -229,3 +229,46 @@ class ImportResult:
     error_message: Optional[str] = None
     changes_made: int = 0
     log_file_path: Optional[str] = None
+    change_log_path: Optional[str] = None
+
+
+@dataclass
+class SheetSummary:
+    """Header-level summary of one worksheet."""
+
+    name: str
+    state: str = "visible"
+    max_row: Optional[int] = None
+    headers: List[Optional[str]] = field(default_factory=list)
+    languages: List[str] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "state": self.state,
+            "max_row": self.max_row,
+            "headers": self.headers,
+            "languages": self.languages
+        }
+
+
+@dataclass
+class WorkbookSummary:
+    """Result of a header-only workbook inspection."""
+
+    valid: bool
+    sheets: List[SheetSummary] = field(default_factory=list)
+    errors: List[str] = field(default_factory=list)
+
+    @property
+    def sheet_names(self) -> List[str]:
+        return [sheet.name for sheet in self.sheets]
+
+    @property
+    def languages(self) -> List[str]:
+        languages = []
+        for sheet in self.sheets:
+            for lang in sheet.languages:
+                if lang not in languages:
+                    languages.append(lang)
+        return languages
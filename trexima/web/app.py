@@ -171,6 +171,14 @@ def create_app(config=None, testing=False):
     from trexima.web.storage import init_storage
     storage = init_storage(app)
 
+    # Keep storage usage counters in step with file rows
+    from trexima.web.storage_usage import init_storage_usage
+    init_storage_usage(app)
+
+    # Bump project versions (listing ETags) as projects change
+    from trexima.web.models import init_project_versions
+    init_project_versions(app)
+
     # Initialize authentication
     from trexima.web.auth import init_auth
     auth_config = init_auth(app)
@@ -195,6 +203,15 @@ def create_app(config=None, testing=False):
         else:
             logger.info("Migrations directory found - use 'flask db upgrade' for schema changes")
 
+    # ==========================================================================
+    # JOB EXECUTOR
+    # ==========================================================================
+    # Export/import jobs run in worker processes so the eventlet loop stays
+    # responsive; JOB_WORKERS=0 runs them as background tasks instead
+
+    from trexima.web.jobs import init_jobs
+    job_executor = init_jobs(app)
+
     # ==========================================================================
     # REGISTER BLUEPRINTS
     # ==========================================================================
@@ -346,6 +363,13 @@ def create_app(config=None, testing=False):
         # Check auth
         health['checks']['auth'] = 'ok' if auth_config.is_initialized else 'not configured'
 
+        # Check job executor
+        if job_executor is not None:
+            executor_status = job_executor.status()
+            health['checks']['jobs'] = executor_status
+            if not job_executor.inline and executor_status['alive'] == 0:
+                health['status'] = 'degraded'
+
         status_code = 200 if health['status'] == 'healthy' else 503
         return jsonify(health), status_code
 
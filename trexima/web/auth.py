@@ -3,13 +3,21 @@ TREXIMA v2.0 - Authentication Module
 
 SAP BTP XSUAA integration for user authentication.
 Handles JWT token validation and user context.
+
+Validated tokens are cached (by SHA-256 of the token) until they expire,
+so repeated requests with the same token skip signature verification.
 """
 
+from collections import OrderedDict
 from functools import wraps
 from flask import request, jsonify, g, current_app
+import base64
+import hashlib
 import os
 import json
 import logging
+import threading
+import time
 from typing import Optional, Dict, Any, Callable
 from datetime import datetime
 
@@ -133,8 +141,95 @@ class UserContext:
         return scope in self.scopes
 
 
+# =============================================================================
+# TOKEN CACHE
+# =============================================================================
+
+# Default number of validated tokens kept (AUTH_TOKEN_CACHE_SIZE, 0 disables)
+TOKEN_CACHE_SIZE = 1024
+
+
+def _token_expiry(token: str) -> Optional[float]:
+    """Get the exp claim (epoch seconds) of a JWT without verifying it."""
+    try:
+        payload = token.split('.')[1]
+        payload += '=' * (-len(payload) % 4)
+        exp = json.loads(base64.urlsafe_b64decode(payload)).get('exp')
+        return float(exp) if exp is not None else None
+    except (IndexError, ValueError, TypeError, AttributeError):
+        return None
+
+
+class TokenCache:
+    """Bounded LRU cache of validated tokens, each expiring with its token."""
+
+    def __init__(self, max_size: int = TOKEN_CACHE_SIZE):
+        self.max_size = max_size
+        self._entries: 'OrderedDict[str, tuple]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(token: str) -> str:
+        return hashlib.sha256(token.encode('utf-8')).hexdigest()
+
+    def get(self, token: str) -> Optional['UserContext']:
+        """Get the cached context of a token, or None if missing or expired."""
+        key = self.key(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, context = entry
+            if expires_at <= time.time():
+                del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return context
+
+    def put(self, token: str, context: 'UserContext'):
+        """Cache a validated context until the token's exp claim."""
+        if self.max_size <= 0:
+            return
+        expires_at = _token_expiry(token)
+        if expires_at is None or expires_at <= time.time():
+            return  # Without exp a token is never cached
+        key = self.key(token)
+        with self._lock:
+            self._entries[key] = (expires_at, context)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'max_size': self.max_size,
+                'hits': self.hits,
+                'misses': self.misses
+            }
+
+
+token_cache = TokenCache()
+
+
 def init_auth(app):
     """Initialize authentication with Flask app."""
+    token_cache.max_size = int(app.config.get(
+        'AUTH_TOKEN_CACHE_SIZE',
+        os.environ.get('AUTH_TOKEN_CACHE_SIZE', TOKEN_CACHE_SIZE)
+    ))
+    token_cache.clear()
+
     # Try to initialize from VCAP_SERVICES
     if not auth_config.init_from_vcap():
         # Check for development mode
@@ -170,6 +265,9 @@ def validate_token(token: str) -> Optional[UserContext]:
     """
     Validate JWT token and return user context.
 
+    Valid tokens are cached until their exp claim; a cached token is not
+    verified again.
+
     Args:
         token: JWT token string
 
@@ -179,6 +277,18 @@ def validate_token(token: str) -> Optional[UserContext]:
     if not token:
         return None
 
+    context = token_cache.get(token)
+    if context is not None:
+        return context
+
+    context = _validate_token(token)
+    if context is not None:
+        token_cache.put(token, context)
+    return context
+
+
+def _validate_token(token: str) -> Optional[UserContext]:
+    """Validate a token that is not cached."""
     # Use SAP XSSEC if available
     if XSSEC_AVAILABLE and auth_config.is_initialized:
         try:
@@ -0,0 +1,116 @@
+"""
+TREXIMA v2.0 - Blob References
+
+Uploaded files are stored once per content (see
+ObjectStorageService.store_blob) and shared by every ProjectFile with the
+same content_hash. A blob is deleted when its last ProjectFile goes,
+together with its label index.
+
+Counting references and deleting the blob are not atomic, so an upload
+that deduplicates against a blob can race its release. Both sides act
+after their commit and check again:
+
+- release_files() moves an unreferenced blob aside, counts again and
+  moves it back if a reference appeared meanwhile;
+- an upload calls ensure_blobs() after committing its rows and stores
+  the content again if the blob is gone.
+
+Whatever the interleaving, a committed reference ends up with its blob.
+"""
+
+import logging
+import uuid
+from typing import BinaryIO, Iterable, List, Optional, Tuple
+
+from trexima.web.models import ProjectFile
+from trexima.web.storage import storage_service
+from trexima.web.label_search import label_index_key
+
+logger = logging.getLogger(__name__)
+
+# (storage_key, content_hash) of a deleted ProjectFile
+FileRef = Tuple[str, Optional[str]]
+
+# Unreferenced blobs are moved here before they are deleted; leftovers of
+# an interrupted release are removed by the orphan scan
+RELEASED_PREFIX = 'blobs/released/'
+
+
+def file_refs(files: Iterable[ProjectFile]) -> List[FileRef]:
+    """Capture what release_files() needs before the rows are deleted."""
+    return [(f.storage_key, f.content_hash) for f in files]
+
+
+def _delete(storage_key: str, index_key: str) -> bool:
+    deleted = storage_service.delete_file(storage_key)
+    storage_service.delete_file(index_key)
+    return deleted
+
+
+def release_files(refs: Iterable[FileRef]) -> int:
+    """
+    Delete the blobs of deleted files that nothing refers to any more.
+
+    Call after the deletions are committed. Files uploaded before content
+    addressing (no content_hash) own their storage key and are always
+    deleted.
+
+    Args:
+        refs: File references from file_refs()
+
+    Returns:
+        Number of storage objects deleted
+    """
+    deleted = 0
+    for storage_key, content_hash in dict.fromkeys(refs):
+        try:
+            if not content_hash:
+                deleted += _delete(storage_key, label_index_key(storage_key))
+                continue
+            if ProjectFile.count_references(content_hash):
+                continue
+
+            released_key = f"{RELEASED_PREFIX}{uuid.uuid4().hex}"
+            try:
+                storage_service.move_file(storage_key, released_key)
+            except Exception:
+                if storage_service.file_exists(storage_key):
+                    raise
+                continue  # Released by someone else
+
+            # An upload may have committed a reference since the count
+            if ProjectFile.count_references(content_hash):
+                storage_service.move_file(released_key, storage_key)
+                logger.info(f"Blob {storage_key} was referenced again, kept")
+                continue
+
+            storage_service.delete_file(label_index_key(storage_key))
+            if storage_service.delete_file(released_key):
+                deleted += 1
+        except Exception as e:
+            logger.warning(f"Failed to delete blob {storage_key}: {e}")
+    return deleted
+
+
+def ensure_blobs(uploads: Iterable[Tuple[str, BinaryIO, Optional[str]]]) -> int:
+    """
+    Store the content of uploaded files again if their blob was released.
+
+    Call after the rows referring to the blobs are committed.
+
+    Args:
+        uploads: (blob key, seekable stream of the whole file, content
+            type) of files that were deduplicated
+
+    Returns:
+        Number of blobs stored again
+    """
+    restored = 0
+    for key, stream, content_type in uploads:
+        if storage_service.file_exists(key):
+            continue
+        logger.warning(f"Blob {key} was released during the upload, storing it again")
+        stream.seek(0)
+        storage_service.store_blob(stream, content_type)
+        restored += 1
+    return restored
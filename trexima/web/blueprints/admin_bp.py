@@ -9,10 +9,15 @@ import logging
 from datetime import datetime, timedelta
 from sqlalchemy import func
 
-from trexima.web.auth import require_admin, get_current_user
-from trexima.web.models import db, User, Project, ProjectFile, GeneratedFile
+from trexima.web.auth import require_admin, get_current_user, token_cache
+from trexima.web.models import db, User, Project, ProjectFile, GeneratedFile, Job
 from trexima.web.storage import storage_service
+from trexima.web.blobs import file_refs, release_files
+from trexima.web.storage_usage import get_usage
+from trexima.web.maintenance import list_tasks, get_task, request_run
+from trexima.web.expiry import expired_backlog
 from trexima.web.websocket import get_active_operations
+from trexima.web.jobs import get_scheduler, get_queue_forecast, set_job_priority
 
 logger = logging.getLogger(__name__)
 
@@ -84,7 +89,8 @@ def get_user(user_id):
         return jsonify({'error': 'User not found'}), 404
 
     return jsonify({
-        'user': user.to_dict(include_projects=True)
+        'user': user.to_dict(include_projects=True),
+        'storage': get_usage(user_id)
     })
 
 
@@ -115,9 +121,15 @@ def delete_user(user_id):
 
     # Delete user (cascades to projects)
     email = user.email
+    refs = file_refs(
+        ProjectFile.query.join(Project).filter(Project.user_id == user_id)
+    )
     db.session.delete(user)
     db.session.commit()
 
+    # Uploads are shared blobs outside the user prefix
+    release_files(refs)
+
     logger.info(f"Admin {admin.email} deleted user {email}")
 
     return jsonify({
@@ -254,8 +266,10 @@ def admin_delete_project(project_id):
 
     project_name = project.name
     owner_email = project.owner.email
+    refs = file_refs(project.files)
     db.session.delete(project)
     db.session.commit()
+    release_files(refs)
 
     logger.info(f"Admin {admin.email} deleted project {project_name} (owner: {owner_email})")
 
@@ -293,16 +307,10 @@ def get_system_stats():
     # File stats
     total_uploaded_files = ProjectFile.query.count()
     total_generated_files = GeneratedFile.query.count()
-    expired_files = GeneratedFile.query.filter(
-        GeneratedFile.expires_at < datetime.utcnow()
-    ).count()
+    expired_files = expired_backlog()
 
-    # Storage stats
-    try:
-        storage_stats = storage_service.get_storage_usage()
-    except Exception as e:
-        logger.warning(f"Could not fetch storage stats: {e}")
-        storage_stats = {'total_files': 0, 'total_size': 0}
+    # Storage stats (counters, no bucket listing)
+    storage_stats = get_usage()
 
     # Active operations
     active_ops = get_active_operations()
@@ -377,6 +385,73 @@ def get_user_stats():
     })
 
 
+# =============================================================================
+# JOB QUEUE
+# =============================================================================
+
+@admin_bp.route('/jobs', methods=['GET'])
+@require_admin
+def list_jobs():
+    """
+    Inspect the export/import job queue.
+
+    Returns running jobs and queued jobs in expected start order, with
+    queue position, estimated start time and the scheduler limits.
+    """
+    running = Job.query.filter_by(status='running').order_by(Job.started_at).all()
+    queued = get_queue_forecast()
+
+    owners = {
+        u.id: u.email for u in User.query.filter(
+            User.id.in_({j.user_id for j in running} | {j['user_id'] for j in queued})
+        )
+    }
+    running_data = []
+    for job in running:
+        data = job.to_dict()
+        data['owner_email'] = owners.get(job.user_id)
+        running_data.append(data)
+    for data in queued:
+        data['owner_email'] = owners.get(data['user_id'])
+
+    return jsonify({
+        'running': running_data,
+        'queued': queued,
+        'limits': get_scheduler().limits()
+    })
+
+
+@admin_bp.route('/jobs/<job_id>/priority', methods=['PUT'])
+@require_admin
+def update_job_priority(job_id):
+    """
+    Reprioritize a queued job.
+
+    Request body:
+        {
+            "priority": int (higher starts first, default 0)
+        }
+    """
+    admin = get_current_user()
+    data = request.get_json() or {}
+
+    try:
+        priority = int(data['priority'])
+    except (KeyError, TypeError, ValueError):
+        return jsonify({'error': 'priority must be an integer'}), 400
+
+    job = set_job_priority(job_id, priority)
+    if not job:
+        return jsonify({'error': 'Queued job not found'}), 404
+
+    logger.info(f"Admin {admin.email} set priority of job {job_id} to {priority}")
+
+    return jsonify({
+        'success': True,
+        'job': job.to_dict()
+    })
+
+
 # =============================================================================
 # CLEANUP OPERATIONS
 # =============================================================================
@@ -387,40 +462,29 @@ def cleanup_expired_files():
     """
     Clean up expired generated files.
 
-    This removes expired files from both database and storage.
+    Schedules the expiry sweeper, which removes expired files from both
+    database and storage in batches (it also runs every 15 minutes).
     """
     admin = get_current_user()
 
-    # Find expired files
-    expired = GeneratedFile.query.filter(
-        GeneratedFile.expires_at < datetime.utcnow()
-    ).all()
+    sweep = get_task('expiry_sweep')
+    if not sweep['running']:
+        request_run('expiry_sweep')
 
-    deleted_count = 0
-    errors = []
-
-    for file in expired:
-        try:
-            # Delete from storage
-            storage_service.delete_file(file.storage_key)
-            # Delete from database
-            db.session.delete(file)
-            deleted_count += 1
-        except Exception as e:
-            errors.append({
-                'file_id': file.id,
-                'error': str(e)
-            })
-
-    db.session.commit()
-
-    logger.info(f"Admin {admin.email} cleaned up {deleted_count} expired files")
+    logger.info(f"Admin {admin.email} requested an expiry sweep")
 
     return jsonify({
         'success': True,
-        'deleted': deleted_count,
-        'errors': errors if errors else None
-    })
+        'backlog': expired_backlog(),
+        'last_sweep': sweep['state']
+    }), 202
+
+
+@admin_bp.route('/cleanup/orphaned', methods=['GET'])
+@require_admin
+def get_orphan_scan():
+    """Get progress of the running orphan scan, or the last scan's result."""
+    return jsonify(get_task('orphan_scan'))
 
 
 @admin_bp.route('/cleanup/orphaned', methods=['POST'])
@@ -429,53 +493,53 @@ def cleanup_orphaned_storage():
     """
     Clean up orphaned files in storage.
 
-    Finds files in storage that don't have database records.
-    Use with caution - performs a full storage scan.
+    Schedules a background scan for files in storage that don't have
+    database records. It walks the bucket page by page and can resume
+    after interruptions; poll GET for progress. Dry run unless
+    ?delete=true.
     """
     admin = get_current_user()
+    delete = request.args.get('delete') == 'true'
 
-    # This is an expensive operation
-    # Get all storage keys
-    try:
-        storage_files = storage_service.list_files('users/', max_keys=10000)
-    except Exception as e:
-        return jsonify({'error': f'Failed to list storage: {e}'}), 500
+    if get_task('orphan_scan')['running']:
+        return jsonify({'error': 'Orphan scan already running'}), 409
 
-    # Get all database storage keys
-    db_keys = set()
+    request_run('orphan_scan', {'dry_run': not delete})
+    logger.info(f"Admin {admin.email} scheduled an orphan scan (delete={delete})")
 
-    for pf in ProjectFile.query.all():
-        db_keys.add(pf.storage_key)
-    for gf in GeneratedFile.query.all():
-        db_keys.add(gf.storage_key)
+    return jsonify({
+        'success': True,
+        'dry_run': not delete,
+        'message': 'Orphan scan scheduled' + ('' if delete else '; add ?delete=true to delete orphaned files')
+    }), 202
 
-    # Find orphans
-    orphaned = [f for f in storage_files if f['key'] not in db_keys]
 
-    # Optional: delete orphans (only if explicitly requested)
-    if request.args.get('delete') == 'true':
-        deleted = 0
-        failed = 0
-        for f in orphaned:
-            try:
-                storage_service.delete_file(f['key'])
-                deleted += 1
-            except Exception as e:
-                logger.warning(f"Failed to delete orphaned file {f['key']}: {e}")
-                failed += 1
+# =============================================================================
+# MAINTENANCE
+# =============================================================================
 
-        logger.info(f"Admin {admin.email} deleted {deleted} orphaned storage files")
+@admin_bp.route('/maintenance', methods=['GET'])
+@require_admin
+def list_maintenance_tasks():
+    """List periodic maintenance tasks with their last run and state."""
+    return jsonify({'tasks': list_tasks()})
 
-        return jsonify({
-            'orphaned_count': len(orphaned),
-            'deleted': deleted
-        })
+
+@admin_bp.route('/maintenance/<name>/run', methods=['POST'])
+@require_admin
+def run_maintenance_task(name):
+    """Make a maintenance task due; an idle worker runs it shortly."""
+    admin = get_current_user()
+
+    if not request_run(name):
+        return jsonify({'error': 'Maintenance task not found'}), 404
+
+    logger.info(f"Admin {admin.email} requested maintenance task {name}")
 
     return jsonify({
-        'orphaned_count': len(orphaned),
-        'orphaned_files': orphaned[:100],  # Limit response size
-        'message': 'Add ?delete=true to delete orphaned files'
-    })
+        'success': True,
+        'message': f'Maintenance task "{name}" scheduled'
+    }), 202
 
 
 # =============================================================================
@@ -510,11 +574,12 @@ def detailed_health():
     # Storage check
     try:
         if storage_service.is_initialized:
-            stats = storage_service.get_storage_usage()
+            stats = get_usage()
             health['checks']['storage'] = {
                 'status': 'ok',
                 'files': stats['total_files'],
-                'size_bytes': stats['total_size']
+                'size_bytes': stats['total_size'],
+                'cache': storage_service.cache_stats()
             }
         else:
             health['checks']['storage'] = {
@@ -526,6 +591,8 @@ def detailed_health():
             'error': str(e)
         }
 
+    health['checks']['auth'] = {'token_cache': token_cache.stats()}
+
     # Active operations
     active_ops = get_active_operations()
     health['checks']['operations'] = {
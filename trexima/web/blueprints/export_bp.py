@@ -15,30 +15,41 @@ from flask import Blueprint, jsonify, request, g
 import logging
 import os
 import tempfile
+import time
 import uuid
 from datetime import datetime, timedelta
 from typing import List, Optional
 
 from trexima.web.auth import require_auth, get_current_user
-from trexima.web.models import db, Project, ProjectFile, GeneratedFile, User, get_or_create_user
+from trexima.web.models import db, Project, ProjectFile, GeneratedFile, User, Job, get_or_create_user
 from trexima.web.storage import storage_service
 from trexima.web.websocket import (
-    ProgressTracker, is_operation_active, OperationCancelled
+    ProgressTracker, is_operation_active, OperationCancelled, emit_operation_complete
 )
+from trexima.web.jobs import (
+    job_handler, job_app_context, enqueue_job, has_active_job, current_checkpoint
+)
+from trexima.web.scheduler import tenant_key
 from trexima.web.constants import (
     FILE_RETENTION_DAYS, EC_CORE_OBJECTS, FOUNDATION_OBJECTS, FO_TRANSLATION_TYPES
 )
 
 # Core processing modules
 from trexima.core.datamodel_processor import DataModelProcessor
-from trexima.core.odata_client import ODataClient
+from trexima.core.odata_client import ODataClient, RecordingSession
 from trexima.core.translation_extractor import TranslationExtractor
 from trexima.config import AppPaths
+from trexima.web.sf_catalog import connection_params, get_catalog
+from trexima.web.translation_rows import save_row_store
 
 logger = logging.getLogger(__name__)
 
 export_bp = Blueprint('export', __name__)
 
+# Checkpoint artifact with the OData responses of an export job
+ODATA_RECORDING_NAME = 'odata_responses.json.gz'
+ODATA_RECORDING_SAVE_INTERVAL = 60
+
 
 def get_user_from_context():
     """Get or create database user from auth context."""
@@ -85,7 +96,7 @@ def start_export(project_id):
         return jsonify({'error': 'Project not found'}), 404
 
     # Check for active operation
-    if is_operation_active(project_id):
+    if is_operation_active(project_id) or has_active_job(project_id):
         return jsonify({
             'error': 'An operation is already in progress for this project'
         }), 409
@@ -116,6 +127,8 @@ def start_export(project_id):
         'fo_objects': request_data.get('fo_objects', config.get('fo_objects', [])),
         # EC objects (for future use)
         'ec_objects': request_data.get('ec_objects', config.get('ec_objects', [])),
+        # Translation memory suggestions for missing data model labels
+        'suggest_translations': request_data.get('suggest_translations', config.get('suggest_translations', True)),
         # Connection details
         'sf_connection': config.get('sf_connection', {})
     }
@@ -124,23 +137,36 @@ def start_export(project_id):
     project.status = 'exporting'
     db.session.commit()
 
-    # Start export in background (using socketio background task)
-    from trexima.web.websocket import socketio
-    socketio.start_background_task(
-        _execute_export,
-        project_id=project_id,
-        user_id=user.id,
-        uploaded_files=[(f.id, f.storage_key, f.file_type) for f in uploaded_files],
-        export_config=export_config
-    )
+    # Queue export for the job executor
+    tenant = tenant_key(export_config['sf_connection'])
+    job = enqueue_job('export', project_id, user.id, tenant=tenant, payload={
+        'project_id': project_id,
+        'user_id': user.id,
+        'uploaded_files': [(f.id, f.storage_key, f.file_type) for f in uploaded_files],
+        'export_config': export_config
+    })
 
     return jsonify({
         'message': 'Export started',
         'project_id': project_id,
+        'job_id': job.id,
         'status': 'exporting'
     }), 202
 
 
+def _abandon_export(project_id: str, **_):
+    """Reset a project whose export was interrupted too often."""
+    project = Project.query.get(project_id)
+    if project and project.status == 'exporting':
+        project.status = 'configured'
+        db.session.commit()
+    emit_operation_complete(
+        project_id, 'export', success=False,
+        error='Export was interrupted repeatedly and has been stopped'
+    )
+
+
+@job_handler('export', on_abandon=_abandon_export)
 def _execute_export(
     project_id: str,
     user_id: str,
@@ -148,177 +174,52 @@ def _execute_export(
     export_config: dict
 ):
     """
-    Execute export operation in background.
+    Execute export operation as a job.
 
-    This function runs in a background greenlet and emits progress via WebSocket.
-    """
-    from flask import current_app
+    Runs in a job worker process (or a background task when JOB_WORKERS=0)
+    and emits progress via WebSocket. Each stage records a checkpoint, so
+    a retried job skips what an interrupted attempt already finished:
 
+    - models: data models loaded (always reparsed, they live in memory)
+    - locales: export locales resolved
+    - odata: all OData responses recorded to storage (partial recordings
+      are saved periodically) and replayed on retry
+    - workbook: workbook uploaded; only the database record is left
+
+    Returns:
+        True if the export succeeded
+    """
     # Need app context for database operations
-    from trexima.web.app import create_app
-    app = create_app()
+    with job_app_context():
+        checkpoint = current_checkpoint()
+        recording_key = checkpoint.artifact_key(user_id, project_id, ODATA_RECORDING_NAME)
 
-    with app.app_context():
         with ProgressTracker(project_id, 'export') as tracker:
             temp_dir = None
             try:
-                # Step 1: Initialize
-                tracker.update(1, "Initializing export environment")
-
-                temp_dir = tempfile.mkdtemp(prefix='trexima_export_')
-                app_paths = AppPaths(app_dir=temp_dir)
-                processor = DataModelProcessor(app_paths)
-                odata_client = ODataClient()
-
-                # Step 2: Load data models
-                tracker.update(2, "Loading data model files")
-
-                loaded_count = 0
-                for file_id, storage_key, file_type in uploaded_files:
-                    if tracker.is_cancelled():
-                        raise OperationCancelled("Export cancelled by user")
-
-                    # Download file from storage
-                    file_content = storage_service.download_file(storage_key)
-                    file_path = os.path.join(temp_dir, f"{file_id}.xml")
-                    with open(file_path, 'wb') as f:
-                        f.write(file_content)
-
-                    # Load into processor
-                    model = processor.load_data_model(file_path)
-                    if model:
-                        loaded_count += 1
-
-                    tracker.update(
-                        2,
-                        f"Loaded {loaded_count} of {len(uploaded_files)} files",
-                        sub_progress=loaded_count / len(uploaded_files)
-                    )
-
-                if loaded_count == 0:
-                    raise ValueError("No valid data model files could be loaded")
-
-                # Step 3: Connect to OData API (if credentials provided)
-                sf_connection = export_config.get('sf_connection', {})
-                api_connected = False
-
-                if sf_connection.get('endpoint') and sf_connection.get('company_id'):
-                    tracker.update(3, "Connecting to SuccessFactors OData API")
-
-                    try:
-                        api_connected = odata_client.connect(
-                            service_url=sf_connection['endpoint'],
-                            company_id=sf_connection['company_id'],
-                            username=sf_connection.get('username', ''),
-                            password=sf_connection.get('password', '')
-                        )
-                    except Exception as e:
-                        logger.warning(f"OData connection failed: {e}")
-                        tracker.update(3, f"API connection skipped: {str(e)}")
+                saved = checkpoint.get('workbook')
+                if saved:
+                    tracker.update(10, "Resuming: workbook already saved")
                 else:
-                    tracker.update(3, "Skipping API connection (no credentials)")
-
-                # Step 4: Fetch locales
-                tracker.update(4, "Determining export locales")
-
-                locales = export_config.get('locales', ['en_US'])
-                if api_connected:
-                    try:
-                        active_locales = odata_client.get_active_locales()
-                        if active_locales:
-                            # Merge with requested locales
-                            locales = list(set(locales + active_locales))
-                    except Exception as e:
-                        logger.warning(f"Could not fetch active locales from API: {e}")
-
-                # Ensure en_US is always first
-                if 'en_US' in locales:
-                    locales.remove('en_US')
-                    locales.insert(0, 'en_US')
-
-                # Create extractor with progress callback
-                def progress_callback(percent: int, message: str):
-                    # Map extractor progress (0-100) to our steps (5-9)
-                    if percent <= 20:
-                        tracker.update(5, message, sub_progress=percent / 20)
-                    elif percent <= 40:
-                        tracker.update(6, message, sub_progress=(percent - 20) / 20)
-                    elif percent <= 60:
-                        tracker.update(7, message, sub_progress=(percent - 40) / 20)
-                    elif percent <= 80:
-                        tracker.update(8, message, sub_progress=(percent - 60) / 20)
-                    else:
-                        tracker.update(9, message, sub_progress=(percent - 80) / 20)
-
-                extractor = TranslationExtractor(
-                    processor=processor,
-                    odata_client=odata_client if api_connected else None,
-                    progress_callback=progress_callback
-                )
-
-                # Step 5-9: Extract translations (handled by progress_callback)
-                tracker.update(5, "Extracting EC field translations")
-
-                workbook = extractor.extract_to_workbook(
-                    locales_for_export=locales,
-                    # Granular picklist options
-                    export_mdf_picklists=export_config.get('export_mdf_picklists', False) and api_connected,
-                    export_legacy_picklists=export_config.get('export_legacy_picklists', False) and api_connected,
-                    # MDF objects
-                    export_mdf_objects=export_config.get('export_mdf_objects', True) and api_connected,
-                    mdf_objects_filter=export_config.get('mdf_objects', []),
-                    # FO translations
-                    export_fo_translations=export_config.get('export_fo_translations', True) and api_connected,
-                    fo_objects_filter=export_config.get('fo_objects', []),
-                    fo_translation_types_filter=export_config.get('fo_translation_types', []),
-                    system_default_lang='en_US'
-                )
-
-                # Step 10: Save and upload
-                tracker.update(10, "Saving workbook and preparing download")
-
-                # Save workbook to temp file
-                timestamp = datetime.utcnow().strftime('%Y%m%d_%H%M%S')
-                filename = f"TranslationsWorkbook_{timestamp}.xlsx"
-                local_path = os.path.join(temp_dir, filename)
-                extractor.save_workbook(workbook, temp_dir, filename)
-
-                # Upload to storage
-                storage_key = f"users/{user_id}/projects/{project_id}/generated/{filename}"
-                with open(local_path, 'rb') as f:
-                    storage_service.upload_file(f, storage_key, content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet')
-
-                # Get file size
-                file_size = os.path.getsize(local_path)
-
-                # Create database record
-                generated_file = GeneratedFile(
-                    id=str(uuid.uuid4()),
-                    project_id=project_id,
-                    filename=filename,
-                    file_type='translation_workbook',
-                    storage_key=storage_key,
-                    file_size=file_size,
-                    expires_at=datetime.utcnow() + timedelta(days=FILE_RETENTION_DAYS)
-                )
-                db.session.add(generated_file)
-
-                # Update project status
-                project = Project.query.get(project_id)
-                if project:
-                    project.status = 'exported'
-                    project.updated_at = datetime.utcnow()
+                    temp_dir = tempfile.mkdtemp(prefix='trexima_export_')
+                    saved = _run_export_stages(
+                        tracker, checkpoint, temp_dir, recording_key,
+                        project_id, user_id, uploaded_files, export_config
+                    )
+                    checkpoint.save('workbook', **saved)
 
-                db.session.commit()
+                generated_file = _finalize_export(project_id, saved)
 
                 # Complete
                 tracker.complete(result={
                     'file_id': generated_file.id,
-                    'filename': filename,
-                    'file_size': file_size,
-                    'locales_exported': locales,
-                    'files_processed': loaded_count
+                    'filename': saved['filename'],
+                    'file_size': saved['file_size'],
+                    'locales_exported': saved['locales'],
+                    'files_processed': saved['files_processed']
                 })
+                _delete_checkpoint_artifacts(recording_key)
+                return True
 
             except OperationCancelled:
                 # Reset project status
@@ -327,6 +228,8 @@ def _execute_export(
                     project.status = 'configured'
                     db.session.commit()
                 tracker.fail("Export cancelled by user")
+                _delete_checkpoint_artifacts(recording_key)
+                return False
 
             except Exception as e:
                 logger.exception(f"Export failed for project {project_id}")
@@ -336,6 +239,8 @@ def _execute_export(
                     project.status = 'configured'
                     db.session.commit()
                 tracker.fail(str(e))
+                _delete_checkpoint_artifacts(recording_key)
+                return False
 
             finally:
                 # Cleanup temp directory
@@ -347,6 +252,258 @@ def _execute_export(
                         logger.debug(f"Could not cleanup temp directory {temp_dir}: {e}")
 
 
+def _run_export_stages(
+    tracker: ProgressTracker,
+    checkpoint,
+    temp_dir: str,
+    recording_key: Optional[str],
+    project_id: str,
+    user_id: str,
+    uploaded_files: List[tuple],
+    export_config: dict
+):
+    """
+    Load, extract and upload the workbook, skipping checkpointed work.
+
+    Returns:
+        Saved workbook info (storage key, filename, size, locales, file count)
+    """
+    # Step 1: Initialize
+    tracker.update(1, "Initializing export environment")
+
+    app_paths = AppPaths(app_dir=temp_dir)
+    processor = DataModelProcessor(app_paths)
+    cancel_token = tracker.cancellation_token()
+    odata_client = ODataClient(cancel_token=cancel_token)
+
+    # Step 2: Load data models
+    resumed = checkpoint.get('models') is not None
+    tracker.update(2, "Reloading data model files" if resumed else "Loading data model files")
+
+    loaded_count = 0
+    for file_id, storage_key, file_type in uploaded_files:
+        if tracker.is_cancelled():
+            raise OperationCancelled("Export cancelled by user")
+
+        # Materialize file from storage (linked from the local cache when possible)
+        file_path = os.path.join(temp_dir, f"{file_id}.xml")
+        storage_service.download_to_file(storage_key, file_path)
+
+        # Load into processor
+        model = processor.load_data_model(file_path)
+        if model:
+            loaded_count += 1
+
+        tracker.update(
+            2,
+            f"Loaded {loaded_count} of {len(uploaded_files)} files",
+            sub_progress=loaded_count / len(uploaded_files)
+        )
+
+    if loaded_count == 0:
+        raise ValueError("No valid data model files could be loaded")
+    if not resumed:
+        checkpoint.save('models', file_ids=[f[0] for f in uploaded_files], loaded_count=loaded_count)
+
+    # Step 3: Connect to OData API (if credentials provided)
+    # Responses fetched by an earlier attempt are replayed from its recording
+    odata_session = _load_odata_recording(recording_key) if checkpoint.resumed else None
+    if odata_session is None:
+        odata_session = RecordingSession()
+
+    sf_connection = export_config.get('sf_connection', {})
+    api_connected = False
+
+    if sf_connection.get('endpoint') and sf_connection.get('company_id'):
+        tracker.update(3, "Connecting to SuccessFactors OData API")
+
+        try:
+            api_connected = odata_client.connect(
+                service_url=sf_connection['endpoint'],
+                company_id=sf_connection['company_id'],
+                username=sf_connection.get('username', ''),
+                password=sf_connection.get('password', ''),
+                session=odata_session
+            )
+        except Exception as e:
+            logger.warning(f"OData connection failed: {e}")
+            tracker.update(3, f"API connection skipped: {str(e)}")
+    else:
+        tracker.update(3, "Skipping API connection (no credentials)")
+
+    # Step 4: Fetch locales
+    tracker.update(4, "Determining export locales")
+
+    saved_locales = checkpoint.get('locales')
+    if saved_locales:
+        locales = saved_locales['locales']
+    else:
+        locales = export_config.get('locales', ['en_US'])
+        if api_connected:
+            try:
+                # The tenant catalog usually has them already
+                params = connection_params(sf_connection)
+                catalog = get_catalog(params) if params else None
+                if catalog is not None and not catalog.is_stale:
+                    active_locales = list(catalog.data.get('locales') or [])
+                else:
+                    active_locales = odata_client.get_active_locales()
+                if active_locales:
+                    # Merge with requested locales
+                    locales = list(set(locales + active_locales))
+            except Exception as e:
+                logger.warning(f"Could not fetch active locales from API: {e}")
+
+        # Ensure en_US is always first
+        if 'en_US' in locales:
+            locales.remove('en_US')
+            locales.insert(0, 'en_US')
+        checkpoint.save('locales', locales=locales)
+
+    last_recording_save = time.monotonic()
+
+    # Create extractor with progress callback
+    def progress_callback(percent: int, message: str):
+        nonlocal last_recording_save
+        # Persist newly fetched OData responses now and then, so an
+        # interrupted extraction does not fetch them again
+        if (recording_key and odata_session.unsaved
+                and time.monotonic() - last_recording_save > ODATA_RECORDING_SAVE_INTERVAL):
+            _save_odata_recording(recording_key, odata_session)
+            last_recording_save = time.monotonic()
+
+        # Map extractor progress (0-100) to our steps (5-9)
+        if percent <= 20:
+            tracker.update(5, message, sub_progress=percent / 20)
+        elif percent <= 40:
+            tracker.update(6, message, sub_progress=(percent - 20) / 20)
+        elif percent <= 60:
+            tracker.update(7, message, sub_progress=(percent - 40) / 20)
+        elif percent <= 80:
+            tracker.update(8, message, sub_progress=(percent - 60) / 20)
+        else:
+            tracker.update(9, message, sub_progress=(percent - 80) / 20)
+
+    extractor = TranslationExtractor(
+        processor=processor,
+        odata_client=odata_client if api_connected else None,
+        progress_callback=progress_callback,
+        cancel_token=cancel_token
+    )
+
+    # Step 5-9: Extract translations (handled by progress_callback)
+    tracker.update(5, "Extracting EC field translations")
+
+    workbook = extractor.extract_to_workbook(
+        locales_for_export=locales,
+        # Granular picklist options
+        export_mdf_picklists=export_config.get('export_mdf_picklists', False) and api_connected,
+        export_legacy_picklists=export_config.get('export_legacy_picklists', False) and api_connected,
+        # MDF objects
+        export_mdf_objects=export_config.get('export_mdf_objects', True) and api_connected,
+        mdf_objects_filter=export_config.get('mdf_objects', []),
+        # FO translations
+        export_fo_translations=export_config.get('export_fo_translations', True) and api_connected,
+        fo_objects_filter=export_config.get('fo_objects', []),
+        fo_translation_types_filter=export_config.get('fo_translation_types', []),
+        system_default_lang='en_US',
+        suggest_translations=export_config.get('suggest_translations', True)
+    )
+
+    if recording_key and api_connected:
+        if odata_session.unsaved:
+            _save_odata_recording(recording_key, odata_session)
+        checkpoint.save('odata', responses=len(odata_session.recorded))
+
+    # Step 10: Save and upload
+    tracker.update(10, "Saving workbook and preparing download")
+
+    # Save workbook to temp file
+    timestamp = datetime.utcnow().strftime('%Y%m%d_%H%M%S')
+    filename = f"TranslationsWorkbook_{timestamp}.xlsx"
+    local_path = os.path.join(temp_dir, filename)
+    extractor.save_workbook(workbook, temp_dir, filename)
+
+    # Upload to storage
+    storage_key = f"users/{user_id}/projects/{project_id}/generated/{filename}"
+    with open(local_path, 'rb') as f:
+        storage_service.upload_file(f, storage_key, content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet')
+
+    # Rows for the paginated preview (/projects/<id>/translations)
+    row_count = save_row_store(workbook, storage_key, temp_dir)
+
+    saved = {
+        'storage_key': storage_key,
+        'filename': filename,
+        'file_size': os.path.getsize(local_path),
+        'locales': locales,
+        'files_processed': loaded_count,
+        'row_count': row_count
+    }
+    return saved
+
+
+def _finalize_export(project_id: str, saved: dict) -> GeneratedFile:
+    """Record the uploaded workbook and mark the project exported."""
+    # A retried job may already have created the record
+    generated_file = GeneratedFile.query.filter_by(
+        project_id=project_id, storage_key=saved['storage_key']
+    ).first()
+
+    if generated_file is None:
+        generated_file = GeneratedFile(
+            id=str(uuid.uuid4()),
+            project_id=project_id,
+            filename=saved['filename'],
+            file_type='translation_workbook',
+            storage_key=saved['storage_key'],
+            file_size=saved['file_size'],
+            expires_at=datetime.utcnow() + timedelta(days=FILE_RETENTION_DAYS),
+            file_metadata={'row_count': saved.get('row_count')}
+        )
+        db.session.add(generated_file)
+
+    # Update project status
+    project = Project.query.get(project_id)
+    if project:
+        project.status = 'exported'
+        project.updated_at = datetime.utcnow()
+
+    db.session.commit()
+    return generated_file
+
+
+def _load_odata_recording(recording_key: Optional[str]) -> Optional[RecordingSession]:
+    """Load OData responses recorded by an earlier attempt."""
+    if not recording_key:
+        return None
+    try:
+        session = RecordingSession.loads(storage_service.download_file(recording_key))
+        logger.info(f"Replaying {len(session.recorded)} recorded OData responses")
+        return session
+    except Exception as e:
+        logger.warning(f"Could not load OData recording {recording_key}: {e}")
+        return None
+
+
+def _save_odata_recording(recording_key: str, session: RecordingSession):
+    """Persist recorded OData responses as a checkpoint artifact."""
+    try:
+        storage_service.upload_bytes(session.dumps(), recording_key, content_type='application/gzip')
+    except Exception as e:
+        logger.warning(f"Could not save OData recording {recording_key}: {e}")
+
+
+def _delete_checkpoint_artifacts(recording_key: Optional[str]):
+    """Remove checkpoint artifacts once a job is finished."""
+    if not recording_key:
+        return
+    try:
+        storage_service.delete_prefix(recording_key.rsplit('/', 1)[0] + '/')
+    except Exception as e:
+        logger.debug(f"Could not delete checkpoint artifacts: {e}")
+
+
 # =============================================================================
 # EXPORT STATUS & DOWNLOADS
 # =============================================================================
@@ -361,7 +518,7 @@ def get_export_status(project_id):
     if not project:
         return jsonify({'error': 'Project not found'}), 404
 
-    active = is_operation_active(project_id)
+    active = is_operation_active(project_id) or has_active_job(project_id)
 
     # Get latest generated file
     latest_file = GeneratedFile.query.filter_by(
@@ -369,11 +526,15 @@ def get_export_status(project_id):
         file_type='translation_workbook'
     ).order_by(GeneratedFile.created_at.desc()).first()
 
+    # Latest export job: attempts, checkpoint stage and heartbeat
+    latest_job = project.jobs.filter_by(job_type='export').order_by(Job.created_at.desc()).first()
+
     return jsonify({
         'project_id': project_id,
         'status': project.status,
         'is_active': active,
-        'latest_export': latest_file.to_dict() if latest_file else None
+        'latest_export': latest_file.to_dict() if latest_file else None,
+        'job': latest_job.to_dict() if latest_job else None
     })
 
 
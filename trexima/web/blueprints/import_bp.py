@@ -24,14 +24,18 @@ from trexima.web.auth import require_auth, get_current_user
 from trexima.web.models import db, Project, ProjectFile, GeneratedFile, User, get_or_create_user
 from trexima.web.storage import storage_service
 from trexima.web.websocket import (
-    ProgressTracker, is_operation_active, OperationCancelled
+    ProgressTracker, is_operation_active, OperationCancelled, emit_operation_complete
 )
+from trexima.web.jobs import job_handler, job_app_context, enqueue_job, has_active_job
+from trexima.web.scheduler import tenant_key
 from trexima.web.constants import FILE_RETENTION_DAYS, MAX_FILE_SIZE_BYTES
 
 # Core processing modules
 from trexima.core.datamodel_processor import DataModelProcessor
 from trexima.core.translation_importer import TranslationImporter
 from trexima.io.excel_handler import ExcelHandler
+from trexima.io.changelog_writer import CHANGE_LOG_FORMATS
+from trexima.io.workbook_inspector import WorkbookInspector
 from trexima.config import AppPaths
 
 logger = logging.getLogger(__name__)
@@ -66,6 +70,11 @@ def start_import(project_id):
 
     Query params:
         - push_to_api: "true" to push translations to SF (default: false)
+        - annotate_workbook: "false" to skip writing the change log into a
+          copy of the workbook (default: true)
+        - change_log_format: "jsonl" or "csv" (default: jsonl)
+        - skip_unchanged: "false" to match every row, including rows that
+          still match the export fingerprints (default: true)
 
     Returns:
         - 202: Import started (check WebSocket for progress)
@@ -80,7 +89,7 @@ def start_import(project_id):
         return jsonify({'error': 'Project not found'}), 404
 
     # Check for active operation
-    if is_operation_active(project_id):
+    if is_operation_active(project_id) or has_active_job(project_id):
         return jsonify({
             'error': 'An operation is already in progress for this project'
         }), 409
@@ -106,10 +115,27 @@ def start_import(project_id):
             'error': f'File too large. Maximum size is {MAX_FILE_SIZE_BYTES // (1024*1024)}MB'
         }), 400
 
-    # Save workbook to temp storage
-    temp_dir = tempfile.mkdtemp(prefix='trexima_import_')
-    workbook_path = os.path.join(temp_dir, secure_filename(workbook_file.filename))
-    workbook_file.save(workbook_path)
+    # Change log options
+    annotate_workbook = request.args.get('annotate_workbook', 'true').lower() != 'false'
+    skip_unchanged = request.args.get('skip_unchanged', 'true').lower() != 'false'
+    change_log_format = request.args.get('change_log_format', 'jsonl').lower()
+    if change_log_format not in CHANGE_LOG_FORMATS:
+        return jsonify({
+            'error': f'Invalid change_log_format. Expected one of {list(CHANGE_LOG_FORMATS)}'
+        }), 400
+
+    # Store the workbook as an artifact of the job, so any worker can run it
+    job_id = str(uuid.uuid4())
+    workbook_name = secure_filename(workbook_file.filename) or 'workbook.xlsx'
+    workbook_key = f"users/{user.id}/projects/{project_id}/jobs/{job_id}/{workbook_name}"
+    try:
+        storage_service.upload_file(
+            workbook_file, workbook_key,
+            content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+        )
+    except Exception as e:
+        logger.error(f"Failed to store import workbook: {e}")
+        return jsonify({'error': 'Failed to store workbook'}), 500
 
     # Parse optional parameters
     worksheets = None
@@ -129,54 +155,89 @@ def start_import(project_id):
     project.status = 'importing'
     db.session.commit()
 
-    # Start import in background
-    from trexima.web.websocket import socketio
-    socketio.start_background_task(
-        _execute_import,
-        project_id=project_id,
-        user_id=user.id,
-        workbook_path=workbook_path,
-        temp_dir=temp_dir,
-        uploaded_files=[(f.id, f.storage_key, f.file_type) for f in uploaded_files],
-        worksheets=worksheets,
-        push_to_api=push_to_api,
-        sf_connection=project.config.get('sf_connection', {}) if project.config else {}
-    )
+    sf_connection = project.config.get('sf_connection', {}) if project.config else {}
+
+    # Queue import for the job executor; it only talks to SF when pushing
+    tenant = tenant_key(sf_connection) if push_to_api else None
+    job = enqueue_job('import', project_id, user.id, tenant=tenant, job_id=job_id, payload={
+        'project_id': project_id,
+        'user_id': user.id,
+        'workbook_key': workbook_key,
+        'uploaded_files': [(f.id, f.storage_key, f.file_type) for f in uploaded_files],
+        'worksheets': worksheets,
+        'push_to_api': push_to_api,
+        'annotate_workbook': annotate_workbook,
+        'change_log_format': change_log_format,
+        'skip_unchanged': skip_unchanged,
+        'sf_connection': sf_connection
+    })
 
     return jsonify({
         'message': 'Import started',
         'project_id': project_id,
+        'job_id': job.id,
         'status': 'importing'
     }), 202
 
 
+def _delete_workbook(workbook_key: Optional[str]):
+    """Remove the stored workbook of an import job once it is finished."""
+    if not workbook_key:
+        return
+    try:
+        storage_service.delete_file(workbook_key)
+    except Exception as e:
+        logger.debug(f"Could not delete import workbook {workbook_key}: {e}")
+
+
+def _abandon_import(project_id: str, workbook_key: Optional[str] = None, **_):
+    """Reset a project whose import was interrupted too often."""
+    _delete_workbook(workbook_key)
+    project = Project.query.get(project_id)
+    if project and project.status == 'importing':
+        project.status = 'exported'
+        db.session.commit()
+    emit_operation_complete(
+        project_id, 'import', success=False,
+        error='Import was interrupted repeatedly and has been stopped'
+    )
+
+
+@job_handler('import', on_abandon=_abandon_import)
 def _execute_import(
     project_id: str,
     user_id: str,
-    workbook_path: str,
-    temp_dir: str,
+    workbook_key: str,
     uploaded_files: List[tuple],
     worksheets: Optional[List[str]],
     push_to_api: bool,
-    sf_connection: dict
+    sf_connection: dict,
+    annotate_workbook: bool = True,
+    change_log_format: str = 'jsonl',
+    skip_unchanged: bool = True
 ):
     """
-    Execute import operation in background.
+    Execute import operation as a job.
 
-    This function runs in a background greenlet and emits progress via WebSocket.
-    """
-    from flask import current_app
+    Runs in a job worker process (or a background task when JOB_WORKERS=0)
+    and emits progress via WebSocket. The workbook is downloaded from
+    storage into a temp dir of this run.
 
+    Returns:
+        True if the import succeeded
+    """
+    temp_dir = None
     # Need app context for database operations
-    from trexima.web.app import create_app
-    app = create_app()
-
-    with app.app_context():
+    with job_app_context():
         with ProgressTracker(project_id, 'import') as tracker:
             try:
                 # Step 1: Initialize
                 tracker.update(1, "Initializing import environment")
 
+                temp_dir = tempfile.mkdtemp(prefix='trexima_import_')
+                workbook_path = os.path.join(temp_dir, os.path.basename(workbook_key))
+                storage_service.download_to_file(workbook_key, workbook_path)
+
                 app_paths = AppPaths(base_dir=temp_dir)
                 processor = DataModelProcessor(app_paths)
                 excel_handler = ExcelHandler()
@@ -192,7 +253,9 @@ def _execute_import(
                 if not excel_handler.validate_translations_workbook(workbook):
                     raise ValueError("Invalid translations workbook format")
 
-                available_sheets = workbook.sheetnames
+                available_sheets = [
+                    ws.title for ws in workbook.worksheets if ws.sheet_state == 'visible'
+                ]
                 sheets_to_process = worksheets if worksheets else available_sheets
 
                 # Filter to valid sheets
@@ -210,7 +273,7 @@ def _execute_import(
 
                     # Download file from storage
                     file_path = os.path.join(temp_dir, f"{file_id}.xml")
-                    storage_service.download_file(storage_key, file_path)
+                    storage_service.download_to_file(storage_key, file_path)
 
                     # Load into processor
                     model = processor.load_data_model(file_path)
@@ -237,9 +300,11 @@ def _execute_import(
                     elif percent <= 100:
                         tracker.update(7, message, sub_progress=(percent - 65) / 35)
 
+                cancel_token = tracker.cancellation_token()
                 importer = TranslationImporter(
                     processor=processor,
-                    progress_callback=progress_callback
+                    progress_callback=progress_callback,
+                    cancel_token=cancel_token
                 )
 
                 # Step 5: Process worksheets and generate XML
@@ -248,7 +313,10 @@ def _execute_import(
                 result = importer.import_from_workbook(
                     workbook=workbook,
                     worksheets_to_process=sheets_to_process,
-                    save_dir=temp_dir
+                    save_dir=temp_dir,
+                    annotate_workbook=annotate_workbook,
+                    change_log_format=change_log_format,
+                    skip_unchanged=skip_unchanged
                 )
 
                 if not result.success:
@@ -259,7 +327,7 @@ def _execute_import(
                     tracker.update(6, "Connecting to SuccessFactors API")
 
                     from trexima.core.odata_client import ODataClient
-                    odata_client = ODataClient()
+                    odata_client = ODataClient(cancel_token=cancel_token)
 
                     try:
                         api_connected = odata_client.connect(
@@ -345,6 +413,29 @@ def _execute_import(
                         'file_type': 'changelog_workbook'
                     })
 
+                # Upload streamed change log
+                if result.change_log_path and os.path.exists(result.change_log_path):
+                    change_log_filename = os.path.basename(result.change_log_path)
+                    change_log_key = f"users/{user_id}/projects/{project_id}/generated/{change_log_filename}"
+                    storage_service.upload_file(result.change_log_path, change_log_key)
+
+                    change_log_file = GeneratedFile(
+                        id=str(uuid.uuid4()),
+                        project_id=project_id,
+                        filename=change_log_filename,
+                        file_type='import_changelog',
+                        storage_key=change_log_key,
+                        file_size=os.path.getsize(result.change_log_path),
+                        expires_at=datetime.utcnow() + timedelta(days=FILE_RETENTION_DAYS)
+                    )
+                    db.session.add(change_log_file)
+
+                    generated_files_info.append({
+                        'file_id': change_log_file.id,
+                        'filename': change_log_filename,
+                        'file_type': 'import_changelog'
+                    })
+
                 # Upload import log
                 if result.log_file_path and os.path.exists(result.log_file_path):
                     log_filename = os.path.basename(result.log_file_path)
@@ -377,6 +468,7 @@ def _execute_import(
                     'changes_made': result.changes_made,
                     'api_pushed': push_to_api and sf_connection.get('endpoint')
                 })
+                return True
 
             except OperationCancelled:
                 # Reset project status
@@ -385,6 +477,7 @@ def _execute_import(
                     project.status = 'exported'
                     db.session.commit()
                 tracker.fail("Import cancelled by user")
+                return False
 
             except Exception as e:
                 logger.exception(f"Import failed for project {project_id}")
@@ -394,8 +487,10 @@ def _execute_import(
                     project.status = 'exported'
                     db.session.commit()
                 tracker.fail(str(e))
+                return False
 
             finally:
+                _delete_workbook(workbook_key)
                 # Cleanup temp directory
                 if temp_dir and os.path.exists(temp_dir):
                     import shutil
@@ -419,13 +514,15 @@ def get_import_status(project_id):
     if not project:
         return jsonify({'error': 'Project not found'}), 404
 
-    active = is_operation_active(project_id)
+    active = is_operation_active(project_id) or has_active_job(project_id)
 
     # Get latest generated files
     generated_files = GeneratedFile.query.filter_by(
         project_id=project_id
     ).filter(
-        GeneratedFile.file_type.in_(['import_xml', 'changelog_workbook', 'import_log'])
+        GeneratedFile.file_type.in_([
+            'import_xml', 'changelog_workbook', 'import_changelog', 'import_log'
+        ])
     ).order_by(GeneratedFile.created_at.desc()).all()
 
     return jsonify({
@@ -489,48 +586,40 @@ def validate_workbook(project_id):
     if not workbook_file.filename.endswith('.xlsx'):
         return jsonify({'error': 'Invalid file type. Expected .xlsx'}), 400
 
-    # Save to temp file for validation
-    temp_dir = tempfile.mkdtemp(prefix='trexima_validate_')
-    try:
-        workbook_path = os.path.join(temp_dir, secure_filename(workbook_file.filename))
-        workbook_file.save(workbook_path)
-
-        excel_handler = ExcelHandler()
-        workbook = excel_handler.load_workbook(workbook_path)
+    # Read headers straight from the upload stream; the workbook is never loaded
+    summary = WorkbookInspector().inspect(workbook_file.stream)
 
-        if not workbook:
-            return jsonify({
-                'valid': False,
-                'error': 'Failed to load workbook'
-            }), 400
+    if not summary.sheets:
+        return jsonify({
+            'valid': False,
+            'error': summary.errors[0] if summary.errors else 'Failed to read workbook',
+            'errors': summary.errors
+        }), 400
 
-        is_valid = excel_handler.validate_translations_workbook(workbook)
-        available_sheets = workbook.sheetnames
+    available_sheets = [sheet.name for sheet in summary.sheets if sheet.state == 'visible']
 
-        # Categorize sheets
-        datamodel_sheets = [s for s in available_sheets if s.startswith('DataModel')]
-        pm_sheets = [s for s in available_sheets if 'Performance' in s or 'PM' in s]
-        gm_sheets = [s for s in available_sheets if 'Goal' in s or 'GM' in s]
-        other_sheets = [s for s in available_sheets
-                        if s not in datamodel_sheets and s not in pm_sheets and s not in gm_sheets]
+    # Categorize sheets
+    datamodel_sheets = [s for s in available_sheets if s.startswith('DataModel')]
+    pm_sheets = [s for s in available_sheets if 'Performance' in s or 'PM' in s]
+    gm_sheets = [s for s in available_sheets if 'Goal' in s or 'GM' in s]
+    other_sheets = [s for s in available_sheets
+                    if s not in datamodel_sheets and s not in pm_sheets and s not in gm_sheets]
 
-        return jsonify({
-            'valid': is_valid,
-            'filename': workbook_file.filename,
-            'sheets': {
-                'all': available_sheets,
-                'datamodel': datamodel_sheets,
-                'pm_templates': pm_sheets,
-                'gm_templates': gm_sheets,
-                'other': other_sheets
-            },
-            'total_sheets': len(available_sheets)
-        })
-
-    finally:
-        # Cleanup
-        import shutil
-        try:
-            shutil.rmtree(temp_dir)
-        except Exception as e:
-            logger.debug(f"Could not cleanup temp directory: {e}")
+    return jsonify({
+        'valid': summary.valid,
+        'filename': workbook_file.filename,
+        'sheets': {
+            'all': available_sheets,
+            'datamodel': datamodel_sheets,
+            'pm_templates': pm_sheets,
+            'gm_templates': gm_sheets,
+            'other': other_sheets
+        },
+        'total_sheets': len(available_sheets),
+        'languages': summary.languages,
+        'worksheets': [
+            {'name': sheet.name, 'max_row': sheet.max_row, 'languages': sheet.languages}
+            for sheet in summary.sheets if sheet.state == 'visible'
+        ],
+        'errors': summary.errors
+    })
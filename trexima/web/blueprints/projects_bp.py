@@ -4,8 +4,12 @@ TREXIMA v2.0 - Projects Blueprint
 Handles project CRUD, file uploads, SF connection, and workflow operations.
 """
 
-from flask import Blueprint, jsonify, request, g, current_app, make_response
+from flask import Blueprint, jsonify, request, g, current_app, send_file
+from sqlalchemy import func
 import logging
+import os
+import shutil
+import tempfile
 from datetime import datetime
 from werkzeug.utils import secure_filename
 
@@ -14,7 +18,16 @@ from trexima.web.models import (
     db, User, Project, ProjectFile, GeneratedFile,
     get_or_create_user, DEFAULT_PROJECT_CONFIG
 )
-from trexima.web.storage import storage_service
+from trexima.web.storage import storage_service, SNIFF_BYTES
+from trexima.web.blobs import file_refs, release_files, ensure_blobs
+from trexima.web.sf_catalog import (
+    connection_params, get_catalog, refresh_catalog, invalidate_catalog,
+    schedule_refresh, pooled_client, discard_client
+)
+from trexima.web.translation_rows import open_row_store
+from trexima.web.label_search import search_project_labels, schedule_label_indexes
+from trexima.io.row_store import DEFAULT_PAGE_SIZE
+from trexima.web.http_utils import send_storage_file, is_complete_download, conditional_json, make_etag
 from trexima.web.websocket import (
     emit_progress, emit_operation_complete, emit_project_saved,
     ProgressTracker, is_operation_active
@@ -40,6 +53,20 @@ def get_user_from_context():
     )
 
 
+def next_expiry(project_ids):
+    """
+    Get the earliest future expires_at of the projects' generated files.
+
+    Part of listing ETags: is_expired flips without a version bump.
+    """
+    if not project_ids:
+        return None
+    return db.session.query(func.min(GeneratedFile.expires_at)).filter(
+        GeneratedFile.project_id.in_(project_ids),
+        GeneratedFile.expires_at > datetime.utcnow()
+    ).scalar()
+
+
 def get_project_or_404(project_id: str, user: User):
     """Get project by ID, checking ownership."""
     project = Project.query.filter_by(id=project_id).first()
@@ -94,12 +121,19 @@ def list_projects():
         query = query.filter_by(status=status_filter)
 
     projects = query.order_by(Project.updated_at.desc()).all()
+    project_ids = [p.id for p in projects]
+    total = len(projects) if not status_filter else user.projects.count()
 
-    return jsonify({
-        'projects': [p.to_dict(include_config=include_config) for p in projects],
+    etag = make_etag(
+        [(p.id, p.version) for p in projects], total,
+        next_expiry(project_ids), include_config
+    )
+
+    return conditional_json(etag, lambda: {
+        'projects': Project.to_dict_many(projects, include_config=include_config),
         'count': len(projects),
         'max_projects': User.MAX_PROJECTS,
-        'can_create': user.can_create_project()
+        'can_create': total < User.MAX_PROJECTS
     })
 
 
@@ -161,11 +195,13 @@ def get_project(project_id):
     if error:
         return jsonify(error[0]), error[1]
 
-    # Update last accessed
-    project.touch()
-    db.session.commit()
+    # Update last accessed (throttled; doesn't change the ETag)
+    if project.record_access():
+        db.session.commit()
 
-    return jsonify({
+    etag = make_etag(project.id, project.version, next_expiry([project.id]))
+
+    return conditional_json(etag, lambda: {
         'project': project.to_dict(include_files=True, include_config=True)
     })
 
@@ -232,9 +268,13 @@ def delete_project(project_id):
 
     # Delete from database (cascades to files)
     project_name = project.name
+    refs = file_refs(project.files)
     db.session.delete(project)
     db.session.commit()
 
+    # Uploads are shared blobs outside the project prefix
+    release_files(refs)
+
     logger.info(f"Project deleted: {project_id} ({project_name}) by {user.email}")
 
     return jsonify({
@@ -361,6 +401,9 @@ def upload_files(project_id):
 
     Accepts multipart/form-data with files.
     Automatically detects file type (sdm, cdm, ec_sdm, ec_cdm, picklist).
+    Files are streamed to storage in chunks, never read into memory whole,
+    and stored once per content: re-uploading a known file only adds a
+    ProjectFile that refers to the existing blob.
     """
     user = get_user_from_context()
     project, error = get_project_or_404(project_id, user)
@@ -380,17 +423,17 @@ def upload_files(project_id):
 
     uploaded = []
     errors = []
+    replaced = []
+    deduplicated = []
+    new_files = []
 
     for file in files:
         try:
             filename = secure_filename(file.filename)
 
-            # Read file content for type detection
-            content = file.read()
-            file.seek(0)  # Reset for upload
-
-            # Detect file type
-            file_type = ProjectFile.detect_file_type(filename, content)
+            # Sniff the file type from the start of the stream
+            head = file.stream.read(SNIFF_BYTES)
+            file_type = ProjectFile.detect_file_type(filename, head)
 
             if not file_type:
                 errors.append({
@@ -399,49 +442,41 @@ def upload_files(project_id):
                 })
                 continue
 
-            # Check if file of this type already exists
-            existing = project.get_file_by_type(file_type)
-            if existing:
-                # Delete old file from storage
-                try:
-                    storage_service.delete_file(existing.storage_key)
-                except Exception as e:
-                    logger.warning(f"Failed to delete old file: {e}")
-                db.session.delete(existing)
-
-            # Generate storage key
-            storage_key = storage_service.generate_upload_key(
-                user.id, project_id, file_type, filename
-            )
-
             # Determine content type
             content_type = 'application/xml' if filename.endswith('.xml') else 'text/csv'
 
-            # Upload to storage
-            from io import BytesIO
-            result = storage_service.upload_file(
-                BytesIO(content),
-                storage_key,
-                content_type
-            )
+            # Store the content once, keyed by its hash
+            result = storage_service.store_blob(file.stream, content_type, head=head)
+            if result['deduplicated']:
+                deduplicated.append((result['key'], file.stream, content_type))
+
+            # Replace the existing file of this type (its blob is released after commit)
+            existing = project.get_file_by_type(file_type)
+            if existing:
+                replaced.extend(file_refs([existing]))
+                db.session.delete(existing)
 
             # Create database record
             project_file = ProjectFile(
                 project_id=project_id,
                 file_type=file_type,
                 original_name=filename,
-                storage_key=storage_key,
-                file_size=len(content),
+                storage_key=result['key'],
+                content_hash=result['sha256'],
+                file_size=result['size'],
                 content_type=content_type
             )
 
             db.session.add(project_file)
+            new_files.append(project_file)
 
             uploaded.append({
                 'id': project_file.id,
                 'file_type': file_type,
                 'original_name': filename,
-                'file_size': len(content)
+                'file_size': result['size'],
+                'sha256': result['sha256'],
+                'deduplicated': result['deduplicated']
             })
 
             logger.info(f"File uploaded: {file_type} for project {project_id}")
@@ -454,6 +489,12 @@ def upload_files(project_id):
             })
 
     db.session.commit()
+    ensure_blobs(deduplicated)
+    release_files(replaced)
+
+    # Index the labels now rather than on the first search
+    if new_files:
+        schedule_label_indexes(current_app._get_current_object(), [f.id for f in new_files])
 
     # Update project status if files uploaded
     if uploaded and project.status == 'draft':
@@ -484,16 +525,14 @@ def delete_file(project_id, file_id):
     if not file:
         return jsonify({'error': 'File not found'}), 404
 
-    # Delete from storage
-    try:
-        storage_service.delete_file(file.storage_key)
-    except Exception as e:
-        logger.warning(f"Failed to delete from storage: {e}")
-
     file_type = file.file_type
+    refs = file_refs([file])
     db.session.delete(file)
     db.session.commit()
 
+    # Delete from storage unless other projects share the content
+    release_files(refs)
+
     return jsonify({
         'success': True,
         'deleted_type': file_type,
@@ -551,6 +590,16 @@ def test_connection(project_id):
         # Test connection by getting locales
         locales = client.get_active_locales()
 
+        # Rebuild the tenant catalog in the background, reusing the client
+        params = {
+            'endpoint_url': data['endpoint_url'],
+            'company_id': data['company_id'],
+            'username': data['username'],
+            'password': data['password']
+        }
+        invalidate_catalog(params)
+        schedule_refresh(current_app._get_current_object(), params, client=client)
+
         # Update project config with connection details
         # NOTE: We store credentials here so that dynamic SF data fetching can work.
         # In a production system, consider using a secure vault or session-based storage.
@@ -685,14 +734,169 @@ def list_downloads(project_id):
     if error:
         return jsonify(error[0]), error[1]
 
-    files = project.generated_files.filter(
+    expiry = next_expiry([project.id])
+    etag = make_etag(project.id, project.version, expiry)
+
+    def build():
+        files = project.generated_files.filter(
+            GeneratedFile.expires_at > datetime.utcnow()
+        ).order_by(GeneratedFile.created_at.desc()).all()
+        return {
+            'files': [f.to_dict() for f in files],
+            'count': len(files)
+        }
+
+    return conditional_json(etag, build)
+
+
+@projects_bp.route('/<project_id>/translations', methods=['GET'])
+@require_auth
+def list_translations(project_id):
+    """
+    Browse the rows of an exported workbook without downloading it.
+
+    Query params:
+        - file_id: Exported workbook (default: the latest)
+        - sheet, section, field_id: Exact filters
+        - locale: Rows with a label column for this locale
+        - missing: Rows whose label for this locale is empty
+        - q: Substring of the default label or field id
+        - sort: row, section, field_id or default_label; '-' prefix for descending
+        - cursor: next_cursor of the previous page
+        - limit: Rows per page (default: 100, max: 1000)
+        - format: 'xlsx' for a workbook of all matching rows
+    """
+    user = get_user_from_context()
+    project, error = get_project_or_404(project_id, user)
+
+    if error:
+        return jsonify(error[0]), error[1]
+
+    query = project.generated_files.filter(
+        GeneratedFile.file_type == 'translation_workbook',
         GeneratedFile.expires_at > datetime.utcnow()
-    ).order_by(GeneratedFile.created_at.desc()).all()
+    )
+    file_id = request.args.get('file_id')
+    if file_id:
+        query = query.filter(GeneratedFile.id == file_id)
+    workbook_file = query.order_by(GeneratedFile.created_at.desc()).first()
+    if workbook_file is None:
+        return jsonify({'error': 'No exported workbook found'}), 404
+
+    sort = request.args.get('sort', 'row')
+    filters = {
+        'sheet': request.args.get('sheet'),
+        'section': request.args.get('section'),
+        'field_id': request.args.get('field_id'),
+        'locale': request.args.get('locale'),
+        'missing_locale': request.args.get('missing'),
+        'search': request.args.get('q'),
+        'sort': sort.lstrip('-'),
+        'descending': sort.startswith('-')
+    }
 
-    return jsonify({
-        'files': [f.to_dict() for f in files],
-        'count': len(files)
-    })
+    try:
+        store = open_row_store(workbook_file.storage_key)
+    except FileNotFoundError:
+        return jsonify({
+            'error': 'No preview available',
+            'message': 'This workbook was exported without a row store. Please export again.'
+        }), 404
+
+    if request.args.get('format') == 'xlsx':
+        temp_dir = tempfile.mkdtemp(prefix='trexima_rows_')
+        path = os.path.join(temp_dir, 'translations.xlsx')
+        try:
+            with store:
+                store.write_workbook(path, **filters)
+        except ValueError as e:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+            return jsonify({'error': str(e)}), 400
+        response = send_file(
+            path,
+            as_attachment=True,
+            download_name=workbook_file.filename.replace('.xlsx', '_filtered.xlsx')
+        )
+        response.call_on_close(lambda: shutil.rmtree(temp_dir, ignore_errors=True))
+        return response
+
+    cursor = request.args.get('cursor')
+    try:
+        limit = int(request.args.get('limit', DEFAULT_PAGE_SIZE))
+    except ValueError:
+        store.close()
+        return jsonify({'error': 'Invalid limit'}), 400
+
+    # Stores are immutable: the ETag depends on the request only
+    etag = make_etag(workbook_file.id, sorted(request.args.items(multi=True)))
+
+    def build():
+        page = store.query(cursor=cursor, limit=limit, **filters)
+        page['file_id'] = workbook_file.id
+        if not cursor:
+            page['sheets'] = store.sheets()
+            page['total'] = store.count(**filters)
+        return page
+
+    try:
+        response = conditional_json(etag, build)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    finally:
+        store.close()
+    return response
+
+
+@projects_bp.route('/<project_id>/search', methods=['GET'])
+@require_auth
+def search_labels(project_id):
+    """
+    Find labels in the project's uploaded data models.
+
+    Query params:
+        - q: Words to find; the last one matches as a prefix
+        - locale: Search this locale's labels, or 'default' (default: any)
+        - missing: Only elements without a label for this locale
+        - prefix: 'false' to match the last word exactly
+        - limit: Maximum results (default: 50, max: 500)
+    """
+    user = get_user_from_context()
+    project, error = get_project_or_404(project_id, user)
+
+    if error:
+        return jsonify(error[0]), error[1]
+
+    query = request.args.get('q', '').strip()
+    missing = request.args.get('missing')
+    if not query and not missing:
+        return jsonify({'error': 'Query parameter q (or missing) is required'}), 400
+
+    try:
+        limit = min(max(int(request.args.get('limit', 50)), 1), 500)
+    except ValueError:
+        return jsonify({'error': 'Invalid limit'}), 400
+
+    files = project.files.order_by(ProjectFile.uploaded_at).all()
+
+    # Indexes follow the files' blobs: the ETag depends on files and request
+    etag = make_etag(
+        [(f.id, f.storage_key) for f in files],
+        sorted(request.args.items(multi=True))
+    )
+
+    def build():
+        result = search_project_labels(
+            files,
+            query,
+            locale=request.args.get('locale'),
+            missing=missing,
+            prefix=request.args.get('prefix', 'true').lower() != 'false',
+            limit=limit
+        )
+        result['query'] = query
+        return result
+
+    return conditional_json(etag, build)
 
 
 @projects_bp.route('/<project_id>/download/<file_id>', methods=['GET'])
@@ -742,7 +946,11 @@ def download_file(project_id, file_id):
 @projects_bp.route('/<project_id>/download/<file_id>/file', methods=['GET'])
 @require_auth
 def download_file_direct(project_id, file_id):
-    """Download a generated file directly (streams file content)."""
+    """
+    Download a generated file directly (streams file content).
+
+    Supports If-None-Match and Range requests for resumed downloads.
+    """
     user = get_user_from_context()
     project, error = get_project_or_404(project_id, user)
 
@@ -761,20 +969,22 @@ def download_file_direct(project_id, file_id):
         return jsonify({'error': 'File has expired'}), 410
 
     try:
-        # Get file content from storage
-        content = storage_service.get_file(gen_file.storage_key)
+        response = send_storage_file(
+            gen_file.storage_key,
+            gen_file.filename,
+            gen_file.content_type or 'application/octet-stream'
+        )
 
-        # Update download count
-        gen_file.increment_download_count()
-        db.session.commit()
+        # Count downloads, not revalidations or resumed ranges
+        if is_complete_download(response):
+            gen_file.increment_download_count()
+            db.session.commit()
 
-        # Return file with proper headers
-        response = make_response(content)
-        response.headers['Content-Type'] = gen_file.content_type or 'application/octet-stream'
-        response.headers['Content-Disposition'] = f'attachment; filename="{gen_file.filename}"'
-        response.headers['Content-Length'] = len(content)
         return response
 
+    except FileNotFoundError:
+        return jsonify({'error': 'File not found in storage'}), 404
+
     except Exception as e:
         logger.error(f"Failed to download file: {e}")
         return jsonify({'error': 'Failed to download file'}), 500
@@ -836,82 +1046,28 @@ def get_sf_objects(project_id):
             'message': 'Please connect to SuccessFactors first'
         }), 400
 
-    # Check if we have credentials
-    endpoint_url = sf_connection.get('endpoint_url') or sf_connection.get('endpoint')
-    company_id = sf_connection.get('company_id')
-    username = sf_connection.get('username')
-    password = sf_connection.get('password')
-
-    if not all([endpoint_url, company_id, username, password]):
+    params = connection_params(sf_connection)
+    if params is None:
         return jsonify({
             'error': 'Missing credentials',
             'message': 'SF connection credentials are incomplete. Please reconnect.'
         }), 400
 
     try:
-        from trexima.core.odata_client import ODataClient
-
-        client = ODataClient()
-        client.connect(
-            service_url=endpoint_url,
-            company_id=company_id,
-            username=username,
-            password=password
-        )
-
-        # Fetch all entity names
-        all_entities = client.get_all_entity_names()
-
-        # Categorize entities
-        mdf_objects = []
-        foundation_objects = []
-        ec_objects = []
-
-        # Known FO prefixes
-        fo_prefixes = ['FO', 'FOCorp', 'FOBusiness', 'FOCompany', 'FODepartment',
-                       'FODivision', 'FOJob', 'FOLocation', 'FOPay', 'FOEvent',
-                       'FOGeo', 'FOFrequency', 'FOCostCenter', 'FOLegal']
-
-        # Known EC prefixes
-        ec_prefixes = ['Per', 'Emp', 'Position', 'Competency', 'DevGoal',
-                       'Goal', 'Achievement', 'Activity', 'Background',
-                       'TimeAccount', 'TimeManagement', 'Absence']
-
-        for entity in all_entities:
-            # Skip metadata and internal entities
-            if entity.startswith('cust_') or entity.endswith('Nav'):
-                mdf_objects.append(entity)
-            elif any(entity.startswith(prefix) for prefix in fo_prefixes):
-                foundation_objects.append(entity)
-            elif any(entity.startswith(prefix) for prefix in ec_prefixes):
-                ec_objects.append(entity)
-
-        # Get picklist counts
-        mdf_picklist_count = client.get_picklist_count('mdf')
-        legacy_picklist_count = client.get_picklist_count('legacy')
-        migrated_count = client.get_migrated_legacy_picklist_count()
-
-        # Get active locales
-        active_locales = client.get_active_locales()
-
-        client.disconnect()
+        catalog = get_catalog(params)
+        if catalog is None:
+            data = refresh_catalog(params)
+            fetched_at = datetime.utcnow()
+        else:
+            if catalog.is_stale:
+                # Serve the stale catalog, the next request gets the new one
+                schedule_refresh(current_app._get_current_object(), params)
+            data, fetched_at = catalog.data, catalog.fetched_at
 
         return jsonify({
             'success': True,
-            'data': {
-                'entities': {
-                    'total': len(all_entities),
-                    'mdf_objects': sorted(mdf_objects),
-                    'foundation_objects': sorted(foundation_objects),
-                    'ec_objects': sorted(ec_objects)
-                },
-                'picklists': {
-                    'mdf_count': mdf_picklist_count,
-                    'legacy_count': legacy_picklist_count,
-                    'migrated_legacy_count': migrated_count
-                },
-                'locales': active_locales
-            }
+            'data': data,
+            'fetched_at': fetched_at.isoformat()
         })
 
     except Exception as e:
@@ -944,12 +1100,8 @@ def get_sf_picklists(project_id):
     if not sf_connection.get('connected'):
         return jsonify({'error': 'No active SF connection'}), 400
 
-    endpoint_url = sf_connection.get('endpoint_url') or sf_connection.get('endpoint')
-    company_id = sf_connection.get('company_id')
-    username = sf_connection.get('username')
-    password = sf_connection.get('password')
-
-    if not all([endpoint_url, company_id, username, password]):
+    params = connection_params(sf_connection)
+    if params is None:
         return jsonify({'error': 'Missing credentials'}), 400
 
     picklist_type = request.args.get('type', 'mdf')
@@ -957,22 +1109,25 @@ def get_sf_picklists(project_id):
     offset = int(request.args.get('offset', 0))
 
     try:
-        from trexima.core.odata_client import ODataClient
+        # Pages reuse this process's connection to the tenant
+        client = pooled_client(params)
+        catalog = get_catalog(params)
+        counts = catalog.data['picklists'] if catalog else {}
 
-        client = ODataClient()
-        client.connect(
-            service_url=endpoint_url,
-            company_id=company_id,
-            username=username,
-            password=password
-        )
-
-        if picklist_type == 'mdf':
-            picklists = client.get_mdf_picklists(top=limit, skip=offset)
-            total = client.get_picklist_count('mdf')
-        else:
-            picklists = client.get_legacy_picklists(top=limit, skip=offset)
-            total = client.get_picklist_count('legacy')
+        try:
+            if picklist_type == 'mdf':
+                picklists = client.get_mdf_picklists(top=limit, skip=offset)
+                total = counts.get('mdf_count')
+                if total is None:
+                    total = client.get_picklist_count('mdf')
+            else:
+                picklists = client.get_legacy_picklists(top=limit, skip=offset)
+                total = counts.get('legacy_count')
+                if total is None:
+                    total = client.get_picklist_count('legacy')
+        except Exception:
+            discard_client(params)
+            raise
 
         # Convert to serializable format
         picklist_data = []
@@ -994,8 +1149,6 @@ def get_sf_picklists(project_id):
                 logger.debug(f"Skipping picklist due to processing error: {e}")
                 continue
 
-        client.disconnect()
-
         return jsonify({
             'success': True,
             'type': picklist_type,
@@ -0,0 +1,165 @@
+"""
+TREXIMA v2.0 - Disk Cache
+
+Bounded LRU cache of object storage files on local disk.
+
+Entries are plain files named by a hash of the storage key and ETag, so
+a changed object never hits a stale entry. The modification time is the
+LRU clock (bumped on every hit), which keeps eviction consistent between
+worker processes sharing the directory. Entries are written to a temp
+file and renamed into place, and evicted entries that are still open or
+hard-linked elsewhere stay readable.
+"""
+
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+from typing import Callable, Dict, Any, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_BYTES = 1024 * 1024 * 1024  # 1 GB
+
+_TEMP_PREFIX = '.tmp-'
+
+
+class DiskCache:
+    """LRU file cache with a size limit."""
+
+    def __init__(self, directory: str, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        os.makedirs(directory, exist_ok=True)
+        self._size = self._scan()[1]
+
+    @classmethod
+    def from_config(cls, config) -> Optional['DiskCache']:
+        """
+        Create a cache from STORAGE_CACHE_DIR / STORAGE_CACHE_MAX_BYTES.
+
+        Returns:
+            The cache, or None if STORAGE_CACHE_MAX_BYTES is 0
+        """
+        max_bytes = int(config.get(
+            'STORAGE_CACHE_MAX_BYTES',
+            os.environ.get('STORAGE_CACHE_MAX_BYTES', DEFAULT_MAX_BYTES)
+        ))
+        if max_bytes <= 0:
+            return None
+        directory = config.get(
+            'STORAGE_CACHE_DIR',
+            os.environ.get(
+                'STORAGE_CACHE_DIR',
+                os.path.join(tempfile.gettempdir(), 'trexima-storage-cache')
+            )
+        )
+        return cls(directory, max_bytes)
+
+    @staticmethod
+    def entry_name(key: str, etag: str) -> str:
+        """Name of the entry for a storage key and ETag."""
+        return hashlib.sha256(f"{key}\0{etag}".encode('utf-8')).hexdigest()
+
+    def get(self, name: str) -> Optional[str]:
+        """
+        Look up an entry and mark it as recently used.
+
+        Returns:
+            Path of the cached file, or None on a miss
+        """
+        path = os.path.join(self.directory, name)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            with self._lock:
+                self._misses += 1
+            return None
+        with self._lock:
+            self._hits += 1
+        return path
+
+    def put(self, name: str, write: Callable[[str], None]) -> str:
+        """
+        Add an entry, evicting least recently used entries over the limit.
+
+        Args:
+            name: Entry name from entry_name()
+            write: Function that writes the content to the given path
+
+        Returns:
+            Path of the cached file
+        """
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, prefix=_TEMP_PREFIX)
+        os.close(fd)
+        try:
+            write(temp_path)
+            size = os.path.getsize(temp_path)
+            path = os.path.join(self.directory, name)
+            os.replace(temp_path, path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+        with self._lock:
+            self._size += size
+            over_limit = self._size > self.max_bytes
+        if over_limit:
+            self._evict(keep=name)
+        return path
+
+    def _scan(self):
+        """List entries as (mtime, name, size), oldest first, and their total size."""
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.name.startswith(_TEMP_PREFIX) or not entry.is_file():
+                continue
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, entry.name, stat.st_size))
+        entries.sort()
+        return entries, sum(size for _, _, size in entries)
+
+    def _evict(self, keep: str):
+        """
+        Delete the oldest entries until the cache fits its limit.
+
+        Rescans the directory so entries added by other processes count.
+        The entry just added is kept even if it alone exceeds the limit.
+        """
+        with self._lock:
+            entries, total = self._scan()
+            for _, name, size in entries:
+                if total <= self.max_bytes:
+                    break
+                if name == keep:
+                    continue
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                except FileNotFoundError:
+                    pass
+                total -= size
+                self._evictions += 1
+            self._size = total
+
+    def stats(self) -> Dict[str, Any]:
+        """Get hit statistics and current size."""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                'directory': self.directory,
+                'max_bytes': self.max_bytes,
+                'size_bytes': self._size,
+                'hits': self._hits,
+                'misses': self._misses,
+                'evictions': self._evictions,
+                'hit_ratio': round(self._hits / lookups, 3) if lookups else None
+            }
@@ -0,0 +1,114 @@
+"""
+TREXIMA v2.0 - Expiry Sweeper
+
+Deletes expired generated files (workbooks, import XMLs, logs) from
+storage and the database in bounded batches.
+
+Each batch selects the oldest expired rows through the expires_at index,
+deletes their objects with one storage request, then removes the rows
+with a single DELETE ... WHERE id IN and adjusts the usage counters and
+project versions in the same transaction.
+"""
+
+import logging
+import time
+from datetime import datetime
+from typing import Dict, Any
+
+from sqlalchemy import delete, func, select, update
+
+from trexima.web.models import db, Project, GeneratedFile
+from trexima.web.storage_usage import record_usage
+from trexima.web.translation_rows import row_store_key
+
+logger = logging.getLogger(__name__)
+
+# Sweep every 15 minutes
+SWEEP_INTERVAL_SECONDS = 15 * 60
+
+DEFAULT_BATCH_SIZE = 500
+# Batches per sweep; the rest waits for the next sweep
+DEFAULT_MAX_BATCHES = 20
+
+
+def expired_backlog(now: datetime = None) -> int:
+    """Count generated files that have expired but are not swept yet."""
+    now = now or datetime.utcnow()
+    return db.session.execute(
+        select(func.count(GeneratedFile.id)).where(GeneratedFile.expires_at < now)
+    ).scalar()
+
+
+def sweep_expired(
+    storage,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    max_batches: int = DEFAULT_MAX_BATCHES
+) -> Dict[str, Any]:
+    """
+    Delete expired generated files in batches.
+
+    Objects that fail to delete from storage are left to the orphan scan;
+    their rows are removed either way.
+
+    Args:
+        storage: Storage service holding the files
+        batch_size: Rows per batch
+        max_batches: Maximum batches in this sweep
+
+    Returns:
+        Metrics: deleted, bytes, batches, backlog, duration_seconds
+    """
+    started = time.monotonic()
+    now = datetime.utcnow()
+    table = GeneratedFile.__table__
+    metrics = {'deleted': 0, 'bytes': 0, 'batches': 0}
+
+    for _ in range(max_batches):
+        rows = db.session.execute(
+            select(table.c.id, table.c.project_id, table.c.storage_key, table.c.file_size, Project.user_id)
+            .outerjoin(Project, Project.id == table.c.project_id)
+            .where(table.c.expires_at < now)
+            .order_by(table.c.expires_at)
+            .limit(batch_size)
+        ).all()
+        if not rows:
+            break
+
+        # With their row stores, if any
+        keys = [row.storage_key for row in rows]
+        storage.delete_files(keys + [row_store_key(key) for key in keys])
+
+        deltas: Dict[tuple, list] = {}
+        for row in rows:
+            if row.user_id is None:
+                continue
+            delta = deltas.setdefault((row.user_id, 'generated'), [0, 0])
+            delta[0] -= row.file_size or 0
+            delta[1] -= 1
+
+        db.session.execute(delete(table).where(table.c.id.in_([row.id for row in rows])))
+        record_usage(db.session.connection(), deltas)
+        # Bulk deletes bypass the ORM listener that bumps versions
+        project_ids = {row.project_id for row in rows if row.project_id}
+        if project_ids:
+            db.session.execute(
+                update(Project.__table__)
+                .where(Project.__table__.c.id.in_(project_ids))
+                .values(version=Project.__table__.c.version + 1)
+            )
+        db.session.commit()
+
+        metrics['deleted'] += len(rows)
+        metrics['bytes'] += sum(row.file_size or 0 for row in rows)
+        metrics['batches'] += 1
+        if len(rows) < batch_size:
+            break
+
+    metrics['backlog'] = expired_backlog(now)
+    metrics['duration_seconds'] = round(time.monotonic() - started, 3)
+    if metrics['deleted']:
+        logger.info(
+            f"Expiry sweep deleted {metrics['deleted']} file(s) in "
+            f"{metrics['duration_seconds']}s; backlog {metrics['backlog']}"
+        )
+    return metrics
@@ -0,0 +1,141 @@
+"""
+TREXIMA v2.0 - HTTP Helpers
+
+Streaming file responses from object storage with ETag revalidation
+and single byte-range requests, and conditional, compressed JSON
+responses for polled listings.
+"""
+
+import gzip
+import hashlib
+from typing import Any, Callable
+
+from flask import Response, request, jsonify
+
+from trexima.web.storage import storage_service
+
+# JSON bodies smaller than this are sent uncompressed
+GZIP_MIN_BYTES = 1024
+GZIP_LEVEL = 6
+
+
+def send_storage_file(key: str, filename: str, content_type: str = None) -> Response:
+    """
+    Stream a stored file as an attachment.
+
+    Answers If-None-Match with 304 and a single Range (honouring If-Range)
+    with 206; multi-range requests get the whole file. Content is read in
+    chunks, so memory use does not depend on the file size.
+
+    Args:
+        key: Storage key
+        filename: Download filename
+        content_type: MIME type (default: stored type or octet-stream)
+
+    Returns:
+        Flask response
+
+    Raises:
+        FileNotFoundError: If the file doesn't exist
+    """
+    info = storage_service.get_file_info(key)
+    if info is None:
+        raise FileNotFoundError(f"File not found: {key}")
+
+    size = info['size']
+    etag = info['etag']
+    headers = {
+        'ETag': f'"{etag}"',
+        'Accept-Ranges': 'bytes',
+        'Cache-Control': 'private, no-cache',
+        'Content-Disposition': f'attachment; filename="{filename}"'
+    }
+    mimetype = content_type or info.get('content_type') or 'application/octet-stream'
+
+    if request.if_none_match.contains(etag):
+        return Response(status=304, headers=headers)
+
+    byte_range = request.range
+    if byte_range and len(byte_range.ranges) == 1 and _if_range_matches(etag):
+        bounds = byte_range.range_for_length(size)
+        if bounds is None:
+            headers['Content-Range'] = f'bytes */{size}'
+            return Response(status=416, headers=headers)
+
+        start, end = bounds
+        headers['Content-Range'] = f'bytes {start}-{end - 1}/{size}'
+        response = Response(
+            storage_service.iter_file(key, start, end),
+            status=206, headers=headers, mimetype=mimetype, direct_passthrough=True
+        )
+        response.content_length = end - start
+        return response
+
+    response = Response(
+        storage_service.iter_file(key),
+        status=200, headers=headers, mimetype=mimetype, direct_passthrough=True
+    )
+    response.content_length = size
+    return response
+
+
+def is_complete_download(response: Response) -> bool:
+    """Check if a response sends a file from its first byte."""
+    if response.status_code == 200:
+        return True
+    return response.status_code == 206 and response.headers['Content-Range'].startswith('bytes 0-')
+
+
+def _if_range_matches(etag: str) -> bool:
+    """A Range only applies if If-Range is absent or names the current ETag."""
+    if_range = request.if_range
+    if not if_range.etag and not if_range.date:
+        return True
+    return if_range.etag == etag
+
+
+def make_etag(*parts: Any) -> str:
+    """Build an ETag from values that identify a representation."""
+    return hashlib.sha1(repr(parts).encode('utf-8')).hexdigest()
+
+
+def conditional_json(etag: str, build: Callable[[], Any]) -> Response:
+    """
+    JSON response revalidated by a (weak) ETag.
+
+    If-None-Match naming the ETag is answered with 304 without calling
+    build, so unchanged polls skip serialization. Larger bodies are
+    gzip-compressed if the client accepts it.
+
+    Args:
+        etag: ETag of the current representation (see make_etag)
+        build: Returns the payload to serialize
+
+    Returns:
+        Flask response
+    """
+    if request.if_none_match.contains_weak(etag):
+        response = Response(status=304)
+    else:
+        response = compress(jsonify(build()))
+    response.set_etag(etag, weak=True)
+    response.headers['Cache-Control'] = 'private, no-cache'
+    response.vary.add('Accept-Encoding')
+    return response
+
+
+def compress(response: Response) -> Response:
+    """Gzip a buffered response body if the client accepts gzip."""
+    if (
+        response.direct_passthrough
+        or 'Content-Encoding' in response.headers
+        or 'gzip' not in request.accept_encodings
+    ):
+        return response
+    body = response.get_data()
+    if len(body) < GZIP_MIN_BYTES:
+        return response
+    response.set_data(gzip.compress(body, compresslevel=GZIP_LEVEL))
+    response.headers['Content-Encoding'] = 'gzip'
+    response.vary.add('Accept-Encoding')
+    return response
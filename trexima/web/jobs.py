@@ -0,0 +1,776 @@
+"""
+TREXIMA v2.0 - Job Executor
+
+Runs export/import jobs outside the web worker's event loop.
+Jobs are persisted in the jobs table; a pool of worker processes claims
+and executes them, and progress events are relayed back to Socket.IO
+through a multiprocessing queue.
+
+Set JOB_WORKERS=0 to run jobs as background tasks in the web process
+(development and tests). Which queued job starts next is decided by the
+FairShareScheduler (see trexima.web.scheduler).
+"""
+
+import logging
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Dict, Any, Optional, Callable, List
+
+from flask import has_app_context, current_app
+
+from trexima.core.cancellation import OperationCancelled
+from trexima.web.models import db, Job, generate_uuid
+from trexima.web.scheduler import FairShareScheduler
+
+logger = logging.getLogger(__name__)
+
+# Set in worker processes so they never start workers themselves
+WORKER_ENV_VAR = 'TREXIMA_JOB_WORKER'
+
+DEFAULT_JOB_WORKERS = 2
+POLL_INTERVAL_SECONDS = 1.0
+CANCEL_CHECK_INTERVAL_SECONDS = 1.0
+# Completed jobs per type used to estimate typical durations
+DURATION_SAMPLE_SIZE = 20
+
+# Running jobs refresh heartbeat_at this often; jobs whose heartbeat is
+# older than the timeout were interrupted and get requeued
+HEARTBEAT_INTERVAL_SECONDS = 30
+HEARTBEAT_TIMEOUT_SECONDS = 120
+DEFAULT_JOB_MAX_ATTEMPTS = 3
+
+# Registered job handlers by job type
+_handlers: Dict[str, Callable[..., Any]] = {}
+
+# Called with the job payload when an interrupted job is given up
+_abandon_handlers: Dict[str, Callable[..., Any]] = {}
+
+# Job executed by this process (worker processes run one job at a time)
+_current_job_id: Optional[str] = None
+
+# Executor of this process (web process only)
+_executor: Optional['JobExecutor'] = None
+_executor_lock = threading.Lock()
+
+# Scheduler of this process, created from app config on first use
+_scheduler: Optional[FairShareScheduler] = None
+
+# Cached cancellation lookups: project_id -> (checked_at, cancelled)
+_cancel_cache: Dict[str, tuple] = {}
+
+
+# =============================================================================
+# HANDLER REGISTRY
+# =============================================================================
+
+def job_handler(job_type: str, on_abandon: Callable[..., Any] = None):
+    """
+    Register a function as the handler for a job type.
+
+    The handler is called with the job payload as keyword arguments and
+    returns False if the job failed. Interrupted jobs are retried, so
+    handlers should resume from current_checkpoint().
+
+    Args:
+        job_type: Job type the handler runs
+        on_abandon: Called with the payload when an interrupted job runs
+            out of attempts, to reset whatever the handler would have
+    """
+    def decorator(func):
+        _handlers[job_type] = func
+        if on_abandon is not None:
+            _abandon_handlers[job_type] = on_abandon
+        return func
+    return decorator
+
+
+def get_job_handler(job_type: str) -> Optional[Callable[..., Any]]:
+    """Get the handler registered for a job type."""
+    if job_type not in _handlers:
+        # Handlers register themselves when their blueprint is imported
+        import trexima.web.blueprints.export_bp  # noqa: F401
+        import trexima.web.blueprints.import_bp  # noqa: F401
+    return _handlers.get(job_type)
+
+
+@contextmanager
+def job_app_context():
+    """
+    Reuse the current app context, or create an app in a worker process.
+
+    Inline jobs (JOB_WORKERS=0) run in the context of the web app that
+    dispatched them, so only spawned worker processes create an app.
+    """
+    if has_app_context():
+        yield current_app
+        return
+
+    from trexima.web.app import create_app
+    app = create_app()
+    with app.app_context():
+        yield app
+
+
+# =============================================================================
+# CHECKPOINTS
+# =============================================================================
+
+class JobCheckpoint:
+    """
+    Completed stages of a job and the data needed to resume after them.
+
+    Stored in Job.checkpoint through separate engine connections so saving
+    a checkpoint never commits the handler's own session.
+    """
+
+    def __init__(self, job_id: Optional[str] = None, state: Optional[Dict[str, Any]] = None):
+        self.job_id = job_id
+        self.stages: Dict[str, Any] = dict((state or {}).get('stages', {}))
+        self.stage: Optional[str] = (state or {}).get('stage')
+
+    @property
+    def resumed(self) -> bool:
+        """Whether an earlier attempt completed any stage."""
+        return bool(self.stages)
+
+    def get(self, stage: str) -> Optional[Dict[str, Any]]:
+        """Get the data saved with a completed stage, or None."""
+        return self.stages.get(stage)
+
+    def save(self, stage: str, **data):
+        """Mark a stage completed with the data needed to skip it."""
+        self.stages[stage] = data
+        self.stage = stage
+        if self.job_id is None:
+            return
+        from sqlalchemy import update
+        with db.engine.begin() as conn:
+            conn.execute(
+                update(Job.__table__)
+                .where(Job.__table__.c.id == self.job_id)
+                .values(checkpoint={'stage': stage, 'stages': self.stages})
+            )
+
+    def artifact_key(self, user_id: str, project_id: str, name: str) -> Optional[str]:
+        """Storage key for a checkpoint artifact, or None outside a job."""
+        if self.job_id is None:
+            return None
+        return f"users/{user_id}/projects/{project_id}/jobs/{self.job_id}/{name}"
+
+
+def current_checkpoint() -> JobCheckpoint:
+    """
+    Get the checkpoint of the job being executed.
+
+    Outside a job (e.g. a handler called directly) this is an in-memory
+    checkpoint that is never persisted.
+    """
+    if _current_job_id is None:
+        return JobCheckpoint()
+    job = db.session.get(Job, _current_job_id)
+    return JobCheckpoint(_current_job_id, job.checkpoint if job else None)
+
+
+def _heartbeat(engine, job_id: str, stop: threading.Event):
+    """Refresh the heartbeat of a running job until stopped."""
+    from sqlalchemy import update
+    while not stop.wait(HEARTBEAT_INTERVAL_SECONDS):
+        try:
+            with engine.begin() as conn:
+                conn.execute(
+                    update(Job.__table__)
+                    .where(Job.__table__.c.id == job_id)
+                    .values(heartbeat_at=datetime.utcnow())
+                )
+        except Exception as e:
+            logger.warning(f"Heartbeat failed for job {job_id}: {e}")
+
+
+# =============================================================================
+# QUEUE OPERATIONS
+# =============================================================================
+
+def enqueue_job(
+    job_type: str,
+    project_id: str,
+    user_id: str,
+    payload: Dict[str, Any],
+    tenant: Optional[str] = None,
+    job_id: Optional[str] = None
+) -> Job:
+    """
+    Persist a job and hand it to the executor.
+
+    Args:
+        job_type: Registered job type ('export', 'import')
+        project_id: Project the job belongs to
+        user_id: User who started the job
+        payload: JSON-serializable handler arguments
+        tenant: SF tenant the job talks to (see scheduler.tenant_key)
+        job_id: Id of the job, for storing its artifacts before it is
+            queued (default: a new id)
+
+    Returns:
+        The queued Job
+    """
+    job = Job(
+        id=job_id or generate_uuid(),
+        job_type=job_type,
+        project_id=project_id,
+        user_id=user_id,
+        payload=payload,
+        tenant=tenant,
+        status='queued'
+    )
+    db.session.add(job)
+    db.session.commit()
+
+    logger.info(f"Queued {job_type} job {job.id} for project {project_id}")
+
+    if _executor is None or _executor.inline:
+        _dispatch_inline()
+    publish_queue_positions()
+
+    return job
+
+
+def has_active_job(project_id: str) -> bool:
+    """Check if a project has a queued or running job."""
+    return Job.query.filter(
+        Job.project_id == project_id,
+        Job.status.in_(Job.ACTIVE_STATUSES)
+    ).first() is not None
+
+
+def get_active_job(project_id: str) -> Optional[Job]:
+    """Get the queued or running job of a project."""
+    return Job.query.filter(
+        Job.project_id == project_id,
+        Job.status.in_(Job.ACTIVE_STATUSES)
+    ).order_by(Job.created_at.desc()).first()
+
+
+def request_cancel(project_id: str) -> bool:
+    """
+    Flag the active job of a project for cancellation.
+
+    Returns:
+        True if there was an active job
+    """
+    updated = Job.query.filter(
+        Job.project_id == project_id,
+        Job.status.in_(Job.ACTIVE_STATUSES)
+    ).update({'cancel_requested': True}, synchronize_session=False)
+    db.session.commit()
+    _cancel_cache.pop(project_id, None)
+
+    # Queued jobs with a cancellation are released at once so their
+    # handlers can clean up; workers pick them up on their next poll
+    if updated and (_executor is None or _executor.inline):
+        _dispatch_inline()
+    return updated > 0
+
+
+def is_cancel_requested(project_id: str) -> bool:
+    """Check the job table for a cancellation request (cached briefly)."""
+    now = time.monotonic()
+    cached = _cancel_cache.get(project_id)
+    if cached and now - cached[0] < CANCEL_CHECK_INTERVAL_SECONDS:
+        return cached[1]
+
+    try:
+        cancelled = Job.query.filter(
+            Job.project_id == project_id,
+            Job.status.in_(Job.ACTIVE_STATUSES),
+            Job.cancel_requested.is_(True)
+        ).first() is not None
+    except Exception as e:
+        logger.debug(f"Cancel check failed for project {project_id}: {e}")
+        cancelled = False
+
+    _cancel_cache[project_id] = (now, cancelled)
+    return cancelled
+
+
+def get_scheduler() -> FairShareScheduler:
+    """Get the scheduler, configured from the current app."""
+    global _scheduler
+    if _scheduler is None:
+        _scheduler = FairShareScheduler.from_config(current_app.config)
+    return _scheduler
+
+
+def _scheduling_state(scheduler: FairShareScheduler):
+    """Load queued jobs, running jobs and per-user usage."""
+    queued = Job.query.filter_by(status='queued').order_by(Job.created_at).all()
+    running = Job.query.filter_by(status='running').all()
+    window_start = datetime.utcnow() - timedelta(seconds=scheduler.fairness_window)
+    recent = Job.query.filter(
+        Job.finished_at >= window_start,
+        Job.started_at.isnot(None)
+    ).all()
+    usage = scheduler.usage_since(running + recent)
+    return queued, running, usage
+
+
+def claim_next_job(worker_id: str) -> Optional[Job]:
+    """
+    Atomically claim the next job chosen by the scheduler.
+
+    Returns:
+        The claimed Job, or None if no queued job may start now
+    """
+    scheduler = get_scheduler()
+
+    while True:
+        queued, running, usage = _scheduling_state(scheduler)
+        candidate = scheduler.select_next(queued, running, usage)
+        if candidate is None:
+            return None
+
+        now = datetime.utcnow()
+        claimed = Job.query.filter_by(id=candidate.id, status='queued').update({
+            'status': 'running',
+            'worker_id': worker_id,
+            'started_at': now,
+            'heartbeat_at': now,
+            'attempts': Job.attempts + 1
+        }, synchronize_session=False)
+        db.session.commit()
+
+        if not claimed:
+            # Another worker won the race; try the next one
+            continue
+
+        job = db.session.get(Job, candidate.id)
+        db.session.refresh(job)
+
+        # Another worker may have claimed a job for the same user or tenant
+        # at the same time; give this one back if that broke a limit
+        running = Job.query.filter(Job.status == 'running', Job.id != job.id).all()
+        if not job.cancel_requested and not scheduler.admits(job, running):
+            Job.query.filter_by(id=job.id, status='running').update({
+                'status': 'queued',
+                'worker_id': None,
+                'started_at': None,
+                'attempts': Job.attempts - 1
+            }, synchronize_session=False)
+            db.session.commit()
+            return None
+
+        publish_queue_positions()
+        return job
+
+
+def typical_durations() -> Dict[str, float]:
+    """Average run time in seconds of recently completed jobs, by type."""
+    durations = {}
+    for (job_type,) in db.session.query(Job.job_type).distinct():
+        samples = Job.query.filter(
+            Job.job_type == job_type,
+            Job.status == 'completed',
+            Job.started_at.isnot(None),
+            Job.finished_at.isnot(None)
+        ).order_by(Job.finished_at.desc()).limit(DURATION_SAMPLE_SIZE).all()
+        if samples:
+            durations[job_type] = sum(
+                (j.finished_at - j.started_at).total_seconds() for j in samples
+            ) / len(samples)
+    return durations
+
+
+def get_queue_forecast() -> List[Dict[str, Any]]:
+    """
+    Get queued jobs in expected start order with estimated start times.
+
+    Returns:
+        List of job dicts with queue_position and estimated_start added
+    """
+    scheduler = get_scheduler()
+    queued, running, usage = _scheduling_state(scheduler)
+    if not queued:
+        return []
+
+    forecast = scheduler.plan(queued, running, usage, typical_durations())
+    planned = {job.id for job, _ in forecast}
+
+    entries = []
+    for position, (job, start) in enumerate(forecast, start=1):
+        entry = job.to_dict()
+        entry['queue_position'] = position
+        entry['estimated_start'] = start.isoformat()
+        entries.append(entry)
+    # Jobs the limits never admit (e.g. a limit of zero)
+    for job in queued:
+        if job.id not in planned:
+            entry = job.to_dict()
+            entry['queue_position'] = len(entries) + 1
+            entry['estimated_start'] = None
+            entries.append(entry)
+    return entries
+
+
+def publish_queue_positions():
+    """Push queue position and estimated start to waiting projects."""
+    from trexima.web.websocket import emit_progress, get_steps_for_operation
+
+    try:
+        forecast = get_queue_forecast()
+    except Exception as e:
+        logger.warning(f"Could not compute queue positions: {e}")
+        return
+
+    for entry in forecast:
+        position = entry['queue_position']
+        emit_progress(
+            project_id=entry['project_id'],
+            operation=entry['job_type'],
+            step=0,
+            total_steps=len(get_steps_for_operation(entry['job_type'])),
+            step_name='Queued',
+            percent=0,
+            message=f"Waiting in queue (position {position} of {len(forecast)})",
+            details={
+                'job_id': entry['id'],
+                'queue_position': position,
+                'queue_length': len(forecast),
+                'estimated_start': entry['estimated_start']
+            }
+        )
+
+
+def set_job_priority(job_id: str, priority: int) -> Optional[Job]:
+    """
+    Change the priority of a queued job.
+
+    Returns:
+        The updated Job, or None if no such queued job exists
+    """
+    job = Job.query.filter_by(id=job_id, status='queued').first()
+    if job is None:
+        return None
+    job.priority = priority
+    db.session.commit()
+    publish_queue_positions()
+    return job
+
+
+def run_job(job: Job) -> None:
+    """Execute a claimed job and record its outcome."""
+    global _current_job_id
+    handler = get_job_handler(job.job_type)
+    job_id = job.id
+
+    if handler is None:
+        _finish_job(job_id, 'failed', error=f"No handler for job type '{job.job_type}'")
+        return
+
+    resumed_from = (job.checkpoint or {}).get('stage')
+    logger.info(
+        f"Running {job.job_type} job {job_id} for project {job.project_id} "
+        f"(attempt {job.attempts}{f', resuming after {resumed_from}' if resumed_from else ''})"
+    )
+
+    stop_heartbeat = threading.Event()
+    threading.Thread(
+        target=_heartbeat, args=(db.engine, job_id, stop_heartbeat), daemon=True
+    ).start()
+    _current_job_id = job_id
+    try:
+        outcome = handler(**(job.payload or {}))
+    except OperationCancelled:
+        logger.info(f"Job {job_id} cancelled")
+        db.session.rollback()
+        _finish_job(job_id, 'cancelled')
+        return
+    except Exception as e:
+        logger.exception(f"Job {job_id} crashed")
+        db.session.rollback()
+        _finish_job(job_id, 'failed', error=str(e))
+        return
+    finally:
+        _current_job_id = None
+        stop_heartbeat.set()
+
+    job = db.session.get(Job, job_id)
+    if outcome is False:
+        status = 'cancelled' if job and job.cancel_requested else 'failed'
+    else:
+        status = 'completed'
+    _finish_job(job_id, status)
+
+
+def _finish_job(job_id: str, status: str, error: str = None):
+    """Mark a job as finished."""
+    job = db.session.get(Job, job_id)
+    if job is None:
+        return
+    job.status = status
+    job.error = error
+    job.finished_at = datetime.utcnow()
+    db.session.commit()
+    _cancel_cache.pop(job.project_id, None)
+    logger.info(f"Job {job_id} {status}")
+
+
+def _dispatch_inline():
+    """Start every job the scheduler admits as a web-process background task."""
+    from trexima.web.websocket import socketio
+
+    # Jobs run with the app that dispatches them, never a new one: that
+    # would reset the operation registry, token cache and Socket.IO setup
+    app = current_app._get_current_object() if has_app_context() else _executor.app
+    worker_id = f"inline-{os.getpid()}"
+    requeue_stale_jobs()
+    while True:
+        job = claim_next_job(worker_id)
+        if job is None:
+            return
+        socketio.start_background_task(_run_inline, app, job.id)
+
+
+def _run_inline(app, job_id: str):
+    """Run a claimed job as a background task of the web process."""
+    with app.app_context():
+        job = db.session.get(Job, job_id)
+        if job is None or job.status != 'running':
+            return
+        run_job(job)
+        # A slot is free now
+        _dispatch_inline()
+        publish_queue_positions()
+
+
+def requeue_stale_jobs() -> int:
+    """
+    Requeue running jobs whose worker stopped sending heartbeats.
+
+    Requeued jobs keep their checkpoint and resume from it. Jobs that
+    used up JOB_MAX_ATTEMPTS are failed and their abandon handler is
+    called.
+
+    Returns:
+        Number of stale jobs found
+    """
+    max_attempts = int(current_app.config.get(
+        'JOB_MAX_ATTEMPTS', os.environ.get('JOB_MAX_ATTEMPTS', DEFAULT_JOB_MAX_ATTEMPTS)
+    ))
+    cutoff = datetime.utcnow() - timedelta(seconds=HEARTBEAT_TIMEOUT_SECONDS)
+    stale = Job.query.filter(
+        Job.status == 'running',
+        db.or_(Job.heartbeat_at < cutoff, Job.heartbeat_at.is_(None))
+    ).all()
+
+    for job in stale:
+        if job.attempts < max_attempts and not job.cancel_requested:
+            updated = Job.query.filter_by(id=job.id, status='running', worker_id=job.worker_id).update({
+                'status': 'queued',
+                'worker_id': None
+            }, synchronize_session=False)
+            db.session.commit()
+            if updated:
+                logger.warning(f"Requeued interrupted job {job.id} (attempt {job.attempts})")
+            continue
+
+        updated = Job.query.filter_by(id=job.id, status='running', worker_id=job.worker_id).update({
+            'status': 'failed',
+            'error': f"Interrupted {job.attempts} time(s); giving up",
+            'finished_at': datetime.utcnow()
+        }, synchronize_session=False)
+        db.session.commit()
+        if not updated:
+            continue
+
+        logger.warning(f"Failed interrupted job {job.id} after {job.attempts} attempt(s)")
+        on_abandon = _abandon_handlers.get(job.job_type)
+        if on_abandon is None:
+            get_job_handler(job.job_type)  # Imports the handler modules
+            on_abandon = _abandon_handlers.get(job.job_type)
+        if on_abandon is not None:
+            try:
+                on_abandon(**(job.payload or {}))
+            except Exception as e:
+                logger.error(f"Abandon handler failed for job {job.id}: {e}")
+                db.session.rollback()
+
+    return len(stale)
+
+
+# =============================================================================
+# WORKER PROCESSES
+# =============================================================================
+
+def _worker_main(worker_id: str, channel, parent_pid: int):
+    """Entry point of a job worker process."""
+    os.environ[WORKER_ENV_VAR] = '1'
+
+    # Importing the app module creates the WSGI app; reuse it
+    from trexima.web.app import application as app
+    from trexima.web.websocket import set_event_channel, set_cancel_check
+    from trexima.web.maintenance import run_due_tasks
+
+    set_event_channel(channel)
+    set_cancel_check(is_cancel_requested)
+
+    logger.info(f"Job worker {worker_id} started (pid {os.getpid()})")
+
+    with app.app_context():
+        last_stale_check = 0.0
+        while os.getppid() == parent_pid:
+            if time.monotonic() - last_stale_check > HEARTBEAT_INTERVAL_SECONDS:
+                last_stale_check = time.monotonic()
+                try:
+                    requeue_stale_jobs()
+                except Exception as e:
+                    logger.error(f"Worker {worker_id} could not check stale jobs: {e}")
+                    db.session.rollback()
+
+            try:
+                job = claim_next_job(worker_id)
+            except Exception as e:
+                logger.error(f"Worker {worker_id} could not claim a job: {e}")
+                db.session.rollback()
+                job = None
+
+            if job is None:
+                try:
+                    run_due_tasks(worker_id)
+                except Exception as e:
+                    logger.error(f"Worker {worker_id} could not run maintenance: {e}")
+                    db.session.rollback()
+                time.sleep(POLL_INTERVAL_SECONDS)
+                continue
+
+            run_job(job)
+            publish_queue_positions()
+            db.session.remove()
+
+    logger.info(f"Job worker {worker_id} exiting: parent process is gone")
+
+
+class JobExecutor:
+    """
+    Pool of job worker processes plus the relay that forwards their
+    progress events to Socket.IO.
+    """
+
+    def __init__(self, app, worker_count: int):
+        self.app = app
+        self.worker_count = worker_count
+        self.inline = worker_count <= 0
+        self.processes: List[multiprocessing.Process] = []
+        self._context = multiprocessing.get_context('spawn')
+        self._channel = self._context.Queue() if not self.inline else None
+
+    def start(self):
+        """Start worker processes and the event relay."""
+        if self.inline:
+            logger.info("Job executor running inline (JOB_WORKERS=0)")
+            return
+
+        for index in range(self.worker_count):
+            self._start_worker(index)
+
+        from trexima.web.websocket import socketio
+        socketio.start_background_task(self._relay_events)
+        logger.info(f"Job executor started {self.worker_count} worker process(es)")
+
+    def _start_worker(self, index: int):
+        worker_id = f"worker-{os.getpid()}-{index}"
+        process = self._context.Process(
+            target=_worker_main,
+            args=(worker_id, self._channel, os.getpid()),
+            name=worker_id,
+            daemon=True
+        )
+        process.start()
+        if index < len(self.processes):
+            self.processes[index] = process
+        else:
+            self.processes.append(process)
+
+    def _relay_events(self):
+        """Forward worker events to Socket.IO and restart dead workers."""
+        from trexima.web.websocket import socketio, relay_event
+
+        last_health_check = time.monotonic()
+        while True:
+            try:
+                kind, payload = self._channel.get_nowait()
+            except queue.Empty:
+                socketio.sleep(0.05)
+            except Exception as e:
+                logger.error(f"Job event relay error: {e}")
+                socketio.sleep(0.5)
+            else:
+                try:
+                    relay_event(kind, payload)
+                except Exception as e:
+                    logger.error(f"Could not relay {kind} event: {e}")
+
+            if time.monotonic() - last_health_check > 5:
+                last_health_check = time.monotonic()
+                for index, process in enumerate(self.processes):
+                    if not process.is_alive():
+                        logger.warning(f"Job worker {process.name} died; restarting")
+                        self._start_worker(index)
+
+    def status(self) -> Dict[str, Any]:
+        """Get executor status for health checks."""
+        return {
+            'mode': 'inline' if self.inline else 'processes',
+            'workers': self.worker_count,
+            'alive': sum(1 for p in self.processes if p.is_alive())
+        }
+
+
+def get_executor() -> Optional[JobExecutor]:
+    """Get the job executor of this process, if started."""
+    return _executor
+
+
+def init_jobs(app) -> Optional[JobExecutor]:
+    """
+    Initialize the job executor with the Flask app.
+
+    Worker processes are started once per web process; worker processes
+    themselves only get the cancellation hooks.
+    """
+    global _executor
+    from trexima.web.websocket import set_cancel_check
+
+    if os.environ.get(WORKER_ENV_VAR):
+        return None
+
+    set_cancel_check(is_cancel_requested, request_cancel)
+
+    with _executor_lock:
+        if _executor is not None:
+            return _executor
+
+        default_workers = 0 if app.config.get('TESTING') else DEFAULT_JOB_WORKERS
+        worker_count = int(app.config.get(
+            'JOB_WORKERS', os.environ.get('JOB_WORKERS', default_workers)
+        ))
+
+        with app.app_context():
+            try:
+                interrupted = requeue_stale_jobs()
+                if interrupted:
+                    logger.warning(f"Found {interrupted} interrupted job(s)")
+            except Exception as e:
+                logger.warning(f"Could not check for interrupted jobs: {e}")
+
+        _executor = JobExecutor(app, worker_count)
+        _executor.start()
+
+        # Worker processes run maintenance tasks while idle
+        if _executor.inline and not app.config.get('TESTING'):
+            from trexima.web.maintenance import start_maintenance_loop
+            start_maintenance_loop(app)
+        return _executor
@@ -0,0 +1,219 @@
+"""
+TREXIMA v2.0 - Label Search
+
+Label indexes (see trexima.core.label_index) of uploaded data models.
+
+Each uploaded model gets its own index, built in a background task after
+the upload (or on first search) and stored next to the model's blob as
+"<blob key>.labels.json.gz". Parsing runs in a native thread when served
+by eventlet, so a build does not block the hub. Blobs never
+change, so an index stays valid as long as its blob exists; projects
+sharing a model share its index. Deleting the last reference to a blob
+deletes its index, and the orphan scan counts the index as referenced by
+the blob's rows. Loaded indexes are kept per process, up to
+LABEL_INDEX_CACHE_SIZE of them.
+"""
+
+import logging
+import os
+import shutil
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional
+
+from trexima.config import AppPaths
+from trexima.core.datamodel_processor import DataModelProcessor
+from trexima.core.label_index import LabelIndex
+from trexima.web.models import db, ProjectFile
+from trexima.web.storage import storage_service
+
+logger = logging.getLogger(__name__)
+
+LABEL_INDEX_SUFFIX = '.labels.json.gz'
+
+# Loaded indexes kept per process
+DEFAULT_CACHE_SIZE = 32
+
+# index key -> LabelIndex
+_indexes: 'OrderedDict[str, LabelIndex]' = OrderedDict()
+_indexes_lock = threading.Lock()
+
+# index key -> lock held while the index is loaded or built
+_loading: Dict[str, threading.Lock] = {}
+
+
+def label_index_key(storage_key: str) -> str:
+    """Get the storage key of a model file's label index."""
+    return storage_key + LABEL_INDEX_SUFFIX
+
+
+def source_key_of(key: str) -> Optional[str]:
+    """Get the model file key a label index key belongs to, or None."""
+    return key[:-len(LABEL_INDEX_SUFFIX)] if key.endswith(LABEL_INDEX_SUFFIX) else None
+
+
+def _cache_size() -> int:
+    from flask import current_app
+    return int(current_app.config.get(
+        'LABEL_INDEX_CACHE_SIZE', os.environ.get('LABEL_INDEX_CACHE_SIZE', DEFAULT_CACHE_SIZE)
+    ))
+
+
+def _remember(key: str, index: LabelIndex):
+    # Caller holds _indexes_lock
+    _indexes[key] = index
+    _indexes.move_to_end(key)
+    while len(_indexes) > max(_cache_size(), 1):
+        _indexes.popitem(last=False)
+
+
+def _off_hub(func, *args):
+    """Run blocking work in a native thread when eventlet is serving."""
+    try:
+        from eventlet import patcher, tpool
+    except ImportError:
+        return func(*args)
+    if patcher.is_monkey_patched('thread'):
+        return tpool.execute(func, *args)
+    return func(*args)
+
+
+def _build(storage_key: str, file_name: str) -> LabelIndex:
+    temp_dir = tempfile.mkdtemp(prefix='trexima_labels_')
+    try:
+        file_path = os.path.join(temp_dir, file_name)
+        storage_service.download_to_file(storage_key, file_path)
+        processor = DataModelProcessor(AppPaths(app_dir=temp_dir))
+        processor.load_data_model(file_path)
+        return LabelIndex.build(processor)
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+def build_label_index(file: ProjectFile) -> LabelIndex:
+    """Parse a model file and index its labels."""
+    # PM templates are named after their file
+    file_name = os.path.basename(file.original_name) or f"{file.id}.xml"
+    return _off_hub(_build, file.storage_key, file_name)
+
+
+def _read(key: str) -> Optional[LabelIndex]:
+    try:
+        return LabelIndex.from_bytes(storage_service.download_file(key))
+    except FileNotFoundError:
+        return None
+    except ValueError as e:
+        logger.info(f"Rebuilding label index {key}: {e}")
+        return None
+
+
+def get_label_index(file: ProjectFile) -> LabelIndex:
+    """
+    Get the label index of a model file: loaded, stored or newly built.
+
+    A newly built index is stored; failing to store it is not an error.
+    """
+    key = label_index_key(file.storage_key)
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is not None:
+            _indexes.move_to_end(key)
+            return index
+        lock = _loading.setdefault(key, threading.Lock())
+
+    # One load or build per index at a time in this process; the loading
+    # entry is dropped only once the cache is filled (or the build failed)
+    with lock:
+        try:
+            with _indexes_lock:
+                index = _indexes.get(key)
+            if index is None:
+                index = _off_hub(_read, key)
+                if index is None:
+                    index = build_label_index(file)
+                    try:
+                        storage_service.upload_bytes(index.to_bytes(), key, content_type='application/gzip')
+                    except Exception as e:
+                        logger.warning(f"Could not store label index {key}: {e}")
+                    logger.info(f"Indexed {len(index)} elements of {file.original_name}")
+                with _indexes_lock:
+                    _remember(key, index)
+        finally:
+            with _indexes_lock:
+                if _loading.get(key) is lock:
+                    _loading.pop(key)
+    return index
+
+
+def schedule_label_indexes(app, file_ids: List[str]):
+    """
+    Build the label indexes of uploaded files in a background task.
+
+    Args:
+        app: Flask app (the task runs in its app context)
+        file_ids: ProjectFile ids; picklists are skipped
+    """
+    from trexima.web.websocket import socketio
+
+    def build():
+        try:
+            with app.app_context():
+                for file in ProjectFile.query.filter(ProjectFile.id.in_(file_ids)).all():
+                    if file.file_type != 'picklist':
+                        get_label_index(file)
+                db.session.remove()
+        except Exception as e:
+            logger.warning(f"Could not index uploaded files: {e}")
+
+    socketio.start_background_task(build)
+
+
+def forget_label_indexes():
+    """Drop the loaded indexes of this process."""
+    with _indexes_lock:
+        _indexes.clear()
+
+
+def search_project_labels(
+    files: List[ProjectFile],
+    query: str,
+    locale: Optional[str] = None,
+    missing: Optional[str] = None,
+    prefix: bool = True,
+    limit: int = 50
+) -> Dict[str, Any]:
+    """
+    Search the labels of a project's model files.
+
+    Args:
+        files: The project's files (picklists are skipped)
+        query, locale, missing, prefix: See LabelIndex.search()
+        limit: Maximum number of results over all files
+
+    Returns:
+        Dict with total, results (entries with file and section path)
+        and the locales found in the models
+    """
+    total = 0
+    results = []
+    locales = set()
+
+    for file in files:
+        if file.file_type == 'picklist':
+            continue
+        index = get_label_index(file)
+        locales.update(index.locales)
+        found = index.search(query, locale=locale, missing=missing, prefix=prefix,
+                             limit=max(limit - len(results), 0))
+        total += found['total']
+        for entry in found['entries']:
+            path = [entry['section'], entry['subsection'], entry['field']]
+            results.append({
+                **entry,
+                'file_id': file.id,
+                'file_name': file.original_name,
+                'path': ' > '.join(p for p in path if p)
+            })
+
+    return {'total': total, 'results': results, 'locales': sorted(locales)}
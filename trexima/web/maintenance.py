@@ -0,0 +1,299 @@
+"""
+TREXIMA v2.0 - Maintenance Tasks
+
+Periodic background work such as reconciling storage usage counters.
+
+Tasks register with @maintenance_task and run when their interval has
+passed. Job worker processes check for due tasks while idle (with
+JOB_WORKERS=0 a background task in the web process does). A lease in the
+maintenance_tasks table makes sure only one process runs a task at a
+time, across instances; the task's state (cursors, metrics) is kept in
+the same row.
+"""
+
+import logging
+import os
+import time
+from datetime import datetime, timedelta
+from typing import Dict, Any, Optional, List
+
+from sqlalchemy import update, insert, or_
+from sqlalchemy.exc import IntegrityError
+
+from trexima.web.models import db, MaintenanceTask
+from trexima.web.storage import storage_service
+from trexima.web.storage_usage import reconcile_storage_usage, RECONCILE_INTERVAL_SECONDS
+from trexima.web.orphans import reconcile_orphans
+from trexima.web.expiry import sweep_expired, SWEEP_INTERVAL_SECONDS
+
+logger = logging.getLogger(__name__)
+
+# How often idle processes look for due tasks
+CHECK_INTERVAL_SECONDS = 60
+# Default lease; long tasks extend it with TaskRun.save()
+DEFAULT_LEASE_SECONDS = 15 * 60
+
+# Registered tasks by name: (function, interval seconds, config key)
+_tasks: Dict[str, tuple] = {}
+
+_last_check = 0.0
+
+
+def maintenance_task(name: str, interval_seconds: int, config_key: str = None):
+    """
+    Register a function as a periodic maintenance task.
+
+    The function is called with a TaskRun and returns a dict that
+    replaces the task state.
+
+    Args:
+        name: Task name
+        interval_seconds: Default time between runs
+        config_key: Config/env key overriding the interval
+    """
+    def decorator(func):
+        _tasks[name] = (func, interval_seconds, config_key)
+        return func
+    return decorator
+
+
+class TaskRun:
+    """A run of a maintenance task holding its lease."""
+
+    def __init__(self, name: str, owner: str, state: Dict[str, Any]):
+        self.name = name
+        self.owner = owner
+        self.state = dict(state or {})
+
+    def save(self, **state):
+        """
+        Persist state (e.g. a cursor) and extend the lease.
+
+        Raises:
+            RuntimeError: If the lease was lost to another process
+        """
+        self.state.update(state)
+        table = MaintenanceTask.__table__
+        with db.engine.begin() as conn:
+            result = conn.execute(
+                update(table)
+                .where(table.c.name == self.name, table.c.locked_by == self.owner)
+                .values(
+                    state=self.state,
+                    locked_until=datetime.utcnow() + timedelta(seconds=DEFAULT_LEASE_SECONDS)
+                )
+            )
+        if not result.rowcount:
+            raise RuntimeError(f"Lost the lease of maintenance task {self.name}")
+
+
+def _interval(name: str) -> int:
+    _, interval, config_key = _tasks[name]
+    if config_key is None:
+        return interval
+    from flask import current_app
+    return int(current_app.config.get(config_key, os.environ.get(config_key, interval)))
+
+
+def _acquire(name: str, owner: str, interval: int) -> Optional[TaskRun]:
+    """Take the lease of a task if it is due and not running elsewhere."""
+    table = MaintenanceTask.__table__
+    now = datetime.utcnow()
+
+    with db.engine.begin() as conn:
+        try:
+            with conn.begin_nested():
+                conn.execute(insert(table).values(name=name, state={}))
+        except IntegrityError:
+            pass  # Exists already
+
+        result = conn.execute(
+            update(table)
+            .where(
+                table.c.name == name,
+                or_(table.c.locked_until.is_(None), table.c.locked_until < now),
+                or_(
+                    table.c.last_started_at.is_(None),
+                    table.c.last_started_at < now - timedelta(seconds=interval),
+                    # Interrupted run (lease expired): resume right away
+                    table.c.last_finished_at.is_(None),
+                    table.c.last_finished_at < table.c.last_started_at
+                )
+            )
+            .values(
+                locked_by=owner,
+                locked_until=now + timedelta(seconds=DEFAULT_LEASE_SECONDS),
+                last_started_at=now
+            )
+        )
+        if not result.rowcount:
+            return None
+        state = conn.execute(table.select().where(table.c.name == name)).first().state
+
+    return TaskRun(name, owner, state)
+
+
+def _release(run: TaskRun, state: Dict[str, Any], error: str = None):
+    table = MaintenanceTask.__table__
+    with db.engine.begin() as conn:
+        conn.execute(
+            update(table)
+            .where(table.c.name == run.name, table.c.locked_by == run.owner)
+            .values(
+                locked_by=None,
+                locked_until=None,
+                last_finished_at=datetime.utcnow(),
+                last_error=error,
+                state=state
+            )
+        )
+
+
+def run_task(name: str, owner: str) -> bool:
+    """
+    Run a task if it is due and no other process is running it.
+
+    Returns:
+        True if the task ran
+    """
+    func = _tasks[name][0]
+    run = _acquire(name, owner, _interval(name))
+    if run is None:
+        return False
+
+    started = time.monotonic()
+    logger.info(f"Maintenance task {name} started by {owner}")
+    try:
+        state = func(run)
+    except Exception as e:
+        logger.exception(f"Maintenance task {name} failed")
+        db.session.rollback()
+        _release(run, run.state, error=str(e))
+        return True
+
+    state = dict(state or run.state)
+    state['duration_seconds'] = round(time.monotonic() - started, 3)
+    _release(run, state)
+    logger.info(f"Maintenance task {name} finished in {state['duration_seconds']}s")
+    return True
+
+
+def run_due_tasks(owner: str, force_check: bool = False) -> List[str]:
+    """
+    Run all due tasks (checks at most every CHECK_INTERVAL_SECONDS).
+
+    Args:
+        owner: Name of this process, for the lease
+        force_check: Check even if the last check was recent
+
+    Returns:
+        Names of the tasks that ran
+    """
+    global _last_check
+    if not force_check and time.monotonic() - _last_check < CHECK_INTERVAL_SECONDS:
+        return []
+    _last_check = time.monotonic()
+
+    ran = []
+    for name in list(_tasks):
+        try:
+            if run_task(name, owner):
+                ran.append(name)
+        except Exception as e:
+            logger.error(f"Could not run maintenance task {name}: {e}")
+            db.session.rollback()
+    return ran
+
+
+def request_run(name: str, options: Dict[str, Any] = None) -> Optional[MaintenanceTask]:
+    """
+    Make a task due now; it runs on the next check.
+
+    Args:
+        name: Task name
+        options: Options for the run, stored as state['options']
+
+    Returns:
+        The task, or None if there is no such task
+    """
+    if name not in _tasks:
+        return None
+    task = db.session.get(MaintenanceTask, name)
+    if task is None:
+        task = MaintenanceTask(name=name, state={})
+        db.session.add(task)
+    if options is not None:
+        task.state = {**(task.state or {}), 'options': options}
+    task.last_started_at = None
+    db.session.commit()
+    return task
+
+
+def get_task(name: str) -> Optional[Dict[str, Any]]:
+    """Get status and state of a task, or None if there is no such task."""
+    if name not in _tasks:
+        return None
+    task = db.session.get(MaintenanceTask, name)
+    info = task.to_dict() if task else {'name': name, 'running': False, 'state': {}}
+    info['interval_seconds'] = _interval(name)
+    return info
+
+
+def list_tasks() -> List[Dict[str, Any]]:
+    """Get status and state of all registered tasks."""
+    return [get_task(name) for name in _tasks]
+
+
+def start_maintenance_loop(app):
+    """Check for due tasks in a background task of the web process."""
+    from trexima.web.websocket import socketio
+
+    owner = f"web-{os.getpid()}"
+
+    def loop():
+        while True:
+            socketio.sleep(CHECK_INTERVAL_SECONDS)
+            with app.app_context():
+                run_due_tasks(owner, force_check=True)
+                db.session.remove()
+
+    socketio.start_background_task(loop)
+
+
+# =============================================================================
+# TASKS
+# =============================================================================
+
+@maintenance_task(
+    'storage_usage',
+    interval_seconds=RECONCILE_INTERVAL_SECONDS,
+    config_key='STORAGE_USAGE_RECONCILE_SECONDS'
+)
+def reconcile_storage_usage_task(run: TaskRun) -> Dict[str, Any]:
+    """Recompute the storage usage counters and measure the bucket."""
+    result = reconcile_storage_usage(storage_service)
+    return {'corrected': result['corrected']}
+
+
+@maintenance_task(
+    'expiry_sweep',
+    interval_seconds=SWEEP_INTERVAL_SECONDS,
+    config_key='EXPIRY_SWEEP_INTERVAL_SECONDS'
+)
+def sweep_expired_task(run: TaskRun) -> Dict[str, Any]:
+    """Delete expired generated files; reports backlog and sweep duration."""
+    return sweep_expired(storage_service)
+
+
+@maintenance_task('orphan_scan', interval_seconds=24 * 3600, config_key='ORPHAN_SCAN_INTERVAL_SECONDS')
+def reconcile_orphans_task(run: TaskRun) -> Dict[str, Any]:
+    """
+    Find storage objects without database rows.
+
+    Scheduled runs are dry runs; deleting needs options {'dry_run': False}
+    (see request_run). Interrupted runs resume from their cursor.
+    """
+    options = run.state.get('options') or {}
+    result = reconcile_orphans(run, storage_service, dry_run=options.get('dry_run', True))
+    # Drops cursor, progress and options: the next run is a fresh dry run
+    return {'last_result': result}
@@ -5,14 +5,22 @@ SQLAlchemy models for PostgreSQL database.
 Handles users, projects, files, and generated outputs.
 """
 
+from flask import current_app, g, has_request_context
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import event, inspect
 from datetime import datetime, timedelta
 from typing import Optional, Dict, Any, List
+import os
 import uuid
 import json
 
 db = SQLAlchemy()
 
+# last_login is written at most this often per user
+LAST_LOGIN_UPDATE_SECONDS = 300
+# last_accessed_at of a project is written at most this often
+ACCESS_UPDATE_SECONDS = 300
+
 
 def generate_uuid() -> str:
     """Generate a new UUID string."""
@@ -66,9 +74,21 @@ class User(db.Model):
         """Check if user can create a new project."""
         return self.projects.count() < self.MAX_PROJECTS
 
-    def update_last_login(self) -> None:
-        """Update last login timestamp."""
-        self.last_login = datetime.utcnow()
+    def update_last_login(self, min_interval: int = 0) -> bool:
+        """
+        Update last login timestamp.
+
+        Args:
+            min_interval: Keep the timestamp if it is younger than this (seconds)
+
+        Returns:
+            True if the timestamp changed
+        """
+        now = datetime.utcnow()
+        if self.last_login and now - self.last_login < timedelta(seconds=min_interval):
+            return False
+        self.last_login = now
+        return True
 
 
 class Project(db.Model):
@@ -85,6 +105,8 @@ class Project(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
     last_accessed_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    # Bumped by touch() on every change of the project or its files (ETags)
+    version = db.Column(db.Integer, default=1, nullable=False)
 
     # Relationships
     files = db.relationship(
@@ -99,6 +121,12 @@ class Project(db.Model):
         lazy='dynamic',
         cascade='all, delete-orphan'
     )
+    jobs = db.relationship(
+        'Job',
+        backref='project',
+        lazy='dynamic',
+        cascade='all, delete-orphan'
+    )
 
     # Valid status values
     STATUSES = ['draft', 'configured', 'exported', 'imported']
@@ -109,8 +137,24 @@ class Project(db.Model):
     def __repr__(self) -> str:
         return f'<Project {self.name}>'
 
-    def to_dict(self, include_files: bool = True, include_config: bool = True) -> Dict[str, Any]:
-        """Convert project to dictionary."""
+    def to_dict(
+        self,
+        include_files: bool = True,
+        include_config: bool = True,
+        files: List['ProjectFile'] = None,
+        generated_files: List['GeneratedFile'] = None
+    ) -> Dict[str, Any]:
+        """
+        Convert project to dictionary.
+
+        Args:
+            include_files: Include file summary and generated files
+            include_config: Include the configuration
+            files: Preloaded uploaded files (default: queried)
+            generated_files: Preloaded generated files (default: queried)
+        """
+        if files is None:
+            files = self.files.all()
         data = {
             'id': self.id,
             'user_id': self.user_id,
@@ -120,22 +164,54 @@ class Project(db.Model):
             'created_at': self.created_at.isoformat() if self.created_at else None,
             'updated_at': self.updated_at.isoformat() if self.updated_at else None,
             'last_accessed_at': self.last_accessed_at.isoformat() if self.last_accessed_at else None,
-            'file_count': self.files.count()
+            'file_count': len(files)
         }
 
         if include_config:
             data['config'] = self.config or {}
 
         if include_files:
-            data['files'] = self.get_files_summary()
-            data['generated_files'] = [gf.to_dict() for gf in self.generated_files.all()]
+            if generated_files is None:
+                generated_files = self.generated_files.all()
+            data['files'] = self.get_files_summary(files)
+            data['generated_files'] = [gf.to_dict() for gf in generated_files]
 
         return data
 
-    def get_files_summary(self) -> Dict[str, Optional[Dict[str, Any]]]:
+    @classmethod
+    def to_dict_many(
+        cls,
+        projects: List['Project'],
+        include_files: bool = True,
+        include_config: bool = True
+    ) -> List[Dict[str, Any]]:
+        """
+        Convert projects to dictionaries, loading their files with one
+        query per table instead of several per project.
+        """
+        ids = [p.id for p in projects]
+        files = {pid: [] for pid in ids}
+        generated = {pid: [] for pid in ids}
+        if ids:
+            for f in ProjectFile.query.filter(ProjectFile.project_id.in_(ids)):
+                files[f.project_id].append(f)
+            if include_files:
+                for gf in GeneratedFile.query.filter(GeneratedFile.project_id.in_(ids)):
+                    generated[gf.project_id].append(gf)
+        return [
+            p.to_dict(
+                include_files=include_files,
+                include_config=include_config,
+                files=files[p.id],
+                generated_files=generated[p.id]
+            )
+            for p in projects
+        ]
+
+    def get_files_summary(self, files: List['ProjectFile'] = None) -> Dict[str, Optional[Dict[str, Any]]]:
         """Get summary of uploaded files by type."""
         summary = {ft: None for ft in self.FILE_TYPES}
-        for f in self.files.all():
+        for f in (self.files.all() if files is None else files):
             if f.file_type in summary:
                 summary[f.file_type] = {
                     'id': f.id,
@@ -166,12 +242,30 @@ class Project(db.Model):
         self.config['last_saved_at'] = datetime.utcnow().isoformat()
         # Mark as modified for SQLAlchemy to detect JSON change
         db.session.execute(
-            db.update(Project).where(Project.id == self.id).values(config=self.config)
+            db.update(Project).where(Project.id == self.id).values(
+                config=self.config, version=Project.version + 1
+            )
         )
 
     def touch(self) -> None:
-        """Update last_accessed_at timestamp."""
+        """Record a change: bump the version and update last_accessed_at."""
         self.last_accessed_at = datetime.utcnow()
+        if inspect(self).persistent:
+            self.version = Project.version + 1
+
+    def record_access(self) -> bool:
+        """
+        Update last_accessed_at (at most every ACCESS_UPDATE_SECONDS),
+        without bumping the version.
+
+        Returns:
+            True if the timestamp changed
+        """
+        now = datetime.utcnow()
+        if self.last_accessed_at and now - self.last_accessed_at < timedelta(seconds=ACCESS_UPDATE_SECONDS):
+            return False
+        self.last_accessed_at = now
+        return True
 
 
 class ProjectFile(db.Model):
@@ -184,6 +278,7 @@ class ProjectFile(db.Model):
     file_type = db.Column(db.String(50), nullable=False)  # sdm, cdm, ec_sdm, ec_cdm, picklist
     original_name = db.Column(db.String(255), nullable=False)
     storage_key = db.Column(db.String(512), nullable=False)  # Object Store key
+    content_hash = db.Column(db.String(64), index=True)  # SHA-256; storage_key is its shared blob
     file_size = db.Column(db.BigInteger, default=0)
     content_type = db.Column(db.String(100))
     uploaded_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
@@ -203,9 +298,15 @@ class ProjectFile(db.Model):
             'original_name': self.original_name,
             'file_size': self.file_size,
             'content_type': self.content_type,
+            'content_hash': self.content_hash,
             'uploaded_at': self.uploaded_at.isoformat() if self.uploaded_at else None
         }
 
+    @classmethod
+    def count_references(cls, content_hash: str) -> int:
+        """Count the files that share the blob of a content hash."""
+        return cls.query.filter_by(content_hash=content_hash).count()
+
     @staticmethod
     def detect_file_type(filename: str, content: bytes = None) -> Optional[str]:
         """
@@ -260,7 +361,7 @@ class GeneratedFile(db.Model):
     file_size = db.Column(db.BigInteger, default=0)
     content_type = db.Column(db.String(100))
     created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
-    expires_at = db.Column(db.DateTime, nullable=False)
+    expires_at = db.Column(db.DateTime, nullable=False, index=True)
     downloaded_count = db.Column(db.Integer, default=0, nullable=False)
     file_metadata = db.Column(db.JSON, default=dict)
 
@@ -306,13 +407,156 @@ class GeneratedFile(db.Model):
 
     @classmethod
     def cleanup_expired(cls) -> int:
-        """Delete expired files. Returns count of deleted files."""
-        expired = cls.query.filter(cls.expires_at < datetime.utcnow()).all()
-        count = len(expired)
-        for f in expired:
-            db.session.delete(f)
-        db.session.commit()
-        return count
+        """Delete expired files from storage and database. Returns count of deleted files."""
+        from trexima.web.expiry import sweep_expired
+        from trexima.web.storage import storage_service
+        return sweep_expired(storage_service)['deleted']
+
+
+class Job(db.Model):
+    """Job model - a queued export/import run executed by a job worker."""
+
+    __tablename__ = 'jobs'
+
+    id = db.Column(db.String(36), primary_key=True, default=generate_uuid)
+    job_type = db.Column(db.String(50), nullable=False)  # export, import
+    project_id = db.Column(db.String(36), db.ForeignKey('projects.id'), nullable=False, index=True)
+    user_id = db.Column(db.String(36), db.ForeignKey('users.id'), nullable=False, index=True)
+    status = db.Column(db.String(20), default='queued', nullable=False, index=True)
+    priority = db.Column(db.Integer, default=0, nullable=False)  # Higher runs first
+    tenant = db.Column(db.String(255), index=True)  # SF company@host the job talks to
+    payload = db.Column(db.JSON, default=dict)
+    result = db.Column(db.JSON)
+    error = db.Column(db.Text)
+    cancel_requested = db.Column(db.Boolean, default=False, nullable=False)
+    worker_id = db.Column(db.String(100))
+    attempts = db.Column(db.Integer, default=0, nullable=False)
+    checkpoint = db.Column(db.JSON)  # {'stage': ..., 'stages': {stage: data}} for resuming
+    heartbeat_at = db.Column(db.DateTime)  # Refreshed while a worker runs the job
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    started_at = db.Column(db.DateTime)
+    finished_at = db.Column(db.DateTime)
+
+    # Valid job statuses
+    VALID_STATUSES = ['queued', 'running', 'completed', 'failed', 'cancelled']
+    ACTIVE_STATUSES = ['queued', 'running']
+
+    def __repr__(self) -> str:
+        return f'<Job {self.job_type}: {self.status}>'
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert job to dictionary."""
+        return {
+            'id': self.id,
+            'job_type': self.job_type,
+            'project_id': self.project_id,
+            'user_id': self.user_id,
+            'status': self.status,
+            'priority': self.priority,
+            'tenant': self.tenant,
+            'error': self.error,
+            'cancel_requested': self.cancel_requested,
+            'worker_id': self.worker_id,
+            'attempts': self.attempts,
+            'checkpoint_stage': (self.checkpoint or {}).get('stage'),
+            'heartbeat_at': self.heartbeat_at.isoformat() if self.heartbeat_at else None,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None
+        }
+
+    @property
+    def is_active(self) -> bool:
+        """Check if job is waiting or running."""
+        return self.status in self.ACTIVE_STATUSES
+
+
+class ActiveOperation(db.Model):
+    """Active operation model - shared progress/cancel state of a running operation."""
+
+    __tablename__ = 'active_operations'
+
+    project_id = db.Column(db.String(36), primary_key=True)
+    operation = db.Column(db.String(50))  # export, import, connect
+    state = db.Column(db.JSON, default=dict)  # step, percent, message, details
+    cancelled = db.Column(db.Boolean, default=False, nullable=False)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False, index=True)
+
+    def __repr__(self) -> str:
+        return f'<ActiveOperation {self.project_id}: {self.operation}>'
+
+
+class StorageUsage(db.Model):
+    """
+    Storage usage counter - bytes and object count of one user (or '*' for
+    all users) in one category.
+
+    'uploads' and 'generated' count ProjectFile and GeneratedFile rows and
+    are updated in the same transaction as the rows; 'stored_*' categories
+    (global only) are what the periodic reconciler found in the bucket.
+    """
+
+    __tablename__ = 'storage_usage'
+
+    user_id = db.Column(db.String(36), primary_key=True)  # '*' = all users
+    category = db.Column(db.String(50), primary_key=True)
+    bytes = db.Column(db.BigInteger, default=0, nullable=False)
+    objects = db.Column(db.Integer, default=0, nullable=False)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+    ALL_USERS = '*'
+    CATEGORIES = ['uploads', 'generated']
+    STORED_CATEGORIES = ['stored_uploads', 'stored_generated', 'stored_other']
+
+    def __repr__(self) -> str:
+        return f'<StorageUsage {self.user_id}/{self.category}: {self.bytes}>'
+
+
+class MaintenanceTask(db.Model):
+    """MaintenanceTask model - schedule, lease and state of a periodic background task."""
+
+    __tablename__ = 'maintenance_tasks'
+
+    name = db.Column(db.String(100), primary_key=True)
+    locked_by = db.Column(db.String(100))
+    locked_until = db.Column(db.DateTime)
+    last_started_at = db.Column(db.DateTime)
+    last_finished_at = db.Column(db.DateTime)
+    last_error = db.Column(db.Text)
+    state = db.Column(db.JSON, default=dict)  # Task-defined: cursors, metrics
+
+    def __repr__(self) -> str:
+        return f'<MaintenanceTask {self.name}>'
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert task to dictionary."""
+        return {
+            'name': self.name,
+            'running': bool(self.locked_until and self.locked_until > datetime.utcnow()),
+            'last_started_at': self.last_started_at.isoformat() if self.last_started_at else None,
+            'last_finished_at': self.last_finished_at.isoformat() if self.last_finished_at else None,
+            'last_error': self.last_error,
+            'state': self.state or {}
+        }
+
+
+class SFCatalog(db.Model):
+    """SFCatalog model - cached catalog of a SuccessFactors tenant (see sf_catalog)."""
+
+    __tablename__ = 'sf_catalogs'
+
+    tenant_key = db.Column(db.String(64), primary_key=True)  # SHA-256 of endpoint, company, user
+    data = db.Column(db.JSON, nullable=False)  # Entities, picklist counts, locales
+    fetched_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    expires_at = db.Column(db.DateTime, nullable=False)
+
+    def __repr__(self) -> str:
+        return f'<SFCatalog {self.tenant_key[:12]}>'
+
+    @property
+    def is_stale(self) -> bool:
+        """Check if the catalog should be refreshed."""
+        return datetime.utcnow() >= self.expires_at
 
 
 # =============================================================================
@@ -358,15 +602,69 @@ def init_db(app):
         db.create_all()
 
 
+# Project columns whose changes don't bump the version
+_UNVERSIONED_COLUMNS = {'version', 'last_accessed_at', 'updated_at'}
+
+
+def _touch_changed_projects(session, flush_context, instances):
+    """Bump the version of projects that changed or whose files changed."""
+    touched = set()
+    with session.no_autoflush:
+        for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+            if isinstance(obj, (ProjectFile, GeneratedFile)):
+                project = obj.project
+                if project is None and obj.project_id:
+                    project = session.get(Project, obj.project_id)
+            elif isinstance(obj, Project) and obj in session.dirty:
+                state = inspect(obj)
+                if not any(
+                    state.attrs[attr.key].history.has_changes()
+                    for attr in state.mapper.column_attrs
+                    if attr.key not in _UNVERSIONED_COLUMNS
+                ):
+                    continue
+                project = obj
+            else:
+                continue
+
+            if project is None or project in session.deleted or id(project) in touched:
+                continue
+            touched.add(id(project))
+            project.touch()
+
+
+def init_project_versions(app):
+    """Bump project versions on every flush that changes a project."""
+    if not event.contains(db.session, 'before_flush', _touch_changed_projects):
+        event.listen(db.session, 'before_flush', _touch_changed_projects)
+
+
 def get_or_create_user(xsuaa_id: str, email: str, display_name: str = None, is_admin: bool = False) -> User:
-    """Get existing user or create new one."""
+    """
+    Get existing user or create new one.
+
+    The user is looked up once per request. last_login is written at most
+    every LAST_LOGIN_UPDATE_SECONDS, so polling doesn't write on every call.
+    """
+    memo = g.setdefault('db_users', {}) if has_request_context() else {}
+    user = memo.get(xsuaa_id)
+    if user is not None and user.is_admin == is_admin:
+        return user
+
     user = User.query.filter_by(xsuaa_id=xsuaa_id).first()
     if user:
-        user.update_last_login()
+        interval = int(current_app.config.get(
+            'LAST_LOGIN_UPDATE_SECONDS',
+            os.environ.get('LAST_LOGIN_UPDATE_SECONDS', LAST_LOGIN_UPDATE_SECONDS)
+        ))
+        changed = user.update_last_login(min_interval=interval)
         # Update admin status if changed
         if user.is_admin != is_admin:
             user.is_admin = is_admin
-        db.session.commit()
+            changed = True
+        if changed:
+            db.session.commit()
+        memo[xsuaa_id] = user
         return user
 
     # Create new user
@@ -378,4 +676,5 @@ def get_or_create_user(xsuaa_id: str, email: str, display_name: str = None, is_a
     )
     db.session.add(user)
     db.session.commit()
+    memo[xsuaa_id] = user
     return user
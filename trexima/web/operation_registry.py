@@ -0,0 +1,206 @@
+"""
+TREXIMA v2.0 - Operation Registry
+
+Tracks the running export/import/connect operation of each project so
+every instance can answer "is something running?", show progress to late
+subscribers and pass on cancellation requests.
+
+Two backends:
+- InMemoryOperationRegistry: process-local dict (single instance, tests)
+- DatabaseOperationRegistry: active_operations table shared by all instances
+
+Select with OPERATION_REGISTRY = 'memory' | 'database'.
+"""
+
+import logging
+import os
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, Any, Optional
+
+from sqlalchemy import select, update, delete, insert
+from sqlalchemy.exc import IntegrityError
+
+logger = logging.getLogger(__name__)
+
+# Entries not updated for this long belong to a crashed instance
+DEFAULT_STALE_SECONDS = 1800
+
+
+class OperationRegistry:
+    """
+    Interface of an operation registry.
+
+    Entries are dicts with the operation, current step, message etc.
+    The 'cancelled' flag is owned by the registry: set() keeps it, only
+    request_cancel() sets it.
+    """
+
+    def set(self, project_id: str, state: Dict[str, Any]):
+        """Create or replace the entry of a project (keeps 'cancelled')."""
+        raise NotImplementedError
+
+    def get(self, project_id: str) -> Optional[Dict[str, Any]]:
+        """Get the entry of a project, or None."""
+        raise NotImplementedError
+
+    def remove(self, project_id: str):
+        """Remove the entry of a project."""
+        raise NotImplementedError
+
+    def all(self) -> Dict[str, Dict[str, Any]]:
+        """Get all entries by project ID."""
+        raise NotImplementedError
+
+    def request_cancel(self, project_id: str) -> bool:
+        """Flag an entry as cancelled. Returns True if it exists."""
+        raise NotImplementedError
+
+    def contains(self, project_id: str) -> bool:
+        """Check if a project has an entry."""
+        return self.get(project_id) is not None
+
+    def is_cancelled(self, project_id: str) -> bool:
+        """Check if the entry of a project was cancelled."""
+        entry = self.get(project_id)
+        return bool(entry and entry.get('cancelled'))
+
+
+class InMemoryOperationRegistry(OperationRegistry):
+    """Process-local registry (thread-safe)."""
+
+    def __init__(self):
+        self._operations: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def set(self, project_id: str, state: Dict[str, Any]):
+        with self._lock:
+            previous = self._operations.get(project_id)
+            entry = dict(state)
+            entry['cancelled'] = bool(previous and previous.get('cancelled'))
+            self._operations[project_id] = entry
+
+    def get(self, project_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._operations.get(project_id)
+            return dict(entry) if entry is not None else None
+
+    def remove(self, project_id: str):
+        with self._lock:
+            self._operations.pop(project_id, None)
+
+    def all(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {pid: dict(entry) for pid, entry in self._operations.items()}
+
+    def request_cancel(self, project_id: str) -> bool:
+        with self._lock:
+            if project_id not in self._operations:
+                return False
+            self._operations[project_id]['cancelled'] = True
+            return True
+
+
+class DatabaseOperationRegistry(OperationRegistry):
+    """
+    Registry in the active_operations table.
+
+    Uses its own connections from the engine rather than the session, so
+    progress writes never commit or roll back the caller's unit of work.
+    """
+
+    def __init__(self, app, stale_seconds: int = DEFAULT_STALE_SECONDS):
+        from trexima.web.models import ActiveOperation
+        self.app = app
+        self.table = ActiveOperation.__table__
+        self.stale_seconds = stale_seconds
+        self._engine = None
+
+    @property
+    def engine(self):
+        if self._engine is None:
+            from trexima.web.models import db
+            with self.app.app_context():
+                self._engine = db.engine
+        return self._engine
+
+    def _fresh(self):
+        cutoff = datetime.utcnow() - timedelta(seconds=self.stale_seconds)
+        return self.table.c.updated_at >= cutoff
+
+    def _entry(self, row) -> Dict[str, Any]:
+        entry = dict(row.state or {})
+        entry['cancelled'] = bool(row.cancelled)
+        return entry
+
+    def set(self, project_id: str, state: Dict[str, Any]):
+        values = {
+            'operation': state.get('operation'),
+            'state': {k: v for k, v in state.items() if k != 'cancelled'},
+            'updated_at': datetime.utcnow()
+        }
+        with self.engine.begin() as conn:
+            result = conn.execute(
+                update(self.table).where(self.table.c.project_id == project_id).values(**values)
+            )
+            if result.rowcount:
+                return
+            try:
+                with conn.begin_nested():
+                    conn.execute(insert(self.table).values(
+                        project_id=project_id, cancelled=False, **values
+                    ))
+            except IntegrityError:
+                # Inserted concurrently by another instance
+                conn.execute(
+                    update(self.table).where(self.table.c.project_id == project_id).values(**values)
+                )
+
+    def get(self, project_id: str) -> Optional[Dict[str, Any]]:
+        with self.engine.connect() as conn:
+            row = conn.execute(
+                select(self.table).where(self.table.c.project_id == project_id, self._fresh())
+            ).first()
+        return self._entry(row) if row is not None else None
+
+    def remove(self, project_id: str):
+        with self.engine.begin() as conn:
+            conn.execute(delete(self.table).where(self.table.c.project_id == project_id))
+
+    def all(self) -> Dict[str, Dict[str, Any]]:
+        with self.engine.connect() as conn:
+            rows = conn.execute(select(self.table).where(self._fresh())).all()
+        return {row.project_id: self._entry(row) for row in rows}
+
+    def request_cancel(self, project_id: str) -> bool:
+        with self.engine.begin() as conn:
+            result = conn.execute(
+                update(self.table)
+                .where(self.table.c.project_id == project_id, self._fresh())
+                .values(cancelled=True)
+            )
+        return result.rowcount > 0
+
+
+def create_operation_registry(app) -> OperationRegistry:
+    """
+    Create the registry selected by OPERATION_REGISTRY.
+
+    Defaults to 'database', or 'memory' when TESTING.
+    """
+    default = 'memory' if app.config.get('TESTING') else 'database'
+    backend = app.config.get(
+        'OPERATION_REGISTRY', os.environ.get('OPERATION_REGISTRY', default)
+    ).lower()
+
+    if backend == 'memory':
+        return InMemoryOperationRegistry()
+    if backend == 'database':
+        return DatabaseOperationRegistry(
+            app,
+            stale_seconds=int(app.config.get(
+                'OPERATION_STALE_SECONDS',
+                os.environ.get('OPERATION_STALE_SECONDS', DEFAULT_STALE_SECONDS)
+            ))
+        )
+    raise ValueError(f"Unknown OPERATION_REGISTRY backend: {backend}")
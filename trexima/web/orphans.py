@@ -0,0 +1,156 @@
+"""
+TREXIMA v2.0 - Orphan Reconciliation
+
+Finds (and optionally deletes) storage objects no database row refers to.
+
+The bucket is walked one page at a time in key order; each page is
+checked with a few batched IN queries and its orphans are deleted in one
+DeleteObjects request. The last key of every page is saved as a cursor,
+so an interrupted scan resumes where it stopped. Memory use depends on
+the page size, not on the number of objects.
+"""
+
+import logging
+import os
+import re
+from datetime import datetime, timedelta, timezone
+from itertools import islice
+from typing import Dict, Any, List, Iterator
+
+from trexima.web.models import db, ProjectFile, GeneratedFile, Job
+from trexima.web.translation_rows import workbook_key_of
+from trexima.web.label_search import source_key_of
+
+logger = logging.getLogger(__name__)
+
+# Prefixes walked, in this order
+SCAN_PREFIXES = ['blobs/', 'users/']
+
+# Keys per page (and per DeleteObjects request)
+PAGE_SIZE = 1000
+
+# Objects younger than this are never orphans: an upload stores its blob
+# before the ProjectFile row is committed
+DEFAULT_GRACE_SECONDS = 3600
+
+# Orphan keys kept in the task state for review
+SAMPLE_SIZE = 100
+
+# Checkpoint artifacts belong to a job, not to a file row
+_JOB_ARTIFACT = re.compile(r'^users/[^/]+/projects/[^/]+/jobs/([^/]+)/')
+
+
+def _pages(files: Iterator[Dict[str, Any]], size: int) -> Iterator[List[Dict[str, Any]]]:
+    while True:
+        page = list(islice(files, size))
+        if not page:
+            return
+        yield page
+
+
+def _utc(value: datetime) -> datetime:
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def find_orphans(page: List[Dict[str, Any]], cutoff: datetime) -> List[Dict[str, Any]]:
+    """
+    Get the files of a page that no row refers to.
+
+    Args:
+        page: File infos from storage.iter_files()
+        cutoff: Files modified after this (UTC) are skipped
+
+    Returns:
+        Orphaned file infos
+    """
+    candidates = [f for f in page if _utc(f['last_modified']) < cutoff]
+    if not candidates:
+        return []
+    keys = [f['key'] for f in candidates]
+    # Row stores belong to their workbook's row, label indexes to their model's
+    owners = {key: workbook_key_of(key) or source_key_of(key) or key for key in keys}
+    lookup = list(set(owners.values()))
+
+    referenced = set()
+    for model in (ProjectFile, GeneratedFile):
+        referenced.update(
+            key for (key,) in db.session.query(model.storage_key).filter(model.storage_key.in_(lookup))
+        )
+
+    job_ids = {m.group(1) for m in map(_JOB_ARTIFACT.match, keys) if m}
+    active_jobs = set()
+    if job_ids:
+        active_jobs = {
+            job_id for (job_id,) in db.session.query(Job.id).filter(
+                Job.id.in_(job_ids), Job.status.in_(Job.ACTIVE_STATUSES)
+            )
+        }
+
+    orphans = []
+    for f in candidates:
+        if owners[f['key']] in referenced:
+            continue
+        match = _JOB_ARTIFACT.match(f['key'])
+        if match and match.group(1) in active_jobs:
+            continue
+        orphans.append(f)
+    return orphans
+
+
+def reconcile_orphans(run, storage, dry_run: bool = True, grace_seconds: int = None) -> Dict[str, Any]:
+    """
+    Scan the bucket for orphans, resuming from the run's saved cursor.
+
+    Progress and the cursor are saved after every page (run.save()).
+
+    Args:
+        run: TaskRun of the maintenance task
+        storage: Storage service to scan
+        dry_run: Only count orphans, don't delete them
+        grace_seconds: Minimum age of an orphan (default ORPHAN_GRACE_SECONDS)
+
+    Returns:
+        Totals: scanned, orphaned, orphaned_bytes, deleted, sample
+    """
+    if grace_seconds is None:
+        grace_seconds = int(os.environ.get('ORPHAN_GRACE_SECONDS', DEFAULT_GRACE_SECONDS))
+    cutoff = datetime.utcnow() - timedelta(seconds=grace_seconds)
+
+    cursor = run.state.get('cursor')
+    progress = run.state.get('progress') if cursor else None
+    if not cursor or not progress:
+        cursor = {'prefix': 0, 'after': None}
+        progress = {
+            'dry_run': dry_run, 'scanned': 0, 'orphaned': 0,
+            'orphaned_bytes': 0, 'deleted': 0, 'sample': []
+        }
+    else:
+        dry_run = progress['dry_run']
+        logger.info(f"Resuming orphan scan after {cursor['after']}")
+
+    for index in range(cursor['prefix'], len(SCAN_PREFIXES)):
+        after = cursor['after'] if index == cursor['prefix'] else None
+        files = storage.iter_files(SCAN_PREFIXES[index], start_after=after, page_size=PAGE_SIZE)
+
+        for page in _pages(files, PAGE_SIZE):
+            orphans = find_orphans(page, cutoff)
+            db.session.rollback()  # End the read transaction between pages
+
+            progress['scanned'] += len(page)
+            progress['orphaned'] += len(orphans)
+            progress['orphaned_bytes'] += sum(f['size'] for f in orphans)
+            room = SAMPLE_SIZE - len(progress['sample'])
+            progress['sample'].extend(f['key'] for f in orphans[:max(room, 0)])
+            if orphans and not dry_run:
+                progress['deleted'] += storage.delete_files([f['key'] for f in orphans])
+
+            run.save(cursor={'prefix': index, 'after': page[-1]['key']}, progress=progress)
+
+    logger.info(
+        f"Orphan scan {'(dry run) ' if dry_run else ''}finished: "
+        f"{progress['orphaned']} of {progress['scanned']} objects orphaned, "
+        f"{progress['deleted']} deleted"
+    )
+    return progress
@@ -7,7 +7,8 @@ API routes and page handlers for the web application.
 import os
 import time
 import json
-from typing import Dict, Any, Optional
+import uuid
+from functools import wraps
 
 from flask import (
     Blueprint, render_template, request, jsonify,
@@ -19,45 +20,38 @@ from trexima.config import APP_NAME, VERSION, AppPaths, AppState
 from trexima.io.xml_handler import XMLHandler
 from trexima.io.excel_handler import ExcelHandler
 from trexima.io.csv_handler import CSVHandler
-from trexima.core.datamodel_processor import DataModelProcessor
 from trexima.core.translation_extractor import TranslationExtractor
 from trexima.core.translation_importer import TranslationImporter
-from trexima.core.odata_client import ODataClient
+from trexima.web.session_pool import session_pool
 
 # Blueprints
 main_bp = Blueprint('main', __name__)
 api_bp = Blueprint('api', __name__, url_prefix='/api')
 
-# Global state (in production, use proper session management)
-app_state: Dict[str, Any] = {
-    'processor': None,
-    'odata_client': None,
-    'extractor': None,
-    'importer': None,
-    'progress': {'percent': 0, 'message': 'Ready'},
-    'files_loaded': [],
-    'last_export_path': None,
-    'last_import_result': None
-}
+# Flask session key of the legacy session ID
+SESSION_ID_KEY = 'legacy_session_id'
 
 
-def get_processor() -> DataModelProcessor:
-    """Get or create the data model processor."""
-    if app_state['processor'] is None:
-        app_state['processor'] = DataModelProcessor()
-    return app_state['processor']
+def session_state(f=None, *, exclusive: bool = True):
+    """
+    Run a route with the state of the caller's session.
 
-
-def get_odata_client() -> ODataClient:
-    """Get or create the OData client."""
-    if app_state['odata_client'] is None:
-        app_state['odata_client'] = ODataClient()
-    return app_state['odata_client']
-
-
-def update_progress(percent: int, message: str):
-    """Update progress state."""
-    app_state['progress'] = {'percent': percent, 'message': message}
+    The state comes from the session pool and is passed as first
+    argument. Exclusive requests of one session run one at a time;
+    read-only routes use @session_state(exclusive=False) so they are
+    answered while an export or import of the session runs.
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated(*args, **kwargs):
+            session_id = session.get(SESSION_ID_KEY)
+            if not session_id:
+                session_id = uuid.uuid4().hex
+                session[SESSION_ID_KEY] = session_id
+            with session_pool.checkout(session_id, exclusive=exclusive) as state:
+                return f(state, *args, **kwargs)
+        return decorated
+    return decorator(f) if f is not None else decorator
 
 
 def allowed_file(filename: str, allowed_extensions: set) -> bool:
@@ -68,6 +62,9 @@ def allowed_file(filename: str, allowed_extensions: set) -> bool:
 
 def register_routes(app):
     """Register all routes with the Flask app."""
+    session_pool.configure(
+        app.config, upload_root=os.path.join(app.config['UPLOAD_FOLDER'], 'sessions')
+    )
     app.register_blueprint(main_bp)
     app.register_blueprint(api_bp)
 
@@ -101,30 +98,33 @@ def settings_page():
 # ==================== API Routes ====================
 
 @api_bp.route('/status')
-def api_status():
+@session_state(exclusive=False)
+def api_status(state):
     """Get application status."""
-    processor = get_processor()
-    odata = get_odata_client()
+    processor = state.processor
+    odata = state.odata_client
 
     return jsonify({
         'app_name': APP_NAME,
         'version': VERSION,
-        'files_loaded': len(app_state['files_loaded']),
-        'odata_connected': odata.is_connected,
-        'is_pmgm_included': processor.is_pmgm_included,
-        'is_sdm_included': processor.is_sdm_included,
-        'progress': app_state['progress']
+        'files_loaded': len(state.files_loaded),
+        'odata_connected': bool(odata and odata.is_connected),
+        'is_pmgm_included': bool(processor and processor.is_pmgm_included),
+        'is_sdm_included': bool(processor and processor.is_sdm_included),
+        'progress': state.progress
     })
 
 
 @api_bp.route('/progress')
-def api_progress():
+@session_state(exclusive=False)
+def api_progress(state):
     """Get current progress."""
-    return jsonify(app_state['progress'])
+    return jsonify(state.progress)
 
 
 @api_bp.route('/upload', methods=['POST'])
-def api_upload():
+@session_state
+def api_upload(state):
     """Upload XML files."""
     if 'files' not in request.files:
         return jsonify({'error': 'No files provided'}), 400
@@ -133,8 +133,9 @@ def api_upload():
     uploaded = []
     errors = []
 
-    processor = get_processor()
-    upload_folder = current_app.config['UPLOAD_FOLDER']
+    processor = state.get_processor()
+    upload_folder = state.upload_dir or current_app.config['UPLOAD_FOLDER']
+    os.makedirs(upload_folder, exist_ok=True)
 
     for file in files:
         if file.filename == '':
@@ -153,7 +154,9 @@ def api_upload():
                     'name': model.name,
                     'type': model.get_type_name()
                 })
-                app_state['files_loaded'].append(filepath)
+                if filename not in state.files_loaded:
+                    state.add_model_file(filepath)
+                state.files_loaded[filename] = filepath
             else:
                 errors.append(f"{filename}: Could not parse as SF data model")
         else:
@@ -162,14 +165,15 @@ def api_upload():
     return jsonify({
         'uploaded': uploaded,
         'errors': errors,
-        'total_loaded': len(app_state['files_loaded'])
+        'total_loaded': len(state.files_loaded)
     })
 
 
 @api_bp.route('/upload/standard', methods=['POST'])
-def api_upload_standard():
+@session_state
+def api_upload_standard(state):
     """Load standard SAP data models."""
-    processor = get_processor()
+    processor = state.get_processor()
     app_paths = AppPaths()
 
     loaded = []
@@ -177,10 +181,13 @@ def api_upload_standard():
         if os.path.exists(path):
             model = processor.load_data_model(path, is_standard=True)
             if model:
+                if not state.standard_loaded:
+                    state.add_model_file(path)
                 loaded.append({
                     'name': model.name,
                     'type': model.get_type_name()
                 })
+    state.standard_loaded = True
 
     return jsonify({
         'loaded': loaded,
@@ -189,7 +196,8 @@ def api_upload_standard():
 
 
 @api_bp.route('/odata/connect', methods=['POST'])
-def api_odata_connect():
+@session_state
+def api_odata_connect(state):
     """Connect to OData service."""
     data = request.get_json()
 
@@ -201,7 +209,7 @@ def api_odata_connect():
         if field not in data:
             return jsonify({'error': f'Missing field: {field}'}), 400
 
-    odata = get_odata_client()
+    odata = state.get_odata_client()
 
     try:
         odata.connect(
@@ -222,19 +230,21 @@ def api_odata_connect():
 
 
 @api_bp.route('/odata/disconnect', methods=['POST'])
-def api_odata_disconnect():
+@session_state
+def api_odata_disconnect(state):
     """Disconnect from OData service."""
-    odata = get_odata_client()
-    odata.disconnect()
+    if state.odata_client is not None:
+        state.odata_client.disconnect()
     return jsonify({'success': True})
 
 
 @api_bp.route('/odata/locales')
-def api_odata_locales():
+@session_state
+def api_odata_locales(state):
     """Get active locales from OData service."""
-    odata = get_odata_client()
+    odata = state.odata_client
 
-    if not odata.is_connected:
+    if odata is None or not odata.is_connected:
         # Return default locales
         return jsonify({
             'locales': ['en_US', 'de_DE', 'fr_FR', 'es_ES', 'ja_JP', 'zh_CN'],
@@ -249,13 +259,18 @@ def api_odata_locales():
 
 
 @api_bp.route('/export', methods=['POST'])
-def api_export():
-    """Execute export operation."""
+@session_state
+def api_export(state):
+    """
+    Execute export operation.
+
+    Reuses the models parsed by earlier uploads of the session.
+    """
     data = request.get_json() or {}
 
-    processor = get_processor()
+    processor = state.get_processor()
 
-    if len(app_state['files_loaded']) == 0:
+    if len(state.files_loaded) == 0:
         return jsonify({'error': 'No files loaded'}), 400
 
     # Get export options
@@ -267,15 +282,15 @@ def api_export():
     default_lang = data.get('default_lang', 'en_US')
 
     # Create extractor
-    odata = get_odata_client()
+    odata = state.odata_client
     extractor = TranslationExtractor(
         processor,
-        odata if odata.is_connected else None,
-        update_progress
+        odata if odata is not None and odata.is_connected else None,
+        state.update_progress
     )
 
     try:
-        update_progress(10, 'Starting export...')
+        state.update_progress(10, 'Starting export...')
 
         # Execute export
         workbook = extractor.extract_to_workbook(
@@ -294,9 +309,9 @@ def api_export():
         filepath = os.path.join(output_folder, filename)
 
         extractor.save_workbook(workbook, output_folder, filename)
-        app_state['last_export_path'] = filepath
+        state.last_export_path = filepath
 
-        update_progress(100, 'Export complete!')
+        state.update_progress(100, 'Export complete!')
 
         return jsonify({
             'success': True,
@@ -305,7 +320,7 @@ def api_export():
         })
 
     except Exception as e:
-        update_progress(0, f'Export failed: {str(e)}')
+        state.update_progress(0, f'Export failed: {str(e)}')
         return jsonify({
             'success': False,
             'error': str(e)
@@ -313,7 +328,8 @@ def api_export():
 
 
 @api_bp.route('/import', methods=['POST'])
-def api_import():
+@session_state
+def api_import(state):
     """Execute import operation."""
     if 'workbook' not in request.files:
         return jsonify({'error': 'No workbook provided'}), 400
@@ -322,12 +338,13 @@ def api_import():
     if not file or not allowed_file(file.filename, {'xlsx'}):
         return jsonify({'error': 'Invalid file type'}), 400
 
-    processor = get_processor()
+    processor = state.get_processor()
 
-    if len(app_state['files_loaded']) == 0:
+    if len(state.files_loaded) == 0:
         return jsonify({'error': 'No XML files loaded'}), 400
 
-    upload_folder = current_app.config['UPLOAD_FOLDER']
+    upload_folder = state.upload_dir or current_app.config['UPLOAD_FOLDER']
+    os.makedirs(upload_folder, exist_ok=True)
     output_folder = current_app.config['OUTPUT_FOLDER']
 
     # Save uploaded workbook
@@ -340,7 +357,7 @@ def api_import():
     sheets_to_process = json.loads(data.get('sheets', '[]'))
 
     try:
-        update_progress(10, 'Starting import...')
+        state.update_progress(10, 'Starting import...')
 
         # Load workbook
         excel_handler = ExcelHandler()
@@ -350,7 +367,7 @@ def api_import():
             sheets_to_process = workbook.sheetnames
 
         # Create importer
-        importer = TranslationImporter(processor, update_progress)
+        importer = TranslationImporter(processor, state.update_progress)
 
         # Execute import
         result = importer.import_from_workbook(
@@ -359,9 +376,9 @@ def api_import():
             output_folder
         )
 
-        app_state['last_import_result'] = result
+        state.last_import_result = result
 
-        update_progress(100, 'Import complete!')
+        state.update_progress(100, 'Import complete!')
 
         return jsonify({
             'success': result.success,
@@ -371,7 +388,7 @@ def api_import():
         })
 
     except Exception as e:
-        update_progress(0, f'Import failed: {str(e)}')
+        state.update_progress(0, f'Import failed: {str(e)}')
         return jsonify({
             'success': False,
             'error': str(e)
@@ -396,10 +413,11 @@ def api_download(filename):
 
 
 @api_bp.route('/datamodels')
-def api_datamodels():
+@session_state
+def api_datamodels(state):
     """Get list of loaded data models."""
-    processor = get_processor()
-    models = processor.get_all_data_models(include_standard=True)
+    processor = state.processor
+    models = processor.get_all_data_models(include_standard=True) if processor else []
 
     return jsonify({
         'models': [
@@ -416,20 +434,9 @@ def api_datamodels():
 
 
 @api_bp.route('/reset', methods=['POST'])
-def api_reset():
-    """Reset application state."""
-    global app_state
-
-    # Clear state
-    app_state = {
-        'processor': None,
-        'odata_client': None,
-        'extractor': None,
-        'importer': None,
-        'progress': {'percent': 0, 'message': 'Ready'},
-        'files_loaded': [],
-        'last_export_path': None,
-        'last_import_result': None
-    }
+@session_state
+def api_reset(state):
+    """Reset the session's state."""
+    state.release()
 
     return jsonify({'success': True, 'message': 'Application state reset'})
@@ -0,0 +1,208 @@
+"""
+TREXIMA v2.0 - Job Scheduler
+
+Decides which queued job a worker runs next.
+
+Admission is limited globally, per user and per SuccessFactors tenant.
+Among admissible jobs, higher priority wins; within a priority, jobs of
+the user with the least weighted recent usage go first (weighted fair
+queuing), then the oldest job.
+"""
+
+import heapq
+import os
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Dict, Any, Optional, List, Iterable, Tuple
+from urllib.parse import urlparse
+
+DEFAULT_MAX_CONCURRENT = 4
+DEFAULT_MAX_PER_USER = 1
+DEFAULT_MAX_PER_TENANT = 2
+DEFAULT_FAIRNESS_WINDOW_SECONDS = 3600
+DEFAULT_JOB_DURATION_SECONDS = 120.0
+
+
+def tenant_key(sf_connection: Optional[Dict[str, Any]]) -> Optional[str]:
+    """
+    Identify the SF tenant of a connection config.
+
+    Returns:
+        'company@host', or None if the connection is not configured
+    """
+    if not sf_connection:
+        return None
+    company_id = sf_connection.get('company_id')
+    host = urlparse(sf_connection.get('endpoint_url') or '').netloc
+    if not company_id and not host:
+        return None
+    return f"{company_id or ''}@{host}".lower()
+
+
+def _config_value(config, key: str, default):
+    value = config.get(key, os.environ.get(key, default))
+    return type(default)(value)
+
+
+class FairShareScheduler:
+    """
+    Fair-share admission control for export/import jobs.
+
+    Works on Job rows (or anything with the same attributes); the caller
+    loads queued and running jobs and persists the decision.
+    """
+
+    def __init__(
+        self,
+        max_concurrent: int = DEFAULT_MAX_CONCURRENT,
+        max_per_user: int = DEFAULT_MAX_PER_USER,
+        max_per_tenant: int = DEFAULT_MAX_PER_TENANT,
+        user_weights: Optional[Dict[str, float]] = None,
+        fairness_window: int = DEFAULT_FAIRNESS_WINDOW_SECONDS
+    ):
+        self.max_concurrent = max_concurrent
+        self.max_per_user = max_per_user
+        self.max_per_tenant = max_per_tenant
+        self.user_weights = user_weights or {}
+        self.fairness_window = fairness_window
+
+    @classmethod
+    def from_config(cls, config) -> 'FairShareScheduler':
+        """Create a scheduler from Flask config, falling back to env vars."""
+        return cls(
+            max_concurrent=_config_value(config, 'JOB_MAX_CONCURRENT', DEFAULT_MAX_CONCURRENT),
+            max_per_user=_config_value(config, 'JOB_MAX_PER_USER', DEFAULT_MAX_PER_USER),
+            max_per_tenant=_config_value(config, 'JOB_MAX_PER_TENANT', DEFAULT_MAX_PER_TENANT),
+            user_weights=config.get('JOB_USER_WEIGHTS'),
+            fairness_window=_config_value(
+                config, 'JOB_FAIRNESS_WINDOW', DEFAULT_FAIRNESS_WINDOW_SECONDS
+            )
+        )
+
+    def limits(self) -> Dict[str, int]:
+        """Get the configured concurrency limits."""
+        return {
+            'max_concurrent': self.max_concurrent,
+            'max_per_user': self.max_per_user,
+            'max_per_tenant': self.max_per_tenant
+        }
+
+    # -------------------------------------------------------------------------
+    # Admission
+    # -------------------------------------------------------------------------
+
+    def admits(self, job, running: Iterable) -> bool:
+        """Check if a job can start next to the running jobs."""
+        running = [r for r in running if r is not job]
+        if len(running) >= self.max_concurrent:
+            return False
+        if sum(1 for r in running if r.user_id == job.user_id) >= self.max_per_user:
+            return False
+        if job.tenant and sum(1 for r in running if r.tenant == job.tenant) >= self.max_per_tenant:
+            return False
+        return True
+
+    def usage_since(self, jobs: Iterable, now: datetime = None) -> Dict[str, float]:
+        """
+        Sum each user's job run time within the fairness window.
+
+        Args:
+            jobs: Running jobs and jobs finished within the window
+            now: Reference time (default: utcnow)
+        """
+        now = now or datetime.utcnow()
+        window_start = now - timedelta(seconds=self.fairness_window)
+        usage: Dict[str, float] = Counter()
+        for job in jobs:
+            if not job.started_at:
+                continue
+            start = max(job.started_at, window_start)
+            end = job.finished_at or now
+            if end > start:
+                usage[job.user_id] += (end - start).total_seconds()
+        return usage
+
+    def _sort_key(self, job, usage: Dict[str, float]) -> Tuple:
+        weight = float(self.user_weights.get(job.user_id, 1.0)) or 1.0
+        return (-(job.priority or 0), usage.get(job.user_id, 0.0) / weight, job.created_at)
+
+    def select_next(self, queued: List, running: List, usage: Dict[str, float]):
+        """
+        Pick the next job to start.
+
+        Jobs with a pending cancellation are released first regardless of
+        limits so their handlers can clean up right away.
+
+        Returns:
+            The job to start, or None if nothing is admissible
+        """
+        for job in queued:
+            if job.cancel_requested:
+                return job
+
+        for job in sorted(queued, key=lambda j: self._sort_key(j, usage)):
+            if self.admits(job, running):
+                return job
+        return None
+
+    # -------------------------------------------------------------------------
+    # Queue forecast
+    # -------------------------------------------------------------------------
+
+    def plan(
+        self,
+        queued: List,
+        running: List,
+        usage: Dict[str, float],
+        durations: Dict[str, float],
+        now: datetime = None
+    ) -> List[Tuple[Any, datetime]]:
+        """
+        Forecast the start order and start time of queued jobs.
+
+        Simulates dispatching with the same rules as select_next, assuming
+        jobs take their type's typical duration.
+
+        Args:
+            queued: Queued jobs
+            running: Running jobs
+            usage: Per-user usage from usage_since()
+            durations: Typical duration in seconds by job type
+            now: Reference time (default: utcnow)
+
+        Returns:
+            List of (job, estimated start) in expected start order
+        """
+        now = now or datetime.utcnow()
+        usage = Counter(usage)
+        pending = list(queued)
+
+        def duration(job) -> float:
+            return durations.get(job.job_type, DEFAULT_JOB_DURATION_SECONDS)
+
+        # Heap of (expected finish time, sequence, job) for simulated running jobs
+        active = []
+        for seq, job in enumerate(running):
+            elapsed = (now - job.started_at).total_seconds() if job.started_at else 0
+            finish = now + timedelta(seconds=max(duration(job) - elapsed, 0))
+            heapq.heappush(active, (finish, seq, job))
+        seq = len(active)
+
+        clock = now
+        forecast = []
+        while pending:
+            job = self.select_next(pending, [entry[2] for entry in active], usage)
+            if job is None:
+                if not active:
+                    # Nothing running but nothing admissible: limits of zero
+                    break
+                clock, _, _ = heapq.heappop(active)
+                continue
+
+            pending.remove(job)
+            forecast.append((job, clock))
+            usage[job.user_id] += duration(job)
+            seq += 1
+            heapq.heappush(active, (clock + timedelta(seconds=duration(job)), seq, job))
+
+        return forecast
@@ -0,0 +1,208 @@
+"""
+TREXIMA v2.0 - Session Pool
+
+Per-session state of the legacy /api routes: the data model processor
+with its parsed XML trees, the OData client, progress and loaded files.
+
+Sessions are kept in an LRU pool. Sessions idle for longer than
+LEGACY_SESSION_TTL_SECONDS are evicted, as are the least recently used
+ones when there are more than LEGACY_SESSION_MAX sessions or their
+estimated memory exceeds LEGACY_SESSION_MEMORY_BYTES. Evicting a session
+releases its trees, disconnects its client and deletes its uploads.
+Requests of one session that change its processor or client run one at
+a time (checkout() holds its lock); read-only requests such as progress
+polls check it out without the lock. Sessions in use are never evicted.
+"""
+
+import logging
+import os
+import shutil
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Dict, Any, Optional, Iterator
+
+from trexima.core.datamodel_processor import DataModelProcessor
+from trexima.core.odata_client import ODataClient
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_SESSIONS = 64
+DEFAULT_TTL_SECONDS = 30 * 60
+DEFAULT_MEMORY_BYTES = 512 * 1024 * 1024
+
+# Parsed XML trees take roughly this many times their file size
+TREE_SIZE_FACTOR = 10
+
+
+class SessionState:
+    """State of one legacy session."""
+
+    def __init__(self, session_id: str, upload_dir: Optional[str] = None):
+        self.session_id = session_id
+        self.upload_dir = upload_dir
+        self.lock = threading.Lock()
+        self.in_use = 0
+        self.last_used = time.monotonic()
+        self.processor: Optional[DataModelProcessor] = None
+        self.odata_client: Optional[ODataClient] = None
+        self.progress: Dict[str, Any] = {'percent': 0, 'message': 'Ready'}
+        # filename -> path; uploading a file again replaces it
+        self.files_loaded: Dict[str, str] = {}
+        self.standard_loaded = False
+        self.model_bytes = 0
+        self.last_export_path: Optional[str] = None
+        self.last_import_result = None
+
+    def get_processor(self) -> DataModelProcessor:
+        """Get or create the session's data model processor."""
+        if self.processor is None:
+            self.processor = DataModelProcessor()
+        return self.processor
+
+    def get_odata_client(self) -> ODataClient:
+        """Get or create the session's OData client."""
+        if self.odata_client is None:
+            self.odata_client = ODataClient()
+        return self.odata_client
+
+    def update_progress(self, percent: int, message: str):
+        """Update progress state."""
+        self.progress = {'percent': percent, 'message': message}
+
+    def add_model_file(self, path: str):
+        """Account for the memory of a parsed model file."""
+        try:
+            self.model_bytes += os.path.getsize(path) * TREE_SIZE_FACTOR
+        except OSError:
+            pass
+
+    @property
+    def estimated_bytes(self) -> int:
+        return self.model_bytes if self.processor is not None else 0
+
+    def release(self):
+        """Drop parsed trees and connections, keep nothing in memory."""
+        if self.odata_client is not None and self.odata_client.is_connected:
+            self.odata_client.disconnect()
+        self.processor = None
+        self.odata_client = None
+        self.files_loaded = {}
+        self.standard_loaded = False
+        self.model_bytes = 0
+        self.last_export_path = None
+        self.last_import_result = None
+        self.progress = {'percent': 0, 'message': 'Ready'}
+        if self.upload_dir and os.path.isdir(self.upload_dir):
+            shutil.rmtree(self.upload_dir, ignore_errors=True)
+
+
+class SessionPool:
+    """LRU pool of SessionStates with TTL and memory budget."""
+
+    def __init__(
+        self,
+        max_sessions: int = DEFAULT_MAX_SESSIONS,
+        ttl_seconds: int = DEFAULT_TTL_SECONDS,
+        memory_bytes: int = DEFAULT_MEMORY_BYTES,
+        upload_root: Optional[str] = None
+    ):
+        self.max_sessions = max_sessions
+        self.ttl_seconds = ttl_seconds
+        self.memory_bytes = memory_bytes
+        self.upload_root = upload_root
+        self._sessions: 'OrderedDict[str, SessionState]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def configure(self, config, upload_root: Optional[str] = None):
+        """Read limits from app config (or the environment)."""
+        def setting(key, default):
+            return int(config.get(key, os.environ.get(key, default)))
+
+        self.max_sessions = setting('LEGACY_SESSION_MAX', DEFAULT_MAX_SESSIONS)
+        self.ttl_seconds = setting('LEGACY_SESSION_TTL_SECONDS', DEFAULT_TTL_SECONDS)
+        self.memory_bytes = setting('LEGACY_SESSION_MEMORY_BYTES', DEFAULT_MEMORY_BYTES)
+        self.upload_root = upload_root
+
+    @contextmanager
+    def checkout(self, session_id: str, exclusive: bool = True) -> Iterator[SessionState]:
+        """
+        Use a session's state.
+
+        Creates the session if needed and evicts idle or surplus sessions.
+
+        Args:
+            session_id: Session to use
+            exclusive: Hold the session's lock; False for requests that
+                only read the state, so they don't wait for a running one
+        """
+        with self._lock:
+            state = self._sessions.get(session_id)
+            if state is None:
+                upload_dir = os.path.join(self.upload_root, session_id) if self.upload_root else None
+                state = SessionState(session_id, upload_dir)
+                self._sessions[session_id] = state
+            self._sessions.move_to_end(session_id)
+            state.in_use += 1
+
+        try:
+            if exclusive:
+                with state.lock:
+                    state.last_used = time.monotonic()
+                    yield state
+            else:
+                state.last_used = time.monotonic()
+                yield state
+        finally:
+            with self._lock:
+                state.in_use -= 1
+                state.last_used = time.monotonic()
+            self.evict()
+
+    def evict(self) -> int:
+        """
+        Evict expired sessions, then least recently used ones over the
+        session or memory limits.
+
+        Returns:
+            Number of sessions evicted
+        """
+        evicted = []
+        now = time.monotonic()
+        with self._lock:
+            idle = [s for s in self._sessions.values() if not s.in_use]
+            for state in idle:
+                if now - state.last_used > self.ttl_seconds:
+                    evicted.append(self._sessions.pop(state.session_id))
+
+            total = sum(s.estimated_bytes for s in self._sessions.values())
+            for state in idle:  # Least recently used first
+                if state.session_id not in self._sessions:
+                    continue
+                if len(self._sessions) <= self.max_sessions and total <= self.memory_bytes:
+                    break
+                total -= state.estimated_bytes
+                evicted.append(self._sessions.pop(state.session_id))
+            self.evictions += len(evicted)
+
+        for state in evicted:
+            state.release()
+        if evicted:
+            logger.info(f"Evicted {len(evicted)} idle legacy session(s)")
+        return len(evicted)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'sessions': len(self._sessions),
+                'max_sessions': self.max_sessions,
+                'estimated_bytes': sum(s.estimated_bytes for s in self._sessions.values()),
+                'memory_bytes': self.memory_bytes,
+                'evictions': self.evictions
+            }
+
+
+# Global pool used by the legacy routes
+session_pool = SessionPool()
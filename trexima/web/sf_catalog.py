@@ -0,0 +1,286 @@
+"""
+TREXIMA v2.0 - SF Tenant Catalog
+
+Cached catalog of a connected SuccessFactors tenant: entity sets by
+category, picklist counts and active locales.
+
+Building a catalog means downloading $metadata and running several
+queries, so catalogs are kept in the sf_catalogs table (shared by web
+and job worker processes) until SF_CATALOG_TTL_SECONDS have passed. A
+successful connection invalidates the catalog and rebuilds it in the
+background; an expired catalog is still served while it is rebuilt.
+Catalogs are keyed by endpoint, company and user, since role-based
+permissions decide what a user can see.
+"""
+
+import hashlib
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Dict, Any, Optional
+
+from sqlalchemy import insert, update, delete
+from sqlalchemy.exc import IntegrityError
+
+from trexima.web.models import db, SFCatalog
+
+logger = logging.getLogger(__name__)
+
+# Default catalog lifetime
+CATALOG_TTL_SECONDS = 3600
+
+# Connected clients kept per process for paging (each holds parsed $metadata)
+CLIENT_POOL_SIZE = 8
+
+# Known FO prefixes
+FO_PREFIXES = ['FO', 'FOCorp', 'FOBusiness', 'FOCompany', 'FODepartment',
+               'FODivision', 'FOJob', 'FOLocation', 'FOPay', 'FOEvent',
+               'FOGeo', 'FOFrequency', 'FOCostCenter', 'FOLegal']
+
+# Known EC prefixes
+EC_PREFIXES = ['Per', 'Emp', 'Position', 'Competency', 'DevGoal',
+               'Goal', 'Achievement', 'Activity', 'Background',
+               'TimeAccount', 'TimeManagement', 'Absence']
+
+# Catalog keys with a refresh running in this process
+_refreshing = set()
+_refreshing_lock = threading.Lock()
+
+# catalog key -> (connected at, client)
+_clients: 'OrderedDict[str, tuple]' = OrderedDict()
+_clients_lock = threading.Lock()
+
+
+def connection_params(sf_connection: Dict[str, Any]) -> Optional[Dict[str, str]]:
+    """
+    Get connection parameters from a project's sf_connection config.
+
+    Returns:
+        Dict with endpoint_url, company_id, username and password, or None
+        if the credentials are incomplete
+    """
+    params = {
+        'endpoint_url': sf_connection.get('endpoint_url') or sf_connection.get('endpoint'),
+        'company_id': sf_connection.get('company_id'),
+        'username': sf_connection.get('username'),
+        'password': sf_connection.get('password')
+    }
+    return params if all(params.values()) else None
+
+
+def catalog_key(params: Dict[str, str]) -> str:
+    """Get the catalog key of a connection."""
+    identity = '\n'.join([params['endpoint_url'].rstrip('/'), params['company_id'], params['username']])
+    return hashlib.sha256(identity.encode('utf-8')).hexdigest()
+
+
+def _ttl() -> int:
+    from flask import current_app
+    return int(current_app.config.get(
+        'SF_CATALOG_TTL_SECONDS', os.environ.get('SF_CATALOG_TTL_SECONDS', CATALOG_TTL_SECONDS)
+    ))
+
+
+def connect_client(params: Dict[str, str], cancel_token=None):
+    """Connect a new OData client."""
+    from trexima.core.odata_client import ODataClient
+
+    client = ODataClient(cancel_token=cancel_token)
+    client.connect(
+        service_url=params['endpoint_url'],
+        company_id=params['company_id'],
+        username=params['username'],
+        password=params['password']
+    )
+    return client
+
+
+# =============================================================================
+# CLIENT POOL
+# =============================================================================
+
+def pooled_client(params: Dict[str, str]):
+    """
+    Get a connected client for a tenant, reusing one of this process.
+
+    Clients older than the catalog TTL are reconnected.
+    """
+    key = catalog_key(params)
+    ttl = _ttl()
+    with _clients_lock:
+        entry = _clients.get(key)
+        if entry and time.monotonic() - entry[0] < ttl:
+            _clients.move_to_end(key)
+            return entry[1]
+
+    client = connect_client(params)
+    _pool_client(key, client)
+    return client
+
+
+def _pool_client(key: str, client):
+    with _clients_lock:
+        old = _clients.pop(key, None)
+        _clients[key] = (time.monotonic(), client)
+        evicted = [old[1]] if old and old[1] is not client else []
+        while len(_clients) > CLIENT_POOL_SIZE:
+            evicted.append(_clients.popitem(last=False)[1][1])
+    for stale in evicted:
+        stale.disconnect()
+
+
+def discard_client(params: Dict[str, str]):
+    """Drop the pooled client of a tenant (e.g. after a failed request)."""
+    with _clients_lock:
+        entry = _clients.pop(catalog_key(params), None)
+    if entry:
+        entry[1].disconnect()
+
+
+# =============================================================================
+# CATALOG
+# =============================================================================
+
+def build_catalog(client) -> Dict[str, Any]:
+    """
+    Read the catalog of a tenant.
+
+    Args:
+        client: Connected ODataClient
+
+    Returns:
+        Dict with entities (total and names by category), picklist counts
+        and active locales
+    """
+    all_entities = client.get_all_entity_names()
+
+    mdf_objects = []
+    foundation_objects = []
+    ec_objects = []
+    for entity in all_entities:
+        # Skip metadata and internal entities
+        if entity.startswith('cust_') or entity.endswith('Nav'):
+            mdf_objects.append(entity)
+        elif any(entity.startswith(prefix) for prefix in FO_PREFIXES):
+            foundation_objects.append(entity)
+        elif any(entity.startswith(prefix) for prefix in EC_PREFIXES):
+            ec_objects.append(entity)
+
+    return {
+        'entities': {
+            'total': len(all_entities),
+            'mdf_objects': sorted(mdf_objects),
+            'foundation_objects': sorted(foundation_objects),
+            'ec_objects': sorted(ec_objects)
+        },
+        'picklists': {
+            'mdf_count': client.get_picklist_count('mdf'),
+            'legacy_count': client.get_picklist_count('legacy'),
+            'migrated_legacy_count': client.get_migrated_legacy_picklist_count()
+        },
+        'locales': client.get_active_locales()
+    }
+
+
+def _store(key: str, data: Dict[str, Any]):
+    table = SFCatalog.__table__
+    now = datetime.utcnow()
+    values = {'data': data, 'fetched_at': now, 'expires_at': now + timedelta(seconds=_ttl())}
+    with db.engine.begin() as conn:
+        result = conn.execute(update(table).where(table.c.tenant_key == key).values(**values))
+        if result.rowcount:
+            return
+        try:
+            with conn.begin_nested():
+                conn.execute(insert(table).values(tenant_key=key, **values))
+        except IntegrityError:
+            # Stored concurrently by another process
+            conn.execute(update(table).where(table.c.tenant_key == key).values(**values))
+
+
+def refresh_catalog(params: Dict[str, str], client=None) -> Dict[str, Any]:
+    """
+    Build and store the catalog of a tenant.
+
+    Args:
+        params: Connection parameters (see connection_params)
+        client: Connected client to use (default: the pooled client)
+
+    Returns:
+        The catalog data
+    """
+    key = catalog_key(params)
+    if client is None:
+        client = pooled_client(params)
+    try:
+        data = build_catalog(client)
+    except Exception:
+        discard_client(params)
+        raise
+    _store(key, data)
+    logger.info(f"SF catalog {key[:12]} refreshed: {data['entities']['total']} entities")
+    return data
+
+
+def get_catalog(params: Dict[str, str]) -> Optional[SFCatalog]:
+    """Get the stored catalog of a tenant (possibly stale), or None."""
+    return db.session.get(SFCatalog, catalog_key(params))
+
+
+def invalidate_catalog(params: Dict[str, str]):
+    """Forget the catalog and pooled client of a tenant."""
+    table = SFCatalog.__table__
+    with db.engine.begin() as conn:
+        conn.execute(delete(table).where(table.c.tenant_key == catalog_key(params)))
+    discard_client(params)
+
+
+def schedule_refresh(app, params: Dict[str, str], client=None) -> bool:
+    """
+    Refresh a tenant's catalog in a background task of this process.
+
+    Args:
+        app: Flask app (the task runs in its app context)
+        params: Connection parameters
+        client: Freshly connected client to reuse and pool (if a refresh
+            is already running it is pooled only when the tenant has no
+            pooled client, and disconnected otherwise)
+
+    Returns:
+        False if a refresh of the tenant is already running here
+    """
+    from trexima.web.websocket import socketio
+
+    key = catalog_key(params)
+    with _refreshing_lock:
+        running = key in _refreshing
+        _refreshing.add(key)
+    if running:
+        if client is not None:
+            # Replacing the pooled client would disconnect it under the refresh
+            with _clients_lock:
+                pooled = key in _clients
+            if pooled:
+                client.disconnect()
+            else:
+                _pool_client(key, client)
+        return False
+    if client is not None:
+        _pool_client(key, client)
+
+    def refresh():
+        try:
+            with app.app_context():
+                refresh_catalog(params)
+                db.session.remove()
+        except Exception as e:
+            logger.warning(f"SF catalog {key[:12]} refresh failed: {e}")
+        finally:
+            with _refreshing_lock:
+                _refreshing.discard(key)
+
+    socketio.start_background_task(refresh)
+    return True
@@ -13,13 +13,31 @@ import os
 import json
 import shutil
 import glob
+import hashlib
+import tempfile
+import uuid
 from datetime import datetime
-from typing import BinaryIO, Dict, Any, Optional, List
+from typing import BinaryIO, Dict, Any, Optional, List, Iterator
 import logging
 from io import BytesIO
 
+from trexima.web.disk_cache import DiskCache
+
 logger = logging.getLogger(__name__)
 
+# Streaming uploads buffer one chunk at a time. S3 multipart parts must be
+# at least 5 MB (except the last one).
+UPLOAD_CHUNK_SIZE = 8 * 1024 * 1024
+
+# Bytes read ahead of an upload to sniff the file type
+SNIFF_BYTES = 2048
+
+# Chunk size of streamed downloads
+DOWNLOAD_CHUNK_SIZE = 256 * 1024
+
+# Maximum keys per S3 DeleteObjects request
+DELETE_BATCH_SIZE = 1000
+
 
 class ObjectStorageService:
     """
@@ -38,6 +56,7 @@ class ObjectStorageService:
         self._initialized = False
         self._use_local_storage = False
         self._local_base = None
+        self.cache: Optional[DiskCache] = None
 
         if app:
             self.init_app(app)
@@ -111,6 +130,7 @@ class ObjectStorageService:
             )
             self._initialized = True
             logger.info(f"Object Storage initialized with bucket: {self.bucket}")
+            self.cache = DiskCache.from_config(app.config)
         except Exception as e:
             logger.error(f"Failed to initialize Object Storage: {e}")
             self._initialized = False
@@ -138,6 +158,11 @@ class ObjectStorageService:
         safe_name = original_name.replace(' ', '_').replace('/', '_')
         return f"users/{user_id}/projects/{project_id}/uploads/{file_type}_{timestamp}_{safe_name}"
 
+    @staticmethod
+    def blob_key(sha256: str) -> str:
+        """Generate the content-addressed storage key of a blob."""
+        return f"blobs/sha256/{sha256[:2]}/{sha256}"
+
     @staticmethod
     def generate_output_key(user_id: str, project_id: str, file_type: str, filename: str) -> str:
         """Generate storage key for generated output file."""
@@ -172,21 +197,7 @@ class ObjectStorageService:
 
         # Local filesystem storage
         if self._use_local_storage:
-            local_path = os.path.join(self._local_base, key)
-            os.makedirs(os.path.dirname(local_path), exist_ok=True)
-
-            # Read content and write to file
-            content = file_obj.read()
-            with open(local_path, 'wb') as f:
-                f.write(content)
-
-            logger.info(f"Uploaded file to local storage: {key}")
-            return {
-                'key': key,
-                'size': len(content),
-                'etag': str(hash(content)),
-                'content_type': content_type
-            }
+            return self.upload_stream(file_obj, key, content_type)
 
         # S3 storage
         extra_args = {}
@@ -210,6 +221,219 @@ class ObjectStorageService:
             logger.error(f"Failed to upload file {key}: {e}")
             raise
 
+    def upload_stream(
+        self,
+        stream: BinaryIO,
+        key: str,
+        content_type: str = None,
+        head: bytes = b'',
+        chunk_size: int = UPLOAD_CHUNK_SIZE
+    ) -> Dict[str, Any]:
+        """
+        Upload a stream in fixed-size chunks, hashing it on the way.
+
+        Only one chunk is held in memory. Local storage writes to a temp
+        file next to the target and renames it into place; S3 uses a
+        multipart upload (or a single PUT if the stream fits in one chunk).
+        Nothing is left behind if the stream or the upload fails.
+
+        Args:
+            stream: File-like object to upload
+            key: Storage key
+            content_type: MIME type of the file
+            head: Bytes already read from the stream (e.g. for sniffing)
+            chunk_size: Chunk (and S3 part) size in bytes
+
+        Returns:
+            Dict with key, size, sha256, etag and content_type
+        """
+        self._ensure_initialized()
+
+        digest = hashlib.sha256()
+        size = 0
+
+        def chunks() -> Iterator[bytes]:
+            nonlocal size
+            for chunk in _read_chunks(stream, head, chunk_size):
+                digest.update(chunk)
+                size += len(chunk)
+                yield chunk
+
+        if self._use_local_storage:
+            self._write_local_atomic(key, chunks())
+            etag = digest.hexdigest()
+        else:
+            etag = self._upload_s3_chunks(key, chunks(), content_type)
+
+        logger.info(f"Streamed {size} bytes to {key}")
+        return {
+            'key': key,
+            'size': size,
+            'sha256': digest.hexdigest(),
+            'etag': etag,
+            'content_type': content_type
+        }
+
+    def store_blob(
+        self,
+        stream: BinaryIO,
+        content_type: str = None,
+        head: bytes = b'',
+        chunk_size: int = UPLOAD_CHUNK_SIZE
+    ) -> Dict[str, Any]:
+        """
+        Store content under a key derived from its SHA-256.
+
+        Seekable streams (like spooled request files) are hashed first, so
+        content that is already stored is not uploaded again. Other streams
+        are uploaded to a staging key and moved to the blob key.
+
+        Blobs are shared; callers track references (ProjectFile.content_hash)
+        and delete a blob only when nothing refers to it any more. A blob
+        that is already stored is touched, so the orphan scan's grace
+        period covers it until the caller's reference is committed.
+
+        Args:
+            stream: File-like object to store
+            content_type: MIME type of the file
+            head: Bytes already read from the stream (e.g. for sniffing)
+            chunk_size: Chunk (and S3 part) size in bytes
+
+        Returns:
+            Dict with key, size, sha256, content_type and deduplicated
+        """
+        self._ensure_initialized()
+
+        seekable = getattr(stream, 'seekable', None)
+        if seekable and seekable():
+            start = stream.tell()
+            digest = hashlib.sha256()
+            size = 0
+            for chunk in _read_chunks(stream, head, chunk_size):
+                digest.update(chunk)
+                size += len(chunk)
+            stream.seek(start)
+
+            sha256 = digest.hexdigest()
+            key = self.blob_key(sha256)
+            if self.touch_file(key):
+                logger.info(f"Blob already stored: {key}")
+                return {
+                    'key': key,
+                    'size': size,
+                    'sha256': sha256,
+                    'content_type': content_type,
+                    'deduplicated': True
+                }
+            result = self.upload_stream(stream, key, content_type, head=head, chunk_size=chunk_size)
+            result['deduplicated'] = False
+            return result
+
+        staging_key = f"blobs/staging/{uuid.uuid4().hex}"
+        result = self.upload_stream(stream, staging_key, content_type, head=head, chunk_size=chunk_size)
+        key = self.blob_key(result['sha256'])
+        if self.touch_file(key):
+            self.delete_file(staging_key)
+            result['deduplicated'] = True
+        else:
+            self.move_file(staging_key, key)
+            result['deduplicated'] = False
+        result['key'] = key
+        return result
+
+    def move_file(self, source_key: str, target_key: str):
+        """
+        Move an object to another key (the moved object counts as modified).
+
+        Raises:
+            FileNotFoundError: (local) or ClientError (S3) if the source
+                does not exist
+        """
+        self._ensure_initialized()
+
+        if self._use_local_storage:
+            target_path = os.path.join(self._local_base, target_key)
+            os.makedirs(os.path.dirname(target_path), exist_ok=True)
+            os.replace(os.path.join(self._local_base, source_key), target_path)
+            os.utime(target_path)
+            return
+
+        self.client.copy_object(
+            Bucket=self.bucket,
+            Key=target_key,
+            CopySource={'Bucket': self.bucket, 'Key': source_key}
+        )
+        self.client.delete_object(Bucket=self.bucket, Key=source_key)
+
+    def _write_local_atomic(self, key: str, chunks: Iterator[bytes]):
+        """Write chunks to a temp file and rename it to the key's path."""
+        local_path = os.path.join(self._local_base, key)
+        directory = os.path.dirname(local_path)
+        os.makedirs(directory, exist_ok=True)
+
+        fd, temp_path = tempfile.mkstemp(dir=directory, prefix='.upload-')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                for chunk in chunks:
+                    f.write(chunk)
+            os.replace(temp_path, local_path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+    def _upload_s3_chunks(self, key: str, chunks: Iterator[bytes], content_type: str = None) -> str:
+        """
+        Upload chunks to S3 as a multipart upload.
+
+        Returns:
+            ETag of the stored object
+        """
+        extra_args = {'ContentType': content_type} if content_type else {}
+
+        first = next(chunks, b'')
+        second = next(chunks, None)
+        if second is None:
+            # Fits in one chunk: a multipart upload would only add round trips
+            response = self.client.put_object(
+                Bucket=self.bucket, Key=key, Body=first, **extra_args
+            )
+            return response['ETag'].strip('"')
+
+        upload_id = self.client.create_multipart_upload(
+            Bucket=self.bucket, Key=key, **extra_args
+        )['UploadId']
+        parts = []
+        try:
+            self._upload_part(key, upload_id, parts, first)
+            self._upload_part(key, upload_id, parts, second)
+            for chunk in chunks:
+                self._upload_part(key, upload_id, parts, chunk)
+
+            response = self.client.complete_multipart_upload(
+                Bucket=self.bucket,
+                Key=key,
+                UploadId=upload_id,
+                MultipartUpload={'Parts': parts}
+            )
+            return response['ETag'].strip('"')
+        except BaseException:
+            try:
+                self.client.abort_multipart_upload(
+                    Bucket=self.bucket, Key=key, UploadId=upload_id
+                )
+            except ClientError as e:
+                logger.warning(f"Failed to abort multipart upload of {key}: {e}")
+            raise
+
+    def _upload_part(self, key: str, upload_id: str, parts: List[Dict[str, Any]], data: bytes):
+        part_number = len(parts) + 1
+        response = self.client.upload_part(
+            Bucket=self.bucket, Key=key, UploadId=upload_id,
+            PartNumber=part_number, Body=data
+        )
+        parts.append({'PartNumber': part_number, 'ETag': response['ETag']})
+
     def upload_bytes(self, data: bytes, key: str, content_type: str = None) -> Dict[str, Any]:
         """
         Upload bytes data to Object Store.
@@ -251,6 +475,14 @@ class ObjectStorageService:
             return data
 
         # S3 storage
+        cached_path = self._cached_path(key)
+        if cached_path:
+            try:
+                with open(cached_path, 'rb') as f:
+                    return f.read()
+            except FileNotFoundError:
+                pass  # Evicted meanwhile; download directly
+
         try:
             response = self.client.get_object(Bucket=self.bucket, Key=key)
             data = response['Body'].read()
@@ -267,6 +499,10 @@ class ObjectStorageService:
         """
         Download a file to local filesystem.
 
+        Local storage and cached S3 files are hard-linked rather than
+        copied when possible; stored files are only ever replaced, never
+        modified in place, so the link is a stable snapshot.
+
         Args:
             key: Storage key
             local_path: Local file path
@@ -281,11 +517,19 @@ class ObjectStorageService:
             src_path = os.path.join(self._local_base, key)
             if not os.path.exists(src_path):
                 raise FileNotFoundError(f"File not found: {key}")
-            shutil.copy2(src_path, local_path)
-            logger.info(f"Copied {key} to {local_path}")
+            _link_or_copy(src_path, local_path)
+            logger.info(f"Linked {key} to {local_path}")
             return local_path
 
         # S3 storage
+        cached_path = self._cached_path(key)
+        if cached_path:
+            try:
+                _link_or_copy(cached_path, local_path)
+                return local_path
+            except FileNotFoundError:
+                pass  # Evicted meanwhile; download directly
+
         try:
             self.client.download_file(self.bucket, key, local_path)
             logger.info(f"Downloaded {key} to {local_path}")
@@ -294,6 +538,106 @@ class ObjectStorageService:
             logger.error(f"Failed to download file {key}: {e}")
             raise
 
+    def _cached_path(self, key: str) -> Optional[str]:
+        """
+        Get the path of an S3 object in the disk cache, downloading it on a miss.
+
+        Returns:
+            Local path, or None if caching is disabled
+        """
+        if self.cache is None:
+            return None
+
+        if key.startswith('blobs/sha256/'):
+            # Content-addressed: the key itself identifies the content
+            etag = key.rsplit('/', 1)[1]
+        else:
+            try:
+                etag = self.client.head_object(Bucket=self.bucket, Key=key)['ETag'].strip('"')
+            except ClientError as e:
+                if e.response['Error']['Code'] in ('404', 'NoSuchKey'):
+                    raise FileNotFoundError(f"File not found: {key}")
+                raise
+
+        name = DiskCache.entry_name(key, etag)
+        path = self.cache.get(name)
+        if path:
+            return path
+
+        def write(temp_path: str):
+            try:
+                self.client.download_file(self.bucket, key, temp_path)
+            except ClientError as e:
+                if e.response['Error']['Code'] in ('404', 'NoSuchKey'):
+                    raise FileNotFoundError(f"File not found: {key}")
+                raise
+
+        path = self.cache.put(name, write)
+        logger.info(f"Cached {key}")
+        return path
+
+    def cache_stats(self) -> Optional[Dict[str, Any]]:
+        """Get disk cache statistics, or None if caching is disabled."""
+        return self.cache.stats() if self.cache else None
+
+    def iter_file(
+        self,
+        key: str,
+        start: int = 0,
+        end: Optional[int] = None,
+        chunk_size: int = DOWNLOAD_CHUNK_SIZE
+    ) -> Iterator[bytes]:
+        """
+        Stream a file (or a byte range of it) in chunks.
+
+        The file is opened on the first iteration and closed when the
+        iterator is exhausted or closed.
+
+        Args:
+            key: Storage key
+            start: First byte offset
+            end: Offset after the last byte (default: end of file)
+            chunk_size: Chunk size in bytes
+
+        Yields:
+            File content chunks
+        """
+        self._ensure_initialized()
+
+        # Local filesystem storage
+        if self._use_local_storage:
+            local_path = os.path.join(self._local_base, key)
+            if not os.path.exists(local_path):
+                raise FileNotFoundError(f"File not found: {key}")
+            with open(local_path, 'rb') as f:
+                f.seek(start)
+                remaining = None if end is None else end - start
+                while remaining is None or remaining > 0:
+                    size = chunk_size if remaining is None else min(chunk_size, remaining)
+                    chunk = f.read(size)
+                    if not chunk:
+                        break
+                    if remaining is not None:
+                        remaining -= len(chunk)
+                    yield chunk
+            return
+
+        # S3 storage
+        params = {'Bucket': self.bucket, 'Key': key}
+        if start or end is not None:
+            params['Range'] = f"bytes={start}-{'' if end is None else end - 1}"
+        try:
+            body = self.client.get_object(**params)['Body']
+        except ClientError as e:
+            if e.response['Error']['Code'] == 'NoSuchKey':
+                raise FileNotFoundError(f"File not found: {key}")
+            raise
+        try:
+            for chunk in body.iter_chunks(chunk_size):
+                yield chunk
+        finally:
+            body.close()
+
     def get_download_url(self, key: str, expires_in: int = 3600, filename: str = None) -> str:
         """
         Generate a pre-signed download URL or local file path.
@@ -368,6 +712,43 @@ class ObjectStorageService:
             logger.error(f"Failed to delete file {key}: {e}")
             return False
 
+    def delete_files(self, keys: List[str]) -> int:
+        """
+        Delete many files, in batches of 1,000 on S3.
+
+        Args:
+            keys: Storage keys
+
+        Returns:
+            Number of files deleted
+        """
+        self._ensure_initialized()
+
+        deleted_count = 0
+
+        # Local filesystem storage
+        if self._use_local_storage:
+            for key in keys:
+                try:
+                    os.remove(os.path.join(self._local_base, key))
+                    deleted_count += 1
+                except FileNotFoundError:
+                    pass
+            return deleted_count
+
+        # S3 storage
+        for start in range(0, len(keys), DELETE_BATCH_SIZE):
+            batch = keys[start:start + DELETE_BATCH_SIZE]
+            response = self.client.delete_objects(
+                Bucket=self.bucket,
+                Delete={'Objects': [{'Key': key} for key in batch], 'Quiet': True}
+            )
+            errors = response.get('Errors', [])
+            for error in errors:
+                logger.warning(f"Failed to delete {error.get('Key')}: {error.get('Message')}")
+            deleted_count += len(batch) - len(errors)
+        return deleted_count
+
     def delete_prefix(self, prefix: str) -> int:
         """
         Delete all files with a given prefix.
@@ -482,6 +863,44 @@ class ObjectStorageService:
                 return False
             raise
 
+    def touch_file(self, key: str) -> bool:
+        """
+        Set a file's modification time to now.
+
+        Args:
+            key: Storage key
+
+        Returns:
+            True if the file exists
+        """
+        self._ensure_initialized()
+
+        # Local filesystem storage
+        if self._use_local_storage:
+            try:
+                os.utime(os.path.join(self._local_base, key))
+                return True
+            except FileNotFoundError:
+                return False
+
+        # S3 storage: copy the object onto itself
+        try:
+            response = self.client.head_object(Bucket=self.bucket, Key=key)
+            extra_args = {'ContentType': response['ContentType']} if response.get('ContentType') else {}
+            self.client.copy_object(
+                Bucket=self.bucket,
+                Key=key,
+                CopySource={'Bucket': self.bucket, 'Key': key},
+                MetadataDirective='REPLACE',
+                Metadata=response.get('Metadata', {}),
+                **extra_args
+            )
+            return True
+        except ClientError as e:
+            if e.response['Error']['Code'] in ('404', 'NoSuchKey'):
+                return False
+            raise
+
     def get_file_info(self, key: str) -> Optional[Dict[str, Any]]:
         """
         Get file metadata.
@@ -505,7 +924,7 @@ class ObjectStorageService:
                 'size': stat.st_size,
                 'content_type': 'application/xml' if key.endswith('.xml') else 'application/octet-stream',
                 'last_modified': datetime.fromtimestamp(stat.st_mtime),
-                'etag': str(hash(f"{key}_{stat.st_size}_{stat.st_mtime}"))
+                'etag': _local_etag(stat)
             }
 
         # S3 storage
@@ -585,7 +1004,7 @@ class ObjectStorageService:
                             'key': rel_path,
                             'size': stat.st_size,
                             'last_modified': datetime.fromtimestamp(stat.st_mtime),
-                            'etag': str(hash(f"{rel_path}_{stat.st_size}"))
+                            'etag': _local_etag(stat)
                         })
             return files
 
@@ -610,9 +1029,75 @@ class ObjectStorageService:
             logger.error(f"Failed to list files with prefix {prefix}: {e}")
             raise
 
+    def iter_files(
+        self,
+        prefix: str,
+        start_after: str = None,
+        page_size: int = 1000
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate over all files with a given prefix in key order.
+
+        Lists one page at a time, so memory use does not depend on the
+        number of files. Pass the last key seen as start_after to resume.
+
+        Args:
+            prefix: Key prefix to match
+            start_after: Only return keys after this one
+            page_size: Keys per listing request
+
+        Yields:
+            File info dicts (key, size, last_modified in UTC, etag)
+        """
+        self._ensure_initialized()
+
+        # Local filesystem storage
+        if self._use_local_storage:
+            base = os.path.join(self._local_base, prefix)
+            directory, name_prefix = (base, '') if prefix.endswith('/') else os.path.split(base)
+            if not os.path.isdir(directory):
+                return
+            rel_dir = os.path.relpath(directory, self._local_base)
+            rel_dir = '' if rel_dir == '.' else rel_dir.replace(os.sep, '/') + '/'
+            for key, path in _walk_sorted(directory, rel_dir, name_prefix):
+                if start_after is not None and key <= start_after:
+                    continue
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                yield {
+                    'key': key,
+                    'size': stat.st_size,
+                    'last_modified': datetime.utcfromtimestamp(stat.st_mtime),
+                    'etag': _local_etag(stat)
+                }
+            return
+
+        # S3 storage (keys are listed in UTF-8 binary order)
+        paginator = self.client.get_paginator('list_objects_v2')
+        params = {
+            'Bucket': self.bucket,
+            'Prefix': prefix,
+            'PaginationConfig': {'PageSize': page_size}
+        }
+        if start_after:
+            params['StartAfter'] = start_after
+        for page in paginator.paginate(**params):
+            for obj in page.get('Contents', []):
+                yield {
+                    'key': obj['Key'],
+                    'size': obj['Size'],
+                    'last_modified': obj['LastModified'],
+                    'etag': obj['ETag'].strip('"')
+                }
+
     def get_storage_usage(self, user_id: str = None) -> Dict[str, Any]:
         """
-        Get storage usage statistics.
+        Get storage usage statistics by listing the bucket.
+
+        Walks every matching object; dashboards should read the
+        StorageUsage counters instead (see trexima.web.storage_usage).
 
         Args:
             user_id: Optional user ID to filter by
@@ -632,9 +1117,7 @@ class ObjectStorageService:
         }
 
         try:
-            files = self.list_files(prefix, max_keys=10000)
-
-            for f in files:
+            for f in self.iter_files(prefix):
                 stats['total_files'] += 1
                 stats['total_size'] += f['size']
 
@@ -651,6 +1134,62 @@ class ObjectStorageService:
             return stats
 
 
+def _link_or_copy(source: str, target: str):
+    """Hard-link a file, falling back to a copy (e.g. across devices)."""
+    if os.path.exists(target):
+        os.remove(target)
+    try:
+        os.link(source, target)
+    except OSError:
+        shutil.copy2(source, target)
+
+
+def _walk_sorted(directory: str, rel_dir: str, name_prefix: str = '') -> Iterator[tuple]:
+    """
+    Yield (key, path) of files below a directory in key order.
+
+    A directory 'a' sorts as 'a/', so the order matches a sort of the
+    full keys (like an S3 listing).
+    """
+    try:
+        entries = [e for e in os.scandir(directory) if e.name.startswith(name_prefix)]
+    except FileNotFoundError:
+        return
+    entries.sort(key=lambda e: e.name + '/' if e.is_dir() else e.name)
+    for entry in entries:
+        if entry.is_dir():
+            yield from _walk_sorted(entry.path, f"{rel_dir}{entry.name}/")
+        elif not entry.name.startswith('.upload-'):
+            yield f"{rel_dir}{entry.name}", entry.path
+
+
+def _local_etag(stat: os.stat_result) -> str:
+    """ETag of a local file from its mtime and size (stable across processes)."""
+    return f"{stat.st_mtime_ns:x}-{stat.st_size:x}"
+
+
+def _read_chunks(stream: BinaryIO, head: bytes, chunk_size: int) -> Iterator[bytes]:
+    """
+    Yield full chunks of head + stream (only the last may be shorter).
+
+    Short reads are topped up so S3 parts meet the minimum part size.
+    """
+    buffer = bytearray(head)
+    while True:
+        while len(buffer) < chunk_size:
+            data = stream.read(chunk_size - len(buffer))
+            if not data:
+                break
+            buffer.extend(data)
+        if not buffer:
+            return
+        if len(buffer) < chunk_size:
+            yield bytes(buffer)
+            return
+        yield bytes(buffer[:chunk_size])
+        del buffer[:chunk_size]
+
+
 # Singleton instance
 storage_service = ObjectStorageService()
 
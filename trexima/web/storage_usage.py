@@ -0,0 +1,265 @@
+"""
+TREXIMA v2.0 - Storage Usage
+
+Per-user and global storage usage counters (StorageUsage table).
+
+ProjectFile and GeneratedFile rows are counted as they are flushed, in
+the same transaction, so the counters never disagree with committed rows.
+Bulk deletes that bypass the ORM call record_usage() themselves. A
+periodic reconciler recomputes the counters from the tables and measures
+what is actually stored in the bucket.
+"""
+
+import logging
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, Any, Iterable, Optional, Tuple
+
+from sqlalchemy import event, func, inspect, select, update, insert, delete
+from sqlalchemy.exc import IntegrityError
+
+from trexima.web.models import db, Project, ProjectFile, GeneratedFile, StorageUsage
+
+logger = logging.getLogger(__name__)
+
+# Reconcile counters every 6 hours
+RECONCILE_INTERVAL_SECONDS = 6 * 3600
+
+_CATEGORY_BY_MODEL = {ProjectFile: 'uploads', GeneratedFile: 'generated'}
+
+# (user_id, category) -> [bytes, objects]
+UsageDeltas = Dict[Tuple[str, str], list]
+
+
+# =============================================================================
+# TRANSACTIONAL COUNTERS
+# =============================================================================
+
+def record_usage(connection, deltas: UsageDeltas):
+    """
+    Add deltas to the counters of each user and to the global counters.
+
+    Runs on the caller's connection, i.e. inside its transaction.
+
+    Args:
+        connection: Connection of the current transaction
+        deltas: (user_id, category) -> [bytes, objects] changes
+    """
+    table = StorageUsage.__table__
+    totals: UsageDeltas = defaultdict(lambda: [0, 0])
+    for (user_id, category), (size, count) in deltas.items():
+        for scope in (user_id, StorageUsage.ALL_USERS):
+            totals[(scope, category)][0] += size
+            totals[(scope, category)][1] += count
+
+    now = datetime.utcnow()
+    for (scope, category), (size, count) in totals.items():
+        if not size and not count:
+            continue
+        where = (table.c.user_id == scope) & (table.c.category == category)
+        result = connection.execute(
+            update(table).where(where).values(
+                bytes=table.c.bytes + size, objects=table.c.objects + count, updated_at=now
+            )
+        )
+        if result.rowcount:
+            continue
+        try:
+            with connection.begin_nested():
+                connection.execute(insert(table).values(
+                    user_id=scope, category=category, bytes=size, objects=count, updated_at=now
+                ))
+        except IntegrityError:
+            # Inserted concurrently by another transaction
+            connection.execute(
+                update(table).where(where).values(
+                    bytes=table.c.bytes + size, objects=table.c.objects + count, updated_at=now
+                )
+            )
+
+
+def _project_owner(session, project_id: str, owners: Dict[str, Optional[str]]) -> Optional[str]:
+    if project_id not in owners:
+        owners[project_id] = session.execute(
+            select(Project.user_id).where(Project.id == project_id)
+        ).scalar()
+    return owners[project_id]
+
+
+def _file_size(obj) -> int:
+    return obj.file_size or 0
+
+
+def _before_flush(session, flush_context, instances):
+    """Count deleted and resized files while their projects still exist."""
+    # Replaced on every flush, so a failed flush leaves nothing behind
+    deltas: UsageDeltas = defaultdict(lambda: [0, 0])
+    owners: Dict[str, Optional[str]] = {}
+    session.info['storage_usage_deltas'] = deltas
+    session.info['storage_usage_owners'] = owners
+
+    with session.no_autoflush:
+        for obj in session.deleted:
+            category = _CATEGORY_BY_MODEL.get(type(obj))
+            if category is None or obj.project_id is None:
+                continue
+            user_id = _project_owner(session, obj.project_id, owners)
+            if user_id:
+                deltas[(user_id, category)][0] -= _file_size(obj)
+                deltas[(user_id, category)][1] -= 1
+
+        for obj in session.dirty:
+            category = _CATEGORY_BY_MODEL.get(type(obj))
+            if category is None or obj.project_id is None:
+                continue
+            history = inspect(obj).attrs.file_size.history
+            if not history.has_changes():
+                continue
+            change = sum(v or 0 for v in history.added) - sum(v or 0 for v in history.deleted)
+            user_id = _project_owner(session, obj.project_id, owners)
+            if user_id:
+                deltas[(user_id, category)][0] += change
+
+
+def _after_flush(session, flush_context):
+    """Count new files (their project IDs are set now) and write all deltas."""
+    deltas: UsageDeltas = session.info.pop('storage_usage_deltas', None) or defaultdict(lambda: [0, 0])
+    owners = session.info.pop('storage_usage_owners', {})
+
+    for obj in session.new:
+        category = _CATEGORY_BY_MODEL.get(type(obj))
+        if category is None:
+            continue
+        user_id = _project_owner(session, obj.project_id, owners)
+        if user_id:
+            deltas[(user_id, category)][0] += _file_size(obj)
+            deltas[(user_id, category)][1] += 1
+
+    if any(size or count for size, count in deltas.values()):
+        record_usage(session.connection(), deltas)
+
+
+def init_storage_usage(app):
+    """Start counting file rows on the app's database session."""
+    for name, listener in (('before_flush', _before_flush), ('after_flush', _after_flush)):
+        if not event.contains(db.session, name, listener):
+            event.listen(db.session, name, listener)
+
+
+# =============================================================================
+# READING
+# =============================================================================
+
+def get_usage(user_id: str = StorageUsage.ALL_USERS) -> Dict[str, Any]:
+    """
+    Get the usage counters of a user, or of all users.
+
+    Reads a handful of counter rows, regardless of the number of files.
+
+    Returns:
+        Dict with total_files, total_size, uploads and generated (count,
+        size) and, for all users, what the last reconcile found stored
+    """
+    rows = StorageUsage.query.filter_by(user_id=user_id).all()
+    by_category = {row.category: row for row in rows}
+
+    usage = {'total_files': 0, 'total_size': 0}
+    for category in StorageUsage.CATEGORIES:
+        row = by_category.get(category)
+        usage[category] = {
+            'count': row.objects if row else 0,
+            'size': row.bytes if row else 0
+        }
+        usage['total_files'] += usage[category]['count']
+        usage['total_size'] += usage[category]['size']
+
+    if user_id == StorageUsage.ALL_USERS:
+        stored = [by_category[c] for c in StorageUsage.STORED_CATEGORIES if c in by_category]
+        usage['stored'] = {
+            row.category[len('stored_'):]: {'count': row.objects, 'size': row.bytes}
+            for row in stored
+        }
+        usage['reconciled_at'] = (
+            max(row.updated_at for row in stored).isoformat() if stored else None
+        )
+    return usage
+
+
+# =============================================================================
+# RECONCILIATION
+# =============================================================================
+
+def classify_key(key: str) -> str:
+    """Get the stored_* category of a storage key."""
+    if key.startswith('blobs/') or '/uploads/' in key:
+        return 'stored_uploads'
+    if '/generated/' in key:
+        return 'stored_generated'
+    return 'stored_other'
+
+
+def reconcile_storage_usage(storage, prefixes: Iterable[str] = ('blobs/', 'users/')) -> Dict[str, Any]:
+    """
+    Recompute all counters and measure the bucket.
+
+    File counters are rebuilt from GROUP BY aggregates (one row per
+    user); stored_* counters from a paginated listing, summed as it goes.
+
+    Args:
+        storage: Storage service to list
+        prefixes: Key prefixes to measure
+
+    Returns:
+        Global usage after reconciling and the number of corrected counters
+    """
+    counters: UsageDeltas = defaultdict(lambda: [0, 0])
+
+    # List first: the aggregates below should be as fresh as possible
+    # when the counters are overwritten
+    for prefix in prefixes:
+        for info in storage.iter_files(prefix):
+            stored = counters[(StorageUsage.ALL_USERS, classify_key(info['key']))]
+            stored[0] += info['size']
+            stored[1] += 1
+
+    for model, category in _CATEGORY_BY_MODEL.items():
+        rows = db.session.execute(
+            select(Project.user_id, func.coalesce(func.sum(model.file_size), 0), func.count(model.id))
+            .join(Project, Project.id == model.project_id)
+            .group_by(Project.user_id)
+        ).all()
+        for user_id, size, count in rows:
+            for scope in (user_id, StorageUsage.ALL_USERS):
+                counters[(scope, category)][0] += int(size)
+                counters[(scope, category)][1] += count
+
+    corrected = 0
+    existing = {(row.user_id, row.category): row for row in StorageUsage.query.all()}
+    now = datetime.utcnow()
+    for key, (size, count) in counters.items():
+        row = existing.pop(key, None)
+        if row is None:
+            row = StorageUsage(user_id=key[0], category=key[1])
+            db.session.add(row)
+        elif (row.bytes, row.objects) == (size, count):
+            row.updated_at = now
+            continue
+        if key[1] in StorageUsage.CATEGORIES:
+            corrected += 1
+        row.bytes, row.objects, row.updated_at = size, count, now
+
+    # Users without files any more
+    for row in existing.values():
+        if row.objects or row.bytes:
+            corrected += 1
+    if existing:
+        table = StorageUsage.__table__
+        for user_id, category in existing:
+            db.session.execute(
+                delete(table).where(table.c.user_id == user_id, table.c.category == category)
+            )
+    db.session.commit()
+
+    if corrected:
+        logger.warning(f"Storage usage reconcile corrected {corrected} counter(s)")
+    return {'corrected': corrected, 'usage': get_usage()}
@@ -0,0 +1,132 @@
+"""
+TREXIMA v2.0 - Translation Rows
+
+Row stores (see trexima.io.row_store) of exported workbooks.
+
+An export writes the rows of its workbook to a SQLite row store and
+uploads it next to the workbook, as "<workbook key>.rows.sqlite". The
+store lives and dies with its workbook: the expiry sweep deletes both and
+the orphan scan counts the store as referenced by the workbook's row.
+
+Stores are read from a local copy (ROW_STORE_DIR), which is hard-linked
+from the storage when possible; the oldest copies beyond
+ROW_STORE_LOCAL_MAX are removed.
+"""
+
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+from typing import Optional
+
+from trexima.io.row_store import TranslationRowStore
+from trexima.web.storage import storage_service
+
+logger = logging.getLogger(__name__)
+
+ROW_STORE_SUFFIX = '.rows.sqlite'
+
+# Local copies kept for reading
+DEFAULT_LOCAL_MAX = 16
+
+_local_lock = threading.Lock()
+
+
+def row_store_key(workbook_key: str) -> str:
+    """Get the storage key of a workbook's row store."""
+    return workbook_key + ROW_STORE_SUFFIX
+
+
+def workbook_key_of(key: str) -> Optional[str]:
+    """Get the workbook key a row store key belongs to, or None."""
+    return key[:-len(ROW_STORE_SUFFIX)] if key.endswith(ROW_STORE_SUFFIX) else None
+
+
+def save_row_store(workbook, workbook_key: str, temp_dir: str) -> Optional[int]:
+    """
+    Build the row store of a workbook and upload it.
+
+    Failures are logged, not raised: the workbook is still usable.
+
+    Args:
+        workbook: openpyxl Workbook that was exported
+        workbook_key: Storage key of the uploaded workbook
+        temp_dir: Directory for the SQLite file
+
+    Returns:
+        Number of rows stored, or None on failure
+    """
+    path = os.path.join(temp_dir, 'rows.sqlite')
+    try:
+        with TranslationRowStore.create(path) as store:
+            count = store.add_workbook(workbook)
+        with open(path, 'rb') as f:
+            storage_service.upload_file(f, row_store_key(workbook_key), content_type='application/vnd.sqlite3')
+        logger.info(f"Stored {count} workbook rows for {workbook_key}")
+        return count
+    except Exception as e:
+        logger.warning(f"Could not build row store for {workbook_key}: {e}")
+        return None
+
+
+def _local_dir() -> str:
+    from flask import current_app
+    directory = current_app.config.get(
+        'ROW_STORE_DIR',
+        os.environ.get('ROW_STORE_DIR', os.path.join(tempfile.gettempdir(), 'trexima_row_stores'))
+    )
+    os.makedirs(directory, exist_ok=True)
+    return directory
+
+
+def _prune(directory: str, keep: int):
+    entries = []
+    for name in os.listdir(directory):
+        if name.endswith('.sqlite'):
+            path = os.path.join(directory, name)
+            try:
+                # ctime: when the copy (or link) was made
+                entries.append((os.stat(path).st_ctime, path))
+            except FileNotFoundError:
+                continue
+    entries.sort(reverse=True)
+    for _, path in entries[keep:]:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def open_row_store(workbook_key: str) -> TranslationRowStore:
+    """
+    Open the row store of a workbook from a local copy.
+
+    Stored objects are never modified in place, so a copy named after the
+    key and ETag stays valid.
+
+    Raises:
+        FileNotFoundError: If the workbook has no row store
+    """
+    key = row_store_key(workbook_key)
+    info = storage_service.get_file_info(key)
+    if info is None:
+        raise FileNotFoundError(f"No row store for {workbook_key}")
+
+    directory = _local_dir()
+    name = hashlib.sha256(f"{key}\n{info['etag']}".encode('utf-8')).hexdigest()
+    path = os.path.join(directory, f"{name}.sqlite")
+
+    with _local_lock:
+        # Copies may be hard links to stored objects: never touch them
+        if not os.path.exists(path):
+            temp_path = f"{path}.{os.getpid()}.tmp"
+            storage_service.download_to_file(key, temp_path)
+            os.replace(temp_path, path)
+            from flask import current_app
+            keep = int(current_app.config.get(
+                'ROW_STORE_LOCAL_MAX', os.environ.get('ROW_STORE_LOCAL_MAX', DEFAULT_LOCAL_MAX)
+            ))
+            _prune(directory, max(keep, 1))
+        # Open while holding the lock: an open file survives pruning
+        return TranslationRowStore.open(path)
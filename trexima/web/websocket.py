@@ -8,10 +8,17 @@ Handles bidirectional communication for export/import operations.
 from flask_socketio import SocketIO, emit, join_room, leave_room, disconnect
 from flask import request, g
 import logging
+import os
 from typing import Dict, Any, Optional, Callable
 from datetime import datetime
 from functools import wraps
 import threading
+import time
+
+from trexima.core.cancellation import CancellationToken, OperationCancelled
+from trexima.web.operation_registry import (
+    OperationRegistry, InMemoryOperationRegistry, create_operation_registry
+)
 
 logger = logging.getLogger(__name__)
 
@@ -34,9 +41,32 @@ socketio = SocketIO(
     max_http_buffer_size=10 * 1024 * 1024
 )
 
-# Store for active operations (thread-safe)
-_active_operations: Dict[str, Dict[str, Any]] = {}
-_operations_lock = threading.Lock()
+# Active operations by project; replaced by the configured backend in
+# init_websocket (the database registry is shared by all instances)
+_registry: OperationRegistry = InMemoryOperationRegistry()
+
+# Progress emits per second and project from a ProgressTracker; step
+# transitions and completion are always sent
+DEFAULT_PROGRESS_EMITS_PER_SECOND = 4.0
+_progress_interval = 1.0 / DEFAULT_PROGRESS_EMITS_PER_SECOND
+
+# Operation-registry cancellation checks per tracker are throttled too
+CANCEL_CHECK_INTERVAL_SECONDS = 0.5
+
+# Last progress state sent per project; later updates only carry the
+# fields that changed (see _progress_message)
+_last_progress: Dict[str, Dict[str, Any]] = {}
+_progress_lock = threading.Lock()
+PROGRESS_DELTA_FIELDS = ('operation', 'total_steps', 'step_name', 'message', 'details')
+
+# In job worker processes, events are put on this channel and emitted by
+# the web process (see trexima.web.jobs) instead of being emitted directly
+_event_channel = None
+
+# Extra cancellation check and request handler (e.g. the job table),
+# both called with a project ID
+_cancel_check: Optional[Callable[[str], bool]] = None
+_cancel_request_handler: Optional[Callable[[str], bool]] = None
 
 
 # =============================================================================
@@ -138,19 +168,18 @@ def handle_subscribe(data):
     })
 
     # Send current operation status if any
-    with _operations_lock:
-        if project_id in _active_operations:
-            op = _active_operations[project_id]
-            emit('progress_update', {
-                'project_id': project_id,
-                'operation': op['operation'],
-                'step': op['current_step'],
-                'total_steps': op['total_steps'],
-                'step_name': op['step_name'],
-                'percent': op['percent'],
-                'message': op['message'],
-                'details': op.get('details', {})
-            })
+    op = _registry.get(project_id)
+    if op is not None:
+        emit('progress_update', {
+            'project_id': project_id,
+            'operation': op['operation'],
+            'step': op['current_step'],
+            'total_steps': op['total_steps'],
+            'step_name': op['step_name'],
+            'percent': op['percent'],
+            'message': op['message'],
+            'details': op.get('details', {})
+        })
 
 
 @socketio.on('unsubscribe_project')
@@ -186,20 +215,18 @@ def handle_cancel(data):
         emit('error', {'code': 'INVALID_REQUEST', 'message': 'project_id required'})
         return
 
-    with _operations_lock:
-        if project_id in _active_operations:
-            _active_operations[project_id]['cancelled'] = True
-            logger.info(f"Operation cancellation requested for project {project_id}")
+    if cancel_operation(project_id):
+        logger.info(f"Operation cancellation requested for project {project_id}")
 
-            emit('operation_cancelling', {
-                'project_id': project_id,
-                'message': 'Cancellation requested, please wait...'
-            }, room=f'project_{project_id}')
-        else:
-            emit('error', {
-                'code': 'NO_OPERATION',
-                'message': 'No active operation for this project'
-            })
+        emit('operation_cancelling', {
+            'project_id': project_id,
+            'message': 'Cancellation requested, please wait...'
+        }, room=f'project_{project_id}')
+    else:
+        emit('error', {
+            'code': 'NO_OPERATION',
+            'message': 'No active operation for this project'
+        })
 
 
 @socketio.on('ping')
@@ -235,35 +262,89 @@ def emit_progress(
         message: Human-readable status message
         details: Optional additional details
     """
-    # Update active operations tracking
-    with _operations_lock:
-        _active_operations[project_id] = {
+    if _event_channel is not None:
+        _event_channel.put(('progress', {
+            'project_id': project_id,
             'operation': operation,
-            'current_step': step,
+            'step': step,
             'total_steps': total_steps,
             'step_name': step_name,
             'percent': percent,
             'message': message,
-            'details': details or {},
-            'updated_at': datetime.utcnow().isoformat()
-        }
+            'details': details
+        }))
+        return
 
-    # Emit to project room
-    socketio.emit('progress_update', {
+    state = {
         'project_id': project_id,
         'operation': operation,
         'step': step,
         'total_steps': total_steps,
         'step_name': step_name,
-        'percent': percent,
+        'percent': round(percent, 1),
         'message': message,
-        'details': details or {},
-        'timestamp': datetime.utcnow().isoformat()
-    }, room=f'project_{project_id}')
+        'details': details or {}
+    }
+    with _progress_lock:
+        previous = _last_progress.get(project_id)
+        _last_progress[project_id] = state
+
+    payload = _progress_message(state, previous)
+    if payload is None:
+        return  # Nothing changed since the last emit
+
+    # Update active operations tracking
+    _registry.set(project_id, {
+        'operation': operation,
+        'current_step': step,
+        'total_steps': total_steps,
+        'step_name': step_name,
+        'percent': state['percent'],
+        'message': message,
+        'details': state['details'],
+        'updated_at': datetime.utcnow().isoformat()
+    })
+
+    # Emit to project room
+    payload['timestamp'] = datetime.utcnow().isoformat()
+    socketio.emit('progress_update', payload, room=f'project_{project_id}')
 
     logger.debug(f"Progress: {project_id} - {step}/{total_steps} ({percent:.1f}%) - {message}")
 
 
+def _progress_message(
+    state: Dict[str, Any],
+    previous: Optional[Dict[str, Any]]
+) -> Optional[Dict[str, Any]]:
+    """
+    Build the progress_update payload for a state.
+
+    The first update of an operation is sent in full. Later updates are
+    deltas: project_id, step and percent plus the fields that changed,
+    flagged with 'delta': True for the client to merge.
+
+    Returns:
+        The payload, or None if nothing changed
+    """
+    if previous is None or previous['operation'] != state['operation']:
+        return dict(state, delta=False)
+
+    changed = {
+        field: state[field] for field in PROGRESS_DELTA_FIELDS
+        if state[field] != previous[field]
+    }
+    if not changed and state['step'] == previous['step'] and state['percent'] == previous['percent']:
+        return None
+
+    changed.update({
+        'project_id': state['project_id'],
+        'step': state['step'],
+        'percent': state['percent'],
+        'delta': True
+    })
+    return changed
+
+
 def emit_operation_complete(
     project_id: str,
     operation: str,
@@ -281,10 +362,20 @@ def emit_operation_complete(
         result: Result data (if success)
         error: Error message (if failed)
     """
+    if _event_channel is not None:
+        _event_channel.put(('complete', {
+            'project_id': project_id,
+            'operation': operation,
+            'success': success,
+            'result': result,
+            'error': error
+        }))
+        return
+
     # Remove from active operations
-    with _operations_lock:
-        if project_id in _active_operations:
-            del _active_operations[project_id]
+    _registry.remove(project_id)
+    with _progress_lock:
+        _last_progress.pop(project_id, None)
 
     socketio.emit('operation_complete', {
         'project_id': project_id,
@@ -301,6 +392,10 @@ def emit_operation_complete(
 
 def emit_project_saved(project_id: str):
     """Emit project saved notification."""
+    if _event_channel is not None:
+        _event_channel.put(('project_saved', {'project_id': project_id}))
+        return
+
     socketio.emit('project_saved', {
         'project_id': project_id,
         'saved_at': datetime.utcnow().isoformat()
@@ -309,6 +404,15 @@ def emit_project_saved(project_id: str):
 
 def emit_error(project_id: str, code: str, message: str, details: Dict[str, Any] = None):
     """Emit error event to project subscribers."""
+    if _event_channel is not None:
+        _event_channel.put(('error', {
+            'project_id': project_id,
+            'code': code,
+            'message': message,
+            'details': details
+        }))
+        return
+
     socketio.emit('error', {
         'project_id': project_id,
         'code': code,
@@ -345,6 +449,9 @@ class ProgressTracker:
         self.current_step = 0
         self.cancelled = False
         self._started_at = None
+        self._last_emit = 0.0
+        self._last_cancel_check = 0.0
+        self._pending: Optional[Dict[str, Any]] = None
 
     def __enter__(self):
         self._started_at = datetime.utcnow()
@@ -352,12 +459,11 @@ class ProgressTracker:
 
     def __exit__(self, exc_type, exc_val, exc_tb):
         # Clean up on exit
-        with _operations_lock:
-            if self.project_id in _active_operations:
-                del _active_operations[self.project_id]
+        _registry.remove(self.project_id)
 
         # If exception occurred, emit error
         if exc_type is not None:
+            self.flush()
             emit_operation_complete(
                 self.project_id,
                 self.operation,
@@ -372,20 +478,26 @@ class ProgressTracker:
         """
         Update progress to a specific step.
 
+        Updates within a step are coalesced to the configured emit rate.
+        The latest held-back update goes out with the next emit, when the
+        step changes, or on complete()/fail()/flush().
+
         Args:
             step: Step number (1-based)
             message: Status message
             details: Optional details
             sub_progress: Progress within current step (0-1)
         """
+        now = time.monotonic()
+        step_changed = step != self.current_step
+
         # Check for cancellation
-        with _operations_lock:
-            if self.project_id in _active_operations:
-                if _active_operations[self.project_id].get('cancelled'):
-                    self.cancelled = True
-                    raise OperationCancelled(f"Operation cancelled by user")
+        if step_changed or now - self._last_cancel_check >= CANCEL_CHECK_INTERVAL_SECONDS:
+            self._last_cancel_check = now
+            if self.is_cancelled():
+                self.cancelled = True
+                raise OperationCancelled(f"Operation cancelled by user")
 
-        self.current_step = step
         step_info = self.steps[step - 1] if step <= len(self.steps) else {"name": "Processing"}
 
         # Calculate overall percentage
@@ -393,7 +505,7 @@ class ProgressTracker:
         step_percent = (sub_progress / self.total_steps) * 100
         percent = min(base_percent + step_percent, 99)  # Cap at 99 until complete
 
-        emit_progress(
+        payload = dict(
             project_id=self.project_id,
             operation=self.operation,
             step=step,
@@ -404,8 +516,28 @@ class ProgressTracker:
             details=details
         )
 
+        if not step_changed and now - self._last_emit < _progress_interval:
+            self._pending = payload
+            return
+
+        # Finish the previous step with its latest update
+        if step_changed:
+            self.flush()
+        self._pending = None
+        self._last_emit = now
+        self.current_step = step
+        emit_progress(**payload)
+
+    def flush(self):
+        """Emit the latest update held back by the emit rate, if any."""
+        if self._pending is not None:
+            payload, self._pending = self._pending, None
+            self._last_emit = time.monotonic()
+            emit_progress(**payload)
+
     def complete(self, result: Dict[str, Any] = None):
         """Mark operation as complete."""
+        self.flush()
         emit_progress(
             project_id=self.project_id,
             operation=self.operation,
@@ -425,6 +557,7 @@ class ProgressTracker:
 
     def fail(self, error: str, details: Dict[str, Any] = None):
         """Mark operation as failed."""
+        self.flush()
         emit_operation_complete(
             project_id=self.project_id,
             operation=self.operation,
@@ -432,19 +565,24 @@ class ProgressTracker:
             error=error
         )
 
+    def cancellation_token(self) -> CancellationToken:
+        """
+        Get a token for the extractor, importer and API client.
+
+        The token polls is_cancelled() at most every
+        CANCEL_CHECK_INTERVAL_SECONDS.
+        """
+        return CancellationToken(self.is_cancelled, CANCEL_CHECK_INTERVAL_SECONDS)
+
     def is_cancelled(self) -> bool:
         """Check if operation was cancelled."""
-        with _operations_lock:
-            if self.project_id in _active_operations:
-                return _active_operations[self.project_id].get('cancelled', False)
+        if _registry.is_cancelled(self.project_id):
+            return True
+        if _cancel_check is not None and _cancel_check(self.project_id):
+            return True
         return self.cancelled
 
 
-class OperationCancelled(Exception):
-    """Exception raised when operation is cancelled by user."""
-    pass
-
-
 # =============================================================================
 # UTILITY FUNCTIONS
 # =============================================================================
@@ -458,14 +596,12 @@ def _cleanup_client_subscriptions(sid: str):
 
 def get_active_operations() -> Dict[str, Dict[str, Any]]:
     """Get all active operations (for admin/debugging)."""
-    with _operations_lock:
-        return dict(_active_operations)
+    return _registry.all()
 
 
 def is_operation_active(project_id: str) -> bool:
     """Check if there's an active operation for a project."""
-    with _operations_lock:
-        return project_id in _active_operations
+    return _registry.contains(project_id)
 
 
 def cancel_operation(project_id: str) -> bool:
@@ -475,15 +611,87 @@ def cancel_operation(project_id: str) -> bool:
     Returns:
         True if operation was found and cancellation requested
     """
-    with _operations_lock:
-        if project_id in _active_operations:
-            _active_operations[project_id]['cancelled'] = True
-            return True
-    return False
+    found = _registry.request_cancel(project_id)
+
+    if _cancel_request_handler is not None and _cancel_request_handler(project_id):
+        found = True
+    return found
+
+
+def set_event_channel(channel):
+    """
+    Forward progress events to a channel instead of emitting them.
+
+    Used by job worker processes, which have no Socket.IO clients. The
+    web process reads the channel and calls relay_event().
+    """
+    global _event_channel
+    _event_channel = channel
+
+
+def set_cancel_check(
+    check: Optional[Callable[[str], bool]],
+    request_handler: Optional[Callable[[str], bool]] = None
+):
+    """
+    Register extra cancellation hooks.
+
+    Args:
+        check: Returns True if the project's operation should stop
+        request_handler: Records a cancellation request; returns True if
+            there was something to cancel
+    """
+    global _cancel_check, _cancel_request_handler
+    _cancel_check = check
+    _cancel_request_handler = request_handler
+
+
+def relay_event(kind: str, payload: Dict[str, Any]):
+    """Emit an event received from a job worker process."""
+    if kind == 'progress':
+        emit_progress(**payload)
+    elif kind == 'complete':
+        emit_operation_complete(**payload)
+    elif kind == 'project_saved':
+        emit_project_saved(**payload)
+    elif kind == 'error':
+        emit_error(**payload)
+    else:
+        logger.warning(f"Unknown worker event: {kind}")
+
+
+def get_operation_registry() -> OperationRegistry:
+    """Get the active operations registry."""
+    return _registry
 
 
 def init_websocket(app):
-    """Initialize WebSocket with Flask app."""
-    socketio.init_app(app)
-    logger.info("WebSocket initialized")
+    """
+    Initialize WebSocket with Flask app.
+
+    With SOCKETIO_MESSAGE_QUEUE set (e.g. redis://host:6379/0), emits are
+    published through the queue so clients connected to any instance
+    receive them.
+    """
+    global _registry, _progress_interval
+    _registry = create_operation_registry(app)
+
+    emits_per_second = float(app.config.get(
+        'PROGRESS_EMITS_PER_SECOND',
+        os.environ.get('PROGRESS_EMITS_PER_SECOND', DEFAULT_PROGRESS_EMITS_PER_SECOND)
+    ))
+    _progress_interval = 1.0 / emits_per_second if emits_per_second > 0 else 0.0
+
+    message_queue = app.config.get(
+        'SOCKETIO_MESSAGE_QUEUE', os.environ.get('SOCKETIO_MESSAGE_QUEUE')
+    )
+    if message_queue:
+        socketio.init_app(app, message_queue=message_queue)
+    else:
+        socketio.init_app(app)
+
+    logger.info(
+        f"WebSocket initialized (registry: {type(_registry).__name__}, "
+        f"message queue: {'yes' if message_queue else 'no'})"
+    )
     return socketio